@@ -18,6 +18,11 @@ try:
 except ImportError:
     STORAGE_AVAILABLE = False
     usage_storage = None
+except Exception as e:
+    # The database could not be opened; track usage in memory rather than break every request
+    logging.getLogger(__name__).warning(f"Usage storage unavailable: {str(e)}")
+    STORAGE_AVAILABLE = False
+    usage_storage = None
 
 logger = logging.getLogger(__name__)
 
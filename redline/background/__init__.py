@@ -24,6 +24,8 @@ if os.path.exists(tasks_py_path):
     process_data_analysis = tasks_module.process_data_analysis
     process_file_upload = tasks_module.process_file_upload
     process_bulk_operations = tasks_module.process_bulk_operations
+    process_batch_download = tasks_module.process_batch_download
+    process_lake_compaction = tasks_module.process_lake_compaction
 else:
     # Fallback: create dummy functions if tasks.py doesn't exist
     def process_data_conversion(*args, **kwargs):
@@ -36,6 +38,10 @@ else:
         raise NotImplementedError("tasks.py not found")
     def process_bulk_operations(*args, **kwargs):
         raise NotImplementedError("tasks.py not found")
+    def process_batch_download(*args, **kwargs):
+        raise NotImplementedError("tasks.py not found")
+    def process_lake_compaction(*args, **kwargs):
+        raise NotImplementedError("tasks.py not found")
 
 __all__ = [
     'TaskManager',
@@ -43,5 +49,7 @@ __all__ = [
     'process_data_download', 
     'process_data_analysis',
     'process_file_upload',
-    'process_bulk_operations'
+    'process_bulk_operations',
+    'process_batch_download',
+    'process_lake_compaction'
 ]
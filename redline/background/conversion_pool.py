@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+REDLINE Conversion Pool
+Converts many files in parallel on a shared process pool.
+
+A batch is submitted as a job and runs on a dispatcher thread, so callers
+get a job id back immediately. The dispatcher keeps at most one file per
+worker in flight and also caps the input bytes in flight at a memory budget
+(files large enough to be streamed count only up to the streaming threshold,
+since their memory use is bounded by the batch size). Every finished file is
+reported to the job's progress callback, which the web layer forwards to
+Flask-SocketIO.
+
+Job state is also saved to a SQLite database (REDLINE_CONVERSION_JOBS_DB)
+every few seconds while the job runs and when it finishes, so a status
+poll answered by another web worker finds the job too.
+"""
+
+import os
+import json
+import time
+import uuid
+import atexit
+import sqlite3
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET_MB = 1024
+# Finished jobs kept for status lookups
+MAX_FINISHED_JOBS = 100
+# Seconds between saves of a running job's state (each save writes every result so far)
+JOB_SAVE_INTERVAL = 2.0
+
+
+def _init_worker():
+    """Worker process setup: converted frames are used once, so skip the frame cache."""
+    os.environ['REDLINE_FRAME_CACHE_MB'] = '0'
+
+
+def _convert_one(input_path: str, input_format: Optional[str], output_path: str,
+                 output_format: str) -> Dict[str, Any]:
+    """
+    Convert one file (runs in a worker process).
+
+    Returns:
+        ConversionStats as a dict
+    """
+    from ..core.format_converter import FormatConverter
+    converter = FormatConverter()
+    if not input_format:
+        input_format = converter.detect_format_from_extension(input_path)
+    return converter.convert_file(input_path, input_format, output_path, output_format).to_dict()
+
+
+@dataclass
+class ConversionJob:
+    """State of one batch conversion job."""
+    job_id: str
+    total: int
+    status: str = 'PENDING'
+    completed: int = 0
+    failed: int = 0
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    submitted_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    completed_at: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('SUCCESS', 'FAILURE')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job state in the shape of the synchronous batch-convert response."""
+        finished = self.completed + self.failed
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'message': f'Batch conversion {"completed" if self.done else "running"}. '
+                       f'{self.completed} successful, {self.failed} failed.',
+            'results': list(self.results),
+            'errors': list(self.errors),
+            'total_files': self.total,
+            'successful': self.completed,
+            'failed': self.failed,
+            'progress': int(finished * 100 / self.total) if self.total else 100,
+            'submitted_at': self.submitted_at,
+            'completed_at': self.completed_at,
+            'seconds': round(self.seconds, 3)
+        }
+
+
+class ConversionJobStore:
+    """State of batch conversion jobs, in SQLite so every process can look a job up."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite file (defaults to REDLINE_CONVERSION_JOBS_DB or data/conversion_jobs.sqlite)
+        """
+        self.path = path or os.environ.get('REDLINE_CONVERSION_JOBS_DB') or os.path.join(
+            os.getcwd(), 'data', 'conversion_jobs.sqlite')
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, state TEXT NOT NULL, done INTEGER NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def save(self, job: ConversionJob):
+        """Record a job's current state, forgetting the oldest finished jobs."""
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT OR REPLACE INTO jobs (job_id, state, done, updated) VALUES (?, ?, ?, ?)",
+                         (job.job_id, json.dumps(asdict(job), default=str), int(job.done), time.time()))
+            if job.done:
+                conn.execute("DELETE FROM jobs WHERE done = 1 AND job_id NOT IN "
+                             "(SELECT job_id FROM jobs WHERE done = 1 ORDER BY updated DESC LIMIT ?)",
+                             (MAX_FINISHED_JOBS,))
+
+    def get(self, job_id: str) -> Optional[ConversionJob]:
+        """A job's last recorded state, or None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT state FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return ConversionJob(**json.loads(row[0])) if row else None
+
+
+class ConversionPool:
+    """Runs batch conversion jobs on a process pool with a bounded in-flight memory budget."""
+
+    def __init__(self, workers: Optional[int] = None, memory_budget_mb: Optional[float] = None,
+                 store: Optional[ConversionJobStore] = None):
+        """
+        Initialize the pool (worker processes start on first use).
+
+        Args:
+            workers: Worker processes (defaults to REDLINE_CONVERT_WORKERS or the CPU count)
+            memory_budget_mb: Input megabytes in flight at once (defaults to REDLINE_CONVERT_MEMORY_MB)
+            store: Job store shared with other processes (defaults to one at REDLINE_CONVERSION_JOBS_DB)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers or int(os.environ.get('REDLINE_CONVERT_WORKERS', 0)) or os.cpu_count() or 1
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.environ.get('REDLINE_CONVERT_MEMORY_MB', DEFAULT_MEMORY_BUDGET_MB))
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._jobs: 'OrderedDict[str, ConversionJob]' = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._saved_at: Dict[str, float] = {}
+        self.store = store or ConversionJobStore()
+
+    def submit(self, items: List[Dict[str, Any]],
+               progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+               errors: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Start a batch conversion job in the background.
+
+        Args:
+            items: Files to convert, each a dict with input_path, output_path,
+                output_format, optional input_format (detected from the extension
+                when missing) and optional meta (copied into the file's result)
+            progress_callback: Called with an event dict as each file finishes
+                and once when the job completes
+            errors: Per-file errors found before submission (counted as failed)
+
+        Returns:
+            Job id for get_job()
+        """
+        job = self._new_job(items, errors)
+        thread = threading.Thread(target=self._run_job, args=(job, items, progress_callback),
+                                  name=f'conversion-job-{job.job_id[:8]}', daemon=True)
+        thread.start()
+        return job.job_id
+
+    def run(self, items: List[Dict[str, Any]],
+            progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+            errors: Optional[List[Dict[str, Any]]] = None) -> ConversionJob:
+        """
+        Run a batch conversion job and wait for it.
+
+        Args:
+            items: Files to convert (see submit)
+            progress_callback: Called with an event dict as each file finishes
+            errors: Per-file errors found before submission (counted as failed)
+
+        Returns:
+            The finished ConversionJob
+        """
+        job = self._new_job(items, errors)
+        self._run_job(job, items, progress_callback)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ConversionJob]:
+        """Look up a job by id, including jobs run by other processes."""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        try:
+            return self.store.get(job_id)
+        except Exception as e:
+            self.logger.warning(f"Could not read conversion job {job_id}: {str(e)}")
+            return None
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _new_job(self, items: List[Dict[str, Any]], errors: Optional[List[Dict[str, Any]]]) -> ConversionJob:
+        errors = list(errors or [])
+        job = ConversionJob(job_id=str(uuid.uuid4()), total=len(items) + len(errors),
+                            failed=len(errors), errors=errors)
+        with self._jobs_lock:
+            self._jobs[job.job_id] = job
+            # Forget the oldest finished jobs
+            finished = [job_id for job_id, known in self._jobs.items() if known.done]
+            for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self._jobs[job_id]
+        self._save(job)
+        return job
+
+    def _save(self, job: ConversionJob):
+        """Record a job's state for other processes; a store failure never fails the job."""
+        self._saved_at[job.job_id] = time.monotonic()
+        try:
+            self.store.save(job)
+        except Exception as e:
+            self.logger.warning(f"Could not record conversion job {job.job_id}: {str(e)}")
+        if job.done:
+            self._saved_at.pop(job.job_id, None)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Shared executor, or None where child processes are not allowed."""
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes (e.g. Celery prefork workers) cannot have children
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                # Spawned (not forked) workers are safe to start from a threaded web server
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'),
+                                                     initializer=_init_worker)
+            return self._executor
+
+    def _cost(self, item: Dict[str, Any]) -> int:
+        """Input bytes a conversion holds in memory (streamed files are bounded by the threshold)."""
+        from ..core.format_converter import STREAM_CONVERT_MB
+        try:
+            size = os.path.getsize(item['input_path'])
+        except (OSError, TypeError):
+            size = 0
+        return min(size, int(STREAM_CONVERT_MB * 1024 * 1024))
+
+    def _run_job(self, job: ConversionJob, items: List[Dict[str, Any]],
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]]):
+        start = time.perf_counter()
+        job.status = 'PROGRESS'
+        self.logger.info(f"Conversion job {job.job_id}: {len(items)} file(s) on {self.workers} worker(s)")
+        # Items not yet recorded, by position
+        unfinished = dict(enumerate(items))
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                for index, item in list(unfinished.items()):
+                    try:
+                        stats = _convert_one(item['input_path'], item.get('input_format'),
+                                             item['output_path'], item['output_format'])
+                        self._record(job, item, stats, None, progress_callback)
+                    except Exception as e:
+                        self._record(job, item, None, e, progress_callback)
+                    del unfinished[index]
+            else:
+                self._dispatch(executor, job, unfinished, progress_callback)
+            job.status = 'SUCCESS'
+        except Exception as e:
+            self.logger.error(f"Conversion job {job.job_id} failed: {str(e)}")
+            # Every file the job did not finish fails with it, keeping its meta
+            for item in unfinished.values():
+                self._record(job, item, None, e, progress_callback)
+            job.status = 'FAILURE'
+        finally:
+            job.seconds = time.perf_counter() - start
+            job.completed_at = datetime.utcnow().isoformat()
+            self._save(job)
+            self.logger.info(f"Conversion job {job.job_id} finished in {job.seconds:.1f}s: "
+                             f"{job.completed} successful, {job.failed} failed")
+            self._emit(progress_callback, {'job_id': job.job_id, 'event': 'job_completed',
+                                           'status': job.status, 'total': job.total,
+                                           'successful': job.completed, 'failed': job.failed,
+                                           'progress': 100, 'seconds': round(job.seconds, 3)})
+
+    def _dispatch(self, executor: ProcessPoolExecutor, job: ConversionJob, unfinished: Dict[int, Dict[str, Any]],
+                  progress_callback: Optional[Callable[[Dict[str, Any]], None]]):
+        """Convert the unfinished items on the executor, removing each from unfinished once recorded."""
+        pending = deque((index, item, self._cost(item)) for index, item in unfinished.items())
+        in_flight: Dict[Any, Tuple[int, Dict[str, Any], int]] = {}
+        in_flight_bytes = 0
+        while pending or in_flight:
+            # Admit files while a worker is free and the budget allows (one file always runs)
+            while pending and len(in_flight) < self.workers:
+                index, item, cost = pending[0]
+                if in_flight and in_flight_bytes + cost > self.memory_budget:
+                    break
+                pending.popleft()
+                future = executor.submit(_convert_one, item['input_path'], item.get('input_format'),
+                                         item['output_path'], item['output_format'])
+                in_flight[future] = (index, item, cost)
+                in_flight_bytes += cost
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item, cost = in_flight.pop(future)
+                in_flight_bytes -= cost
+                try:
+                    self._record(job, item, future.result(), None, progress_callback)
+                except BrokenProcessPool:
+                    # A worker died; drop the pool so the next job starts a fresh one
+                    self.shutdown()
+                    raise
+                except Exception as e:
+                    self._record(job, item, None, e, progress_callback)
+                del unfinished[index]
+
+    def _record(self, job: ConversionJob, item: Dict[str, Any], stats: Optional[Dict[str, Any]],
+                error: Optional[Exception], progress_callback: Optional[Callable[[Dict[str, Any]], None]]):
+        meta = dict(item.get('meta') or {'input_file': item['input_path']})
+        if error is None:
+            entry = {
+                **meta,
+                'output_format': item['output_format'],
+                'file_size': stats['output_bytes'],
+                'records': stats['rows'],
+                'conversion_stats': stats,
+                'success': True
+            }
+            job.results.append(entry)
+            job.completed += 1
+        else:
+            self.logger.warning(f"Conversion of {item['input_path']} failed: {str(error)}")
+            entry = {**meta, 'error': str(error)}
+            job.errors.append(entry)
+            job.failed += 1
+
+        # Saving writes every result so far, so a running job is saved only now and then
+        if time.monotonic() - self._saved_at.get(job.job_id, 0.0) >= JOB_SAVE_INTERVAL:
+            self._save(job)
+        finished = job.completed + job.failed
+        self._emit(progress_callback, {
+            'job_id': job.job_id,
+            'event': 'file_completed' if error is None else 'file_failed',
+            'file': entry,
+            'completed': finished,
+            'total': job.total,
+            'progress': int(finished * 100 / job.total) if job.total else 100
+        })
+
+    def _emit(self, progress_callback: Optional[Callable[[Dict[str, Any]], None]], event: Dict[str, Any]):
+        if progress_callback is None:
+            return
+        try:
+            progress_callback(event)
+        except Exception as e:
+            # A broken progress channel must not stop the conversions
+            self.logger.debug(f"Progress callback failed: {str(e)}")
+
+
+_conversion_pool: Optional[ConversionPool] = None
+_conversion_pool_lock = threading.Lock()
+
+
+def get_conversion_pool() -> ConversionPool:
+    """
+    Get the process-wide conversion pool.
+
+    Configured from the environment on first use:
+        REDLINE_CONVERT_WORKERS     worker processes (default: CPU count)
+        REDLINE_CONVERT_MEMORY_MB   input megabytes in flight (default 1024)
+        REDLINE_CONVERSION_JOBS_DB  SQLite file shared by all processes (default: data/conversion_jobs.sqlite)
+    """
+    global _conversion_pool
+    with _conversion_pool_lock:
+        if _conversion_pool is None:
+            _conversion_pool = ConversionPool()
+        return _conversion_pool
+
+
+def _shutdown_conversion_pool():
+    with _conversion_pool_lock:
+        if _conversion_pool is not None:
+            _conversion_pool.shutdown()
+
+
+atexit.register(_shutdown_conversion_pool)
@@ -0,0 +1,705 @@
+#!/usr/bin/env python3
+"""
+REDLINE Download Jobs
+Batch downloads run as resumable background jobs.
+
+A batch download is recorded in a SQLite database (REDLINE_DOWNLOAD_JOBS_DB)
+before it starts: one row for the job and one per ticker. Each ticker moves
+through pending -> fetching -> done | failed as the download engine works on
+it, and the row is updated as each state is reached, so the database always
+shows how far the job has got.
+
+The process running a job holds a lease on it and renews it every few
+seconds. If that process crashes or is restarted, the lease lapses and the
+watchdog of any web worker (or the next one to start) claims the job. Its
+fetching tickers go back to pending, and it carries on with the tickers
+not yet done. An owner that finds its lease gone (say after a long stall)
+starts no new requests and records nothing more, so a job never runs in
+two places at once. Cancelling a job sets a flag in the database, so it
+works from any worker: no new requests start, and the tickers not yet
+started stay pending.
+
+Jobs go to Celery through TaskManager when a broker is configured;
+otherwise they run on a thread in the web process. API keys are never
+written to the job database: the submitting process hands the key to the
+job directly, and a resumed job looks its source's key up again (the
+environment, then the saved API keys).
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..downloaders.download_engine import DownloadCancelled
+from ..downloaders.exceptions import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+# Ticker states
+PENDING = 'pending'
+FETCHING = 'fetching'
+DONE = 'done'
+FAILED = 'failed'
+
+# Job statuses, as for other background jobs
+FINISHED_STATUSES = ('SUCCESS', 'FAILURE', 'CANCELLED')
+
+DEFAULT_LEASE_SECONDS = 30.0
+
+
+def create_downloader(source: str, api_key: Optional[str] = None):
+    """
+    Create the downloader for a batch download source.
+
+    Args:
+        source: 'yahoo', 'stooq', 'alpha_vantage', 'finnhub', 'massive',
+            'csv' or 'custom_<id>'
+        api_key: API key for sources that need one (defaults to the
+            source's environment variable)
+
+    Returns:
+        Downloader instance, or None for an unknown source
+
+    Raises:
+        ValueError: If the source needs an API key or configuration it does not have
+        LookupError: If a custom API is not configured
+    """
+    if source == 'yahoo':
+        from ..downloaders.yahoo_downloader import YahooDownloader
+        return YahooDownloader()
+    if source == 'stooq':
+        from ..downloaders.stooq_downloader import StooqDownloader
+        # Use REDLINE data directory for Stooq downloads
+        data_dir = os.path.join(os.getcwd(), 'data', 'stooq')
+        os.makedirs(data_dir, exist_ok=True)
+        return StooqDownloader(output_dir=data_dir)
+    if source == 'alpha_vantage':
+        from ..downloaders.alpha_vantage_downloader import AlphaVantageDownloader
+        api_key = api_key or os.environ.get('ALPHA_VANTAGE_API_KEY')
+        if not api_key:
+            raise ValueError('Alpha Vantage API key is required. Please select an API key or set '
+                             'ALPHA_VANTAGE_API_KEY environment variable.')
+        return AlphaVantageDownloader(api_key=api_key)
+    if source == 'finnhub':
+        from ..downloaders.finnhub_downloader import FinnhubDownloader
+        api_key = api_key or os.environ.get('FINNHUB_API_KEY')
+        if not api_key:
+            raise ValueError('Finnhub API key is required. Please select an API key or set '
+                             'FINNHUB_API_KEY environment variable.')
+        return FinnhubDownloader(api_key=api_key)
+    if source == 'massive':
+        from ..downloaders.massive_downloader import MassiveDownloader
+        api_key = api_key or os.environ.get('MASSIVE_API_KEY')
+        if not api_key:
+            raise ValueError('Massive.com API key is required. Please select an API key or set '
+                             'MASSIVE_API_KEY environment variable.')
+        try:
+            return MassiveDownloader(api_key=api_key)
+        except Exception as e:
+            raise ValueError(f'Massive.com initialization error: {str(e)}')
+    if source.startswith('custom_'):
+        from ..downloaders.generic_api_downloader import GenericAPIDownloader
+        from ..utils.config_paths import get_custom_apis_file
+
+        custom_api_id = source.replace('custom_', '')
+        custom_apis_file = str(get_custom_apis_file())
+        if not os.path.exists(custom_apis_file):
+            raise ValueError('No custom APIs configured. Please configure a custom API first.')
+        with open(custom_apis_file, 'r') as f:
+            custom_apis = json.load(f)
+        if custom_api_id not in custom_apis:
+            raise LookupError(f'Custom API "{custom_api_id}" not found. Please check your configuration.')
+
+        api_config = custom_apis[custom_api_id].copy()
+        if api_key:
+            api_config['api_key'] = api_key
+        try:
+            return GenericAPIDownloader(api_config)
+        except Exception as e:
+            raise ValueError(f'Custom API configuration error: {str(e)}')
+    if source == 'csv':
+        from ..downloaders.csv_downloader import CSVDownloader
+        return CSVDownloader()
+    return None
+
+
+def stored_api_key(source: str) -> Optional[str]:
+    """A source's key from the saved API keys (see the API keys page), or None."""
+    try:
+        from ..utils.config_paths import get_api_keys_file
+        path = get_api_keys_file()
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f).get(source) or None
+    except Exception as e:
+        logger.debug(f"Could not read saved API keys: {str(e)}")
+        return None
+
+
+def _sample_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Consistent random bars for a ticker (REDLINE_TEST_MODE)."""
+    dates = pd.date_range(start=start_date, end=end_date, freq='D')
+    np.random.seed(hash(ticker) % 2**32)  # Consistent random data per ticker
+    return pd.DataFrame({
+        'Open': 100 + np.random.randn(len(dates)).cumsum(),
+        'High': 105 + np.random.randn(len(dates)).cumsum(),
+        'Low': 95 + np.random.randn(len(dates)).cumsum(),
+        'Close': 100 + np.random.randn(len(dates)).cumsum(),
+        'Volume': np.random.randint(1000000, 10000000, len(dates))
+    }, index=dates)
+
+
+class DownloadJobStore:
+    """Job and per-ticker state of batch downloads, in SQLite so every process shares it."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite file (defaults to REDLINE_DOWNLOAD_JOBS_DB or data/download_jobs.sqlite)
+        """
+        self.path = path or os.environ.get('REDLINE_DOWNLOAD_JOBS_DB') or os.path.join(
+            os.getcwd(), 'data', 'download_jobs.sqlite')
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, source TEXT NOT NULL, start_date TEXT, end_date TEXT, "
+                "options TEXT, status TEXT NOT NULL, cancel_requested INTEGER NOT NULL DEFAULT 0, "
+                "owner TEXT, heartbeat REAL NOT NULL DEFAULT 0, error TEXT, "
+                "submitted_at TEXT NOT NULL, completed_at TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tickers ("
+                "job_id TEXT NOT NULL, position INTEGER NOT NULL, ticker TEXT NOT NULL, state TEXT NOT NULL, "
+                "records INTEGER, filename TEXT, error TEXT, rate_limited INTEGER NOT NULL DEFAULT 0, "
+                "retry_after INTEGER, latency REAL, updated REAL, PRIMARY KEY (job_id, ticker))"
+            )
+            # Jobs recorded by earlier versions kept the API key in their options
+            conn.execute("UPDATE jobs SET options = '{}' WHERE options LIKE '%api_key%'")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(sql, params).rowcount
+
+    def create(self, job_id: str, tickers: List[str], source: str, start_date: Optional[str],
+               end_date: Optional[str], options: Optional[Dict[str, Any]] = None):
+        """Record a new job with all its tickers pending."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # A new job counts as leased until it has had a lease period to start
+            conn.execute("INSERT INTO jobs (job_id, source, start_date, end_date, options, status, heartbeat, "
+                         "submitted_at) VALUES (?, ?, ?, ?, ?, 'PENDING', ?, ?)",
+                         (job_id, source, start_date, end_date, json.dumps(options or {}), now,
+                          datetime.utcnow().isoformat()))
+            conn.executemany("INSERT INTO tickers (job_id, position, ticker, state, updated) VALUES (?, ?, ?, ?, ?)",
+                             [(job_id, i, ticker, PENDING, now) for i, ticker in enumerate(tickers)])
+            conn.execute("COMMIT")
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Take ownership of an unfinished job whose lease has lapsed (or that is already ours).
+
+        Interrupted fetches of the job go back to pending.
+
+        Returns:
+            True if the caller now owns the job
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status, owner, heartbeat FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if (row is None or row[0] in FINISHED_STATUSES
+                    or (row[1] not in (None, owner) and row[2] > now - lease_seconds)):
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute("UPDATE jobs SET owner = ?, heartbeat = ? WHERE job_id = ?", (owner, now, job_id))
+            conn.execute("UPDATE tickers SET state = ?, updated = ? WHERE job_id = ? AND state = ?",
+                         (PENDING, now, job_id, FETCHING))
+            conn.execute("COMMIT")
+            return True
+
+    def heartbeat(self, job_id: str, owner: str) -> bool:
+        """Renew the owner's lease; False if the job is no longer ours."""
+        return self._execute("UPDATE jobs SET heartbeat = ? WHERE job_id = ? AND owner = ?",
+                             (time.time(), job_id, owner)) > 0
+
+    def stalled(self, lease_seconds: float) -> List[str]:
+        """Unfinished jobs nobody holds a lease on."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT job_id FROM jobs WHERE status IN ('PENDING', 'PROGRESS') "
+                                "AND heartbeat <= ? ORDER BY submitted_at",
+                                (time.time() - lease_seconds,)).fetchall()
+        return [row[0] for row in rows]
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None, owner: Optional[str] = None) -> bool:
+        """Set a job's status; with ``owner``, only while that owner holds the job. Returns whether it was set."""
+        completed_at = datetime.utcnow().isoformat() if status in FINISHED_STATUSES else None
+        sql = "UPDATE jobs SET status = ?, error = COALESCE(?, error), completed_at = ? WHERE job_id = ?"
+        params = (status, error, completed_at, job_id)
+        if owner is not None:
+            sql, params = sql + " AND owner = ?", params + (owner,)
+        return self._execute(sql, params) > 0
+
+    def set_ticker(self, job_id: str, ticker: str, state: str, owner: Optional[str] = None, **fields) -> bool:
+        """
+        Move a ticker to a state, recording result fields (records, filename, error, ...).
+
+        With ``owner``, the ticker is only updated while that owner holds the
+        job. Returns whether it was updated.
+        """
+        columns = ['state', 'updated'] + list(fields)
+        values = [state, time.time()] + list(fields.values())
+        assignments = ', '.join(f"{column} = ?" for column in columns)
+        sql = f"UPDATE tickers SET {assignments} WHERE job_id = ? AND ticker = ?"
+        params = tuple(values) + (job_id, ticker)
+        if owner is not None:
+            sql += " AND EXISTS (SELECT 1 FROM jobs WHERE job_id = ? AND owner = ?)"
+            params += (job_id, owner)
+        return self._execute(sql, params) > 0
+
+    def request_cancel(self, job_id: str) -> bool:
+        """Flag an unfinished job for cancellation; False if it is unknown or finished."""
+        return self._execute("UPDATE jobs SET cancel_requested = 1 WHERE job_id = ? "
+                             "AND status NOT IN ('SUCCESS', 'FAILURE', 'CANCELLED')", (job_id,)) > 0
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def owned_by(self, job_id: str, owner: str) -> bool:
+        """Whether ``owner`` still holds the job."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT owner FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row and row[0] == owner)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job and its tickers in submission order, or None."""
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            job = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            tickers = conn.execute("SELECT * FROM tickers WHERE job_id = ? ORDER BY position", (job_id,)).fetchall()
+        job = dict(job)
+        job['options'] = json.loads(job['options'] or '{}')
+        job['tickers'] = [dict(row) for row in tickers]
+        return job
+
+
+def job_summary(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A job's state in the shape of the synchronous batch-download response.
+
+    Args:
+        job: Job from DownloadJobStore.get
+
+    Returns:
+        Response dict with job_id, status, results, errors and per-ticker states
+    """
+    tickers = job['tickers']
+    results = [{
+        'ticker': row['ticker'],
+        'success': True,
+        'records': row['records'],
+        'filename': row['filename'],
+        'latency_seconds': row['latency']
+    } for row in tickers if row['state'] == DONE]
+
+    errors = []
+    for row in tickers:
+        if row['state'] != FAILED:
+            continue
+        error = {'ticker': row['ticker'], 'error': row['error']}
+        if row['rate_limited']:
+            error['rate_limited'] = True
+            if row['retry_after'] is not None:
+                error['retry_after'] = row['retry_after']
+        errors.append(error)
+    if job.get('error'):
+        errors.append({'ticker': 'ALL', 'error': job['error']})
+
+    # Check if failures are due to rate limiting
+    rate_limit_count = sum(1 for error in errors if error.get('rate_limited') or 'rate limit' in (error.get('error') or '').lower())
+    rate_limit_errors = [err for err in errors if err.get('rate_limited')]
+
+    # Get retry_after from first rate limit error if available
+    retry_after = None
+    if rate_limit_errors:
+        retry_after = rate_limit_errors[0].get('retry_after', 300)
+
+    counts = {state: 0 for state in (PENDING, FETCHING, DONE, FAILED)}
+    for row in tickers:
+        counts[row['state']] += 1
+    finished = counts[DONE] + counts[FAILED]
+
+    status = job['status']
+    running = 'completed' if status == 'SUCCESS' else status.lower() if status in FINISHED_STATUSES else 'running'
+    message = f'Batch download {running}. {len(results)} successful, {len(errors)} failed.'
+    if rate_limit_count > 0:
+        if retry_after:
+            minutes = retry_after // 60
+            message += f' {rate_limit_count} failure(s) due to rate limiting. Please wait {minutes} minute(s) before retrying.'
+        else:
+            message += f' {rate_limit_count} failure(s) due to rate limiting. Please wait a few minutes before retrying.'
+
+    summary = {
+        'job_id': job['job_id'],
+        'status': status,
+        'source': job['source'],
+        'message': message,
+        'results': results,
+        'errors': errors,
+        'total_requested': len(tickers),
+        'successful': len(results),
+        'failed': len(errors),
+        'pending': counts[PENDING],
+        'fetching': counts[FETCHING],
+        'rate_limit_failures': rate_limit_count,
+        'progress': int(finished * 100 / len(tickers)) if tickers else 100,
+        'cancel_requested': bool(job['cancel_requested']),
+        'submitted_at': job['submitted_at'],
+        'completed_at': job['completed_at'],
+        'tickers': [{'ticker': row['ticker'], 'state': row['state']} for row in tickers]
+    }
+    # Add retry_after if there are rate limit errors
+    if retry_after:
+        summary['retry_after'] = retry_after
+    return summary
+
+
+class DownloadJobManager:
+    """Runs batch downloads as resumable jobs and reports their progress."""
+
+    def __init__(self, store: Optional[DownloadJobStore] = None, lease_seconds: Optional[float] = None):
+        """
+        Initialize the manager.
+
+        Args:
+            store: Job store (defaults to one at REDLINE_DOWNLOAD_JOBS_DB)
+            lease_seconds: How long a job's owner may go without renewing its
+                lease before another worker resumes the job
+                (REDLINE_DOWNLOAD_JOB_LEASE_SECONDS, default 30)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.store = store or DownloadJobStore()
+        self.lease_seconds = lease_seconds or float(os.environ.get('REDLINE_DOWNLOAD_JOB_LEASE_SECONDS',
+                                                                   DEFAULT_LEASE_SECONDS))
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        # API keys of jobs submitted here, held in memory only
+        self._api_keys: Dict[str, str] = {}
+        self._watchdog: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Set the progress channel and start resuming stalled jobs.
+
+        A watchdog thread claims jobs whose owner stopped renewing its lease,
+        now and every lease period after.
+
+        Args:
+            progress_callback: Called with an event dict as each ticker
+                changes state and as jobs finish
+        """
+        with self._lock:
+            if progress_callback is not None:
+                self.progress_callback = progress_callback
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(target=self._watch, name='download-job-watchdog', daemon=True)
+                self._watchdog.start()
+
+    def submit(self, tickers: List[str], source: str, start_date: Optional[str] = None,
+               end_date: Optional[str] = None, api_key: Optional[str] = None,
+               progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
+        """
+        Record a batch download and start it in the background.
+
+        Args:
+            tickers: Ticker symbols (duplicates are downloaded once)
+            source: Data source (see create_downloader)
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            api_key: API key for the source (kept in memory, never in the job database)
+            progress_callback: Called with an event dict as each ticker changes
+                state (defaults to the one given to start)
+
+        Returns:
+            Job id
+        """
+        job_id = self.create(tickers, source, start_date, end_date, api_key)
+
+        from .task_manager import CELERY_AVAILABLE, task_manager
+        if CELERY_AVAILABLE and task_manager.celery_app is not None:
+            self._api_keys.pop(job_id, None)
+            task_manager.submit_task('redline.background.tasks.process_batch_download',
+                                     kwargs={'job_id': job_id, 'api_key': api_key})
+        else:
+            self._start_thread(job_id, progress_callback)
+        return job_id
+
+    def create(self, tickers: List[str], source: str, start_date: Optional[str] = None,
+               end_date: Optional[str] = None, api_key: Optional[str] = None) -> str:
+        """
+        Record a batch download without starting it; returns the job id.
+
+        The API key is held in this process for the job's first run; it is
+        not stored with the job.
+        """
+        job_id = str(uuid.uuid4())
+        if api_key:
+            self._api_keys[job_id] = api_key
+        self.store.create(job_id, list(dict.fromkeys(tickers)), source, start_date, end_date)
+        self.logger.info(f"Download job {job_id}: {len(tickers)} ticker(s) from {source}")
+        return job_id
+
+    def run(self, job_id: str, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+            downloader=None, api_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run (or resume) a job until it finishes, is cancelled or loses its lease.
+
+        Args:
+            job_id: Job to run
+            progress_callback: Called with an event dict as each ticker changes state
+            downloader: Downloader to use (created from the job's source if None)
+            api_key: API key for the source (defaults to the one given at
+                submission in this process, then the environment and saved keys)
+
+        Returns:
+            The job summary, or None if another worker owns the job, it has
+            finished, or another worker took it over while it ran
+        """
+        api_key = api_key or self._api_keys.pop(job_id, None)
+        if not self.store.claim(job_id, self.owner, self.lease_seconds):
+            return None
+        progress_callback = progress_callback or self.progress_callback
+        job = self.store.get(job_id)
+        stop_heartbeat, lease_lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, stop_heartbeat, lease_lost),
+                                     name=f'download-job-{job_id[:8]}-lease', daemon=True)
+        heartbeat.start()
+        try:
+            self.store.set_status(job_id, 'PROGRESS', owner=self.owner)
+            tickers = [row['ticker'] for row in job['tickers'] if row['state'] == PENDING]
+            self.logger.info(f"Running download job {job_id}: {len(tickers)} of {len(job['tickers'])} ticker(s) to go")
+            self._download(job, tickers, downloader, progress_callback, api_key, lease_lost)
+            status = 'CANCELLED' if self.store.cancel_requested(job_id) else 'SUCCESS'
+            if not lease_lost.is_set() and not self.store.set_status(job_id, status, owner=self.owner):
+                lease_lost.set()
+        except Exception as e:
+            self.logger.error(f"Download job {job_id} failed: {str(e)}")
+            self.store.set_status(job_id, 'FAILURE', error=str(e), owner=self.owner)
+        finally:
+            stop_heartbeat.set()
+
+        if lease_lost.is_set():
+            self.logger.warning(f"Stopped download job {job_id}: another worker has taken it over")
+            return None
+
+        summary = job_summary(self.store.get(job_id))
+        self._emit(progress_callback, {'job_id': job_id, 'event': 'job_completed', 'status': summary['status'],
+                                       'total': summary['total_requested'], 'successful': summary['successful'],
+                                       'failed': summary['failed'], 'pending': summary['pending'],
+                                       'progress': summary['progress']})
+        return summary
+
+    def cancel(self, job_id: str) -> bool:
+        """Ask a job to stop; tickers not yet started stay pending. False if unknown or finished."""
+        cancelled = self.store.request_cancel(job_id)
+        if cancelled:
+            self.logger.info(f"Download job {job_id} cancellation requested")
+        return cancelled
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's summary (see job_summary), or None if unknown."""
+        job = self.store.get(job_id)
+        return job_summary(job) if job is not None else None
+
+    def resume_stalled(self) -> List[str]:
+        """Start every job whose owner stopped renewing its lease; returns their ids."""
+        stalled = self.store.stalled(self.lease_seconds)
+        for job_id in stalled:
+            self.logger.info(f"Resuming stalled download job {job_id}")
+            self._start_thread(job_id, None)
+        return stalled
+
+    def _start_thread(self, job_id: str, progress_callback):
+        thread = threading.Thread(target=self.run, args=(job_id, progress_callback),
+                                  name=f'download-job-{job_id[:8]}', daemon=True)
+        thread.start()
+
+    def _watch(self):
+        while True:
+            try:
+                self.resume_stalled()
+            except Exception as e:
+                self.logger.warning(f"Could not check for stalled download jobs: {str(e)}")
+            time.sleep(self.lease_seconds)
+
+    def _heartbeat(self, job_id: str, stop: threading.Event, lease_lost: threading.Event):
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.store.heartbeat(job_id, self.owner):
+                self.logger.warning(f"Lost the lease on download job {job_id}")
+                lease_lost.set()
+                return
+
+    def _download(self, job: Dict[str, Any], tickers: List[str], downloader, progress_callback,
+                  api_key: Optional[str], lease_lost: threading.Event):
+        job_id, source = job['job_id'], job['source']
+        start_date, end_date = job['start_date'], job['end_date']
+        total = len(job['tickers'])
+        finished = total - len(tickers)
+
+        def stop() -> bool:
+            if not lease_lost.is_set() and not self.store.owned_by(job_id, self.owner):
+                lease_lost.set()
+            return lease_lost.is_set() or self.store.cancel_requested(job_id)
+
+        def set_ticker(ticker: str, state: str, **fields) -> bool:
+            # Only while this process still owns the job
+            if lease_lost.is_set() or not self.store.set_ticker(job_id, ticker, state, owner=self.owner, **fields):
+                lease_lost.set()
+                return False
+            return True
+
+        def started(ticker: str):
+            if not set_ticker(ticker, FETCHING):
+                return
+            self._emit(progress_callback, {'job_id': job_id, 'event': 'ticker_started', 'ticker': ticker,
+                                           'completed': finished, 'total': total})
+
+        def record(ticker: str, result: Optional[pd.DataFrame], error: Optional[BaseException], latency=None):
+            nonlocal finished
+            if isinstance(error, DownloadCancelled):
+                set_ticker(ticker, PENDING)
+                return
+            if lease_lost.is_set():
+                return
+            if error is None and (result is None or result.empty):
+                # If download failed due to rate limiting, try to use existing data
+                existing_file = f"data/{ticker}_yahoo_data.csv"
+                if os.path.exists(existing_file):
+                    logger.info(f"Using existing data file for {ticker}")
+                    result = pd.read_csv(existing_file, index_col=0, parse_dates=True)
+
+            fields = {'latency': round(latency, 4) if latency is not None else None}
+            if error is None and result is not None and not result.empty:
+                from ..web.utils.download_helpers import save_downloaded_data
+                try:
+                    filename, _ = save_downloaded_data(result, ticker, source, start_date, end_date)
+                    fields.update(records=len(result), filename=filename)
+                    state = DONE
+                except Exception as e:
+                    error, state = e, FAILED
+            else:
+                state = FAILED
+            if state == FAILED:
+                fields.update(self._describe_error(ticker, source, error))
+            if not set_ticker(ticker, state, **fields):
+                return
+
+            finished += 1
+            self._emit(progress_callback, {'job_id': job_id, 'event': 'ticker_' + state, 'ticker': ticker,
+                                           'error': fields.get('error'), 'records': fields.get('records'),
+                                           'completed': finished, 'total': total,
+                                           'progress': int(finished * 100 / total) if total else 100})
+
+        # Use environment variable for test mode instead of request parameter
+        if os.environ.get('REDLINE_TEST_MODE', 'false').lower() == 'true':
+            logger.info("Running in test mode - will create sample data")
+            for ticker in tickers:
+                if stop():
+                    return
+                started(ticker)
+                record(ticker, _sample_data(ticker, start_date, end_date), None)
+            return
+
+        if downloader is None:
+            try:
+                downloader = create_downloader(source, api_key)
+            except ValueError:
+                # No key given and none in the environment: try the saved keys
+                saved_key = None if api_key else stored_api_key(source)
+                if not saved_key:
+                    raise
+                downloader = create_downloader(source, saved_key)
+        if downloader is None:
+            for ticker in tickers:
+                record(ticker, None, None)
+            return
+
+        downloader.download_report(
+            tickers, start_date, end_date,
+            start_callback=lambda item: started(item.ticker),
+            progress_callback=lambda done, count, item: record(item.ticker, item.data, item.error,
+                                                                item.latency_seconds),
+            cancel=stop)
+
+    @staticmethod
+    def _describe_error(ticker: str, source: str, error: Optional[BaseException]) -> Dict[str, Any]:
+        """Error fields of a failed ticker, flagging rate limiting."""
+        if error is None:
+            # No data found - not a rate limit issue
+            return {'error': 'No data found'}
+        if isinstance(error, RateLimitError):
+            # Rate limit error from downloader
+            logger.warning(f"Rate limited for {ticker} from {source}: {error.message}")
+            retry_after = error.retry_after or 300
+            error_msg = f"Rate limit exceeded. {error.message}"
+            minutes = retry_after // 60
+            if minutes > 0:
+                error_msg += f" Please wait {minutes} minute(s) before trying again."
+            return {'error': error_msg, 'rate_limited': 1, 'retry_after': retry_after}
+
+        error_msg = str(error)
+        # Check if exception indicates rate limiting (fallback)
+        if "Too Many Requests" in error_msg or "rate limit" in error_msg.lower():
+            return {'error': f"Rate limited for {ticker}. Please wait before trying again.", 'rate_limited': 1}
+        return {'error': error_msg}
+
+    def _emit(self, progress_callback: Optional[Callable[[Dict[str, Any]], None]], event: Dict[str, Any]):
+        if progress_callback is None:
+            return
+        try:
+            progress_callback(event)
+        except Exception as e:
+            # A broken progress channel must not stop the downloads
+            self.logger.debug(f"Progress callback failed: {str(e)}")
+
+
+_download_jobs: Optional[DownloadJobManager] = None
+_download_jobs_lock = threading.Lock()
+
+
+def get_download_jobs() -> DownloadJobManager:
+    """
+    Get the process-wide download job manager.
+
+    Configured from the environment on first use:
+        REDLINE_DOWNLOAD_JOBS_DB             SQLite file shared by all processes (default: data/download_jobs.sqlite)
+        REDLINE_DOWNLOAD_JOB_LEASE_SECONDS   seconds before an unrenewed job is resumed elsewhere (default 30)
+    """
+    global _download_jobs
+    with _download_jobs_lock:
+        if _download_jobs is None:
+            _download_jobs = DownloadJobManager()
+        return _download_jobs
@@ -18,9 +18,10 @@ except ImportError:
 
 # Import task implementations
 from .tasks.conversion_tasks import process_data_conversion_impl, process_file_upload_impl
-from .tasks.download_tasks import process_data_download_impl
+from .tasks.download_tasks import process_data_download_impl, process_batch_download_impl
 from .tasks.analysis_tasks import process_data_analysis_impl
 from .tasks.bulk_tasks import process_bulk_operations_impl
+from .tasks.lake_tasks import process_lake_compaction_impl
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +86,20 @@ if CELERY_AVAILABLE:
         def progress_callback(meta):
             self.update_state(state='PROGRESS', meta=meta)
         return process_bulk_operations_impl(operations, options, progress_callback)
+    
+    @celery_app.task(bind=True, base=BaseTask, name='redline.background.tasks.process_lake_compaction')
+    def process_lake_compaction(self, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Compact small files in the partitioned Parquet lake in background."""
+        def progress_callback(meta):
+            self.update_state(state='PROGRESS', meta=meta)
+        return process_lake_compaction_impl(options, progress_callback)
+    
+    @celery_app.task(bind=True, base=BaseTask, name='redline.background.tasks.process_batch_download')
+    def process_batch_download(self, job_id: str, api_key: str = None) -> Dict[str, Any]:
+        """Run or resume a batch download job in background."""
+        def progress_callback(meta):
+            self.update_state(state='PROGRESS', meta=meta)
+        return process_batch_download_impl(job_id, progress_callback, api_key)
 else:
     def process_data_conversion(input_file: str, output_format: str, output_file: str, 
                                options: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -110,3 +125,11 @@ else:
                               options: Dict[str, Any] = None) -> Dict[str, Any]:
         """Process bulk operations in background."""
         return process_bulk_operations_impl(operations, options)
+    
+    def process_lake_compaction(options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Compact small files in the partitioned Parquet lake in background."""
+        return process_lake_compaction_impl(options)
+    
+    def process_batch_download(job_id: str, api_key: str = None) -> Dict[str, Any]:
+        """Run or resume a batch download job in background."""
+        return process_batch_download_impl(job_id, api_key=api_key)
@@ -4,15 +4,19 @@ Task implementations for asynchronous processing.
 """
 
 from .conversion_tasks import process_data_conversion_impl, process_file_upload_impl
-from .download_tasks import process_data_download_impl
+from .download_tasks import process_data_download_impl, process_batch_download_impl
 from .analysis_tasks import process_data_analysis_impl
 from .bulk_tasks import process_bulk_operations_impl
+from .lake_tasks import process_lake_compaction_impl, submit_lake_compaction
 
 __all__ = [
     'process_data_conversion_impl',
     'process_file_upload_impl',
     'process_data_download_impl',
+    'process_batch_download_impl',
     'process_data_analysis_impl',
-    'process_bulk_operations_impl'
+    'process_bulk_operations_impl',
+    'process_lake_compaction_impl',
+    'submit_lake_compaction'
 ]
 
@@ -8,7 +8,6 @@ import logging
 from typing import Dict, Any, List
 from datetime import datetime
 
-from .conversion_tasks import process_data_conversion_impl
 from .download_tasks import process_data_download_impl
 from .analysis_tasks import process_data_analysis_impl
 
@@ -23,26 +22,57 @@ def process_bulk_operations_impl(operations: List[Dict[str, Any]],
         
         results = []
         total = len(operations)
+        finished = 0
+        
+        # Conversions run in parallel on the shared conversion pool; the rest run in order
+        conversions = [(i, operation.get('data', {})) for i, operation in enumerate(operations)
+                       if operation.get('type') == 'convert']
+        if conversions:
+            from ..conversion_pool import get_conversion_pool
+            
+            def conversion_progress(event):
+                if progress_callback and event.get('event') != 'job_completed':
+                    progress_callback({'step': 'converting', 'progress': int((event['completed'] / total) * 100),
+                                       'current': event['completed'], 'total': total})
+            
+            items = [{
+                'input_path': op_data.get('input_file'),
+                'output_path': op_data.get('output_file'),
+                'output_format': op_data.get('output_format'),
+                'meta': {'operation': i+1}
+            } for i, op_data in conversions]
+            job = get_conversion_pool().run(items, progress_callback=conversion_progress)
+            
+            for entry in job.results:
+                stats = entry['conversion_stats']
+                results.append({'operation': entry['operation'], 'type': 'convert', 'status': 'success', 'result': {
+                    'status': 'success',
+                    'input_file': stats['input_path'],
+                    'output_file': stats['output_path'],
+                    'output_format': stats['output_format'],
+                    'rows_converted': stats['rows'],
+                    'columns': stats['columns'],
+                    'conversion_stats': stats,
+                    'completed_at': job.completed_at
+                }})
+            for entry in job.errors:
+                results.append({'operation': entry['operation'], 'type': 'convert', 'status': 'error', 'error': entry['error']})
+            finished = len(conversions)
         
         for i, operation in enumerate(operations):
             op_type = operation.get('type')
             op_data = operation.get('data', {})
             
+            if op_type == 'convert':
+                continue
+            
             if progress_callback:
-                progress = int((i / total) * 100)
-                progress_callback({'step': f'operation_{i+1}', 'progress': progress, 'current': i+1, 'total': total})
+                progress = int((finished / total) * 100)
+                progress_callback({'step': f'operation_{i+1}', 'progress': progress, 'current': finished+1, 'total': total})
+            finished += 1
             
             try:
-                if op_type == 'convert':
-                    # Use data conversion
-                    result = process_data_conversion_impl(
-                        input_file=op_data.get('input_file'),
-                        output_format=op_data.get('output_format'),
-                        output_file=op_data.get('output_file'),
-                        options=options
-                    )
-                    results.append({'operation': i+1, 'type': op_type, 'status': 'success', 'result': result})
-                elif op_type == 'download':
+                if op_type == 'download':
                     # Use data download
                     result = process_data_download_impl(
                         ticker=op_data.get('ticker'),
@@ -65,6 +95,8 @@ def process_bulk_operations_impl(operations: List[Dict[str, Any]],
             except Exception as e:
                 results.append({'operation': i+1, 'type': op_type, 'status': 'error', 'error': str(e)})
         
+        results.sort(key=lambda r: r['operation'])
+        
         if progress_callback:
             progress_callback({'step': 'completed', 'progress': 100, 'current': total, 'total': total})
         
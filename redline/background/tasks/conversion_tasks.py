@@ -6,7 +6,6 @@ Background tasks for data format conversion and file upload processing.
 
 import os
 import logging
-import pandas as pd
 from typing import Dict, Any
 from datetime import datetime
 
@@ -26,19 +25,17 @@ def process_data_conversion_impl(input_file: str, output_format: str, output_fil
         if progress_callback:
             progress_callback({'step': 'loading_data', 'progress': 10})
         
-        # Load data
         converter = FormatConverter()
         format_type = converter.detect_format_from_extension(input_file)
-        data = converter.load_file_by_type(input_file, format_type)
         
-        if not isinstance(data, pd.DataFrame):
-            raise ValueError("Invalid data format")
-        
-        if progress_callback:
-            progress_callback({'step': 'converting_data', 'progress': 50})
+        def report_batches(batch_progress):
+            # Streamed conversions report rows written; keep the bar between loading and finalizing
+            if progress_callback:
+                progress_callback({'step': 'converting_data', 'progress': 50,
+                                   'rows_converted': batch_progress['rows']})
         
-        # Convert and save
-        converter.save_file_by_type(data, output_file, output_format)
+        stats = converter.convert_file(input_file, format_type, output_file, output_format,
+                                       progress_callback=report_batches)
         
         if progress_callback:
             progress_callback({'step': 'finalizing', 'progress': 90})
@@ -48,12 +45,13 @@ def process_data_conversion_impl(input_file: str, output_format: str, output_fil
             'input_file': input_file,
             'output_file': output_file,
             'output_format': output_format,
-            'rows_converted': len(data),
-            'columns': list(data.columns),
+            'rows_converted': stats.rows,
+            'columns': stats.columns,
+            'conversion_stats': stats.to_dict(),
             'completed_at': datetime.utcnow().isoformat()
         }
         
-        logger.info(f"Data conversion completed: {len(data)} rows")
+        logger.info(f"Data conversion completed: {stats.rows} rows ({'streamed' if stats.streamed else 'in memory'})")
         return result
         
     except Exception as e:
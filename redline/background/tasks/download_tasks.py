@@ -90,3 +90,14 @@ def process_data_download_impl(ticker: str, start_date: str, end_date: str,
         logger.error(f"Data download failed: {str(e)}")
         raise
 
+
+
+def process_batch_download_impl(job_id: str, progress_callback=None, api_key: str = None) -> Dict[str, Any]:
+    """Internal implementation of a batch download job (see background.download_jobs)."""
+    from ..download_jobs import get_download_jobs
+
+    logger.info(f"Starting batch download job {job_id}")
+    manager = get_download_jobs()
+    summary = manager.run(job_id, progress_callback=progress_callback, api_key=api_key)
+    # None: another worker holds the job, or it had already finished
+    return summary if summary is not None else manager.get_job(job_id)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+REDLINE Lake Tasks
+Background tasks for the partitioned Parquet lake.
+"""
+
+import uuid
+import logging
+import threading
+from typing import Dict, Any
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def process_lake_compaction_impl(options: Dict[str, Any] = None, progress_callback=None) -> Dict[str, Any]:
+    """Internal implementation of lake compaction."""
+    try:
+        from ...core.partitioned_store import get_partitioned_store
+
+        options = options or {}
+        # Always the configured lake: compaction rewrites and deletes files under its root
+        store = get_partitioned_store()
+        logger.info(f"Starting lake compaction: {store.root}")
+
+        stats = store.compact(small_file_mb=options.get('small_file_mb'),
+                              deduplicate=options.get('deduplicate', True),
+                              progress_callback=progress_callback)
+
+        if progress_callback:
+            progress_callback({'step': 'completed', 'progress': 100})
+
+        result = {
+            'status': 'success',
+            'root': store.root,
+            **stats,
+            'completed_at': datetime.utcnow().isoformat()
+        }
+
+        logger.info(f"Lake compaction completed: {stats['files_before']} -> {stats['files_after']} files")
+        return result
+
+    except Exception as e:
+        logger.error(f"Lake compaction failed: {str(e)}")
+        raise
+
+
+def submit_lake_compaction(options: Dict[str, Any] = None) -> str:
+    """
+    Start a lake compaction in the background.
+
+    Goes to Celery through TaskManager when a broker is configured; otherwise
+    it runs on a thread in the web process and its state is kept in
+    TaskManager's registry, so the task status routes report it either way.
+
+    Args:
+        options: Compaction options (small_file_mb, deduplicate)
+
+    Returns:
+        Task id
+    """
+    from ..task_manager import CELERY_AVAILABLE, task_manager
+    if CELERY_AVAILABLE and task_manager.celery_app is not None:
+        return task_manager.submit_task('redline.background.tasks.process_lake_compaction',
+                                        kwargs={'options': options})
+
+    task_id = str(uuid.uuid4())
+    task_info = {
+        'task_id': task_id,
+        'task_name': 'process_lake_compaction',
+        'args': (),
+        'kwargs': {'options': options},
+        'status': 'PENDING',
+        'submitted_at': datetime.utcnow().isoformat(),
+        'execution_mode': 'thread'
+    }
+    task_manager.task_registry[task_id] = task_info
+
+    def progress_callback(meta):
+        task_info['status'] = 'PROGRESS'
+        task_info['progress'] = meta
+
+    def run():
+        try:
+            task_info['result'] = process_lake_compaction_impl(options, progress_callback)
+            task_info['status'] = 'SUCCESS'
+        except Exception as e:
+            task_info['error'] = str(e)
+            task_info['status'] = 'FAILURE'
+        task_info['completed_at'] = datetime.utcnow().isoformat()
+
+    thread = threading.Thread(target=run, name=f'lake-compaction-{task_id[:8]}', daemon=True)
+    thread.start()
+    return task_id
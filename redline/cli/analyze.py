@@ -40,6 +40,11 @@ def main():
     parser.add_argument('--end-date', type=str,
                        help='End date filter (YYYY-MM-DD)')
     
+    # Execution options
+    parser.add_argument('--engine', choices=['pandas', 'polars'],
+                       help='Execution engine (default: REDLINE_ENGINE or pandas); '
+                            'polars scans the input lazily and collects once')
+    
     # Output options
     parser.add_argument('--output', type=str,
                        help='Output file path (optional)')
@@ -60,6 +65,18 @@ def main():
     )
     
     try:
+        from redline.core.polars_engine import resolve_engine
+        if resolve_engine(args.engine) == 'polars':
+            frame, paths = _scan_data(args)
+            if frame is not None:
+                results = _perform_analysis_lazy(frame, args, paths)
+                if results is None:
+                    print("No data remaining after filtering")
+                    sys.exit(1)
+                _output_results(results, args)
+                print("Analysis completed successfully!")
+                return
+        
         # Load data
         data = _load_data(args)
         
@@ -133,6 +150,49 @@ def _load_data(args):
     else:
         raise ValueError(f"Input path does not exist: {args.input}")
 
+def _input_files(args):
+    """Files named by --input with their formats."""
+    if os.path.isfile(args.input):
+        paths = [args.input]
+    elif os.path.isdir(args.input):
+        import glob
+        patterns = ['*.csv', '*.parquet', '*.json'] if args.format == 'auto' or not args.format else [f'*.{args.format}']
+        paths = [path for pattern in patterns for path in glob.glob(os.path.join(args.input, pattern))]
+        if not paths:
+            raise ValueError(f"No files found in {args.input}")
+    else:
+        raise ValueError(f"Input path does not exist: {args.input}")
+    formats = [_detect_format(path) if args.format == 'auto' else args.format for path in paths]
+    return paths, formats
+
+def _scan_data(args):
+    """
+    Open the input as one filtered polars LazyFrame.
+    
+    Returns (None, paths) if some input cannot be scanned lazily, so the
+    caller falls back to the pandas path.
+    """
+    import polars as pl
+    from redline.core.polars_engine import can_scan, scan_many
+    
+    paths, formats = _input_files(args)
+    if not all(can_scan(path, format) for path, format in zip(paths, formats)):
+        return None, paths
+    
+    frame = scan_many(paths, formats)
+    names = frame.collect_schema().names()
+    if args.tickers and 'ticker' in names:
+        frame = frame.filter(pl.col('ticker').is_in(args.tickers))
+    if (args.start_date or args.end_date) and 'timestamp' in names:
+        # Same parsing as pd.to_datetime on the loaded column
+        if frame.collect_schema()['timestamp'] == pl.String:
+            frame = frame.with_columns(pl.col('timestamp').str.to_datetime())
+        if args.start_date:
+            frame = frame.filter(pl.col('timestamp') >= pd.Timestamp(args.start_date).to_pydatetime())
+        if args.end_date:
+            frame = frame.filter(pl.col('timestamp') <= pd.Timestamp(args.end_date).to_pydatetime())
+    return frame, paths
+
 def _detect_format(file_path):
     """Detect file format from extension (uses centralized function)."""
     from redline.core.schema import detect_format_from_path
@@ -290,6 +350,123 @@ def _volume_analysis(data):
     
     return results
 
+def _perform_analysis_lazy(frame, args, paths):
+    """
+    Perform the requested analysis on a LazyFrame.
+    
+    Every statistic is part of one polars plan collected in a single pass;
+    results are converted to the same pandas objects the pandas path
+    produces. Returns None if no rows remain after filtering.
+    """
+    import polars as pl
+    from datetime import datetime
+    from redline.core.polars_engine import collect, should_stream
+    
+    schema = frame.collect_schema()
+    names = schema.names()
+    numeric = [col for col in names if schema[col].is_numeric()]
+    # describe() summarises datetime columns too, without a std
+    temporal = [col for col in names if schema[col] == pl.Datetime]
+    described = [col for col in names if col in numeric or col in temporal]
+    plans = {'rows': frame.select(pl.len())}
+    
+    if args.analysis == 'stats':
+        stats = [pl.col(col).count().alias(f'count:{col}') for col in described]
+        for name in ('mean', 'min', 'max'):
+            stats += [getattr(pl.col(col), name)().alias(f'{name}:{col}') for col in described]
+        stats += [pl.col(col).std().alias(f'std:{col}') for col in numeric]
+        for q in (0.25, 0.5, 0.75):
+            stats += [pl.col(col).quantile(q, 'linear').alias(f'{int(q * 100)}%:{col}') for col in described]
+        plans['basic_stats'] = frame.select(stats) if stats else frame.select(pl.len())
+        plans['nulls'] = frame.select(pl.all().null_count())
+        if 'timestamp' in names:
+            plans['dates'] = frame.select(pl.col('timestamp').min().alias('start'),
+                                          pl.col('timestamp').max().alias('end'))
+        if 'ticker' in names and 'close' in names:
+            aggregates = [getattr(pl.col('close'), name)().alias(f'close:{name}')
+                          for name in ('count', 'mean', 'std', 'min', 'max')]
+            if 'vol' in names:
+                aggregates += [pl.col('vol').mean().alias('vol:mean'), pl.col('vol').sum().alias('vol:sum')]
+            plans['ticker_stats'] = frame.group_by('ticker').agg(aggregates).sort('ticker')
+    elif args.analysis == 'correlation':
+        plans['numeric'] = frame.select(numeric)
+    elif args.analysis == 'trends' and 'close' in names and 'timestamp' in names:
+        changes = pl.col('close').pct_change().drop_nulls()
+        trend = [
+            changes.mean().alias('avg_daily_change'),
+            changes.std().alias('volatility'),
+            ((pl.col('close').last() / pl.col('close').first() - 1) * 100).alias('total_return'),
+            (changes > 0).sum().alias('positive_days'),
+            (changes < 0).sum().alias('negative_days'),
+            pl.len().alias('rows')
+        ]
+        ordered = frame.sort('timestamp', maintain_order=True)
+        if 'ticker' in names:
+            plans['trends'] = ordered.group_by('ticker', maintain_order=True).agg(trend).filter(pl.col('rows') > 1)
+        else:
+            plans['trends'] = ordered.select(trend).with_columns(pl.lit('overall').alias('ticker'))
+    elif args.analysis == 'volume' and 'vol' in names:
+        vol = pl.col('vol')
+        plans['volume'] = frame.select(
+            vol.sum().alias('total_volume'), vol.mean().alias('average_volume'),
+            vol.median().alias('median_volume'), vol.max().alias('max_volume'),
+            vol.min().alias('min_volume'), (vol > vol.mean() * 2).sum().alias('high_volume_count')
+        )
+        if 'ticker' in names:
+            plans['volume_by_ticker'] = frame.group_by('ticker').agg(
+                vol.sum().alias('sum'), vol.mean().alias('mean'), vol.std().alias('std')).sort('ticker')
+    elif args.analysis not in ('trends', 'volume'):
+        raise ValueError(f"Unknown analysis type: {args.analysis}")
+    
+    collected = dict(zip(plans, collect(list(plans.values()), streaming=should_stream(paths))))
+    rows = collected['rows'].item()
+    if rows == 0:
+        return None
+    
+    results = {}
+    if args.analysis == 'stats':
+        row = collected['basic_stats'].row(0, named=True)
+        if temporal:
+            index = ['count', 'mean', 'min', '25%', '50%', '75%', 'max', 'std']
+        else:
+            index = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        results['basic_stats'] = pd.DataFrame({col: [row.get(f'{name}:{col}', float('nan')) for name in index]
+                                               for col in described}, index=index)
+        if 'ticker_stats' in collected:
+            ticker_stats = collected['ticker_stats'].to_pandas().set_index('ticker')
+            ticker_stats.columns = pd.MultiIndex.from_tuples([tuple(col.split(':')) for col in ticker_stats.columns])
+            results['ticker_stats'] = ticker_stats
+        dates = {'start': None, 'end': None}
+        if 'dates' in collected:
+            dates = {key: pd.Timestamp(value) if isinstance(value, datetime) else value
+                     for key, value in collected['dates'].row(0, named=True).items()}
+        results['data_quality'] = {
+            'total_records': rows,
+            'missing_values': collected['nulls'].row(0, named=True),
+            'date_range': dates
+        }
+    elif args.analysis == 'correlation':
+        correlation_matrix = collected['numeric'].to_pandas().corr()
+        results = {
+            'correlation_matrix': correlation_matrix,
+            'high_correlations': _find_high_correlations(correlation_matrix)
+        }
+    elif 'trends' in collected:
+        for row in collected['trends'].iter_rows(named=True):
+            ticker = row.pop('ticker')
+            results[ticker] = {key: value for key, value in row.items() if key != 'rows'}
+    elif 'volume' in collected:
+        volume = collected['volume'].row(0, named=True)
+        high_volume_count = volume.pop('high_volume_count')
+        results['volume_stats'] = volume
+        results['high_volume_days'] = {
+            'count': high_volume_count,
+            'percentage': (high_volume_count / rows) * 100
+        }
+        if 'volume_by_ticker' in collected:
+            results['volume_by_ticker'] = collected['volume_by_ticker'].to_pandas().set_index('ticker')
+    return results
+
 def _output_results(results, args):
     """Output analysis results."""
     if args.output:
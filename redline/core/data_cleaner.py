@@ -29,16 +29,15 @@ class DataCleaner:
             Cleaned DataFrame with standardized columns
         """
         try:
-            # Make a copy to avoid modifying original
-            data = data.copy()
+            if data.columns.has_duplicates:
+                # reindex cannot select from repeated labels; keep the first column of each name
+                data = data.loc[:, ~data.columns.duplicated()]
             
-            # Ensure all schema columns are present
-            for col in SCHEMA:
-                if col not in data.columns:
-                    data[col] = None
-            
-            # Select only schema columns in correct order
-            data = data[SCHEMA]
+            # Selecting the schema columns builds a new frame, so the original is never modified
+            missing = [col for col in SCHEMA if col not in data.columns]
+            data = data.reindex(columns=SCHEMA)
+            for col in missing:
+                data[col] = None
             
             # Clean numeric columns and handle type conversion safely
             for col in NUMERIC_COLUMNS:
@@ -46,7 +45,7 @@ class DataCleaner:
                     data[col] = self._clean_numeric_column(data[col])
             
             # Ensure timestamp is datetime
-            if 'timestamp' in data.columns:
+            if 'timestamp' in data.columns and not pd.api.types.is_datetime64_any_dtype(data['timestamp']):
                 data['timestamp'] = pd.to_datetime(data['timestamp'], errors='coerce')
                 
             return data
@@ -56,22 +55,60 @@ class DataCleaner:
             raise
     
     def _clean_numeric_column(self, series: pd.Series) -> pd.Series:
-        """Clean a numeric column by converting types and handling errors."""
+        """Convert a column to a numeric dtype (float64/int64), coercing invalid values to NaN."""
         try:
-            # Convert to numeric, coerce errors to NaN
-            cleaned = pd.to_numeric(series, errors='coerce')
-            
-            # Clean any remaining non-numeric values
-            cleaned = cleaned.apply(
-                lambda x: float(x) if pd.notnull(x) and not isinstance(x, (list, tuple, dict)) else None
-            )
-            
-            return cleaned
+            if pd.api.types.is_bool_dtype(series):
+                return series.astype('float64')
+            if pd.api.types.is_numeric_dtype(series):
+                return series
+            try:
+                return pd.to_numeric(series, errors='coerce')
+            except TypeError:
+                # Containers (lists, dicts) are not numbers; blank them and convert the rest
+                is_container = series.map(lambda x: isinstance(x, (list, tuple, dict, set)))
+                return pd.to_numeric(series.mask(is_container), errors='coerce')
             
         except Exception as e:
             self.logger.error(f"Error cleaning numeric column: {str(e)}")
             return series
     
+    def stooq_timestamps(self, date: pd.Series, time: pd.Series = None) -> pd.Series:
+        """
+        Build timestamps from Stooq YYYYMMDD dates and optional HHMMSS times.
+        
+        The fields are split arithmetically and assembled as datetime64 values,
+        so no per-row strings are created. Invalid dates or times become NaT.
+        
+        Args:
+            date: Dates as YYYYMMDD integers or strings
+            time: Times as HHMMSS integers or strings (None for date-only data)
+            
+        Returns:
+            datetime64[ns] Series aligned with ``date``
+        """
+        date_values = pd.to_numeric(date, errors='coerce').to_numpy(dtype='float64')
+        valid = np.isfinite(date_values)
+        dates = np.where(valid, date_values, 19700101).astype(np.int64)
+        year, month, day = dates // 10000, dates // 100 % 100, dates % 100
+        valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+        
+        month_start = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype('datetime64[M]')
+        days = month_start.astype('datetime64[D]') + (np.clip(day, 1, 31) - 1)
+        # Day 31 of a 30-day month rolls into the next month
+        valid &= days.astype('datetime64[M]') == month_start
+        result = days.astype('datetime64[ns]')
+        
+        if time is not None:
+            time_values = pd.to_numeric(time, errors='coerce').to_numpy(dtype='float64')
+            valid &= np.isfinite(time_values)
+            times = np.where(np.isfinite(time_values), time_values, 0).astype(np.int64)
+            hours, minutes, seconds = times // 10000, times // 100 % 100, times % 100
+            valid &= (hours < 24) & (minutes < 60) & (seconds < 60) & (times >= 0)
+            result = result + (hours * 3600 + minutes * 60 + seconds).astype('timedelta64[s]')
+        
+        result[~valid] = np.datetime64('NaT')
+        return pd.Series(result, index=date.index)
+    
     def standardize_txt_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Standardize columns from Stooq TXT format to REDLINE schema.
@@ -83,14 +120,9 @@ class DataCleaner:
             DataFrame with standardized columns
         """
         try:
-            # Create a copy to avoid modifying original
-            result = df.copy()
-            
             # Map Stooq columns to REDLINE schema
             column_mapping = {
                 '<TICKER>': 'ticker',
-                '<DATE>': 'date_str',
-                '<TIME>': 'time_str',
                 '<OPEN>': 'open',
                 '<HIGH>': 'high',
                 '<LOW>': 'low',
@@ -98,24 +130,15 @@ class DataCleaner:
                 '<VOL>': 'vol'
             }
             
-            # Rename columns if they exist
+            # Build the result from the mapped columns only (the source frame is not copied or modified)
+            result = pd.DataFrame(index=df.index)
             for stooq_col, redline_col in column_mapping.items():
-                if stooq_col in result.columns:
-                    result[redline_col] = result[stooq_col]
+                if stooq_col in df.columns:
+                    result[redline_col] = df[stooq_col]
             
             # Combine date and time into timestamp
-            if 'date_str' in result.columns and 'time_str' in result.columns:
-                result['timestamp'] = pd.to_datetime(
-                    result['date_str'] + ' ' + result['time_str'], 
-                    format='%Y%m%d %H%M%S', 
-                    errors='coerce'
-                )
-            elif 'date_str' in result.columns:
-                result['timestamp'] = pd.to_datetime(
-                    result['date_str'], 
-                    format='%Y%m%d', 
-                    errors='coerce'
-                )
+            if '<DATE>' in df.columns:
+                result['timestamp'] = self.stooq_timestamps(df['<DATE>'], df.get('<TIME>'))
             
             # Clean numeric columns
             numeric_cols = ['open', 'high', 'low', 'close', 'vol']
@@ -126,19 +149,12 @@ class DataCleaner:
             # Add missing columns
             result['openint'] = None
             result['format'] = 'stooq_txt'
-            
-            # Select and reorder columns to match schema
-            final_columns = []
             for col in SCHEMA:
-                if col in result.columns:
-                    final_columns.append(col)
-                else:
-                    final_columns.append(col)
+                if col not in result.columns:
                     result[col] = None
             
-            result = result[SCHEMA]
-            
-            return result
+            # Select and reorder columns to match schema
+            return result[SCHEMA]
             
         except Exception as e:
             self.logger.error(f"Error standardizing TXT columns: {str(e)}")
@@ -7,7 +7,7 @@ Main data loading and processing functionality for financial data.
 import logging
 import configparser
 import pandas as pd
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, Optional, Sequence
 import os
 
 # Optional dependencies
@@ -36,6 +36,9 @@ from .schema import SCHEMA, EXT_TO_FORMAT, FORMAT_DIALOG_INFO
 from .data_validator import DataValidator
 from .data_cleaner import DataCleaner
 from .format_converter import FormatConverter
+from .load_filters import range_filters
+from .time_index import index_by_time, slice_date_range
+from ..database.shared_tables import write_frame, default_write_mode
 
 logger = logging.getLogger(__name__)
 
@@ -80,8 +83,9 @@ class DataLoader:
                 # Convert absolute path to relative path if needed
                 relative_path = path.replace('/app/', '')
                 
-                # Validate file before attempting to load
-                if not self.validator.validate_data(relative_path, format):
+                # Validate the header/metadata before loading; the body is parsed only once, below
+                columns = self.validator.read_columns(relative_path, format)
+                if columns is not None and not self.validator.validate_columns(columns, format, relative_path):
                     skipped_files.append({
                         'file': os.path.basename(path),
                         'reason': 'Failed validation'
@@ -89,11 +93,16 @@ class DataLoader:
                     continue
                 
                 # Load and standardize the data
+                df = self.converter.load_file_by_type(relative_path, format)
+                if columns is None and not self.validator.validate_columns(list(df.columns), format, relative_path):
+                    # Columns of JSON documents are only known once loaded
+                    skipped_files.append({
+                        'file': os.path.basename(path),
+                        'reason': 'Failed validation'
+                    })
+                    continue
                 if format == 'txt':
-                    df = pd.read_csv(relative_path)
                     df = self.cleaner.standardize_txt_columns(df)
-                else:
-                    df = self.converter.load_file_by_type(relative_path, format)
                 
                 # Validate required columns after standardization
                 if not all(col in df.columns for col in ['ticker', 'timestamp', 'close']):
@@ -103,7 +112,7 @@ class DataLoader:
                     })
                     continue
                 
-                data.append(df)
+                data.append(index_by_time(df))
                 self.logger.info(f"Successfully loaded {path}")
                 
             except Exception as e:
@@ -118,7 +127,8 @@ class DataLoader:
         
         return data
     
-    def save_to_shared(self, table: str, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table'], format: str) -> None:
+    def save_to_shared(self, table: str, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table'], format: str,
+                       mode: str = None) -> None:
         """
         Save data to shared database table.
         
@@ -126,6 +136,8 @@ class DataLoader:
             table: Table name
             data: Data to save
             format: Data format identifier
+            mode: 'replace' (recreate the table), 'append', or 'upsert' (replace rows
+                with the same ticker and timestamp); defaults to REDLINE_SHARED_WRITE_MODE
         """
         try:
             # Convert to pandas DataFrame if needed
@@ -140,10 +152,7 @@ class DataLoader:
             # Ensure timestamp is in datetime format
             data['timestamp'] = pd.to_datetime(data['timestamp'])
             
-            # Create table if not exists and insert data using DuckDB
-            conn = duckdb.connect(self.db_path)
-            conn.execute(f"DROP TABLE IF EXISTS {table}")
-            
+            mode = mode or default_write_mode()
             create_table_sql = f"""
             CREATE TABLE IF NOT EXISTS {table} (
                 ticker VARCHAR,
@@ -157,43 +166,81 @@ class DataLoader:
                 format VARCHAR
             )
             """
-            conn.execute(create_table_sql)
             
-            # Insert data
-            conn.register('temp_df', data)
-            insert_sql = f"INSERT INTO {table} SELECT * FROM temp_df"
-            conn.execute(insert_sql)
-            conn.unregister('temp_df')
-            conn.close()
+            conn = duckdb.connect(self.db_path)
+            try:
+                rows = write_frame(conn, table, data, mode, create_table_sql)
+            finally:
+                conn.close()
             
-            self.logger.info(f"Saved data to {table} in format {format}")
+            self.logger.info(f"Saved {rows} rows to {table} in format {format} ({mode})")
             
         except Exception as e:
             self.logger.exception(f"Failed to save to {table}: {str(e)}")
             raise
     
-    def load_ticker_data(self, ticker: str) -> pd.DataFrame:
+    def load_ticker_data(self, ticker: str, start=None, end=None) -> pd.DataFrame:
         """
-        Load data for a specific ticker from the database.
+        Load data for a specific ticker.
+        
+        Rows come from the tickers_data table and, for tickers held in the
+        partitioned Parquet lake, from their partitions. The lake does not
+        record which dates it covers, so both are read and merged; where
+        both hold a timestamp the lake row is kept.
         
         Args:
             ticker: Ticker symbol
+            start: First timestamp to include (optional)
+            end: Last timestamp to include (optional)
             
         Returns:
             DataFrame with ticker data
         """
         try:
-            conn = duckdb.connect(self.db_path)
-            query = f"SELECT * FROM tickers_data WHERE ticker = '{ticker}' ORDER BY timestamp"
-            result = conn.execute(query).fetchdf()
-            conn.close()
+            lake = None
+            if PYARROW_AVAILABLE:
+                from .partitioned_store import get_partitioned_store
+                store = get_partitioned_store()
+                if store.has_ticker(ticker):
+                    lake = store.read([ticker], start, end)
             
-            return result
+            try:
+                result = self._load_ticker_from_db(ticker, start, end)
+            except Exception as e:
+                if lake is None:
+                    raise
+                self.logger.debug(f"No database rows for {ticker}, using the lake only: {str(e)}")
+                return lake
+            
+            if lake is None or lake.empty:
+                return index_by_time(result)
+            if result.empty:
+                return lake
+            merged = pd.concat([lake, result], ignore_index=True)
+            merged = merged.drop_duplicates(subset=['timestamp'], keep='first')
+            return index_by_time(merged)
             
         except Exception as e:
             self.logger.error(f"Error loading ticker data for {ticker}: {str(e)}")
             return pd.DataFrame()
     
+    def _load_ticker_from_db(self, ticker: str, start=None, end=None) -> pd.DataFrame:
+        """A ticker's rows from the tickers_data table, in timestamp order."""
+        conditions, params = ["ticker = ?"], [ticker]
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(pd.Timestamp(start).to_pydatetime())
+        if end is not None:
+            conditions.append("timestamp <= ?")
+            params.append(pd.Timestamp(end).to_pydatetime())
+        
+        conn = duckdb.connect(self.db_path)
+        try:
+            query = f"SELECT * FROM tickers_data WHERE {' AND '.join(conditions)} ORDER BY timestamp"
+            return conn.execute(query, params).fetchdf()
+        finally:
+            conn.close()
+    
     def get_data_stats(self, data: pd.DataFrame) -> Dict[str, Any]:
         """
         Get statistics about the loaded data.
@@ -224,22 +271,49 @@ class DataLoader:
             self.logger.error(f"Error calculating data stats: {str(e)}")
             return {}
     
+    def load_date_range(self, file_path: str, format: str, start_date: str, end_date: str,
+                        tickers: Optional[List[str]] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load only the rows of a file within a date range.
+        
+        Unlike loading the file and calling filter_data_by_date_range, the
+        range (and ticker list) is pushed into the reader, so rows outside
+        it are skipped while the file is read where the format allows.
+        
+        Args:
+            file_path: Path to file
+            format: Format type
+            start_date: Start date string
+            end_date: End date string
+            tickers: Tickers to keep (all if None)
+            columns: Columns to return (all if None)
+            
+        Returns:
+            Filtered DataFrame
+        """
+        filters = range_filters(tickers, start_date, end_date)
+        data = index_by_time(self.load_file_by_type(file_path, format, columns=columns, filters=filters))
+        if data.empty:
+            self.logger.warning(f"No data found between {start_date} and {end_date} in {file_path}")
+        return data
+    
     def filter_data_by_date_range(self, data: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
         """
         Filter the dataframe by date range for all tickers.
         
+        Frames from load_data are already indexed by time, so the range is
+        found by binary search; other frames are parsed and sorted first.
+        
         Args:
             data: DataFrame to filter
             start_date: Start date string
             end_date: End date string
             
         Returns:
-            Filtered DataFrame
+            Filtered DataFrame, in ticker/timestamp order
         """
         try:
-            data['timestamp'] = pd.to_datetime(data['timestamp'])
-            mask = (data['timestamp'] >= start_date) & (data['timestamp'] <= end_date)
-            filtered_data = data.loc[mask]
+            filtered_data = slice_date_range(data, start_date, end_date)
             
             if filtered_data.empty:
                 self.logger.warning(f"No data found between {start_date} and {end_date}")
@@ -265,9 +339,10 @@ class DataLoader:
         """Clean and standardize DataFrame columns."""
         return self.cleaner.clean_and_select_columns(data)
     
-    def load_file_by_type(self, file_path: str, format: str) -> Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table']:
-        """Load data from file based on format type."""
-        return self.converter.load_file_by_type(file_path, format)
+    def load_file_by_type(self, file_path: str, format: str, columns: Optional[List[str]] = None,
+                          filters: Optional[Sequence] = None) -> Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table']:
+        """Load data from file based on format type, optionally selecting columns and rows."""
+        return self.converter.load_file_by_type(file_path, format, columns=columns, filters=filters)
     
     @staticmethod
     def save_file_by_type(data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table', dict], 
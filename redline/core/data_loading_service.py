@@ -15,11 +15,16 @@ from .schema import EXT_TO_FORMAT, REQUIRED_COLUMNS, detect_format_from_path
 from .data_validator import DataValidator
 from .data_cleaner import DataCleaner
 from .format_converter import FormatConverter
+from .parallel_csv_loader import ParallelCSVLoader
+from .row_range_reader import detect_text_separator
 from ..utils.logging_mixin import LoggingMixin
 from ..utils.error_handling import handle_errors, handle_file_errors
 
 logger = logging.getLogger(__name__)
 
+# Engines accepted by DataLoadingService.load_file for CSV/TXT files
+LOAD_ENGINES = ('pandas', 'parallel')
+
 class DataLoadingService(LoggingMixin):
     """
     Centralized data loading service to eliminate duplication across modules.
@@ -39,15 +44,19 @@ class DataLoadingService(LoggingMixin):
         self.max_file_size_mb = 50  # 50MB threshold for chunked loading
         self.chunk_size = 10000     # Rows per chunk for large files
         self.supported_formats = ['csv', 'json', 'parquet', 'feather', 'duckdb', 'txt']
+        self.load_engine = os.environ.get('REDLINE_LOAD_ENGINE', 'pandas')
     
     @handle_file_errors(default_return=pd.DataFrame())
-    def load_file(self, file_path: str, format_type: Optional[str] = None) -> pd.DataFrame:
+    def load_file(self, file_path: str, format_type: Optional[str] = None,
+                  engine: Optional[str] = None) -> pd.DataFrame:
         """
         Load a single file with automatic format detection and validation.
         
         Args:
             file_path: Path to the file to load
             format_type: Expected format (auto-detected if None)
+            engine: CSV/TXT engine, 'pandas' (chunked for large files) or
+                'parallel' (multi-process Arrow parser); defaults to REDLINE_LOAD_ENGINE
             
         Returns:
             Loaded DataFrame or empty DataFrame if loading fails
@@ -66,8 +75,14 @@ class DataLoadingService(LoggingMixin):
             file_size = os.path.getsize(file_path)
             is_large_file = file_size > (self.max_file_size_mb * 1024 * 1024)
             
-            # Load data based on file size and format
-            if is_large_file and format_type in ['csv', 'txt']:
+            engine = engine or self.load_engine
+            if engine not in LOAD_ENGINES:
+                raise ValueError(f"Unknown load engine: {engine}")
+            
+            # Load data based on engine, file size and format
+            if engine == 'parallel' and format_type in ['csv', 'txt']:
+                data = self._load_parallel(file_path, format_type)
+            elif is_large_file and format_type in ['csv', 'txt']:
                 data = self._load_large_file_chunked(file_path, format_type)
             else:
                 data = self.converter.load_file_by_type(file_path, format_type)
@@ -184,6 +199,26 @@ class DataLoadingService(LoggingMixin):
         """
         return detect_format_from_path(file_path)
     
+    def _load_parallel(self, file_path: str, format_type: str) -> pd.DataFrame:
+        """
+        Load a CSV/TXT file with the multi-process Arrow parser.
+        
+        Falls back to chunked loading if the file cannot be parsed that way.
+        
+        Args:
+            file_path: Path to the file
+            format_type: 'csv' or 'txt'
+            
+        Returns:
+            Loaded DataFrame
+        """
+        try:
+            sep = detect_text_separator(file_path, format_type)
+            return ParallelCSVLoader().load(file_path, sep=sep)
+        except Exception as e:
+            self.logger.warning(f"Parallel loading failed for {file_path}, using chunked loading: {str(e)}")
+            return self._load_large_file_chunked(file_path, format_type)
+    
     def _load_large_file_chunked(self, file_path: str, format_type: str) -> pd.DataFrame:
         """
         Load large files in chunks to prevent memory issues.
@@ -199,12 +234,8 @@ class DataLoadingService(LoggingMixin):
         
         try:
             if format_type == 'csv':
-                chunks = []
-                for chunk in pd.read_csv(file_path, chunksize=self.chunk_size):
-                    chunks.append(chunk)
-                    if len(chunks) >= 10:  # Limit memory usage
-                        combined = pd.concat(chunks, ignore_index=True)
-                        chunks = [combined]
+                # Concatenate once at the end; merging every few chunks re-copies the accumulated rows
+                chunks = list(pd.read_csv(file_path, chunksize=self.chunk_size))
                 
                 if chunks:
                     return pd.concat(chunks, ignore_index=True)
@@ -219,12 +250,7 @@ class DataLoadingService(LoggingMixin):
                     
                     if '<TICKER>' in first_line:
                         # Stooq format - load in chunks
-                        chunks = []
-                        for chunk in pd.read_csv(file_path, chunksize=self.chunk_size, sep=','):
-                            chunks.append(chunk)
-                            if len(chunks) >= 10:
-                                combined = pd.concat(chunks, ignore_index=True)
-                                chunks = [combined]
+                        chunks = list(pd.read_csv(file_path, chunksize=self.chunk_size, sep=','))
                         
                         if chunks:
                             return pd.concat(chunks, ignore_index=True)
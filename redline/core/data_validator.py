@@ -4,9 +4,21 @@ REDLINE Data Validator
 Handles validation of financial data files and data integrity checks.
 """
 
+import json
 import logging
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
 from .schema import STOOQ_COLUMNS, REQUIRED_COLUMNS
 
 logger = logging.getLogger(__name__)
@@ -21,6 +33,10 @@ class DataValidator:
         """
         Validate data file format and structure.
         
+        Only the header (CSV/TXT/JSON Lines) or footer metadata (Parquet/Arrow)
+        is read; the file body is parsed only for JSON documents, whose
+        columns are not known until the whole document is read.
+        
         Args:
             file_path: Path to the data file
             format: Expected format type
@@ -29,77 +45,87 @@ class DataValidator:
             True if validation passes, False otherwise
         """
         try:
-            if format == 'txt':
-                return self._validate_stooq_format(file_path)
-            elif format in ['csv', 'json']:
-                # First try to detect if it's Stooq format
-                if self._is_stooq_format(file_path):
-                    return self._validate_stooq_format(file_path)
-                else:
-                    return self._validate_standard_format(file_path, format)
-            else:
-                # For other formats like feather, assume valid
-                return True
+            columns = self.read_columns(file_path, format)
+            if columns is None:
+                if format != 'json':
+                    # For other formats like duckdb, assume valid
+                    return True
+                columns = list(pd.read_json(file_path).columns)
+            return self.validate_columns(columns, format, file_path)
                 
         except Exception as e:
             self.logger.error(f"Validation failed for {file_path}: {str(e)}")
             return False
     
-    def _is_stooq_format(self, file_path: str) -> bool:
-        """Detect if a file is in Stooq format by checking column names."""
-        try:
-            if file_path.endswith('.csv'):
-                df = pd.read_csv(file_path, nrows=1)  # Read only header
-                # Check if columns match Stooq format
-                stooq_cols = set(STOOQ_COLUMNS)
-                file_cols = set(df.columns)
-                return len(stooq_cols.intersection(file_cols)) >= 3  # At least 3 Stooq columns
-            return False
-        except:
-            return False
-    
-    def _validate_stooq_format(self, file_path: str) -> bool:
-        """Validate Stooq format files."""
-        try:
-            with open(file_path, 'r') as f:
-                header = f.readline().strip()
-                
-            # Check for Stooq format header
-            header_cols = [col.strip() for col in header.split(',')]
-            
-            # Validate header columns
-            missing_cols = [col for col in STOOQ_COLUMNS if col not in header_cols]
-            if missing_cols:
-                self.logger.warning(f"Missing required columns in {file_path}: {', '.join(missing_cols)}")
-                return False
-                
-            return True
+    def read_columns(self, file_path: str, format: str) -> Optional[List[str]]:
+        """
+        Read column names without parsing the file body.
+        
+        Args:
+            file_path: Path to the data file
+            format: Format type
             
-        except Exception as e:
-            self.logger.error(f"Error validating Stooq format: {str(e)}")
-            return False
+        Returns:
+            Column names, or None if they cannot be determined from the header/metadata
+        """
+        if format in ('csv', 'txt'):
+            with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+                header = f.readline().strip()
+            sep = '\t' if '\t' in header and ',' not in header else ','
+            return [col.strip().strip('"') for col in header.split(sep)]
+        
+        if format == 'json':
+            with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+                first_line = f.readline().strip()
+                second_line = f.readline().strip()
+            # JSON Lines: the first record's keys are the columns
+            if first_line.startswith('{') and first_line.endswith('}') and second_line.startswith('{'):
+                return list(json.loads(first_line).keys())
+            return None
+        
+        if format in ('parquet', 'polars') and PYARROW_AVAILABLE:
+            return list(pq.read_schema(file_path).names)
+        
+        if format in ('feather', 'pyarrow', 'arrow') and PYARROW_AVAILABLE:
+            try:
+                with pa.memory_map(file_path, 'r') as source:
+                    return list(pa.ipc.open_file(source).schema.names)
+            except pa.ArrowInvalid:
+                # Feather v1 files have no IPC footer
+                return None
+        
+        return None
     
-    def _validate_standard_format(self, file_path: str, format: str) -> bool:
-        """Validate standard CSV/JSON format files."""
-        try:
-            if format == 'csv':
-                df = pd.read_csv(file_path)
-            elif format == 'json':
-                df = pd.read_json(file_path)
-            else:
-                return False
-                
-            # Check for required columns
-            missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
-            if missing_cols:
-                self.logger.warning(f"Missing required columns: {', '.join(missing_cols)}")
-                return False
-                
-            return True
+    def is_stooq_columns(self, columns: List[str]) -> bool:
+        """Detect Stooq format from column names (at least 3 Stooq columns)."""
+        return len(set(STOOQ_COLUMNS).intersection(columns)) >= 3
+    
+    def validate_columns(self, columns: List[str], format: str, file_path: str = '') -> bool:
+        """
+        Validate column names against the Stooq or standard REDLINE layout.
+        
+        TXT files and files with Stooq-style columns must have every Stooq
+        column; everything else must have the REDLINE required columns.
+        
+        Args:
+            columns: Column names from the header, file metadata or a loaded frame
+            format: Format type
+            file_path: File the columns came from (for log messages)
             
-        except Exception as e:
-            self.logger.error(f"Error validating {format} format: {str(e)}")
+        Returns:
+            True if the required columns are present
+        """
+        if format == 'txt' or self.is_stooq_columns(columns):
+            required = STOOQ_COLUMNS
+        else:
+            required = REQUIRED_COLUMNS
+        
+        missing_cols = [col for col in required if col not in columns]
+        if missing_cols:
+            self.logger.warning(f"Missing required columns in {file_path}: {', '.join(missing_cols)}")
             return False
+        
+        return True
     
     def validate_data_integrity(self, data: pd.DataFrame) -> List[str]:
         """
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+REDLINE File Catalog
+In-process name -> path index over the data directory tree.
+
+Web routes resolve bare filenames by probing data/, data/stooq/,
+data/downloaded/, data/uploads/ and the whole data/converted/ tree. Walking
+converted/ on every request dominates latency once it holds many files, so
+the catalog builds the index once and keeps it current with a watchdog
+observer (or periodic rescans when watchdog is not installed).
+"""
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Any
+
+# Optional dependencies
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Search locations in resolution priority order: (location name, subdirectory, recursive)
+CATALOG_LOCATIONS = (
+    ('root', '', False),
+    ('stooq', 'stooq', False),
+    ('downloaded', 'downloaded', False),
+    ('uploads', 'uploads', False),
+    ('converted', 'converted', True),
+)
+LOCATION_NAMES = tuple(name for name, _, _ in CATALOG_LOCATIONS)
+
+
+@dataclass
+class CatalogEntry:
+    """A single indexed file."""
+    name: str
+    path: str
+    location: str
+    size: int
+    modified: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _CatalogEventHandler(FileSystemEventHandler):
+    """Forwards watchdog events to the owning catalog."""
+
+    def __init__(self, catalog: 'FileCatalog'):
+        super().__init__()
+        self.catalog = catalog
+
+    def on_created(self, event):
+        if event.is_directory:
+            self.catalog._scan_tree(event.src_path)
+        else:
+            self.catalog.add(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.catalog.add(event.src_path)
+
+    def on_deleted(self, event):
+        self.catalog.discard(event.src_path, is_directory=event.is_directory)
+
+    def on_moved(self, event):
+        self.catalog.discard(event.src_path, is_directory=event.is_directory)
+        if event.is_directory:
+            self.catalog._scan_tree(event.dest_path)
+        else:
+            self.catalog.add(event.dest_path)
+
+
+class FileCatalog:
+    """
+    Thread-safe filename index for a REDLINE data directory.
+
+    The index is built lazily on first use. When watchdog is available an
+    observer keeps it current; otherwise it is rebuilt once it is older than
+    ``refresh_interval`` seconds. Lookups always confirm the indexed path
+    still exists, so a stale entry never resolves to a missing file.
+    """
+
+    def __init__(self, data_dir: str, watch: bool = True, refresh_interval: float = 30.0):
+        """
+        Initialize the catalog.
+
+        Args:
+            data_dir: Root data directory (usually cwd/data)
+            watch: Start a watchdog observer when available
+            refresh_interval: Rebuild interval in seconds when not watching
+        """
+        self.data_dir = os.path.abspath(data_dir)
+        self.watch = watch and WATCHDOG_AVAILABLE
+        self.refresh_interval = refresh_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.RLock()
+        self._by_name: Dict[str, Dict[str, CatalogEntry]] = {}
+        self._built_at: Optional[float] = None
+        self._observer = None
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _location_for(self, path: str) -> Optional[str]:
+        """Return the catalog location a path belongs to, or None if untracked."""
+        rel = os.path.relpath(path, self.data_dir)
+        if rel.startswith(os.pardir):
+            return None
+        parts = rel.split(os.sep)
+        if len(parts) == 1:
+            return 'root'
+        for name, subdir, recursive in CATALOG_LOCATIONS:
+            if subdir and parts[0] == subdir and (recursive or len(parts) == 2):
+                return name
+        return None
+
+    def _make_entry(self, path: str, location: str) -> Optional[CatalogEntry]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return CatalogEntry(
+            name=os.path.basename(path),
+            path=path,
+            location=location,
+            size=stat.st_size,
+            modified=stat.st_mtime
+        )
+
+    def _insert(self, entry: CatalogEntry):
+        self._by_name.setdefault(entry.name, {})[entry.path] = entry
+
+    def _scan_tree(self, directory: str):
+        """Index every file below a directory that falls inside a tracked location."""
+        with self._lock:
+            for root, dirs, files in os.walk(directory):
+                location = self._location_for(os.path.join(root, '_'))
+                if location is None:
+                    if os.path.abspath(root) != self.data_dir:
+                        dirs[:] = []
+                    continue
+                for filename in files:
+                    entry = self._make_entry(os.path.join(root, filename), location)
+                    if entry:
+                        self._insert(entry)
+
+    def build(self):
+        """(Re)build the whole index from disk."""
+        started = time.time()
+        by_name: Dict[str, Dict[str, CatalogEntry]] = {}
+
+        for location, subdir, recursive in CATALOG_LOCATIONS:
+            base = os.path.join(self.data_dir, subdir) if subdir else self.data_dir
+            if not os.path.isdir(base):
+                continue
+            try:
+                if recursive:
+                    walker = os.walk(base)
+                else:
+                    walker = [(base, None, [e.name for e in os.scandir(base) if e.is_file()])]
+                for root, _, files in walker:
+                    for filename in files:
+                        entry = self._make_entry(os.path.join(root, filename), location)
+                        if entry:
+                            by_name.setdefault(filename, {})[entry.path] = entry
+            except OSError as e:
+                self.logger.warning(f"Error indexing {base}: {str(e)}")
+
+        with self._lock:
+            self._by_name = by_name
+            self._built_at = time.time()
+
+        total = sum(len(paths) for paths in by_name.values())
+        self.logger.info(f"Indexed {total} files under {self.data_dir} in {time.time() - started:.2f}s")
+
+    def _start_watcher(self):
+        if not self.watch or self._observer is not None or not os.path.isdir(self.data_dir):
+            return
+        try:
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_CatalogEventHandler(self), self.data_dir, recursive=True)
+            observer.start()
+            self._observer = observer
+            self.logger.info(f"Watching {self.data_dir} for file catalog updates")
+        except Exception as e:
+            self.logger.warning(f"File catalog watcher unavailable, using periodic rescans: {str(e)}")
+            self.watch = False
+
+    def _ensure_fresh(self):
+        with self._lock:
+            stale = self._built_at is None or (
+                self._observer is None and time.time() - self._built_at > self.refresh_interval
+            )
+            if stale:
+                self.build()
+                self._start_watcher()
+
+    def add(self, path: str):
+        """Add or refresh a single file in the index (e.g. right after writing it)."""
+        path = os.path.abspath(path)
+        location = self._location_for(path)
+        if location is None or not os.path.isfile(path):
+            return
+        entry = self._make_entry(path, location)
+        if entry:
+            with self._lock:
+                self._insert(entry)
+
+    def discard(self, path: str, is_directory: bool = False):
+        """Remove a file (or every file below a directory) from the index."""
+        path = os.path.abspath(path)
+        with self._lock:
+            if is_directory:
+                prefix = path + os.sep
+                for name in list(self._by_name):
+                    paths = self._by_name[name]
+                    for p in [p for p in paths if p.startswith(prefix)]:
+                        del paths[p]
+                    if not paths:
+                        del self._by_name[name]
+            else:
+                paths = self._by_name.get(os.path.basename(path))
+                if paths is not None:
+                    paths.pop(path, None)
+                    if not paths:
+                        del self._by_name[os.path.basename(path)]
+
+    def stop(self):
+        """Stop the watcher thread, if running."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _direct_candidates(self, filename: str, locations: Sequence[str]) -> List[str]:
+        candidates = []
+        for location, subdir, _ in CATALOG_LOCATIONS:
+            if location in locations:
+                candidates.append(os.path.join(self.data_dir, subdir, filename) if subdir
+                                  else os.path.join(self.data_dir, filename))
+        return candidates
+
+    def resolve(self, filename: str, locations: Optional[Sequence[str]] = None) -> Optional[str]:
+        """
+        Resolve a filename to an absolute path.
+
+        Args:
+            filename: Bare filename (or a path relative to the data directory)
+            locations: Location names to search, in priority order (default: all)
+
+        Returns:
+            Path to the first match, or None if not found
+        """
+        locations = tuple(locations) if locations else LOCATION_NAMES
+
+        # Relative sub-paths are not indexed by name; probe them directly
+        if os.path.basename(filename) != filename:
+            for candidate in self._direct_candidates(filename, locations):
+                if os.path.isfile(candidate):
+                    return candidate
+            return None
+
+        self._ensure_fresh()
+        with self._lock:
+            entries = list(self._by_name.get(filename, {}).values())
+
+        for location in locations:
+            matches = sorted((e for e in entries if e.location == location),
+                             key=lambda e: (e.path.count(os.sep), e.path))
+            for entry in matches:
+                if os.path.isfile(entry.path):
+                    return entry.path
+                self.discard(entry.path)
+
+        # Watcher events are asynchronous; a file written moments ago may not
+        # be indexed yet. The flat locations are cheap to probe directly.
+        for candidate in self._direct_candidates(filename, locations):
+            if os.path.isfile(candidate):
+                self.add(candidate)
+                return candidate
+        return None
+
+    def list_files(self, locations: Optional[Sequence[str]] = None) -> List[CatalogEntry]:
+        """
+        List indexed files without re-stat'ing them.
+
+        Args:
+            locations: Location names to include (default: all)
+
+        Returns:
+            List of catalog entries
+        """
+        self._ensure_fresh()
+        locations = set(locations) if locations else set(LOCATION_NAMES)
+        with self._lock:
+            return [entry for paths in self._by_name.values()
+                    for entry in paths.values() if entry.location in locations]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get catalog statistics."""
+        with self._lock:
+            return {
+                'data_dir': self.data_dir,
+                'files': sum(len(paths) for paths in self._by_name.values()),
+                'names': len(self._by_name),
+                'built_at': self._built_at,
+                'watching': self._observer is not None
+            }
+
+
+_catalogs: Dict[str, FileCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_file_catalog(data_dir: Optional[str] = None) -> FileCatalog:
+    """
+    Get the shared catalog for a data directory (defaults to cwd/data).
+
+    Set REDLINE_FILE_CATALOG_WATCH=false to disable the watchdog observer.
+    """
+    if data_dir is None:
+        data_dir = os.path.join(os.getcwd(), 'data')
+    key = os.path.abspath(data_dir)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            watch = os.environ.get('REDLINE_FILE_CATALOG_WATCH', 'true').lower() == 'true'
+            catalog = FileCatalog(key, watch=watch)
+            _catalogs[key] = catalog
+        return catalog
+
+
+def resolve_data_file(filename: str, file_path_hint: Optional[str] = None,
+                      locations: Optional[Sequence[str]] = None,
+                      data_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve a data filename using the shared catalog.
+
+    Args:
+        filename: Filename to look up
+        file_path_hint: Explicit path that wins if it exists
+        locations: Location names to search, in priority order (default: all)
+        data_dir: Data directory (defaults to cwd/data)
+
+    Returns:
+        Path to the file, or None if not found
+    """
+    if file_path_hint and os.path.exists(file_path_hint):
+        return file_path_hint
+    if not filename:
+        return None
+    return get_file_catalog(data_dir).resolve(filename, locations)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+REDLINE File Metadata
+Column names, row counts and a short preview without parsing whole files.
+
+Parquet and Arrow footers carry the schema and row count; CSV/TXT row counts
+come from the sidecar line index (a vectorised newline count over a memory
+map); NPZ shapes come from the array headers inside the archive. Results are
+cached per (path, mtime, size).
+"""
+
+import os
+import logging
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+from .line_index import get_line_index
+from .format_loaders import FormatLoaders
+
+logger = logging.getLogger(__name__)
+
+# Separators tried for TXT files, in order (first one giving >1 column wins)
+TXT_SEPARATORS = [',', '\t', ';', ' ', '|']
+
+# Formats with a metadata fast path
+METADATA_FORMATS = {'csv', 'txt', 'parquet', 'feather', 'pyarrow', 'arrow', 'json', 'duckdb', 'tensorflow', 'npz'}
+
+
+class FileMetadataReader:
+    """Reads quick stats (columns, row count, preview) from file metadata."""
+
+    def __init__(self, preview_rows: int = 5, max_cached: int = 1024):
+        self.logger = logging.getLogger(__name__)
+        self.preview_rows = preview_rows
+        self.max_cached = max_cached
+        self.loaders = FormatLoaders()
+        self._cache: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_quick_stats(self, file_path: str, format: str) -> Dict[str, Any]:
+        """
+        Get columns, total row count and a preview frame for a file.
+
+        Args:
+            file_path: Path to file
+            format: Format type
+
+        Returns:
+            Dict with 'columns', 'total_rows' and 'preview' (DataFrame)
+        """
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, format)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        stats = self._read_stats(file_path, format)
+        with self._lock:
+            self._cache[key] = stats
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return stats
+
+    def _read_stats(self, file_path: str, format: str) -> Dict[str, Any]:
+        try:
+            if format in ('csv', 'txt'):
+                return self._text_stats(file_path, format)
+            if format == 'parquet' and PYARROW_AVAILABLE:
+                return self._parquet_stats(file_path)
+            if format in ('feather', 'pyarrow', 'arrow') and PYARROW_AVAILABLE:
+                return self._ipc_stats(file_path)
+            if format == 'json':
+                return self._json_stats(file_path)
+            if format == 'duckdb' and DUCKDB_AVAILABLE:
+                return self._duckdb_stats(file_path)
+            if format in ('tensorflow', 'npz'):
+                return self._npz_stats(file_path)
+        except Exception as e:
+            self.logger.warning(f"Metadata read failed for {file_path}, falling back to full load: {str(e)}")
+
+        loader_format = {'arrow': 'pyarrow', 'npz': 'tensorflow'}.get(format, format)
+        df = self.loaders.load_file_by_type(file_path, loader_format)
+        return self._result(df.head(self.preview_rows), len(df))
+
+    def _result(self, preview: pd.DataFrame, total_rows: int) -> Dict[str, Any]:
+        return {'columns': list(preview.columns), 'total_rows': int(total_rows), 'preview': preview}
+
+    def _text_stats(self, file_path: str, format: str) -> Dict[str, Any]:
+        sep = ','
+        if format == 'txt':
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                header = f.readline()
+            sep = next((s for s in TXT_SEPARATORS if len(header.split(s)) > 1), None)
+            if sep is None:
+                raise ValueError('no delimiter found in header')
+        preview = pd.read_csv(file_path, sep=sep, nrows=self.preview_rows)
+        return self._result(preview, get_line_index(file_path).total_rows)
+
+    def _parquet_stats(self, file_path: str) -> Dict[str, Any]:
+        parquet_file = pq.ParquetFile(file_path)
+        total = parquet_file.metadata.num_rows
+        batch = next(parquet_file.iter_batches(batch_size=self.preview_rows), None)
+        if batch is None:
+            return self._result(parquet_file.schema_arrow.empty_table().to_pandas(), total)
+        return self._result(pa.Table.from_batches([batch]).to_pandas(), total)
+
+    def _ipc_stats(self, file_path: str) -> Dict[str, Any]:
+        with pa.memory_map(file_path, 'r') as source:
+            reader = pa.ipc.open_file(source)
+            batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+            total = sum(batch.num_rows for batch in batches)
+            table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, self.preview_rows)
+            return self._result(table.to_pandas(), total)
+
+    def _json_stats(self, file_path: str) -> Dict[str, Any]:
+        with open(file_path, 'rb') as f:
+            first_line = f.readline().strip()
+            second_line = f.readline().strip()
+        # JSON Lines: one record object per line, so rows can be counted without parsing
+        if first_line.startswith(b'{') and first_line.endswith(b'}') and second_line.startswith(b'{'):
+            preview = pd.read_json(file_path, lines=True, nrows=self.preview_rows)
+            return self._result(preview, get_line_index(file_path).total_rows + 1)
+        raise ValueError('not JSON Lines')
+
+    def _duckdb_stats(self, file_path: str) -> Dict[str, Any]:
+        conn = duckdb.connect(file_path, read_only=True)
+        try:
+            tables = conn.execute('SHOW TABLES').fetchall()
+            if not tables:
+                raise ValueError('No tables found in DuckDB file')
+            table_name = tables[0][0]
+            total = conn.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()[0]
+            preview = conn.execute(f'SELECT * FROM "{table_name}" LIMIT {self.preview_rows}').fetchdf()
+            return self._result(preview, total)
+        finally:
+            conn.close()
+
+    def _npz_stats(self, file_path: str) -> Dict[str, Any]:
+        with zipfile.ZipFile(file_path) as archive:
+            names = [n[:-4] for n in archive.namelist() if n.endswith('.npy')]
+            key = 'data' if 'data' in names else names[0]
+            columns = None
+            if 'columns' in names and key == 'data':
+                with archive.open('columns.npy') as f:
+                    columns = [str(c) for c in np.lib.format.read_array(f, allow_pickle=False).tolist()]
+
+            with archive.open(f'{key}.npy') as f:
+                # Only the array header and the first few rows are decompressed
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+                if dtype.hasobject or fortran_order or len(shape) != 2:
+                    raise ValueError('array cannot be previewed from its header')
+                rows = min(self.preview_rows, shape[0])
+                buffer = f.read(rows * shape[1] * dtype.itemsize)
+                head = np.frombuffer(buffer, dtype=dtype).reshape(rows, shape[1])
+
+        if columns is None or len(columns) != shape[1]:
+            columns = [f'col_{i}' for i in range(shape[1])]
+        return self._result(pd.DataFrame(head, columns=columns), shape[0])
+
+
+_metadata_reader: Optional[FileMetadataReader] = None
+_metadata_reader_lock = threading.Lock()
+
+
+def get_file_metadata_reader() -> FileMetadataReader:
+    """Get the process-wide metadata reader (shares its per-file cache across requests)."""
+    global _metadata_reader
+    with _metadata_reader_lock:
+        if _metadata_reader is None:
+            _metadata_reader = FileMetadataReader()
+        return _metadata_reader
@@ -4,9 +4,11 @@ REDLINE Format Converter
 Handles conversion between different data formats and file I/O operations.
 """
 
+import os
+import time
 import logging
 import pandas as pd
-from typing import Union, List
+from typing import Any, Callable, Dict, Optional, Sequence, Union, List
 
 # Optional dependencies
 try:
@@ -33,9 +35,13 @@ except ImportError:
 from .format_loaders import FormatLoaders
 from .format_savers import FormatSavers
 from .format_converters import FormatConverters
+from .streaming_converter import StreamingConverter, ConversionStats, peak_rss_bytes
 
 logger = logging.getLogger(__name__)
 
+# Inputs at least this large are converted by streaming record batches instead of loading them whole
+STREAM_CONVERT_MB = float(os.environ.get('REDLINE_STREAM_CONVERT_MB', 64))
+
 class FormatConverter:
     """Handles format conversion and file I/O operations."""
     
@@ -62,7 +68,7 @@ class FormatConverter:
         return self.converters.convert_format(data, from_format, to_format)
     
     def save_file_by_type(self, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table', dict], 
-                          file_path: str, format: str) -> None:
+                          file_path: str, format: str, mode: str = 'replace') -> None:
         """
         Save data to file based on format type.
         
@@ -70,21 +76,85 @@ class FormatConverter:
             data: Data to save
             file_path: Path to save file
             format: Format type
+            mode: DuckDB targets only: 'replace', 'append' or 'upsert' (see FormatSavers)
         """
-        self.savers.save_file_by_type(data, file_path, format)
+        self.savers.save_file_by_type(data, file_path, format, mode)
     
-    def load_file_by_type(self, file_path: str, format: str) -> Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table']:
+    def load_file_by_type(self, file_path: str, format: str, use_cache: bool = True,
+                          columns: Optional[List[str]] = None,
+                          filters: Optional[Sequence] = None) -> Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table']:
         """
         Load data from file based on format type.
         
         Args:
             file_path: Path to file
             format: Format type
+            use_cache: Consult and populate the shared frame cache
+            columns: Columns to return (all if None)
+            filters: Row filters pushed into the reader (see FormatLoaders)
             
         Returns:
             Loaded data
         """
-        return self.loaders.load_file_by_type(file_path, format)
+        return self.loaders.load_file_by_type(file_path, format, use_cache=use_cache,
+                                              columns=columns, filters=filters)
+    
+    def convert_file(self, input_path: str, input_format: str, output_path: str, output_format: str,
+                     progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     stream: Optional[bool] = None) -> ConversionStats:
+        """
+        Convert a file on disk to another format.
+        
+        Large inputs are streamed batch by batch (see StreamingConverter) so
+        memory stays bounded; small inputs, pairs with no streaming
+        implementation, and inputs whose types streaming cannot settle are
+        loaded whole and saved.
+        
+        Args:
+            input_path: Input file
+            input_format: Input format type
+            output_path: Output file
+            output_format: Output format type
+            progress_callback: Called with {'rows', 'batches'} as batches are written (streaming only)
+            stream: Force (True) or disable (False) streaming; None decides by file size
+            
+        Returns:
+            ConversionStats for the conversion
+            
+        Raises:
+            ValueError: If the input cannot be loaded or is empty
+        """
+        streamer = StreamingConverter()
+        if stream is None:
+            stream = os.path.getsize(input_path) >= STREAM_CONVERT_MB * 1024 * 1024
+        if stream and streamer.can_stream(input_path, input_format, output_format):
+            try:
+                return streamer.convert(input_path, input_format, output_path, output_format, progress_callback)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                # Even the widened column types did not fit; pandas infers types from the whole file
+                self.logger.warning(f"Streaming conversion of {input_path} failed ({str(e)}), loading it whole")
+        
+        start = time.perf_counter()
+        data = self.load_file_by_type(input_path, input_format)
+        if data is None or (hasattr(data, 'empty') and data.empty):
+            raise ValueError('Failed to load input file or file is empty')
+        self.save_file_by_type(data, output_path, output_format)
+        
+        is_frame = isinstance(data, pd.DataFrame)
+        return ConversionStats(
+            input_path=input_path,
+            output_path=output_path,
+            output_format=output_format,
+            streamed=False,
+            rows=len(data) if is_frame else 0,
+            columns=[str(col) for col in data.columns] if is_frame else [],
+            batches=1,
+            input_bytes=os.path.getsize(input_path),
+            output_bytes=os.path.getsize(output_path),
+            seconds=time.perf_counter() - start,
+            peak_data_bytes=int(data.memory_usage(deep=True).sum()) if is_frame else 0,
+            peak_rss_bytes=peak_rss_bytes()
+        )
     
     def convert_to_stooq_format(self, data: pd.DataFrame, ticker: str = None) -> pd.DataFrame:
         """
@@ -101,7 +171,7 @@ class FormatConverter:
     
     def get_supported_formats(self) -> List[str]:
         """Get list of supported file formats."""
-        formats = ['csv', 'parquet', 'feather', 'json', 'duckdb', 'txt']
+        formats = ['csv', 'parquet', 'feather', 'json', 'jsonl', 'duckdb', 'txt']
         if TENSORFLOW_AVAILABLE:
             formats.extend(['keras', 'tensorflow'])
         if PYARROW_AVAILABLE:
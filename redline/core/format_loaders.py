@@ -6,7 +6,7 @@ Handles loading data from different file formats.
 
 import logging
 import pandas as pd
-from typing import Union
+from typing import List, Optional, Sequence, Union
 import os
 
 # Optional dependencies
@@ -19,9 +19,13 @@ except ImportError:
 
 try:
     import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
     PYARROW_AVAILABLE = True
 except ImportError:
     pa = None
+    ds = None
+    pq = None
     PYARROW_AVAILABLE = False
 
 try:
@@ -45,8 +49,35 @@ except ImportError:
     np = None
     NUMPY_AVAILABLE = False
 
+from .frame_cache import get_frame_cache, CACHEABLE_FORMATS
+from .time_index import index_by_time
+from .line_index import naive_timestamp, ticker_column, timestamp_columns
+from .load_filters import (
+    normalize_filters, needed_columns, apply_to_frame, arrow_expression,
+    polars_expression, sql_where, quote_identifier
+)
+
 logger = logging.getLogger(__name__)
 
+# Block pruning of CSV/TXT date ranges is widened by a day so UTC block
+# statistics never exclude rows the exact (local time) filter keeps
+PRUNE_MARGIN = pd.Timedelta(days=1)
+
+# Formats whose readers can skip columns and rows before building a frame
+PUSHDOWN_FORMATS = {'csv', 'txt', 'duckdb'}
+if PYARROW_AVAILABLE:
+    PUSHDOWN_FORMATS |= {'parquet', 'feather', 'pyarrow'}
+if POLARS_AVAILABLE:
+    PUSHDOWN_FORMATS.add('polars')
+
+
+def is_json_lines(file_path: str) -> bool:
+    """Check whether a JSON file holds one record per line (JSON Lines) rather than a document."""
+    with open(file_path, 'rb') as f:
+        first_line = f.readline().strip()
+        second_line = f.readline().strip()
+    return first_line.startswith(b'{') and first_line.endswith(b'}') and second_line.startswith(b'{')
+
 
 class FormatLoaders:
     """Handles loading data from different file formats."""
@@ -54,13 +85,29 @@ class FormatLoaders:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def load_file_by_type(self, file_path: str, format: str) -> Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table']:
+    def load_file_by_type(self, file_path: str, format: str, use_cache: bool = True,
+                          columns: Optional[List[str]] = None,
+                          filters: Optional[Sequence] = None) -> Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table']:
         """
         Load data from file based on format type.
         
+        Parsed DataFrames are served from the process-wide frame cache while the
+        file's mtime and size are unchanged.
+        
+        When ``columns`` or ``filters`` are given only the selected columns and
+        rows are returned, and they are pushed into the reader where the format
+        allows it: ``usecols`` for CSV, line-index blocks whose timestamp and
+        ticker statistics overlap the filters for CSV/TXT, dataset filters for Parquet, Feather
+        and Arrow files, a lazy polars scan for polars files and a WHERE
+        clause for DuckDB. A file already in the frame cache is filtered in
+        memory instead. Selective loads are not cached.
+        
         Args:
             file_path: Path to file
             format: Format type
+            use_cache: Consult and populate the frame cache
+            columns: Columns to return (all if None)
+            filters: Row filters, see redline.core.load_filters
             
         Returns:
             Loaded data
@@ -69,33 +116,185 @@ class FormatLoaders:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"File not found: {file_path}")
             
-            if format == 'csv':
-                return pd.read_csv(file_path)
-            elif format == 'parquet':
-                return self._load_parquet(file_path)
-            elif format == 'feather':
-                return pd.read_feather(file_path)
-            elif format == 'json':
-                return pd.read_json(file_path)
-            elif format == 'txt':
-                return self._load_txt(file_path)
-            elif format == 'duckdb':
-                return self._load_duckdb(file_path)
-            elif format == 'keras' and TENSORFLOW_AVAILABLE:
-                return tf.keras.models.load_model(file_path)
-            elif format == 'tensorflow' and NUMPY_AVAILABLE:
-                return self._load_tensorflow(file_path)
-            elif format == 'pyarrow' and PYARROW_AVAILABLE:
-                return pa.ipc.open_file(file_path).read_all().to_pandas()
-            elif format == 'polars' and POLARS_AVAILABLE:
-                return pl.read_parquet(file_path).to_pandas()
-            else:
-                raise ValueError(f"Unsupported format: {format}")
+            if format == 'parquet' and os.path.isdir(file_path):
+                # A partitioned Parquet lake rather than a single file
+                return self.load_partitioned(file_path, columns=columns, filters=filters)
+            
+            filters = normalize_filters(filters)
+            selective = bool(columns or filters)
+            
+            cache = get_frame_cache() if use_cache and format in CACHEABLE_FORMATS else None
+            if cache is not None:
+                cached = cache.get(file_path, format)
+                if cached is not None:
+                    return apply_to_frame(cached, filters, columns) if selective else cached
+            
+            if selective and format in PUSHDOWN_FORMATS:
+                try:
+                    return index_by_time(self._load_pushdown(file_path, format, columns, filters), reorder=False)
+                except Exception as e:
+                    self.logger.warning(f"Pushdown load of {file_path} failed, loading in full: {str(e)}")
+            
+            # Flag frames whose timestamps are already sorted (rows are never
+            # reordered here), so date slicing can binary-search them
+            data = index_by_time(self._load_uncached(file_path, format), reorder=False)
+            
+            if cache is not None and isinstance(data, pd.DataFrame):
+                cache.put(file_path, format, data)
+            if selective and isinstance(data, pd.DataFrame):
+                return apply_to_frame(data, filters, columns)
+            return data
                 
         except Exception as e:
             self.logger.error(f"Error loading file {file_path}: {str(e)}")
             raise
     
+    def load_partitioned(self, root: str, tickers: Optional[Sequence[str]] = None, start=None, end=None,
+                         columns: Optional[List[str]] = None, filters: Optional[Sequence] = None) -> pd.DataFrame:
+        """
+        Load rows from a ticker/year partitioned Parquet directory.
+        
+        Ticker and date predicates are pushed down: only the matching
+        partition directories are opened and row groups outside the date
+        range are skipped using their statistics.
+        
+        Args:
+            root: Lake directory
+            tickers: Tickers to load (all if None)
+            start: First timestamp to include
+            end: Last timestamp to include
+            columns: Columns to load (all if None)
+            filters: Further row filters, see redline.core.load_filters
+            
+        Returns:
+            Loaded data
+        """
+        from .partitioned_store import PartitionedStore
+        return PartitionedStore(root).read(tickers, start, end, columns, filters=filters)
+    
+    def peek(self, file_path: str, format: str, rows: int = 1000) -> pd.DataFrame:
+        """
+        Load the first rows of a file, for column detection.
+        
+        Args:
+            file_path: Path to file
+            format: Format type
+            rows: Number of rows to read
+            
+        Returns:
+            Up to ``rows`` rows with the file's columns and types
+        """
+        cache = get_frame_cache() if format in CACHEABLE_FORMATS else None
+        cached = cache.get(file_path, format) if cache is not None else None
+        if cached is not None:
+            return cached.head(rows)
+        if format == 'csv':
+            return pd.read_csv(file_path, nrows=rows)
+        if format in ('parquet', 'polars') and PYARROW_AVAILABLE and os.path.isfile(file_path):
+            batches = pq.ParquetFile(file_path).iter_batches(batch_size=rows)
+            batch = next(batches, None)
+            return batch.to_pandas() if batch is not None else pq.read_schema(file_path).empty_table().to_pandas()
+        if format == 'duckdb' and DUCKDB_AVAILABLE:
+            conn = duckdb.connect(file_path, read_only=True)
+            try:
+                return conn.execute(f"SELECT * FROM tickers_data LIMIT {int(rows)}").fetchdf()
+            finally:
+                conn.close()
+        data = self.load_file_by_type(file_path, format)
+        return data.head(rows) if isinstance(data, pd.DataFrame) else data
+    
+    def _load_pushdown(self, file_path: str, format: str, columns: Optional[List[str]],
+                       filters: List) -> pd.DataFrame:
+        """Load only the selected columns and rows of a file."""
+        if format in ('csv', 'txt'):
+            candidates = self._load_text_blocks(file_path, format, filters)
+            if candidates is not None:
+                return apply_to_frame(candidates, filters, columns)
+        if format == 'txt':
+            # Nothing to prune by: filter the (frame-cached) full load
+            return apply_to_frame(self.load_file_by_type(file_path, format), filters, columns)
+        if format == 'csv':
+            header = pd.read_csv(file_path, nrows=0).columns
+            usecols = needed_columns(header, columns, filters)
+            return apply_to_frame(pd.read_csv(file_path, usecols=usecols), filters, columns)
+        if format == 'polars':
+            lazy = pl.scan_parquet(file_path)
+            schema = lazy.collect_schema()
+            expression, residual = polars_expression(filters, schema)
+            if expression is not None:
+                lazy = lazy.filter(expression)
+            wanted = needed_columns(schema.names(), columns, residual)
+            if wanted is not None:
+                lazy = lazy.select(wanted)
+            return apply_to_frame(lazy.collect().to_pandas(), residual, columns)
+        if format == 'duckdb':
+            return self._load_duckdb(file_path, columns, filters)
+        dataset = ds.dataset(file_path, format='parquet' if format == 'parquet' else 'ipc')
+        expression, residual = arrow_expression(filters, dataset.schema)
+        wanted = needed_columns(dataset.schema.names, columns, residual)
+        table = dataset.to_table(columns=wanted, filter=expression)
+        return apply_to_frame(table.to_pandas(), residual, columns)
+    
+    def _load_text_blocks(self, file_path: str, format: str, filters: List) -> Optional[pd.DataFrame]:
+        """
+        Rows of the CSV/TXT index blocks that may satisfy timestamp and
+        ticker filters.
+        
+        Returns:
+            Candidate rows (to be filtered exactly by the caller), or None when
+            no filter bounds the file's timestamp or ticker column
+        """
+        if not filters:
+            return None
+        from .row_range_reader import RowRangeReader, detect_text_separator
+        header = list(pd.read_csv(file_path, sep=detect_text_separator(file_path, format), nrows=0).columns)
+        time_columns = timestamp_columns(header)
+        # Stooq <DATE>/<TIME> pairs are compared as numbers by the exact filter, not as dates
+        time_col = time_columns[0] if len(time_columns) == 1 and time_columns[0] != '<DATE>' else None
+        tick_col = ticker_column(header)
+        
+        start = end = tickers = None
+        for column, op, value in filters:
+            if column == time_col and op in ('>', '>=', '<', '<=', '=='):
+                try:
+                    bound = naive_timestamp(value)
+                except (TypeError, ValueError):
+                    continue
+                if op in ('>', '>=', '=='):
+                    start = bound - PRUNE_MARGIN
+                if op in ('<', '<=', '=='):
+                    end = bound + PRUNE_MARGIN
+            elif column == tick_col and op in ('in', '=='):
+                tickers = [str(v) for v in value] if op == 'in' else [str(value)]
+        if start is None and end is None and tickers is None:
+            return None
+        return RowRangeReader().read_candidate_rows(file_path, format, start, end, tickers)
+    
+    def _load_uncached(self, file_path: str, format: str) -> Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table']:
+        """Parse a file from disk based on format type."""
+        if format == 'csv':
+            return pd.read_csv(file_path)
+        elif format == 'parquet':
+            return self._load_parquet(file_path)
+        elif format == 'feather':
+            return pd.read_feather(file_path)
+        elif format == 'json':
+            return pd.read_json(file_path, lines=is_json_lines(file_path))
+        elif format == 'txt':
+            return self._load_txt(file_path)
+        elif format == 'duckdb':
+            return self._load_duckdb(file_path)
+        elif format == 'keras' and TENSORFLOW_AVAILABLE:
+            return tf.keras.models.load_model(file_path)
+        elif format == 'tensorflow' and NUMPY_AVAILABLE:
+            return self._load_tensorflow(file_path)
+        elif format == 'pyarrow' and PYARROW_AVAILABLE:
+            return pa.ipc.open_file(file_path).read_all().to_pandas()
+        elif format == 'polars' and POLARS_AVAILABLE:
+            return pl.read_parquet(file_path).to_pandas()
+        else:
+            raise ValueError(f"Unsupported format: {format}")
+    
     def _load_parquet(self, file_path: str) -> pd.DataFrame:
         """Load parquet file with fallback handling."""
         try:
@@ -143,12 +342,19 @@ class FormatLoaders:
             except:
                 raise txt_error
     
-    def _load_duckdb(self, file_path: str) -> pd.DataFrame:
-        """Load data from DuckDB database."""
+    def _load_duckdb(self, file_path: str, columns: Optional[List[str]] = None,
+                     filters: Optional[List] = None) -> pd.DataFrame:
+        """Load data from DuckDB database, selecting columns and rows in SQL."""
         conn = duckdb.connect(file_path)
         try:
-            result = conn.execute("SELECT * FROM tickers_data").fetchdf()
-            return result
+            if not (columns or filters):
+                return conn.execute("SELECT * FROM tickers_data").fetchdf()
+            column_types = {row[0]: row[1] for row in conn.execute("DESCRIBE tickers_data").fetchall()}
+            where, params, residual = sql_where(filters or [], column_types)
+            wanted = needed_columns(list(column_types), columns, residual)
+            select = ', '.join(quote_identifier(col) for col in wanted) if wanted else '*'
+            query = f"SELECT {select} FROM tickers_data" + (f" WHERE {where}" if where else '')
+            return apply_to_frame(conn.execute(query, params).fetchdf(), residual, columns)
         except Exception as e:
             try:
                 conn.close()
@@ -46,6 +46,8 @@ except ImportError:
     np = None
     NUMPY_AVAILABLE = False
 
+from ..database.shared_tables import write_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,7 +58,7 @@ class FormatSavers:
         self.logger = logging.getLogger(__name__)
     
     def save_file_by_type(self, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table', dict], 
-                          file_path: str, format: str) -> None:
+                          file_path: str, format: str, mode: str = 'replace') -> None:
         """
         Save data to file based on format type.
         
@@ -64,6 +66,8 @@ class FormatSavers:
             data: Data to save
             file_path: Path to save file
             format: Format type
+            mode: DuckDB targets only: 'replace' the tickers_data table, 'append'
+                to it, or 'upsert' rows by ticker and timestamp
         """
         try:
             # Ensure directory exists
@@ -79,8 +83,10 @@ class FormatSavers:
                 self._save_feather(data, file_path)
             elif format == 'json':
                 self._save_json(data, file_path)
+            elif format == 'jsonl':
+                self._save_json_lines(data, file_path)
             elif format == 'duckdb':
-                self._save_duckdb(data, file_path)
+                self._save_duckdb(data, file_path, mode)
             elif format == 'txt':
                 self._save_txt(data, file_path)
             elif format == 'keras' and TENSORFLOW_AVAILABLE:
@@ -218,8 +224,15 @@ class FormatSavers:
                 self.logger.error(f"Data shape: {data.shape}")
             raise Exception(f"Failed to save JSON file: {str(e)}")
     
-    def _save_duckdb(self, data: Union[pd.DataFrame, 'pl.DataFrame'], file_path: str) -> None:
-        """Save data to DuckDB format."""
+    def _save_json_lines(self, data: pd.DataFrame, file_path: str) -> None:
+        """Save data as JSON Lines (one record per line, NaN as null)."""
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError(f"Cannot save {type(data)} to JSON Lines format")
+        self.logger.info(f"Saving {len(data)} rows to JSON Lines: {file_path}")
+        data.to_json(file_path, orient='records', lines=True, date_format='iso')
+    
+    def _save_duckdb(self, data: Union[pd.DataFrame, 'pl.DataFrame'], file_path: str, mode: str = 'replace') -> None:
+        """Save data to DuckDB format (the tickers_data table)."""
         if not DUCKDB_AVAILABLE:
             raise ImportError("duckdb not available. Please install duckdb to use DuckDB format.")
         
@@ -233,7 +246,12 @@ class FormatSavers:
             conn = duckdb.connect(file_path)
             self.logger.info(f"Saving data to DuckDB database: {file_path}")
             
-            if isinstance(data, pd.DataFrame):
+            if mode != 'replace':
+                # Keep the existing table and its indexes; write only the new rows
+                rows = write_frame(conn, 'tickers_data', data, mode)
+                self.logger.info(f"Saved {rows} rows to DuckDB ({mode})")
+                
+            elif isinstance(data, pd.DataFrame):
                 # Register the DataFrame with DuckDB and create table
                 if data.empty:
                     self.logger.warning("DataFrame is empty, creating empty table")
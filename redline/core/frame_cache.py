@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+REDLINE Frame Cache
+Process-wide cache of parsed DataFrames keyed by file identity.
+
+Paginating, analysing and charting the same file used to re-parse it on every
+request. Entries are keyed by (path, mtime, size, format, loader options), so
+any change to the file on disk is a guaranteed miss. The in-memory tier is an
+LRU bounded by bytes; an optional Arrow IPC spill directory (normally under
+/dev/shm) lets gunicorn workers on the same host reuse each other's parses.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Formats whose loaders return plain DataFrames and are safe to cache
+CACHEABLE_FORMATS = {'csv', 'txt', 'parquet', 'feather', 'json', 'duckdb', 'pyarrow', 'polars', 'tensorflow'}
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_SHM_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    """Approximate in-memory size of a DataFrame including object payloads."""
+    try:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return 0
+
+
+class FrameCache:
+    """
+    Thread-safe, byte-bounded LRU cache of parsed DataFrames.
+
+    Frames are handed out as copies so callers can mutate them freely; a copy
+    is a memcpy and still orders of magnitude cheaper than re-parsing.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, shm_dir: Optional[str] = None,
+                 shm_max_bytes: int = DEFAULT_SHM_MAX_BYTES):
+        """
+        Initialize frame cache.
+
+        Args:
+            max_bytes: In-memory budget in bytes
+            shm_dir: Directory for shared Arrow IPC spill files (disabled if None)
+            shm_max_bytes: Budget for the spill directory in bytes
+        """
+        self.max_bytes = max_bytes
+        self.shm_dir = shm_dir if shm_dir and PYARROW_AVAILABLE else None
+        self.shm_max_bytes = shm_max_bytes
+        self.logger = logging.getLogger(__name__)
+
+        self._entries: 'OrderedDict[Tuple, Tuple[pd.DataFrame, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {'hits': 0, 'misses': 0, 'shm_hits': 0, 'evictions': 0, 'stores': 0, 'rejected': 0}
+
+        if self.shm_dir:
+            try:
+                os.makedirs(self.shm_dir, exist_ok=True)
+            except OSError as e:
+                self.logger.warning(f"Frame cache spill directory unavailable ({self.shm_dir}): {str(e)}")
+                self.shm_dir = None
+
+    @staticmethod
+    def make_key(file_path: str, format: str, options: Optional[Dict[str, Any]] = None) -> Optional[Tuple]:
+        """Build a cache key from file identity, or None if the file cannot be stat'ed."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        opts = tuple(sorted((k, repr(v)) for k, v in (options or {}).items()))
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, format, opts)
+
+    def _shm_path(self, key: Tuple) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.shm_dir, f"{digest}.arrow")
+
+    def get(self, file_path: str, format: str, options: Optional[Dict[str, Any]] = None) -> Optional[pd.DataFrame]:
+        """
+        Get a cached frame for a file.
+
+        Args:
+            file_path: Path to the source file
+            format: Format the file was loaded as
+            options: Loader options that affect the parsed result
+
+        Returns:
+            Copy of the cached DataFrame, or None on a miss
+        """
+        key = self.make_key(file_path, format, options)
+        if key is None:
+            return None
+
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return item[0].copy()
+
+        frame = self._read_shm(key)
+        if frame is not None:
+            with self._lock:
+                self._stats['shm_hits'] += 1
+            self._store(key, frame)
+            return frame.copy()
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, file_path: str, format: str, data: pd.DataFrame,
+            options: Optional[Dict[str, Any]] = None):
+        """
+        Cache a freshly parsed frame.
+
+        The cache keeps its own copy, so the caller may keep mutating ``data``.
+        """
+        if not isinstance(data, pd.DataFrame):
+            return
+        key = self.make_key(file_path, format, options)
+        if key is None:
+            return
+        frame = data.copy()
+        if self._store(key, frame):
+            self._write_shm(key, frame)
+
+    def _store(self, key: Tuple, frame: pd.DataFrame) -> bool:
+        nbytes = _frame_nbytes(frame)
+        with self._lock:
+            if nbytes > self.max_bytes:
+                self._stats['rejected'] += 1
+                self.logger.debug(f"Frame for {key[0]} ({nbytes} bytes) exceeds cache budget")
+                return False
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (frame, nbytes)
+            self._bytes += nbytes
+            self._stats['stores'] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self._stats['evictions'] += 1
+        return True
+
+    def _read_shm(self, key: Tuple) -> Optional[pd.DataFrame]:
+        if not self.shm_dir:
+            return None
+        path = self._shm_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with pa.memory_map(path, 'r') as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable frame spill file {path}: {str(e)}")
+            return None
+
+    def _write_shm(self, key: Tuple, frame: pd.DataFrame):
+        if not self.shm_dir:
+            return
+        path = self._shm_path(key)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+            self._prune_shm()
+        except Exception as e:
+            # Mixed-type object columns cannot always be expressed in Arrow
+            self.logger.debug(f"Could not spill frame for {key[0]}: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _prune_shm(self):
+        """Delete the least recently written spill files beyond the spill budget."""
+        try:
+            entries = [e for e in os.scandir(self.shm_dir) if e.name.endswith('.arrow')]
+            stats = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in stats:
+            if total <= self.shm_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def invalidate(self, file_path: str):
+        """Drop every in-memory entry for a file."""
+        path = os.path.abspath(file_path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Clear all in-memory entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        self.logger.info("Cleared frame cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['shm_hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hit_ratio': round((self._stats['hits'] + self._stats['shm_hits']) / lookups, 4) if lookups else 0.0,
+                'shm_dir': self.shm_dir
+            }
+
+
+_frame_cache: Optional[FrameCache] = None
+_frame_cache_lock = threading.Lock()
+
+
+def get_frame_cache() -> FrameCache:
+    """
+    Get the process-wide frame cache.
+
+    Configured from the environment on first use:
+        REDLINE_FRAME_CACHE_MB       in-memory budget (default 512, 0 disables caching)
+        REDLINE_FRAME_CACHE_SHM_DIR  Arrow IPC spill directory, e.g. /dev/shm/redline-frames
+        REDLINE_FRAME_CACHE_SHM_MB   spill directory budget (default 2048)
+    """
+    global _frame_cache
+    with _frame_cache_lock:
+        if _frame_cache is None:
+            max_mb = int(os.environ.get('REDLINE_FRAME_CACHE_MB', DEFAULT_MAX_BYTES // (1024 * 1024)))
+            shm_mb = int(os.environ.get('REDLINE_FRAME_CACHE_SHM_MB', DEFAULT_SHM_MAX_BYTES // (1024 * 1024)))
+            _frame_cache = FrameCache(
+                max_bytes=max_mb * 1024 * 1024,
+                shm_dir=os.environ.get('REDLINE_FRAME_CACHE_SHM_DIR') or None,
+                shm_max_bytes=shm_mb * 1024 * 1024
+            )
+        return _frame_cache
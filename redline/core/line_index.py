@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+REDLINE Line Index
+Sidecar byte-offset index for CSV/TXT files.
+
+Records the byte offset of every Nth data row so a reader can seek straight
+to a page instead of parsing the file from the top. The index is persisted
+next to the data file as a hidden ``.<name>.redline.idx`` sidecar (hidden so
+file listings skip it) and is rebuilt whenever the file's mtime or size
+changes. Offsets count physical lines; quoted fields containing newlines are
+not supported, which matches the Stooq/OHLCV files REDLINE produces.
+
+Each block of ``stride`` rows can also carry min/max timestamp and ticker
+statistics (built on first request, then persisted with the offsets), so
+date-range and ticker reads touch only the blocks that can match. Block
+boundaries double as split points for parsing one file on several cores.
+"""
+
+import os
+import mmap
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_STRIDE = 1000
+SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+NEWLINE = 10
+NAT = np.iinfo(np.int64).min
+
+# Column names searched (in order) when building block statistics
+TIMESTAMP_COLUMNS = ['timestamp', 'Timestamp', 'datetime', 'Datetime', 'date', 'Date', 'DATE']
+TICKER_COLUMNS = ['ticker', '<TICKER>', 'Ticker', 'symbol', 'Symbol', 'TICKER']
+
+
+def sidecar_path(file_path: str) -> str:
+    """Return the sidecar index path for a data file."""
+    directory, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, f".{name}.redline.idx")
+
+
+def timestamp_columns(columns: Sequence[str]) -> List[str]:
+    """Columns needed to derive a row timestamp (Stooq ``<DATE>``/``<TIME>`` or a single column)."""
+    if '<DATE>' in columns:
+        return ['<DATE>', '<TIME>'] if '<TIME>' in columns else ['<DATE>']
+    for column in TIMESTAMP_COLUMNS:
+        if column in columns:
+            return [column]
+    return []
+
+
+def ticker_column(columns: Sequence[str]) -> Optional[str]:
+    """Ticker column name, if the file has one."""
+    return next((c for c in TICKER_COLUMNS if c in columns), None)
+
+
+def parse_timestamps(frame: pd.DataFrame) -> Optional[pd.Series]:
+    """
+    Derive naive datetime64 timestamps for each row of a frame.
+
+    Args:
+        frame: Rows containing the columns returned by ``timestamp_columns``
+
+    Returns:
+        Series of timestamps (NaT where unparseable), or None if there is no timestamp column
+    """
+    columns = timestamp_columns(list(frame.columns))
+    if not columns:
+        return None
+    if columns[0] == '<DATE>':
+        date_str = frame['<DATE>'].astype(str).str.slice(0, 8)
+        if len(columns) == 2:
+            time_str = frame['<TIME>'].astype(str).str.zfill(6)
+            return pd.to_datetime(date_str + time_str, format='%Y%m%d%H%M%S', errors='coerce')
+        return pd.to_datetime(date_str, format='%Y%m%d', errors='coerce')
+    parsed = pd.to_datetime(frame[columns[0]], errors='coerce', utc=True)
+    return parsed.dt.tz_localize(None)
+
+
+def naive_timestamp(value) -> Optional[pd.Timestamp]:
+    """A timestamp bound comparable with ``parse_timestamps`` (timezone-aware values converted to naive UTC)."""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_convert('UTC').tz_localize(None) if ts.tzinfo is not None else ts
+
+
+class LineIndex:
+    """Row byte-offsets for one CSV/TXT file."""
+
+    def __init__(self, file_path: str, offsets: np.ndarray, total_rows: int, stride: int,
+                 mtime_ns: int, size: int):
+        self.file_path = file_path
+        self.offsets = offsets
+        self.total_rows = total_rows
+        self.stride = stride
+        self.mtime_ns = mtime_ns
+        self.size = size
+        # Per-block statistics (None until build_block_stats has run)
+        self.ts_min: Optional[np.ndarray] = None
+        self.ts_max: Optional[np.ndarray] = None
+        self.ticker_min: Optional[np.ndarray] = None
+        self.ticker_max: Optional[np.ndarray] = None
+
+    @property
+    def has_block_stats(self) -> bool:
+        """Whether per-block timestamp/ticker statistics are available."""
+        return self.ts_min is not None
+
+    @property
+    def header_end(self) -> int:
+        """Byte offset where the first data row starts."""
+        return int(self.offsets[0]) if len(self.offsets) else self.size
+
+    def is_current(self) -> bool:
+        """Check the index still matches the file on disk."""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        return stat.st_mtime_ns == self.mtime_ns and stat.st_size == self.size
+
+    def seek_row(self, handle, row: int):
+        """
+        Position a binary file handle at the start of a data row.
+
+        Args:
+            handle: File object opened in 'rb' mode
+            row: Zero-based data row (header excluded)
+        """
+        row = max(0, min(row, self.total_rows))
+        block = min(row // self.stride, len(self.offsets) - 1) if len(self.offsets) else 0
+        handle.seek(int(self.offsets[block]) if len(self.offsets) else self.size)
+        for _ in range(row - block * self.stride):
+            if not handle.readline():
+                break
+
+    def block_byte_range(self, block: int) -> Tuple[int, int]:
+        """Byte range [start, end) covered by a block of ``stride`` rows."""
+        start = int(self.offsets[block])
+        end = int(self.offsets[block + 1]) if block + 1 < len(self.offsets) else self.size
+        return start, end
+
+    def block_rows(self, block: int) -> int:
+        """Number of data rows in a block."""
+        return min(self.stride, self.total_rows - block * self.stride)
+
+    def split(self, parts: int) -> List[Tuple[int, int, int, int]]:
+        """
+        Split the data rows into contiguous ranges aligned to block boundaries.
+
+        Args:
+            parts: Desired number of ranges (fewer are returned for small files)
+
+        Returns:
+            List of (start_byte, end_byte, first_row, row_count)
+        """
+        blocks = len(self.offsets)
+        if not blocks:
+            return []
+        parts = max(1, min(parts, blocks))
+        bounds = np.linspace(0, blocks, parts + 1).astype(int)
+        ranges = []
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            if last <= first:
+                continue
+            start = int(self.offsets[first])
+            end = int(self.offsets[last]) if last < blocks else self.size
+            first_row = int(first) * self.stride
+            rows = min(int(last) * self.stride, self.total_rows) - first_row
+            ranges.append((start, end, first_row, rows))
+        return ranges
+
+    def blocks_for(self, start=None, end=None, tickers: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Indices of blocks that may contain rows matching a date range and/or tickers.
+
+        Blocks without statistics (or whose timestamps could not be parsed) are
+        always included, so pruning never drops matching rows.
+
+        Args:
+            start: Inclusive lower timestamp bound (anything ``pd.Timestamp`` accepts)
+            end: Inclusive upper timestamp bound
+            tickers: Tickers to keep
+
+        Returns:
+            Sorted array of block indices
+        """
+        keep = np.ones(len(self.offsets), dtype=bool)
+        if not self.has_block_stats:
+            return np.flatnonzero(keep)
+
+        unknown = self.ts_min == NAT
+        if start is not None:
+            keep &= unknown | (self.ts_max >= naive_timestamp(start).value)
+        if end is not None:
+            keep &= unknown | (self.ts_min <= naive_timestamp(end).value)
+        if tickers:
+            has_ticker = self.ticker_min != ''
+            in_range = np.zeros(len(self.offsets), dtype=bool)
+            for ticker in tickers:
+                in_range |= (self.ticker_min <= str(ticker)) & (self.ticker_max >= str(ticker))
+            keep &= ~has_ticker | in_range
+        return np.flatnonzero(keep)
+
+    def byte_ranges(self, blocks: Sequence[int]) -> List[Tuple[int, int]]:
+        """Merge block indices into contiguous byte ranges [start, end)."""
+        ranges: List[Tuple[int, int]] = []
+        for block in blocks:
+            start, end = self.block_byte_range(int(block))
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def build_block_stats(self, sep: str = ','):
+        """
+        Compute per-block min/max timestamp and ticker by reading only those columns.
+
+        Args:
+            sep: Field separator of the file
+        """
+        columns = list(pd.read_csv(self.file_path, sep=sep, nrows=0).columns)
+        ts_cols = timestamp_columns(columns)
+        tick_col = ticker_column(columns)
+        blocks = len(self.offsets)
+        ts_min = np.full(blocks, NAT, dtype=np.int64)
+        ts_max = np.full(blocks, NAT, dtype=np.int64)
+        ticker_min = np.full(blocks, '', dtype=object)
+        ticker_max = np.full(blocks, '', dtype=object)
+
+        usecols = ts_cols + ([tick_col] if tick_col else [])
+        if usecols and blocks:
+            # Chunks of ``stride`` rows line up exactly with the index blocks, which
+            # count physical lines: blank lines are kept as empty rows, then dropped
+            dtypes = {c: str for c in usecols}
+            reader = pd.read_csv(self.file_path, sep=sep, usecols=usecols, dtype=dtypes, chunksize=self.stride,
+                                 skip_blank_lines=False)
+            for block, chunk in enumerate(reader):
+                if block >= blocks:
+                    break
+                chunk = chunk.dropna(how='all')
+                timestamps = parse_timestamps(chunk)
+                if timestamps is not None and timestamps.notna().any():
+                    ts_min[block] = timestamps.min().value
+                    ts_max[block] = timestamps.max().value
+                if tick_col:
+                    values = chunk[tick_col].dropna()
+                    if len(values):
+                        ticker_min[block] = values.min()
+                        ticker_max[block] = values.max()
+
+        self.ts_min, self.ts_max = ts_min, ts_max
+        self.ticker_min, self.ticker_max = ticker_min.astype(str), ticker_max.astype(str)
+
+    @classmethod
+    def build(cls, file_path: str, stride: int = DEFAULT_STRIDE) -> 'LineIndex':
+        """Scan a file once and record the offset of every ``stride``-th data row."""
+        stat = os.stat(file_path)
+        size = stat.st_size
+        checkpoints = []
+        newlines = 0
+        last_byte = None
+
+        if size:
+            # Scan zero-copy windows over a memory map; the byte compare is vectorised by numpy
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = np.frombuffer(mm, dtype=np.uint8)
+                for position in range(0, size, SCAN_CHUNK_BYTES):
+                    window = data[position:position + SCAN_CHUNK_BYTES]
+                    positions = np.flatnonzero(window == NEWLINE)
+                    if len(positions):
+                        # Newline k ends line k; data row r starts after newline r (line 0 is the header)
+                        line_numbers = newlines + np.arange(len(positions))
+                        selected = positions[line_numbers % stride == 0]
+                        if len(selected):
+                            checkpoints.append(selected.astype(np.int64) + position + 1)
+                        newlines += len(positions)
+                last_byte = int(data[-1])
+                del data, window
+
+        offsets = np.concatenate(checkpoints) if checkpoints else np.empty(0, dtype=np.int64)
+        offsets = offsets[offsets < size]
+
+        total_lines = newlines + (1 if size and last_byte != NEWLINE else 0)
+        total_rows = max(0, total_lines - 1)
+        return cls(file_path, offsets, total_rows, stride, stat.st_mtime_ns, size)
+
+    def save(self, path: Optional[str] = None) -> bool:
+        """Persist the index as a sidecar file. Returns False if the directory is read-only."""
+        path = path or sidecar_path(self.file_path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **self._arrays())
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.debug(f"Could not write line index {path}: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+    def _arrays(self) -> dict:
+        arrays = {
+            'meta': np.array([INDEX_VERSION, self.mtime_ns, self.size, self.stride, self.total_rows],
+                             dtype=np.int64),
+            'offsets': self.offsets,
+        }
+        if self.has_block_stats:
+            arrays.update(ts_min=self.ts_min, ts_max=self.ts_max,
+                          ticker_min=self.ticker_min, ticker_max=self.ticker_max)
+        return arrays
+
+    @classmethod
+    def load(cls, file_path: str, path: Optional[str] = None) -> Optional['LineIndex']:
+        """Load a sidecar index if it exists and still matches the data file."""
+        path = path or sidecar_path(file_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as loaded:
+                version, mtime_ns, size, stride, total_rows = (int(v) for v in loaded['meta'])
+                if version != INDEX_VERSION:
+                    return None
+                index = cls(file_path, loaded['offsets'], total_rows, stride, mtime_ns, size)
+                if 'ts_min' in loaded.files:
+                    index.ts_min, index.ts_max = loaded['ts_min'], loaded['ts_max']
+                    index.ticker_min, index.ticker_max = loaded['ticker_min'], loaded['ticker_max']
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable line index {path}: {str(e)}")
+            return None
+        return index if index.is_current() else None
+
+
+_indexes: 'OrderedDict[str, LineIndex]' = OrderedDict()
+_indexes_lock = threading.Lock()
+_MAX_CACHED_INDEXES = 256
+
+
+def get_line_index(file_path: str, stride: int = DEFAULT_STRIDE, persist: bool = True,
+                   with_stats: bool = False, sep: str = ',') -> LineIndex:
+    """
+    Get a current line index for a file, loading or building it as needed.
+
+    Args:
+        file_path: CSV/TXT file to index
+        stride: Rows between recorded offsets when building
+        persist: Write a sidecar file after building
+        with_stats: Ensure per-block timestamp/ticker statistics are present
+        sep: Field separator (only used when building statistics)
+
+    Returns:
+        LineIndex matching the file's current mtime and size
+    """
+    key = os.path.abspath(file_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None and index.is_current() and (index.has_block_stats or not with_stats):
+            _indexes.move_to_end(key)
+            return index
+
+    if index is None or not index.is_current():
+        index = LineIndex.load(key)
+    changed = False
+    if index is None:
+        index = LineIndex.build(key, stride=stride)
+        logger.info(f"Built line index for {file_path}: {index.total_rows} rows, {len(index.offsets)} checkpoints")
+        changed = True
+    if with_stats and not index.has_block_stats:
+        index.build_block_stats(sep=sep)
+        changed = True
+    if changed and persist:
+        index.save()
+
+    with _indexes_lock:
+        _indexes[key] = index
+        _indexes.move_to_end(key)
+        while len(_indexes) > _MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+REDLINE Load Filters
+Row predicates that loaders push down into the file reader.
+
+A filter list uses the same shape as pyarrow's ``filters`` argument:
+``[('ticker', 'in', ['AAPL', 'MSFT']), ('timestamp', 'between', ('2024-01-01', '2024-06-30')),
+('close', '>', 100)]``. All conditions must hold. JSON callers may send
+``{'column': ..., 'op': ..., 'value': ...}`` objects instead of tuples.
+
+Values are coerced to the type of the column they are compared with, so
+dates can be given as strings and numbers as text. Each backend (pyarrow
+datasets, polars lazy frames, DuckDB SQL) takes the conditions it can
+evaluate natively; the rest are returned as a residual list and applied
+to the loaded frame with ``apply_to_frame``. Conditions on columns the
+source does not have are ignored, as ``apply_filters`` does for the web
+filter form.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ds = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    pl = None
+    POLARS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+Filter = Tuple[str, str, Any]
+
+COMPARISONS = ('==', '!=', '<', '<=', '>', '>=')
+OPERATORS = COMPARISONS + ('in', 'not in', 'between')
+_ALIASES = {'=': '==', 'eq': '==', 'ne': '!=', 'lt': '<', 'le': '<=', 'gt': '>', 'ge': '>=', 'not_in': 'not in'}
+
+_NUMERIC_SQL_TYPES = ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT',
+                      'UINTEGER', 'UBIGINT', 'FLOAT', 'DOUBLE', 'DECIMAL', 'REAL')
+
+
+class _Unpushable(Exception):
+    """A condition whose value does not fit the column type natively."""
+
+
+def normalize_filters(filters: Optional[Iterable]) -> List[Filter]:
+    """
+    Validate a filter list and expand ``between`` into two comparisons.
+
+    Args:
+        filters: (column, op, value) tuples or {'column', 'op', 'value'} dicts
+
+    Returns:
+        List of (column, op, value) tuples using only comparison, in and not in
+    """
+    result = []
+    for item in filters or []:
+        if isinstance(item, dict):
+            column, op, value = item.get('column'), item.get('op', '=='), item.get('value')
+        else:
+            column, op, value = item
+        op = _ALIASES.get(str(op).lower(), str(op).lower())
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported filter operator '{op}' (use one of {', '.join(OPERATORS)})")
+        if op == 'between':
+            low, high = value
+            if low is not None and low != '':
+                result.append((column, '>=', low))
+            if high is not None and high != '':
+                result.append((column, '<=', high))
+        elif op in ('in', 'not in'):
+            values = [value] if isinstance(value, (str, bytes)) or not isinstance(value, Iterable) else list(value)
+            result.append((column, op, values))
+        else:
+            result.append((column, op, value))
+    return result
+
+
+def range_filters(tickers: Optional[Sequence[str]] = None, start=None, end=None,
+                  ticker_column: str = 'ticker', time_column: str = 'timestamp') -> List[Filter]:
+    """Filters for a ticker list and an inclusive date range."""
+    filters = []
+    if tickers:
+        filters.append((ticker_column, 'in', [str(t) for t in tickers]))
+    if (start is not None and start != '') or (end is not None and end != ''):
+        filters.append((time_column, 'between', (start, end)))
+    return normalize_filters(filters)
+
+
+def filter_columns(filters: Iterable[Filter]) -> List[str]:
+    """Columns referenced by a filter list, in first-use order."""
+    return list(dict.fromkeys(column for column, _, _ in filters))
+
+
+def needed_columns(available: Sequence[str], columns: Optional[Sequence[str]],
+                   filters: Iterable[Filter]) -> Optional[List[str]]:
+    """
+    Columns a reader must decode to return ``columns`` after applying ``filters``.
+
+    Returns None (read everything) when no projection was requested.
+    """
+    if not columns:
+        return None
+    wanted = list(dict.fromkeys(list(columns) + filter_columns(filters)))
+    return [col for col in wanted if col in available]
+
+
+# ---------------------------------------------------------------------------
+# Value coercion
+# ---------------------------------------------------------------------------
+
+def _to_number(value):
+    if isinstance(value, bool):
+        raise _Unpushable(value)
+    try:
+        return float(value) if not isinstance(value, (int, float)) else value
+    except (TypeError, ValueError):
+        raise _Unpushable(value)
+
+
+def _to_timestamp(value, tz=None) -> pd.Timestamp:
+    try:
+        ts = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        raise _Unpushable(value)
+    if ts is pd.NaT:
+        raise _Unpushable(value)
+    if tz is not None:
+        ts = ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+    elif ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts
+
+
+def _coerce(kind: str, op: str, value, tz=None):
+    """Coerce a filter value for a column kind, raising _Unpushable if it does not fit."""
+    convert = {
+        'numeric': _to_number,
+        'temporal': lambda v: _to_timestamp(v, tz),
+        'string': lambda v: str(v),
+    }.get(kind)
+    if convert is None or (kind == 'string' and op not in ('==', '!=', 'in', 'not in')):
+        raise _Unpushable(value)
+    if op in ('in', 'not in'):
+        return [convert(v) for v in value]
+    return convert(value)
+
+
+# ---------------------------------------------------------------------------
+# pandas
+# ---------------------------------------------------------------------------
+
+def _compare(series: pd.Series, op: str, value) -> pd.Series:
+    if op == 'in':
+        return series.isin(value)
+    if op == 'not in':
+        return ~series.isin(value) & series.notna()
+    return {
+        '==': series.__eq__, '!=': series.__ne__, '<': series.__lt__,
+        '<=': series.__le__, '>': series.__gt__, '>=': series.__ge__
+    }[op](value)
+
+
+def _frame_condition(series: pd.Series, op: str, value) -> pd.Series:
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        kind = 'other'
+    elif pd.api.types.is_numeric_dtype(dtype):
+        kind = 'numeric'
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        kind = 'temporal'
+    else:
+        kind = 'other'
+    try:
+        return _compare(series, op, _coerce(kind, op, value, getattr(dtype, 'tz', None)))
+    except _Unpushable:
+        pass
+
+    # Untyped (text) columns: equality compares text, ordering compares
+    # numbers if the value is numeric and dates otherwise
+    if op in ('==', '!=', 'in', 'not in'):
+        text = series.astype(str)
+        return _compare(text, op, [str(v) for v in value] if op in ('in', 'not in') else str(value))
+    try:
+        return _compare(pd.to_numeric(series, errors='coerce'), op, _to_number(value))
+    except _Unpushable:
+        pass
+    try:
+        return _compare(pd.to_datetime(series, errors='coerce'), op, _to_timestamp(value))
+    except _Unpushable:
+        raise ValueError(f"Cannot compare column '{series.name}' with {value!r}")
+
+
+def frame_mask(df: pd.DataFrame, filters: Iterable[Filter]) -> pd.Series:
+    """Boolean mask of the rows of ``df`` that satisfy every filter."""
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        if column not in df.columns:
+            logger.warning(f"Ignoring filter on missing column '{column}'")
+            continue
+        mask &= _frame_condition(df[column], op, value).fillna(False).astype(bool)
+    return mask
+
+
+def apply_to_frame(df: pd.DataFrame, filters: Optional[Iterable[Filter]] = None,
+                   columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Filter and project a loaded frame.
+
+    Args:
+        df: Loaded data
+        filters: Normalized filters to apply
+        columns: Columns to keep, in this order (missing ones are skipped)
+
+    Returns:
+        The selected rows and columns
+    """
+    filters = list(filters or [])
+    if filters:
+        df = df[frame_mask(df, filters)]
+    if columns:
+        df = df[[col for col in columns if col in df.columns]]
+    return df.reset_index(drop=True) if filters else df
+
+
+# ---------------------------------------------------------------------------
+# pyarrow
+# ---------------------------------------------------------------------------
+
+def _arrow_kind(arrow_type) -> Tuple[str, Any]:
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return 'numeric', None
+    if pa.types.is_timestamp(arrow_type):
+        return 'temporal', arrow_type.tz
+    if pa.types.is_date(arrow_type):
+        return 'date', None
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return 'string', None
+    return 'other', None
+
+
+def arrow_expression(filters: Iterable[Filter], schema: 'pa.Schema') -> Tuple[Optional['ds.Expression'], List[Filter]]:
+    """
+    Translate filters into a pyarrow dataset expression.
+
+    Args:
+        filters: Normalized filters
+        schema: Schema of the dataset being read
+
+    Returns:
+        (expression or None, residual filters to apply after loading)
+    """
+    expression, residual = None, []
+    for column, op, value in filters:
+        if column not in schema.names:
+            logger.warning(f"Ignoring filter on missing column '{column}'")
+            continue
+        arrow_type = schema.field(column).type
+        kind, tz = _arrow_kind(arrow_type)
+        try:
+            if kind == 'date':
+                coerced = _coerce('temporal', op, value)
+                coerced = [v.date() for v in coerced] if isinstance(coerced, list) else coerced.date()
+            else:
+                coerced = _coerce(kind, op, value, tz)
+            if kind == 'temporal':
+                to_scalar = lambda v: pa.scalar(v, type=arrow_type)
+                coerced = [to_scalar(v) for v in coerced] if isinstance(coerced, list) else to_scalar(coerced)
+        except _Unpushable:
+            residual.append((column, op, value))
+            continue
+
+        field = ds.field(column)
+        if op == 'in':
+            condition = field.isin(coerced)
+        elif op == 'not in':
+            condition = ~field.isin(coerced) & field.is_valid()
+        else:
+            condition = _compare_expression(field, op, coerced)
+        expression = condition if expression is None else expression & condition
+    return expression, residual
+
+
+def _compare_expression(field, op, value):
+    return {
+        '==': lambda: field == value, '!=': lambda: field != value, '<': lambda: field < value,
+        '<=': lambda: field <= value, '>': lambda: field > value, '>=': lambda: field >= value
+    }[op]()
+
+
+# ---------------------------------------------------------------------------
+# polars
+# ---------------------------------------------------------------------------
+
+def polars_expression(filters: Iterable[Filter], schema: Dict[str, Any]) -> Tuple[Optional['pl.Expr'], List[Filter]]:
+    """
+    Translate filters into a polars expression for a lazy scan.
+
+    Args:
+        filters: Normalized filters
+        schema: Column name to polars dtype, from ``LazyFrame.collect_schema()``
+
+    Returns:
+        (expression or None, residual filters to apply after collecting)
+    """
+    expression, residual = None, []
+    for column, op, value in filters:
+        if column not in schema:
+            logger.warning(f"Ignoring filter on missing column '{column}'")
+            continue
+        dtype = schema[column]
+        if dtype.is_numeric():
+            kind, tz = 'numeric', None
+        elif dtype == pl.Datetime:
+            kind, tz = 'temporal', getattr(dtype, 'time_zone', None)
+        elif dtype == pl.String:
+            kind, tz = 'string', None
+        else:
+            kind, tz = 'other', None
+        try:
+            coerced = _coerce(kind, op, value, tz)
+        except _Unpushable:
+            residual.append((column, op, value))
+            continue
+        if kind == 'temporal':
+            coerced = [v.to_pydatetime() for v in coerced] if isinstance(coerced, list) else coerced.to_pydatetime()
+
+        col = pl.col(column)
+        if op == 'in':
+            condition = col.is_in(coerced)
+        elif op == 'not in':
+            condition = ~col.is_in(coerced) & col.is_not_null()
+        else:
+            condition = _compare_expression(col, op, coerced if not isinstance(coerced, datetime)
+                                            else pl.lit(coerced, dtype=dtype))
+        expression = condition if expression is None else expression & condition
+    return expression, residual
+
+
+# ---------------------------------------------------------------------------
+# SQL (DuckDB)
+# ---------------------------------------------------------------------------
+
+def _sql_kind(sql_type: str) -> str:
+    sql_type = sql_type.upper()
+    if sql_type.startswith(_NUMERIC_SQL_TYPES):
+        return 'numeric'
+    if sql_type.startswith('TIMESTAMP') or sql_type == 'DATE':
+        return 'temporal'
+    if sql_type == 'VARCHAR':
+        return 'string'
+    return 'other'
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a column name for SQL."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sql_where(filters: Iterable[Filter], column_types: Dict[str, str]) -> Tuple[str, List[Any], List[Filter]]:
+    """
+    Translate filters into a parameterised SQL WHERE clause.
+
+    Args:
+        filters: Normalized filters
+        column_types: Column name to SQL type name (from DESCRIBE)
+
+    Returns:
+        (clause without the WHERE keyword or '', parameters, residual filters)
+    """
+    clauses, params, residual = [], [], []
+    for column, op, value in filters:
+        if column not in column_types:
+            logger.warning(f"Ignoring filter on missing column '{column}'")
+            continue
+        kind = _sql_kind(column_types[column])
+        tz = 'UTC' if 'TIME ZONE' in column_types[column].upper() else None
+        try:
+            coerced = _coerce(kind, op, value, tz)
+        except _Unpushable:
+            residual.append((column, op, value))
+            continue
+        if kind == 'temporal':
+            coerced = [v.to_pydatetime() for v in coerced] if isinstance(coerced, list) else coerced.to_pydatetime()
+
+        name = quote_identifier(column)
+        if op in ('in', 'not in'):
+            if not coerced:
+                clauses.append('FALSE' if op == 'in' else f"{name} IS NOT NULL")
+                continue
+            placeholders = ', '.join('?' for _ in coerced)
+            clauses.append(f"{name} {'IN' if op == 'in' else 'NOT IN'} ({placeholders})")
+            params.extend(coerced)
+        else:
+            clauses.append(f"{name} {'=' if op == '==' else op} ?")
+            params.append(coerced)
+    return ' AND '.join(clauses), params, residual
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+REDLINE Merge Engine
+Merges many files into one without loading them into memory.
+
+Each input is exposed to DuckDB as a lazy scan (read_csv_auto, read_parquet,
+read_json_auto, an attached DuckDB file, or an Arrow dataset for Feather/IPC
+files). Column mappings and the column union are applied in SQL, the scans
+are combined with UNION ALL, and the optional de-duplication and sort run
+inside DuckDB, which spills to a temporary directory when the configured
+memory limit is reached. The result is written by DuckDB's COPY (CSV, TXT,
+Parquet, JSON), inserted into an attached DuckDB file, or streamed as Arrow
+record batches (Feather/Arrow), so peak memory follows the budget rather
+than the input size.
+"""
+
+import os
+import time
+import logging
+import tempfile
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# Optional dependencies
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pa_ds = None
+    PYARROW_AVAILABLE = False
+
+from .row_range_reader import detect_text_separator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_LIMIT_MB = 1024
+BATCH_ROWS = 64 * 1024
+
+# Hidden columns recording each row's position in the inputs while de-duplicating by key
+SOURCE_FILE = '__redline_file'
+SOURCE_ROW = '__redline_row'
+
+MERGE_INPUTS = {'csv', 'txt', 'parquet', 'polars', 'json', 'duckdb', 'feather', 'pyarrow', 'arrow'}
+MERGE_OUTPUTS = {'csv', 'txt', 'parquet', 'json', 'jsonl', 'duckdb', 'feather', 'pyarrow', 'arrow'}
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    """Quote a SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+@dataclass
+class MergeStats:
+    """Outcome of one out-of-core merge."""
+    output_path: str
+    output_format: str
+    rows: int = 0
+    columns: List[str] = field(default_factory=list)
+    files: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    seconds: float = 0.0
+    memory_limit_mb: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result['seconds'] = round(self.seconds, 3)
+        return result
+
+
+class MergeEngine:
+    """Unions files lazily in DuckDB and writes the result in a streaming fashion."""
+
+    def __init__(self, memory_limit_mb: Optional[float] = None, temp_dir: Optional[str] = None,
+                 threads: Optional[int] = None):
+        """
+        Initialize the merge engine.
+
+        Args:
+            memory_limit_mb: DuckDB memory limit (defaults to REDLINE_MERGE_MEMORY_MB)
+            temp_dir: Spill directory (defaults to REDLINE_MERGE_TEMP_DIR or the system temp dir)
+            threads: DuckDB worker threads (defaults to DuckDB's choice)
+        """
+        self.logger = logging.getLogger(__name__)
+        if memory_limit_mb is None:
+            memory_limit_mb = float(os.environ.get('REDLINE_MERGE_MEMORY_MB', DEFAULT_MEMORY_LIMIT_MB))
+        self.memory_limit_mb = memory_limit_mb
+        self.temp_dir = temp_dir or os.environ.get('REDLINE_MERGE_TEMP_DIR') or tempfile.gettempdir()
+        self.threads = threads
+
+    def can_merge(self, input_formats: Sequence[str], output_format: str) -> bool:
+        """Check whether every input and the output have an out-of-core implementation."""
+        if not DUCKDB_AVAILABLE or not PYARROW_AVAILABLE:
+            return False
+        return output_format in MERGE_OUTPUTS and all(fmt in MERGE_INPUTS for fmt in input_formats)
+
+    def probe(self, input_path: str, input_format: str) -> List[str]:
+        """
+        Read the column names of one input (raises if DuckDB cannot scan it).
+
+        Args:
+            input_path: Input file
+            input_format: Input format type
+
+        Returns:
+            Column names
+        """
+        if os.path.getsize(input_path) == 0:
+            raise ValueError('File is empty')
+        conn = self._connect()
+        try:
+            relation = self._source(conn, 0, input_path, input_format)
+            return [row[0] for row in conn.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()]
+        finally:
+            conn.close()
+
+    def merge(self, sources: List[Tuple[str, str]], output_path: str, output_format: str,
+              column_mappings: Optional[Dict[str, str]] = None, column_order: Optional[List[str]] = None,
+              deduplicate: Union[bool, List[str]] = False, sort_by: Optional[List[str]] = None) -> MergeStats:
+        """
+        Merge input files into one output file.
+
+        Columns are aligned like converter_helpers.merge_dataframes: mappings are
+        applied per file, the output has the union of all columns (in
+        column_order if given, else first-file order with new columns appended)
+        and missing values are NULL.
+
+        Args:
+            sources: (path, format) of each input, in merge order
+            output_path: Output file (replaced if it exists)
+            output_format: Output format type
+            column_mappings: Old column name -> new column name
+            column_order: Preferred column order
+            deduplicate: True drops identical rows; a list of columns keeps one row per key
+            sort_by: Columns to sort the output by
+
+        Returns:
+            MergeStats for the merge
+        """
+        start = time.perf_counter()
+        column_mappings = column_mappings or {}
+        stats = MergeStats(output_path=output_path, output_format=output_format, files=len(sources),
+                           input_bytes=sum(os.path.getsize(path) for path, _ in sources),
+                           memory_limit_mb=self.memory_limit_mb)
+
+        conn = self._connect()
+        tmp_path = f"{output_path}.{os.getpid()}.part"
+        try:
+            relations = []
+            for i, (path, fmt) in enumerate(sources):
+                relation = self._source(conn, i, path, fmt)
+                names = [row[0] for row in conn.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()]
+                relations.append((relation, {name: column_mappings.get(name, name) for name in names}))
+
+            columns = self._align([list(mapped.values()) for _, mapped in relations], column_order)
+            keyed = bool(deduplicate) and deduplicate is not True
+            selects = []
+            for i, (relation, mapped) in enumerate(relations):
+                available = {new: old for old, new in mapped.items()}
+                parts = [f"{_quote(available[col])} AS {_quote(col)}" if col in available else f"NULL AS {_quote(col)}"
+                         for col in columns]
+                if keyed:
+                    # Source order (file, then row), so the first row of each key is kept like pandas keep='first'
+                    parts += [f"{i} AS {SOURCE_FILE}", f"row_number() OVER () AS {SOURCE_ROW}"]
+                selects.append(f"SELECT {', '.join(parts)} FROM {relation}")
+            query = ' UNION ALL '.join(selects)
+
+            if deduplicate is True:
+                query = f"SELECT DISTINCT * FROM ({query})"
+            elif keyed:
+                keys = ', '.join(_quote(col) for col in deduplicate)
+                query = (f"SELECT * FROM ({query}) QUALIFY row_number() OVER "
+                         f"(PARTITION BY {keys} ORDER BY {SOURCE_FILE}, {SOURCE_ROW}) = 1")
+            column_list = ', '.join(_quote(col) for col in columns)
+            query = f"SELECT {column_list} FROM ({query})"
+            if sort_by:
+                query += ' ORDER BY ' + ', '.join(_quote(col) for col in sort_by)
+
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            stats.rows = self._write(conn, query, tmp_path, output_format)
+            stats.columns = columns
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            conn.close()
+
+        stats.seconds = time.perf_counter() - start
+        stats.output_bytes = os.path.getsize(output_path)
+        self.logger.info(f"Merged {len(sources)} files into {output_path}: {stats.rows} rows in "
+                         f"{stats.seconds:.2f}s (memory limit {self.memory_limit_mb:.0f} MB)")
+        return stats
+
+    def _connect(self) -> 'duckdb.DuckDBPyConnection':
+        conn = duckdb.connect()
+        conn.execute(f"SET memory_limit = '{int(self.memory_limit_mb)}MB'")
+        conn.execute(f"SET temp_directory = {_literal(self.temp_dir)}")
+        if self.threads:
+            conn.execute(f"SET threads = {int(self.threads)}")
+        return conn
+
+    def _source(self, conn: 'duckdb.DuckDBPyConnection', index: int, path: str, fmt: str) -> str:
+        """Expose one input to DuckDB and return a relation usable in FROM."""
+        if fmt in ('csv', 'txt'):
+            sep = detect_text_separator(path, fmt)
+            return f"read_csv_auto({_literal(path)}, delim = {_literal(sep)}, header = true)"
+        if fmt in ('parquet', 'polars'):
+            return f"read_parquet({_literal(path)})"
+        if fmt == 'json':
+            return f"read_json_auto({_literal(path)})"
+        if fmt == 'duckdb':
+            alias = f"merge_src_{index}"
+            conn.execute(f"ATTACH {_literal(path)} AS {alias} (READ_ONLY)")
+            return f"{alias}.tickers_data"
+        if fmt in ('feather', 'pyarrow', 'arrow'):
+            # Arrow datasets are scanned lazily, batch by batch
+            alias = f"merge_src_{index}"
+            conn.register(alias, pa_ds.dataset(path, format='ipc'))
+            return alias
+        raise ValueError(f"Unsupported merge input format: {fmt}")
+
+    @staticmethod
+    def _align(column_lists: List[List[str]], column_order: Optional[List[str]]) -> List[str]:
+        """Union of columns, ordered like converter_helpers.align_columns_for_merge."""
+        ordered = []
+        for names in column_lists:
+            for name in names:
+                if name not in ordered:
+                    ordered.append(name)
+        if column_order:
+            preferred = [col for col in column_order if col in ordered]
+            return preferred + sorted(col for col in ordered if col not in column_order)
+        return ordered
+
+    def _write(self, conn: 'duckdb.DuckDBPyConnection', query: str, output_path: str, output_format: str) -> int:
+        """Write the query result and return the row count."""
+        if output_format in ('csv', 'txt', 'parquet', 'json', 'jsonl'):
+            options = {
+                'csv': "FORMAT CSV, HEADER true",
+                'txt': "FORMAT CSV, HEADER true, DELIMITER '\t'",
+                'parquet': "FORMAT PARQUET",
+                'json': "FORMAT JSON, ARRAY true",
+                'jsonl': "FORMAT JSON"
+            }[output_format]
+            result = conn.execute(f"COPY ({query}) TO {_literal(output_path)} ({options})").fetchone()
+            return int(result[0]) if result else 0
+
+        if output_format == 'duckdb':
+            conn.execute(f"ATTACH {_literal(output_path)} AS merge_out")
+            try:
+                conn.execute(f"CREATE TABLE merge_out.tickers_data AS {query}")
+                return conn.execute("SELECT COUNT(*) FROM merge_out.tickers_data").fetchone()[0]
+            finally:
+                conn.execute("DETACH merge_out")
+
+        if output_format in ('feather', 'pyarrow', 'arrow'):
+            result = conn.execute(query)
+            # to_arrow_reader replaces fetch_record_batch in newer DuckDB releases
+            fetch_reader = getattr(result, 'to_arrow_reader', None) or result.fetch_record_batch
+            reader = fetch_reader(BATCH_ROWS)
+            rows = 0
+            with pa.OSFile(output_path, 'wb') as sink, pa.ipc.new_file(sink, reader.schema) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+            return rows
+
+        raise ValueError(f"Unsupported merge output format: {output_format}")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+REDLINE Parallel CSV Loader
+Parses one large CSV/TXT file on several cores.
+
+The file is split at newline boundaries taken from the sidecar line index.
+Each worker process parses its byte range with an explicit Arrow schema
+(inferred once from the head of the file), converts Stooq ``<DATE>``/``<TIME>``
+columns to a ``timestamp`` column locally, and returns its record batches as
+an Arrow IPC stream (one contiguous buffer, so only the parsed bytes cross
+the process boundary). The parent reads the streams zero-copy, concatenates
+the batches once and converts to pandas a single time.
+"""
+
+import os
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pa_csv = None
+    pc = None
+    PYARROW_AVAILABLE = False
+
+from .line_index import get_line_index
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the head of the file to infer column types
+SCHEMA_SAMPLE_BYTES = 1024 * 1024
+# Files smaller than this are parsed in-process
+MIN_PARALLEL_BYTES = 16 * 1024 * 1024
+
+
+def _stooq_timestamp(table: 'pa.Table') -> 'pa.Table':
+    """Append a ``timestamp`` column built from Stooq ``<DATE>`` (and ``<TIME>``) columns."""
+    names = table.column_names
+    if '<DATE>' not in names or 'timestamp' in names:
+        return table
+    date_str = pc.utf8_slice_codeunits(pc.cast(table['<DATE>'], pa.string()), 0, 8)
+    if '<TIME>' in names:
+        time_str = pc.utf8_lpad(pc.cast(table['<TIME>'], pa.string()), width=6, padding='0')
+        parsed = pc.strptime(pc.binary_join_element_wise(date_str, time_str, ''),
+                             format='%Y%m%d%H%M%S', unit='ns', error_is_null=True)
+    else:
+        parsed = pc.strptime(date_str, format='%Y%m%d', unit='ns', error_is_null=True)
+    return table.append_column('timestamp', parsed)
+
+
+def _parse_range(file_path: str, start: int, end: int, sep: str, schema: 'pa.Schema',
+                 parse_timestamps: bool) -> 'pa.Buffer':
+    """
+    Parse the rows in bytes [start, end) of a file (runs in a worker process).
+
+    Args:
+        file_path: CSV/TXT file
+        start: First byte (start of a row)
+        end: End byte (start of a row or end of file)
+        sep: Field separator
+        schema: Column names and types to parse with
+        parse_timestamps: Derive ``timestamp`` from Stooq date/time columns
+
+    Returns:
+        Arrow IPC stream holding the record batches for the range
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    read_options = pa_csv.ReadOptions(column_names=schema.names, use_threads=False)
+    parse_options = pa_csv.ParseOptions(delimiter=sep)
+    try:
+        convert_options = pa_csv.ConvertOptions(column_types=schema)
+        table = pa_csv.read_csv(pa.BufferReader(data), read_options, parse_options, convert_options)
+    except pa.ArrowInvalid:
+        # A value the sampled schema cannot hold (e.g. a decimal in an integer column):
+        # infer this chunk's types and let the parent promote when concatenating
+        table = pa_csv.read_csv(pa.BufferReader(data), read_options, parse_options)
+
+    if parse_timestamps:
+        table = _stooq_timestamp(table)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+class ParallelCSVLoader:
+    """Loads large CSV/TXT files by parsing block-aligned byte ranges in a process pool."""
+
+    def __init__(self, workers: Optional[int] = None, min_parallel_bytes: int = MIN_PARALLEL_BYTES):
+        """
+        Initialize the loader.
+
+        Args:
+            workers: Worker processes (defaults to REDLINE_PARSE_WORKERS or the CPU count)
+            min_parallel_bytes: Files smaller than this are parsed in-process
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers or int(os.environ.get('REDLINE_PARSE_WORKERS', 0)) or os.cpu_count() or 1
+        self.min_parallel_bytes = min_parallel_bytes
+
+    def load(self, file_path: str, sep: str = ',', parse_timestamps: bool = True) -> pd.DataFrame:
+        """
+        Load a CSV/TXT file into a DataFrame.
+
+        Args:
+            file_path: Path to file
+            sep: Field separator
+            parse_timestamps: Add a ``timestamp`` column for Stooq ``<DATE>``/``<TIME>`` files
+
+        Returns:
+            Loaded DataFrame
+        """
+        return self.load_table(file_path, sep, parse_timestamps).to_pandas()
+
+    def load_table(self, file_path: str, sep: str = ',', parse_timestamps: bool = True) -> 'pa.Table':
+        """
+        Load a CSV/TXT file as an Arrow table.
+
+        Args:
+            file_path: Path to file
+            sep: Field separator
+            parse_timestamps: Add a ``timestamp`` column for Stooq ``<DATE>``/``<TIME>`` files
+
+        Returns:
+            Arrow table with all rows in file order
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the parallel CSV loader")
+
+        schema = self._infer_schema(file_path, sep)
+        index = get_line_index(file_path)
+        parts = self.workers if index.size >= self.min_parallel_bytes else 1
+        ranges = index.split(parts)
+        if not ranges:
+            return schema.empty_table()
+
+        if len(ranges) == 1:
+            start, end, _, _ = ranges[0]
+            streams = [_parse_range(file_path, start, end, sep, schema, parse_timestamps)]
+        else:
+            pool = get_parse_pool(self.workers)
+            futures = [pool.submit(_parse_range, file_path, start, end, sep, schema, parse_timestamps)
+                       for start, end, _, _ in ranges]
+            try:
+                streams = [future.result() for future in futures]
+            except BrokenProcessPool:
+                # A worker died; drop the pool so the next call starts a fresh one
+                _shutdown_parse_pool()
+                raise
+
+        tables = [pa.ipc.open_stream(stream).read_all() for stream in streams]
+        table = pa.concat_tables(tables, promote_options='permissive')
+        self.logger.info(f"Parsed {file_path} in {len(ranges)} ranges: {table.num_rows} rows")
+        return table
+
+    def _infer_schema(self, file_path: str, sep: str) -> 'pa.Schema':
+        """Infer column names and types from the head of the file."""
+        with open(file_path, 'rb') as f:
+            sample = f.read(SCHEMA_SAMPLE_BYTES)
+        if len(sample) == SCHEMA_SAMPLE_BYTES:
+            # Drop the trailing partial line
+            sample = sample[:sample.rfind(b'\n') + 1]
+        table = pa_csv.read_csv(pa.BufferReader(sample), parse_options=pa_csv.ParseOptions(delimiter=sep))
+        fields = []
+        for field in table.schema:
+            # Columns that are all-null in the sample stay open to any value later on
+            fields.append(pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field)
+        return pa.schema(fields)
+
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Get the shared parser process pool, creating it on first use.
+
+    Workers are spawned (not forked) so the pool is safe to start from a
+    threaded web server.
+    """
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool_workers != workers:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False)
+            _parse_pool = ProcessPoolExecutor(max_workers=workers,
+                                              mp_context=multiprocessing.get_context('spawn'))
+            _parse_pool_workers = workers
+        return _parse_pool
+
+
+def _shutdown_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+atexit.register(_shutdown_parse_pool)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+REDLINE Partitioned Store
+Parquet data lake partitioned by ticker and year.
+
+Rows are written under ``<root>/ticker=<TICKER>/year=<YYYY>/part-*.parquet``
+(Hive-style directories), sorted by timestamp so that the min/max statistics
+of each row group are tight. Readers turn ticker and date predicates into
+partition filters, so only the directories for the requested tickers and
+years are opened, and the timestamp range is checked against row-group
+statistics before any data page is read. Each write adds new part files;
+compact() merges the small files of a partition into one.
+"""
+
+import os
+import uuid
+import logging
+import threading
+from datetime import date, datetime
+from urllib.parse import quote, unquote
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+from .load_filters import normalize_filters, arrow_expression, apply_to_frame, filter_columns
+from .time_index import index_by_time
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ['ticker', 'year']
+DEFAULT_ROW_GROUP_ROWS = 128 * 1024
+DEFAULT_SMALL_FILE_MB = 32
+
+DateLike = Union[str, date, datetime, pd.Timestamp, None]
+
+
+def _partitioning() -> 'ds.Partitioning':
+    return ds.partitioning(pa.schema([('ticker', pa.string()), ('year', pa.int32())]), flavor='hive')
+
+
+def _to_timestamp(value: DateLike) -> Optional[pd.Timestamp]:
+    return None if value is None or value == '' else pd.Timestamp(value)
+
+
+class PartitionedStore:
+    """Reads and writes ticker/year partitioned Parquet."""
+
+    def __init__(self, root: Optional[str] = None, row_group_rows: Optional[int] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Lake directory (defaults to REDLINE_LAKE_DIR or data/lake)
+            row_group_rows: Rows per Parquet row group
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the partitioned Parquet store")
+        self.root = root or os.environ.get('REDLINE_LAKE_DIR') or os.path.join(os.getcwd(), 'data', 'lake')
+        self.row_group_rows = row_group_rows or DEFAULT_ROW_GROUP_ROWS
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def write(self, data: Union[pd.DataFrame, 'pa.Table']) -> Dict[str, Any]:
+        """
+        Add rows to the lake.
+
+        Args:
+            data: Rows with at least ticker and timestamp columns
+
+        Returns:
+            Rows, partitions and files written
+        """
+        frame = data.to_pandas() if isinstance(data, pa.Table) else data
+        missing = [col for col in ('ticker', 'timestamp') if col not in frame.columns]
+        if missing:
+            raise ValueError(f"Partitioned store needs ticker and timestamp columns (missing: {', '.join(missing)})")
+
+        frame = frame.drop(columns=['year'], errors='ignore')
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], errors='coerce')
+        invalid = frame['ticker'].isna() | frame['timestamp'].isna()
+        if invalid.any():
+            self.logger.warning(f"Skipping {int(invalid.sum())} row(s) without a ticker or timestamp")
+            frame = frame[~invalid]
+        if frame.empty:
+            return {'rows': 0, 'partitions': 0, 'files': 0}
+
+        frame = frame.assign(ticker=frame['ticker'].astype(str),
+                             year=frame['timestamp'].dt.year.astype('int32'))
+        frame = frame.sort_values(['ticker', 'timestamp'], kind='stable')
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        partitions = frame.groupby(PARTITION_COLUMNS, sort=False).ngroups
+
+        written = []
+        os.makedirs(self.root, exist_ok=True)
+        ds.write_dataset(
+            table, self.root, format='parquet', partitioning=_partitioning(),
+            basename_template=f"part-{uuid.uuid4().hex[:12]}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            max_partitions=partitions + 1,
+            max_rows_per_group=self.row_group_rows,
+            file_options=ds.ParquetFileFormat().make_write_options(write_statistics=True),
+            file_visitor=lambda f: written.append(f.path)
+        )
+        self.logger.info(f"Wrote {len(frame)} rows to {partitions} partition(s) under {self.root}")
+        return {'rows': len(frame), 'partitions': partitions, 'files': len(written)}
+
+    def dataset(self) -> Optional['ds.Dataset']:
+        """The lake as a pyarrow dataset, or None if it holds no data."""
+        if not os.path.isdir(self.root):
+            return None
+        dataset = ds.dataset(self.root, format='parquet', partitioning=_partitioning())
+        return dataset if dataset.files else None
+
+    @staticmethod
+    def build_filter(tickers: Optional[Sequence[str]] = None, start: DateLike = None,
+                     end: DateLike = None) -> Optional['ds.Expression']:
+        """
+        Dataset filter for a ticker list and an inclusive date range.
+
+        The year bounds prune partitions; the timestamp bounds are checked
+        against row-group statistics.
+        """
+        conditions = []
+        if tickers:
+            conditions.append(ds.field('ticker').isin([str(t) for t in tickers]))
+        start, end = _to_timestamp(start), _to_timestamp(end)
+        if start is not None:
+            conditions.append(ds.field('year') >= start.year)
+            conditions.append(ds.field('timestamp') >= pa.scalar(start.to_pydatetime(), pa.timestamp('us')))
+        if end is not None:
+            conditions.append(ds.field('year') <= end.year)
+            conditions.append(ds.field('timestamp') <= pa.scalar(end.to_pydatetime(), pa.timestamp('us')))
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def read(self, tickers: Optional[Sequence[str]] = None, start: DateLike = None, end: DateLike = None,
+             columns: Optional[List[str]] = None, filters: Optional[Sequence] = None) -> pd.DataFrame:
+        """
+        Read rows for some tickers and an inclusive date range.
+
+        Args:
+            tickers: Tickers to read (all if None)
+            start: First timestamp to include
+            end: Last timestamp to include
+            columns: Columns to return (all if None)
+            filters: Further row filters, see redline.core.load_filters
+
+        Returns:
+            Rows sorted by ticker and timestamp, ticker first
+        """
+        dataset = self.dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=columns or ['ticker', 'timestamp'])
+
+        expression = self.build_filter(tickers, start, end)
+        extra, residual = arrow_expression(normalize_filters(filters), dataset.schema)
+        if extra is not None:
+            expression = extra if expression is None else expression & extra
+
+        names = dataset.schema.names
+        requested = list(columns or names) + [col for col in filter_columns(residual) if columns]
+        wanted = [col for col in dict.fromkeys(requested) if col in names and col != 'year']
+        if columns and 'year' in columns:
+            wanted.append('year')
+        table = dataset.to_table(columns=wanted, filter=expression)
+        frame = apply_to_frame(table.to_pandas(), residual)
+        order = [col for col in ('ticker', 'timestamp') if col in frame.columns]
+        if order:
+            frame = frame.sort_values(order, kind='stable').reset_index(drop=True)
+        if columns:
+            frame = frame[[col for col in columns if col in frame.columns]]
+        if 'ticker' in frame.columns:
+            frame = frame[['ticker'] + [col for col in frame.columns if col != 'ticker']]
+        return index_by_time(frame, reorder=False)
+
+    def has_ticker(self, ticker: str) -> bool:
+        """Check whether the lake holds a partition for a ticker."""
+        return os.path.isdir(self._partition_dir(ticker))
+
+    def partitions(self) -> List[Dict[str, Any]]:
+        """List partitions with their file counts and sizes."""
+        result = []
+        if not os.path.isdir(self.root):
+            return result
+        for ticker_entry in sorted(os.scandir(self.root), key=lambda e: e.name):
+            if not (ticker_entry.is_dir() and ticker_entry.name.startswith('ticker=')):
+                continue
+            for year_entry in sorted(os.scandir(ticker_entry.path), key=lambda e: e.name):
+                if not (year_entry.is_dir() and year_entry.name.startswith('year=')):
+                    continue
+                files = self._part_files(year_entry.path)
+                result.append({
+                    'ticker': unquote(ticker_entry.name.split('=', 1)[1]),
+                    'year': int(year_entry.name.split('=', 1)[1]),
+                    'path': year_entry.path,
+                    'files': len(files),
+                    'bytes': sum(os.path.getsize(f) for f in files)
+                })
+        return result
+
+    def compact(self, small_file_mb: Optional[float] = None, deduplicate: bool = True,
+                progress_callback=None) -> Dict[str, Any]:
+        """
+        Merge the small files of each partition into one file.
+
+        Partitions with fewer than two small files are left alone. The merged
+        file is written next to the old ones and moved into place before they
+        are deleted, so readers never see a partition without its data.
+
+        Args:
+            small_file_mb: Files below this size are merged (defaults to REDLINE_LAKE_SMALL_FILE_MB)
+            deduplicate: Keep one row per timestamp (from the newest file)
+            progress_callback: Called with a progress dict after each partition
+
+        Returns:
+            Partitions compacted and files before/after
+        """
+        if small_file_mb is None:
+            small_file_mb = float(os.environ.get('REDLINE_LAKE_SMALL_FILE_MB', DEFAULT_SMALL_FILE_MB))
+        threshold = int(small_file_mb * 1024 * 1024)
+        stats = {'partitions': 0, 'compacted': 0, 'files_before': 0, 'files_after': 0, 'rows': 0}
+
+        with self._lock:
+            partitions = self.partitions()
+            for n, partition in enumerate(partitions, start=1):
+                files = self._part_files(partition['path'])
+                stats['partitions'] += 1
+                stats['files_before'] += len(files)
+                small = [f for f in files if os.path.getsize(f) < threshold]
+                if len(small) >= 2:
+                    stats['rows'] += self._merge_files(partition['path'], small, deduplicate)
+                    stats['compacted'] += 1
+                stats['files_after'] += len(self._part_files(partition['path']))
+                if progress_callback:
+                    progress_callback({'step': 'compacting', 'current': n, 'total': len(partitions),
+                                       'progress': int(n * 100 / len(partitions))})
+
+        self.logger.info(f"Compacted {stats['compacted']} of {stats['partitions']} partition(s): "
+                         f"{stats['files_before']} -> {stats['files_after']} files")
+        return stats
+
+    def _merge_files(self, directory: str, files: List[str], deduplicate: bool) -> int:
+        # Oldest first, so the newest copy of a timestamp wins de-duplication
+        files = sorted(files, key=os.path.getmtime)
+        table = pa.concat_tables([pq.read_table(f) for f in files], promote_options='default')
+        frame = table.to_pandas()
+        if deduplicate and 'timestamp' in frame.columns:
+            frame = frame.drop_duplicates(subset=['timestamp'], keep='last')
+        frame = frame.sort_values('timestamp', kind='stable') if 'timestamp' in frame.columns else frame
+
+        name = f"part-{uuid.uuid4().hex[:12]}-0.parquet"
+        # A leading dot keeps the unfinished file out of dataset discovery
+        tmp_path = os.path.join(directory, f".{name}.tmp")
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path,
+                       row_group_size=self.row_group_rows, write_statistics=True)
+        os.replace(tmp_path, os.path.join(directory, name))
+        for path in files:
+            os.remove(path)
+        return len(frame)
+
+    def _partition_dir(self, ticker: str) -> str:
+        # Partition values are URI-encoded, as pyarrow's Hive partitioning writes them
+        return os.path.join(self.root, f"ticker={quote(str(ticker), safe='')}")
+
+    @staticmethod
+    def _part_files(directory: str) -> List[str]:
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                      if name.endswith('.parquet') and not name.startswith(('.', '_')))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Summary of the lake contents."""
+        partitions = self.partitions()
+        return {
+            'root': self.root,
+            'tickers': len({p['ticker'] for p in partitions}),
+            'partitions': len(partitions),
+            'files': sum(p['files'] for p in partitions),
+            'bytes': sum(p['bytes'] for p in partitions)
+        }
+
+
+_partitioned_store: Optional[PartitionedStore] = None
+_partitioned_store_lock = threading.Lock()
+
+
+def get_partitioned_store() -> PartitionedStore:
+    """
+    Get the process-wide partitioned store.
+
+    Configured from the environment on first use:
+        REDLINE_LAKE_DIR             lake directory (default: data/lake)
+        REDLINE_LAKE_SMALL_FILE_MB   compaction threshold (default 32)
+    """
+    global _partitioned_store
+    with _partitioned_store_lock:
+        if _partitioned_store is None:
+            _partitioned_store = PartitionedStore()
+        return _partitioned_store
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+REDLINE Polars Engine
+Opt-in lazy execution backend for the filter, clean and analyze paths.
+
+With the pandas engine (the default) a route loads the whole file into a
+DataFrame and then filters, cleans or aggregates it. With the polars
+engine the file is opened as a LazyFrame (scan_csv, scan_parquet,
+scan_ipc, scan_ndjson), the route adds its filter/clean/aggregate steps to
+the plan, and the plan is collected once. Polars pushes projections and
+predicates into the scan. Inputs above REDLINE_POLARS_STREAMING_MB are
+collected with the streaming engine so they need not fit in memory.
+Results become pandas objects only at the response boundary.
+
+The engine is chosen per request (``engine`` in the JSON body, ``--engine``
+on the CLI) or process-wide with REDLINE_ENGINE=polars. Formats polars
+cannot scan fall back to the pandas path.
+"""
+
+import os
+import logging
+from typing import List, Optional, Sequence, Union
+
+# Optional dependencies
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    pl = None
+    POLARS_AVAILABLE = False
+
+from .row_range_reader import detect_text_separator
+from .format_loaders import is_json_lines
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('pandas', 'polars')
+DEFAULT_STREAMING_MB = 512
+
+# Formats with a polars lazy scan
+SCANNABLE_FORMATS = {'csv', 'txt', 'parquet', 'polars', 'feather', 'pyarrow', 'arrow', 'json'}
+
+
+def resolve_engine(requested: Optional[str] = None) -> str:
+    """
+    Pick the execution engine for a request.
+
+    Args:
+        requested: 'pandas' or 'polars' (defaults to REDLINE_ENGINE, then 'pandas')
+
+    Returns:
+        'polars' if requested and installed, otherwise 'pandas'
+    """
+    engine = (requested or os.environ.get('REDLINE_ENGINE') or 'pandas').lower()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}' (use one of {', '.join(ENGINES)})")
+    if engine == 'polars' and not POLARS_AVAILABLE:
+        logger.warning("Polars engine requested but polars is not installed; using pandas")
+        return 'pandas'
+    return engine
+
+
+def can_scan(file_path: str, format: str) -> bool:
+    """Check whether a file can be opened as a polars LazyFrame."""
+    if not POLARS_AVAILABLE or format not in SCANNABLE_FORMATS:
+        return False
+    return format != 'json' or is_json_lines(file_path)
+
+
+def scan(file_path: str, format: str) -> 'pl.LazyFrame':
+    """
+    Open a file as a LazyFrame without reading it.
+
+    Text columns are left as strings (dates are not parsed), so collected
+    results match what the pandas loaders return.
+
+    Args:
+        file_path: Path to file
+        format: Format type
+
+    Returns:
+        LazyFrame over the file
+    """
+    if not can_scan(file_path, format):
+        raise ValueError(f"Format '{format}' cannot be scanned lazily: {file_path}")
+    if format in ('csv', 'txt'):
+        return pl.scan_csv(file_path, separator=detect_text_separator(file_path, format),
+                           infer_schema_length=10000)
+    if format == 'json':
+        return pl.scan_ndjson(file_path)
+    frame = pl.scan_parquet(file_path) if format in ('parquet', 'polars') else pl.scan_ipc(file_path)
+    # pandas stores a non-default index as __index_level_N__ columns and
+    # restores it as the index, so the loaded frame does not show them
+    index_columns = [name for name in frame.collect_schema().names() if name.startswith('__index_level_')]
+    return frame.drop(index_columns) if index_columns else frame
+
+
+def scan_many(paths: Sequence[str], formats: Sequence[str]) -> 'pl.LazyFrame':
+    """Scan several files as one LazyFrame, taking the union of their columns."""
+    frames = [scan(path, format) for path, format in zip(paths, formats)]
+    return frames[0] if len(frames) == 1 else pl.concat(frames, how='diagonal_relaxed')
+
+
+def should_stream(paths: Union[str, Sequence[str]]) -> bool:
+    """Use the streaming engine when the inputs exceed REDLINE_POLARS_STREAMING_MB."""
+    paths = [paths] if isinstance(paths, str) else paths
+    threshold = float(os.environ.get('REDLINE_POLARS_STREAMING_MB', DEFAULT_STREAMING_MB)) * 1024 * 1024
+    total = sum(os.path.getsize(p) for p in paths if os.path.isfile(p))
+    return total >= threshold
+
+
+def collect(plans: Union['pl.LazyFrame', List['pl.LazyFrame']],
+            streaming: bool = False) -> Union['pl.DataFrame', List['pl.DataFrame']]:
+    """
+    Execute one plan, or several sharing a scan, in a single pass.
+
+    Several plans are collected together with ``collect_all`` so polars can
+    share their common sub-plans (the scan and filters) instead of running
+    each one separately.
+
+    Args:
+        plans: A LazyFrame or a list of them
+        streaming: Use the streaming engine (bounded memory)
+
+    Returns:
+        The collected DataFrame(s)
+    """
+    engine = 'streaming' if streaming else 'auto'
+    if isinstance(plans, list):
+        return pl.collect_all(plans, engine=engine)
+    return plans.collect(engine=engine)
+
+
+def clean_plan(frame: 'pl.LazyFrame', subset: Optional[List[str]] = None, remove_duplicates: bool = True,
+               handle_missing: Optional[str] = 'drop') -> 'pl.LazyFrame':
+    """
+    Lazy equivalent of DataCleaner.remove_duplicates plus handle_missing_values.
+
+    Args:
+        frame: Input plan
+        subset: Columns identifying duplicates (all columns if None)
+        remove_duplicates: Drop repeated rows, keeping the first
+        handle_missing: 'drop', 'forward_fill', 'backward_fill' or None/'none'
+
+    Returns:
+        Plan with the cleaning steps added
+    """
+    if remove_duplicates:
+        frame = frame.unique(subset=subset, keep='first', maintain_order=True)
+    if handle_missing == 'drop':
+        # DataCleaner drops on the core columns and skips files without them
+        names = frame.collect_schema().names()
+        if all(col in names for col in ('ticker', 'timestamp', 'close')):
+            frame = frame.drop_nulls(subset=['ticker', 'timestamp', 'close'])
+    elif handle_missing == 'forward_fill':
+        frame = frame.with_columns(pl.all().forward_fill())
+    elif handle_missing == 'backward_fill':
+        frame = frame.with_columns(pl.all().backward_fill())
+    elif handle_missing and handle_missing != 'none':
+        logger.warning(f"Unknown strategy '{handle_missing}', leaving missing values")
+    return frame
+
+
+def pandas_dtypes(schema) -> dict:
+    """The pandas dtype names the columns of a polars schema convert to."""
+    empty = pl.DataFrame(schema=schema).to_pandas()
+    return empty.dtypes.astype(str).to_dict()
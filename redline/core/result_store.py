@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+REDLINE Result Store
+Materialised query results that clients page through by cursor.
+
+A filter used to send every matching row back in one JSON response, and
+an export re-ran the same filter. Results are now written once to an
+Arrow IPC file under a random result id. Pages are sliced from the
+memory-mapped file, so fetching rows 5,000,000-5,000,100 costs the same
+as fetching the first page. Exports stream the file's record batches
+into the target format. Results expire REDLINE_RESULT_TTL_SECONDS after
+their last use. The files live under REDLINE_RESULT_DIR, so every web
+worker on the host sees the same results.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    pl = None
+    POLARS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 30 * 60
+BATCH_ROWS = 64 * 1024
+
+_RESULT_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ResultStore:
+    """Arrow IPC files holding materialised results, addressed by result id."""
+
+    def __init__(self, root: Optional[str] = None, ttl_seconds: Optional[int] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory for result files (defaults to REDLINE_RESULT_DIR or <tmp>/redline_results)
+            ttl_seconds: Idle time before a result expires (defaults to REDLINE_RESULT_TTL_SECONDS or 1800)
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for materialised results")
+        self.root = root or os.environ.get('REDLINE_RESULT_DIR') or os.path.join(tempfile.gettempdir(),
+                                                                                  'redline_results')
+        if ttl_seconds is None:
+            ttl_seconds = int(os.environ.get('REDLINE_RESULT_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+        self.ttl_seconds = ttl_seconds
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def create(self, data: Union[pd.DataFrame, 'pa.Table', 'pl.LazyFrame'],
+               metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Materialise a result.
+
+        Args:
+            data: Rows to store. A polars LazyFrame is streamed to disk without being collected
+            metadata: Extra fields kept with the result (e.g. source file and filters)
+
+        Returns:
+            The result's metadata, including result_id, rows and columns
+        """
+        self.prune()
+        result_id = uuid.uuid4().hex
+        path = self.path(result_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            if POLARS_AVAILABLE and isinstance(data, pl.LazyFrame):
+                data.sink_ipc(tmp_path)
+            else:
+                table = data if isinstance(data, pa.Table) else _frame_to_table(data)
+                with pa.OSFile(tmp_path, 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table, max_chunksize=BATCH_ROWS)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with pa.memory_map(path, 'r') as source:
+            reader = pa.ipc.open_file(source)
+            rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+            columns = list(reader.schema.names)
+
+        info = {
+            **(metadata or {}),
+            'result_id': result_id,
+            'rows': rows,
+            'columns': columns,
+            'bytes': os.path.getsize(path),
+            'created_at': time.time(),
+            'ttl_seconds': self.ttl_seconds
+        }
+        with open(self._meta_path(result_id), 'w') as f:
+            json.dump(info, f, default=str)
+        self.logger.info(f"Materialised result {result_id}: {rows} rows, {info['bytes']} bytes")
+        return info
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a result's metadata and extend its lifetime.
+
+        Returns:
+            Metadata dict, or None if the result is unknown or expired
+        """
+        if not _RESULT_ID.match(str(result_id)):
+            return None
+        path, meta_path = self.path(result_id), self._meta_path(result_id)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                self.delete(result_id)
+                return None
+            with open(meta_path) as f:
+                info = json.load(f)
+            now = time.time()
+            os.utime(path, (now, now))
+        except (OSError, ValueError):
+            return None
+        return info
+
+    def page(self, result_id: str, offset: int = 0, limit: int = 100) -> Tuple[pd.DataFrame, int]:
+        """
+        Read a slice of a result.
+
+        Args:
+            result_id: Result to read
+            offset: First row (0-based)
+            limit: Maximum rows to return
+
+        Returns:
+            (rows as a DataFrame, total rows in the result)
+        """
+        info = self.get(result_id)
+        if info is None:
+            raise KeyError(f"Result not found or expired: {result_id}")
+        offset = max(0, int(offset))
+        with pa.memory_map(self.path(result_id), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+            frame = table.slice(offset, max(0, int(limit))).to_pandas()
+        return frame, info['rows']
+
+    def page_records(self, result_id: str, offset: int = 0, limit: int = 100) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Read a slice of a result as JSON-ready records.
+
+        Missing values are None whatever the column type, so the output does
+        not depend on how the pandas version represents them.
+
+        Returns:
+            (rows as a list of dicts, total rows in the result)
+        """
+        frame, total = self.page(result_id, offset, limit)
+        frame = frame.astype(object).where(frame.notna(), None)
+        return frame.to_dict('records'), total
+
+    def path(self, result_id: str) -> str:
+        """Path of a result's Arrow IPC file."""
+        return os.path.join(self.root, f"{result_id}.arrow")
+
+    def _meta_path(self, result_id: str) -> str:
+        return os.path.join(self.root, f"{result_id}.json")
+
+    def delete(self, result_id: str) -> bool:
+        """Delete a result; returns whether it existed."""
+        if not _RESULT_ID.match(str(result_id)):
+            return False
+        existed = False
+        for path in (self.path(result_id), self._meta_path(result_id)):
+            try:
+                os.remove(path)
+                existed = True
+            except OSError:
+                pass
+        return existed
+
+    def prune(self) -> int:
+        """Delete expired results; returns how many were removed."""
+        removed = 0
+        now = time.time()
+        with self._lock:
+            try:
+                entries = list(os.scandir(self.root))
+            except OSError:
+                return 0
+            for entry in entries:
+                if not entry.name.endswith('.arrow'):
+                    continue
+                try:
+                    expired = now - entry.stat().st_mtime > self.ttl_seconds
+                except OSError:
+                    continue
+                if expired and self.delete(entry.name[:-len('.arrow')]):
+                    removed += 1
+        if removed:
+            self.logger.info(f"Pruned {removed} expired result(s)")
+        return removed
+
+
+def _frame_to_table(frame: pd.DataFrame) -> 'pa.Table':
+    """Convert a DataFrame to Arrow, storing mixed-type object columns as text."""
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        frame = frame.copy()
+        for col in frame.columns:
+            if frame[col].dtype == object:
+                frame[col] = frame[col].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+        return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+_result_store: Optional[ResultStore] = None
+_result_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """
+    Get the process-wide result store.
+
+    Configured from the environment on first use:
+        REDLINE_RESULT_DIR           directory for result files (default: <tmp>/redline_results)
+        REDLINE_RESULT_TTL_SECONDS   idle lifetime of a result (default 1800)
+    """
+    global _result_store
+    with _result_store_lock:
+        if _result_store is None:
+            _result_store = ResultStore()
+        return _result_store
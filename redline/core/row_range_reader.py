@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+REDLINE Row Range Reader
+Reads a single page of rows from a data file without materialising the rest.
+
+Each format uses the cheapest native mechanism available:
+    parquet         row-group pruning from the footer metadata
+    feather/arrow   record-batch slicing over a memory-mapped IPC file
+    duckdb          LIMIT/OFFSET pushdown
+    csv/txt         byte-offset seeking via the sidecar line index
+Other formats fall back to a full (frame-cached) load followed by a slice.
+
+Date-range reads of CSV/TXT files skip every index block whose min/max
+timestamp lies outside the requested range.
+"""
+
+import logging
+from io import BytesIO
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+from .line_index import get_line_index, naive_timestamp, parse_timestamps, ticker_column
+from .format_loaders import FormatLoaders
+
+logger = logging.getLogger(__name__)
+
+
+def detect_text_separator(file_path: str, format: str) -> str:
+    """Separator FormatLoaders uses for a CSV/TXT file (Stooq TXT is comma-separated)."""
+    if format != 'txt':
+        return ','
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        first_line = f.readline()
+    return ',' if ('<TICKER>' in first_line or '<DATE>' in first_line) else '\t'
+
+
+class RowRangeReader:
+    """Reads row ranges and row counts from files using format metadata."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.loaders = FormatLoaders()
+
+    def count_rows(self, file_path: str, format: str) -> int:
+        """
+        Get the number of data rows in a file, from metadata where possible.
+
+        Args:
+            file_path: Path to file
+            format: Format type
+
+        Returns:
+            Number of rows
+        """
+        if format in ('csv', 'txt'):
+            return get_line_index(file_path).total_rows
+        if format in ('parquet', 'polars') and PYARROW_AVAILABLE:
+            return pq.ParquetFile(file_path).metadata.num_rows
+        if format in ('feather', 'pyarrow') and PYARROW_AVAILABLE:
+            with pa.memory_map(file_path, 'r') as source:
+                reader = pa.ipc.open_file(source)
+                return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+        if format == 'duckdb' and DUCKDB_AVAILABLE:
+            conn = duckdb.connect(file_path, read_only=True)
+            try:
+                return conn.execute("SELECT COUNT(*) FROM tickers_data").fetchone()[0]
+            finally:
+                conn.close()
+        return len(self.loaders.load_file_by_type(file_path, format))
+
+    def read_range(self, file_path: str, format: str, offset: int, limit: int) -> Tuple[pd.DataFrame, int]:
+        """
+        Read rows [offset, offset + limit) from a file.
+
+        Args:
+            file_path: Path to file
+            format: Format type
+            offset: Zero-based first row
+            limit: Maximum number of rows
+
+        Returns:
+            Tuple of (page DataFrame, total row count)
+        """
+        offset = max(0, int(offset))
+        limit = max(0, int(limit))
+        try:
+            if format in ('csv', 'txt'):
+                return self._read_text_range(file_path, format, offset, limit)
+            if format in ('parquet', 'polars') and PYARROW_AVAILABLE:
+                return self._read_parquet_range(file_path, offset, limit)
+            if format in ('feather', 'pyarrow') and PYARROW_AVAILABLE:
+                return self._read_ipc_range(file_path, offset, limit)
+            if format == 'duckdb' and DUCKDB_AVAILABLE:
+                return self._read_duckdb_range(file_path, offset, limit)
+        except Exception as e:
+            # e.g. Feather v1 files, or CSV files the line index cannot describe
+            self.logger.warning(f"Row-range read failed for {file_path}, falling back to full load: {str(e)}")
+
+        data = self.loaders.load_file_by_type(file_path, format)
+        return data.iloc[offset:offset + limit], len(data)
+
+    def _read_text_range(self, file_path: str, format: str, offset: int, limit: int) -> Tuple[pd.DataFrame, int]:
+        index = get_line_index(file_path)
+        sep = detect_text_separator(file_path, format)
+        columns = list(pd.read_csv(file_path, sep=sep, nrows=0).columns)
+        if offset >= index.total_rows or limit == 0:
+            return pd.DataFrame(columns=columns), index.total_rows
+
+        with open(file_path, 'rb') as f:
+            index.seek_row(f, offset)
+            page = pd.read_csv(f, sep=sep, header=None, names=columns, nrows=limit)
+        return page, index.total_rows
+
+    def _read_parquet_range(self, file_path: str, offset: int, limit: int) -> Tuple[pd.DataFrame, int]:
+        parquet_file = pq.ParquetFile(file_path)
+        metadata = parquet_file.metadata
+        total = metadata.num_rows
+
+        # Only decode the row groups that overlap the requested range
+        groups: List[int] = []
+        first_group_start = None
+        start = 0
+        for i in range(metadata.num_row_groups):
+            rows = metadata.row_group(i).num_rows
+            if start + rows > offset and start < offset + limit:
+                if first_group_start is None:
+                    first_group_start = start
+                groups.append(i)
+            start += rows
+
+        if not groups:
+            return parquet_file.schema_arrow.empty_table().to_pandas(), total
+        table = parquet_file.read_row_groups(groups)
+        table = table.slice(offset - first_group_start, limit)
+        return table.to_pandas(), total
+
+    def _read_ipc_range(self, file_path: str, offset: int, limit: int) -> Tuple[pd.DataFrame, int]:
+        with pa.memory_map(file_path, 'r') as source:
+            reader = pa.ipc.open_file(source)
+            # Batches are zero-copy views over the memory map; only the page is materialised
+            batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+            total = sum(batch.num_rows for batch in batches)
+            table = pa.Table.from_batches(batches, schema=reader.schema).slice(offset, limit)
+            return table.to_pandas(), total
+
+    def _read_duckdb_range(self, file_path: str, offset: int, limit: int) -> Tuple[pd.DataFrame, int]:
+        conn = duckdb.connect(file_path, read_only=True)
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM tickers_data").fetchone()[0]
+            # Without an ORDER BY, DuckDB may return rows in any order, so pages could overlap or skip
+            # rows; rowid is the order the rows were written in
+            page = conn.execute("SELECT * FROM tickers_data ORDER BY rowid LIMIT ? OFFSET ?",
+                                [limit, offset]).fetchdf()
+            return page, total
+        finally:
+            conn.close()
+
+    def read_date_range(self, file_path: str, format: str, start=None, end=None,
+                        tickers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Read the rows of a CSV/TXT file between two timestamps (inclusive).
+
+        Only index blocks whose timestamp/ticker statistics overlap the request
+        are parsed; the surviving rows are then filtered exactly.
+
+        Args:
+            file_path: Path to file
+            format: 'csv' or 'txt'
+            start: Inclusive lower timestamp bound (None for open-ended);
+                timezone-aware bounds are compared in UTC
+            end: Inclusive upper timestamp bound (None for open-ended)
+            tickers: Optional tickers to keep
+
+        Returns:
+            Matching rows
+        """
+        start, end = naive_timestamp(start), naive_timestamp(end)
+        data = self.read_candidate_rows(file_path, format, start, end, tickers)
+
+        mask = pd.Series(True, index=data.index)
+        timestamps = parse_timestamps(data)
+        if timestamps is not None:
+            if start is not None:
+                mask &= timestamps >= start
+            if end is not None:
+                mask &= timestamps <= end
+        tick_col = ticker_column(list(data.columns))
+        if tickers and tick_col:
+            mask &= data[tick_col].astype(str).isin([str(t) for t in tickers])
+        return data[mask].reset_index(drop=True)
+
+    def read_candidate_rows(self, file_path: str, format: str, start=None, end=None,
+                            tickers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Read the rows of the CSV/TXT index blocks that may match a date range.
+
+        Unlike read_date_range the rows are not filtered, so callers can apply
+        their own exact conditions; every matching row is included.
+
+        Args:
+            file_path: Path to file
+            format: 'csv' or 'txt'
+            start: Inclusive lower timestamp bound (None for open-ended)
+            end: Inclusive upper timestamp bound (None for open-ended)
+            tickers: Optional tickers to keep
+
+        Returns:
+            Rows of the overlapping blocks, in file order
+        """
+        sep = detect_text_separator(file_path, format)
+        index = get_line_index(file_path, with_stats=True, sep=sep)
+        columns = list(pd.read_csv(file_path, sep=sep, nrows=0).columns)
+        ranges = index.byte_ranges(index.blocks_for(start, end, tickers))
+        self.logger.debug(f"Date-range read of {file_path}: {len(ranges)} byte ranges "
+                          f"covering {sum(e - s for s, e in ranges)} of {index.size} bytes")
+
+        frames = []
+        with open(file_path, 'rb') as f:
+            for range_start, range_end in ranges:
+                f.seek(range_start)
+                chunk = BytesIO(f.read(range_end - range_start))
+                frames.append(pd.read_csv(chunk, sep=sep, header=None, names=columns))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
@@ -30,6 +30,7 @@ SCHEMA = ['ticker', 'timestamp', 'open', 'high', 'low', 'close', 'vol', 'openint
 _EXT_TO_FORMAT_BASE = {
     '.csv': 'csv',
     '.json': 'json',
+    '.jsonl': 'json',
     '.duckdb': 'duckdb',
     '.parquet': 'parquet',
     '.feather': 'feather',
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+REDLINE Streaming Converter
+Converts files between formats without loading them into memory.
+
+Record batches are piped from a format reader straight into a format writer,
+so memory use is bounded by the batch size rather than the file size:
+
+    csv/txt             pyarrow streaming CSV reader
+    parquet             row-group batches (ParquetFile.iter_batches)
+    feather/arrow       record batches of a memory-mapped IPC file
+    json                JSON Lines files in chunks (JSON documents are not streamable)
+    duckdb              DuckDB Arrow record-batch reader
+
+Writers produce Parquet (sized row groups), Feather/Arrow IPC, CSV/TXT, JSON
+(a record array, or JSON Lines for 'jsonl') and DuckDB. DuckDB targets are
+filled by DuckDB itself with read_parquet, or from an Arrow stream for other
+inputs. Text inputs and outputs follow pandas conventions (missing strings
+are null, dates stay text, CSV formatting is to_csv's), so a streamed
+conversion writes what the loaded path would. Every conversion reports rows,
+throughput and peak memory.
+"""
+
+import os
+import sys
+import time
+import logging
+from dataclasses import dataclass, asdict, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pa_csv = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    # Windows
+    resource = None
+    RESOURCE_AVAILABLE = False
+
+from .format_loaders import is_json_lines
+from .row_range_reader import detect_text_separator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_ROWS = 64 * 1024
+DEFAULT_ROW_GROUP_ROWS = 1024 * 1024
+CSV_BLOCK_BYTES = 16 * 1024 * 1024
+
+STREAMABLE_INPUTS = {'csv', 'txt', 'parquet', 'polars', 'feather', 'pyarrow', 'arrow', 'json', 'duckdb'}
+STREAMABLE_OUTPUTS = {'csv', 'txt', 'parquet', 'polars', 'feather', 'pyarrow', 'arrow', 'json', 'jsonl', 'duckdb'}
+
+
+@dataclass
+class ConversionStats:
+    """Outcome of one file conversion (streamed or loaded whole)."""
+    input_path: str
+    output_path: str
+    output_format: str
+    streamed: bool = True
+    rows: int = 0
+    columns: List[str] = field(default_factory=list)
+    batches: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    seconds: float = 0.0
+    # Data held in memory at peak: in-flight Arrow buffers when streamed, the whole frame otherwise
+    peak_data_bytes: int = 0
+    peak_rss_bytes: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.input_bytes / (1024 * 1024) / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Stats as a JSON-friendly dict (including derived throughput)."""
+        result = asdict(self)
+        result['seconds'] = round(self.seconds, 3)
+        result['rows_per_second'] = round(self.rows_per_second, 1)
+        result['mb_per_second'] = round(self.mb_per_second, 2)
+        result['peak_data_mb'] = round(self.peak_data_bytes / (1024 * 1024), 1)
+        result['peak_rss_mb'] = round(self.peak_rss_bytes / (1024 * 1024), 1)
+        return result
+
+
+def peak_rss_bytes() -> int:
+    """Process peak resident set size (ru_maxrss is KiB on Linux, bytes on macOS; 0 if unavailable)."""
+    if not RESOURCE_AVAILABLE:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _open_schema(schema: 'pa.Schema', widen: bool, text_dates: bool = False) -> 'pa.Schema':
+    """
+    Loosen types inferred from a first block: all-null columns become strings,
+    integers float64 when widening, and dates and times strings when
+    ``text_dates`` is set (pandas.read_csv leaves them as text).
+    """
+    fields = []
+    for column in schema:
+        if pa.types.is_null(column.type) or (text_dates and pa.types.is_temporal(column.type)):
+            column = column.with_type(pa.string())
+        elif widen and pa.types.is_integer(column.type):
+            column = column.with_type(pa.float64())
+        fields.append(column)
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+class StreamingConverter:
+    """Converts files by streaming Arrow record batches from a reader to a writer."""
+
+    def __init__(self, batch_rows: int = DEFAULT_BATCH_ROWS, row_group_rows: int = DEFAULT_ROW_GROUP_ROWS):
+        """
+        Initialize the converter.
+
+        Args:
+            batch_rows: Rows per record batch read from the input
+            row_group_rows: Rows per Parquet row group written
+        """
+        self.logger = logging.getLogger(__name__)
+        self.batch_rows = batch_rows
+        self.row_group_rows = row_group_rows
+
+    def can_stream(self, input_path: str, input_format: str, output_format: str) -> bool:
+        """
+        Check whether a conversion can be streamed.
+
+        Args:
+            input_path: Input file
+            input_format: Input format type
+            output_format: Output format type
+
+        Returns:
+            True if both sides have a streaming implementation
+        """
+        if not PYARROW_AVAILABLE or input_format not in STREAMABLE_INPUTS or output_format not in STREAMABLE_OUTPUTS:
+            return False
+        if 'duckdb' in (input_format, output_format) and not DUCKDB_AVAILABLE:
+            return False
+        if input_format == 'json':
+            return is_json_lines(input_path)
+        if input_format in ('feather', 'pyarrow', 'arrow'):
+            # Feather v1 files have no IPC footer and cannot be read batch by batch
+            try:
+                with pa.memory_map(input_path, 'r') as source:
+                    pa.ipc.open_file(source)
+            except pa.ArrowInvalid:
+                return False
+        return True
+
+    def convert(self, input_path: str, input_format: str, output_path: str, output_format: str,
+                progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> ConversionStats:
+        """
+        Stream-convert a file.
+
+        Args:
+            input_path: Input file
+            input_format: Input format type
+            output_path: Output file (replaced if it exists)
+            output_format: Output format type
+            progress_callback: Called after each batch with {'rows', 'batches'}
+
+        Returns:
+            ConversionStats for the conversion
+        """
+        stats = ConversionStats(input_path=input_path, output_path=output_path, output_format=output_format,
+                                input_bytes=os.path.getsize(input_path))
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        baseline = pa.total_allocated_bytes()
+        start = time.perf_counter()
+
+        def track(batch: 'pa.RecordBatch') -> 'pa.RecordBatch':
+            stats.rows += batch.num_rows
+            stats.batches += 1
+            stats.peak_data_bytes = max(stats.peak_data_bytes, pa.total_allocated_bytes() - baseline)
+            if progress_callback:
+                progress_callback({'rows': stats.rows, 'batches': stats.batches})
+            return batch
+
+        # Write to a temporary path so a failed conversion never leaves a truncated output behind
+        tmp_path = f"{output_path}.{os.getpid()}.part"
+        try:
+            if output_format == 'duckdb' and input_format in ('parquet', 'polars'):
+                stats.rows, stats.columns = self._duckdb_native(input_path, input_format, tmp_path)
+                stats.batches = 1
+            else:
+                try:
+                    schema, batches = self._open_reader(input_path, input_format)
+                    stats.columns = list(schema.names)
+                    self._write(schema, (track(b) for b in batches), tmp_path, output_format)
+                except pa.ArrowInvalid:
+                    if input_format not in ('csv', 'txt', 'json'):
+                        raise
+                    # A later block did not fit the types inferred from the first one
+                    self.logger.info(f"Restarting conversion of {input_path} with widened column types")
+                    stats.rows, stats.batches = 0, 0
+                    stats.peak_data_bytes = 0
+                    schema, batches = self._open_reader(input_path, input_format, widen=True)
+                    self._write(schema, (track(b) for b in batches), tmp_path, output_format)
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        stats.seconds = time.perf_counter() - start
+        stats.output_bytes = os.path.getsize(output_path)
+        stats.peak_rss_bytes = peak_rss_bytes()
+        self.logger.info(
+            f"Streamed {input_path} -> {output_path}: {stats.rows} rows in {stats.seconds:.2f}s "
+            f"({stats.mb_per_second:.1f} MB/s, peak data {stats.peak_data_bytes / (1024 * 1024):.1f} MB)"
+        )
+        return stats
+
+    # Readers
+
+    def _open_reader(self, input_path: str, input_format: str, widen: bool = False):
+        """
+        Return (schema, iterator of record batches) for an input file.
+
+        Text inputs infer types from their first block; ``widen`` reads
+        integer columns as float64 so a later decimal or blank still fits.
+        """
+        if input_format in ('csv', 'txt'):
+            return self._csv_reader(input_path, input_format, widen)
+        if input_format in ('parquet', 'polars'):
+            parquet_file = pq.ParquetFile(input_path)
+            return parquet_file.schema_arrow, parquet_file.iter_batches(batch_size=self.batch_rows)
+        if input_format in ('feather', 'pyarrow', 'arrow'):
+            return self._ipc_reader(input_path)
+        if input_format == 'json':
+            return self._json_lines_reader(input_path, widen)
+        if input_format == 'duckdb':
+            return self._duckdb_reader(input_path)
+        raise ValueError(f"Unsupported streaming input format: {input_format}")
+
+    def _csv_reader(self, input_path: str, input_format: str, widen: bool = False):
+        # Read values the way pandas.read_csv does on the loaded path: blanks and
+        # NA tokens are missing in every column, and dates stay text
+        sep = detect_text_separator(input_path, input_format)
+        read_options = pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES)
+        parse_options = pa_csv.ParseOptions(delimiter=sep)
+        convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+        probe = pa_csv.open_csv(input_path, read_options=read_options, parse_options=parse_options,
+                                convert_options=convert_options)
+        schema = _open_schema(probe.schema, widen, text_dates=True)
+        probe.close()
+        convert_options.column_types = {column.name: column.type for column in schema}
+        reader = pa_csv.open_csv(input_path, read_options=read_options, parse_options=parse_options,
+                                 convert_options=convert_options)
+        return reader.schema, iter(reader)
+
+    def _ipc_reader(self, input_path: str):
+        source = pa.memory_map(input_path, 'r')
+        reader = pa.ipc.open_file(source)
+
+        def batches() -> Iterator['pa.RecordBatch']:
+            try:
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i)
+            finally:
+                source.close()
+        return reader.schema, batches()
+
+    def _json_lines_reader(self, input_path: str, widen: bool = False):
+        chunks = pd.read_json(input_path, lines=True, chunksize=self.batch_rows)
+        first = next(chunks, None)
+        if first is None:
+            return pa.schema([]), iter(())
+        schema = _open_schema(pa.Schema.from_pandas(first, preserve_index=False), widen)
+
+        def batches() -> Iterator['pa.RecordBatch']:
+            yield pa.RecordBatch.from_pandas(first, schema=schema, preserve_index=False)
+            for chunk in chunks:
+                yield pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+        return schema, batches()
+
+    def _duckdb_reader(self, input_path: str):
+        conn = duckdb.connect(input_path, read_only=True)
+        reader = conn.execute("SELECT * FROM tickers_data").fetch_record_batch(self.batch_rows)
+
+        def batches() -> Iterator['pa.RecordBatch']:
+            try:
+                yield from reader
+            finally:
+                conn.close()
+        return reader.schema, batches()
+
+    # Writers
+
+    def _write(self, schema: 'pa.Schema', batches: Iterator['pa.RecordBatch'], output_path: str, output_format: str):
+        if output_format in ('parquet', 'polars'):
+            self._write_parquet(schema, batches, output_path)
+        elif output_format in ('feather', 'pyarrow', 'arrow'):
+            with pa.OSFile(output_path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+        elif output_format in ('csv', 'txt'):
+            self._write_text(schema, batches, output_path, sep='\t' if output_format == 'txt' else ',')
+        elif output_format in ('json', 'jsonl'):
+            self._write_json(batches, output_path, lines=output_format == 'jsonl')
+        elif output_format == 'duckdb':
+            self._write_duckdb(schema, batches, output_path)
+        else:
+            raise ValueError(f"Unsupported streaming output format: {output_format}")
+
+    def _write_parquet(self, schema: 'pa.Schema', batches: Iterator['pa.RecordBatch'], output_path: str):
+        # Buffer batches up to one row group so small input batches still produce large row groups
+        pending, pending_rows = [], 0
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for batch in batches:
+                pending.append(batch)
+                pending_rows += batch.num_rows
+                if pending_rows >= self.row_group_rows:
+                    writer.write_table(pa.Table.from_batches(pending, schema=schema), row_group_size=self.row_group_rows)
+                    pending, pending_rows = [], 0
+            if pending:
+                writer.write_table(pa.Table.from_batches(pending, schema=schema), row_group_size=self.row_group_rows)
+
+    def _write_text(self, schema: 'pa.Schema', batches: Iterator['pa.RecordBatch'], output_path: str, sep: str):
+        # pandas formats each batch so quoting and number formatting match FormatSavers' to_csv
+        with open(output_path, 'w', newline='') as f:
+            f.write(pd.DataFrame(columns=schema.names).to_csv(index=False, sep=sep))
+            for batch in batches:
+                if batch.num_rows:
+                    f.write(batch.to_pandas().to_csv(index=False, header=False, sep=sep))
+
+    def _write_json(self, batches: Iterator['pa.RecordBatch'], output_path: str, lines: bool):
+        # Each batch is serialised as JSON Lines; for 'json' the lines become one record array
+        first = True
+        with open(output_path, 'w') as f:
+            if not lines:
+                f.write('[')
+            for batch in batches:
+                if batch.num_rows == 0:
+                    continue
+                text = batch.to_pandas().to_json(orient='records', lines=True, date_format='iso').rstrip('\n')
+                if lines:
+                    f.write(text + '\n')
+                else:
+                    f.write(('' if first else ',\n') + text.replace('\n', ',\n'))
+                first = False
+            if not lines:
+                f.write(']\n')
+
+    def _write_duckdb(self, schema: 'pa.Schema', batches: Iterator['pa.RecordBatch'], output_path: str):
+        reader = pa.RecordBatchReader.from_batches(schema, batches)
+        conn = duckdb.connect(output_path)
+        try:
+            conn.register('source_stream', reader)
+            conn.execute("CREATE TABLE tickers_data AS SELECT * FROM source_stream")
+        finally:
+            conn.close()
+
+    def _duckdb_native(self, input_path: str, input_format: str, output_path: str) -> Tuple[int, List[str]]:
+        """
+        Let DuckDB read Parquet directly (it streams and parallelises internally).
+
+        Text inputs go through the Arrow CSV reader instead: read_csv_auto
+        sniffs its own types (dates included), which would not match the
+        columns a loaded conversion writes.
+        """
+        conn = duckdb.connect(output_path)
+        try:
+            conn.execute("CREATE TABLE tickers_data AS SELECT * FROM read_parquet(?)", [input_path])
+            rows = conn.execute("SELECT COUNT(*) FROM tickers_data").fetchone()[0]
+            columns = [row[0] for row in conn.execute("DESCRIBE tickers_data").fetchall()]
+            return rows, columns
+        finally:
+            conn.close()
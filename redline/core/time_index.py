@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+REDLINE Time Index
+Sorted timestamp order for loaded frames, and binary-search slicing on it.
+
+A frame is indexed once, when it is loaded: the timestamp column becomes
+datetime64 and the rows are sorted by (ticker, timestamp), or by timestamp
+alone when there is no usable ticker column. The sort keys are recorded in
+``df.attrs``, which pandas carries through slicing, filtering and copies,
+so later date-range and per-ticker selections can binary-search the
+sorted columns instead of parsing the timestamps and scanning every row.
+A single contiguous range comes back as an ``iloc`` slice, i.e. a view.
+
+Missing timestamps (NaT) sort first, matching their int64 value, and are
+never inside a date range. pandas also copies ``attrs`` through concat and
+sort_values, so the flag alone proves nothing: ``sorted_by`` checks that the
+key columns really are in order before any binary search, and remembers the
+answer for that frame object until it is collected or its timestamps change.
+"""
+
+import logging
+import threading
+import weakref
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TIME_COLUMN = 'timestamp'
+TICKER_COLUMN = 'ticker'
+SORTED_BY_ATTR = 'redline_sorted_by'
+
+_MIN_TIME = np.iinfo(np.int64).min + 1  # above NaT
+_MAX_TIME = np.iinfo(np.int64).max
+
+# id(frame) -> (weak reference, fingerprint, keys) of frames whose order was checked
+_verified: Dict[int, Tuple[weakref.ref, Tuple[int, int], Tuple[str, ...]]] = {}
+_verified_lock = threading.Lock()
+
+
+def sorted_by(df: pd.DataFrame) -> Optional[Tuple[str, ...]]:
+    """
+    The columns a frame is known to be sorted by.
+
+    Returns:
+        ('ticker', 'timestamp'), ('timestamp',) or None if the order is not guaranteed
+    """
+    keys = df.attrs.get(SORTED_BY_ATTR)
+    if not keys or not all(col in df.columns for col in keys):
+        return None
+    if not pd.api.types.is_datetime64_any_dtype(df[TIME_COLUMN]):
+        return None
+    keys = tuple(keys)
+    fingerprint = _fingerprint(df)
+    with _verified_lock:
+        entry = _verified.get(id(df))
+    if entry is not None and entry[0]() is df and entry[1:] == (fingerprint, keys):
+        return keys
+    # attrs survive concat and sort_values, so the order is checked, not trusted
+    if not _is_sorted(df, keys):
+        return None
+    _remember_sorted(df, keys, fingerprint)
+    return keys
+
+
+def _fingerprint(df: pd.DataFrame) -> Tuple[int, int]:
+    """Length and timestamp buffer address; either changes when the rows are replaced."""
+    values = _time_values(df[TIME_COLUMN])
+    return len(df), values.__array_interface__['data'][0] if len(values) else 0
+
+
+def _remember_sorted(df: pd.DataFrame, keys: Tuple[str, ...], fingerprint: Optional[Tuple[int, int]] = None):
+    key = id(df)
+
+    def forget(_, key=key):
+        with _verified_lock:
+            _verified.pop(key, None)
+
+    with _verified_lock:
+        _verified[key] = (weakref.ref(df, forget), fingerprint or _fingerprint(df), keys)
+
+
+def is_time_sorted(df: pd.DataFrame) -> bool:
+    """Check whether a frame carries a guaranteed timestamp order."""
+    return sorted_by(df) is not None
+
+
+def index_by_time(df: pd.DataFrame, reorder: bool = True) -> pd.DataFrame:
+    """
+    Normalise a frame's timestamp column and sort order, and flag it.
+
+    Args:
+        df: Frame to index
+        reorder: Parse and sort as needed. If False the frame is only
+            flagged when its timestamp column is already datetime64 and sorted
+
+    Returns:
+        The indexed frame: ``df`` itself when it was already in order,
+        otherwise a sorted copy with a fresh RangeIndex. Frames without a
+        parsable timestamp column are returned unchanged and unflagged
+    """
+    if not isinstance(df, pd.DataFrame) or TIME_COLUMN not in df.columns:
+        return df
+
+    timestamps = df[TIME_COLUMN]
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        if not reorder:
+            return df
+        try:
+            timestamps = pd.to_datetime(timestamps)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Timestamp column not parsable, frame left unindexed: {str(e)}")
+            return df
+        df = df.copy()
+        df[TIME_COLUMN] = timestamps
+
+    keys = [TIME_COLUMN]
+    if TICKER_COLUMN in df.columns and not df[TICKER_COLUMN].isna().any():
+        keys = [TICKER_COLUMN, TIME_COLUMN]
+
+    if not _is_sorted(df, keys):
+        if not reorder:
+            return df
+        try:
+            df = df.sort_values(keys, kind='stable', na_position='first')
+        except TypeError:
+            # Tickers of mixed types have no order; sort by time alone
+            keys = [TIME_COLUMN]
+            df = df.sort_values(keys, kind='stable', na_position='first')
+        df = df.reset_index(drop=True)
+    df.attrs[SORTED_BY_ATTR] = tuple(keys)
+    _remember_sorted(df, tuple(keys))
+    return df
+
+
+def _is_sorted(df: pd.DataFrame, keys: Sequence[str]) -> bool:
+    """Whether the rows are in key order (timestamps ascending within each ticker)."""
+    times = _time_values(df[TIME_COLUMN])
+    if len(keys) == 1:
+        return pd.Index(times).is_monotonic_increasing
+    tickers = df[TICKER_COLUMN]
+    try:
+        if not pd.Index(tickers).is_monotonic_increasing:
+            return False
+    except TypeError:
+        # Tickers of mixed types have no order
+        return False
+    if len(times) < 2:
+        return True
+    values = tickers.array
+    same_ticker = np.asarray(values[1:] == values[:-1], dtype=bool)
+    return bool(np.all((times[1:] >= times[:-1]) | ~same_ticker))
+
+
+def _time_values(series: pd.Series) -> np.ndarray:
+    """Timestamps as int64 (UTC epoch in the column's unit, NaT as the minimum)."""
+    return series.array.asi8
+
+
+def _time_bound(series: pd.Series, value, default: int) -> int:
+    """
+    A date bound as an int64 comparable with _time_values of the column.
+
+    The bound is expressed in the column's own unit. A bound finer than that
+    unit is rounded inwards, so a lower bound never admits an earlier value
+    and an upper bound never admits a later one.
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return default
+    stamp = pd.Timestamp(value)
+    tz = series.dt.tz
+    if tz is not None:
+        stamp = stamp.tz_localize(tz) if stamp.tzinfo is None else stamp.tz_convert(tz)
+    elif stamp.tzinfo is not None:
+        raise TypeError(f"Cannot compare timezone-aware bound {value} with naive timestamps")
+    unit = series.dt.unit
+    bound = stamp.as_unit(unit)
+    step = pd.Timedelta(1, unit=unit)
+    if default == _MIN_TIME and bound < stamp:
+        bound += step
+    elif default == _MAX_TIME and bound > stamp:
+        bound -= step
+    return int(bound.asm8.view('i8'))
+
+
+def ticker_blocks(df: pd.DataFrame, tickers: Optional[Sequence[str]] = None) -> List[Tuple[str, int, int]]:
+    """
+    Row ranges of each ticker in a frame sorted by ticker.
+
+    Args:
+        df: Frame indexed by (ticker, timestamp)
+        tickers: Tickers to locate (all present if None)
+
+    Returns:
+        (ticker, first row, end row) for each ticker present
+    """
+    values = df[TICKER_COLUMN].array
+    if tickers is not None:
+        blocks = []
+        for ticker in dict.fromkeys(tickers):
+            try:
+                start = int(values.searchsorted(ticker, side='left'))
+                end = int(values.searchsorted(ticker, side='right'))
+            except (KeyError, TypeError, ValueError):
+                # Not a category of a categorical column, or not comparable
+                continue
+            if end > start:
+                blocks.append((ticker, start, end))
+        return sorted(blocks, key=lambda block: block[1])
+
+    blocks, start = [], 0
+    while start < len(values):
+        ticker = values[start]
+        end = int(values.searchsorted(ticker, side='right'))
+        blocks.append((ticker, start, end))
+        start = end
+    return blocks
+
+
+def range_bounds(df: pd.DataFrame, start=None, end=None,
+                 tickers: Optional[Sequence[str]] = None) -> List[Tuple[int, int]]:
+    """
+    Row ranges holding an inclusive date range, found by binary search.
+
+    Args:
+        df: Indexed frame (see index_by_time)
+        start: First timestamp to include (unbounded if None)
+        end: Last timestamp to include (unbounded if None)
+        tickers: Restrict to these tickers; needs a frame sorted by ticker
+
+    Returns:
+        Non-empty (first row, end row) ranges in row order
+    """
+    keys = sorted_by(df)
+    if keys is None:
+        raise ValueError("Frame is not indexed by time; call index_by_time first")
+    if tickers is not None and TICKER_COLUMN not in keys:
+        raise ValueError("Frame is not sorted by ticker")
+
+    timestamps = df[TIME_COLUMN]
+    values = _time_values(timestamps)
+    low = _time_bound(timestamps, start, _MIN_TIME)
+    high = _time_bound(timestamps, end, _MAX_TIME)
+
+    if TICKER_COLUMN in keys:
+        blocks = [(first, last) for _, first, last in ticker_blocks(df, tickers)]
+    else:
+        blocks = [(0, len(values))]
+
+    bounds = []
+    for first, last in blocks:
+        block = values[first:last]
+        lo = first + int(np.searchsorted(block, low, side='left'))
+        hi = first + int(np.searchsorted(block, high, side='right'))
+        if hi > lo:
+            if bounds and bounds[-1][1] == lo:
+                bounds[-1] = (bounds[-1][0], hi)
+            else:
+                bounds.append((lo, hi))
+    return bounds
+
+
+def slice_date_range(df: pd.DataFrame, start=None, end=None,
+                     tickers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Rows within an inclusive date range, optionally for some tickers.
+
+    An unindexed frame is indexed first (which parses and sorts it). When the
+    matching rows are contiguous - a single ticker, or a frame sorted by
+    timestamp alone - the result is a view of ``df``.
+
+    Args:
+        df: Frame to slice
+        start: First timestamp to include (unbounded if None)
+        end: Last timestamp to include (unbounded if None)
+        tickers: Tickers to keep (all if None)
+
+    Returns:
+        Matching rows, in ticker/timestamp order
+    """
+    df = df if is_time_sorted(df) else index_by_time(df)
+    if tickers is not None and TICKER_COLUMN not in (sorted_by(df) or ()):
+        df = df[df[TICKER_COLUMN].isin(tickers)] if TICKER_COLUMN in df.columns else df.iloc[:0]
+    bounds = range_bounds(df, start, end, tickers if TICKER_COLUMN in (sorted_by(df) or ()) else None)
+    if not bounds:
+        return df.iloc[:0]
+    if len(bounds) == 1:
+        return df.iloc[bounds[0][0]:bounds[0][1]]
+    return df.take(np.concatenate([np.arange(lo, hi) for lo, hi in bounds]))
+
+
+def slice_ticker(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """
+    Rows of one ticker; a view when the frame is sorted by ticker.
+
+    Args:
+        df: Frame to slice
+        ticker: Ticker symbol
+
+    Returns:
+        The ticker's rows
+    """
+    if TICKER_COLUMN in (sorted_by(df) or ()):
+        blocks = ticker_blocks(df, [ticker])
+        return df.iloc[blocks[0][1]:blocks[0][2]] if blocks else df.iloc[:0]
+    return df[df[TICKER_COLUMN] == ticker]
@@ -30,6 +30,8 @@ except ImportError:
     pa = None
     PYARROW_AVAILABLE = False
 
+from .shared_tables import write_frame, default_write_mode
+
 logger = logging.getLogger(__name__)
 
 class DatabaseConnector:
@@ -150,7 +152,8 @@ class DatabaseConnector:
             self.logger.error(f"Failed to read from {table}: {str(e)}")
             raise
     
-    def write_shared_data(self, table: str, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table'], format: str) -> None:
+    def write_shared_data(self, table: str, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table'], format: str,
+                          mode: str = None) -> None:
         """
         Write data to a shared table.
         
@@ -158,6 +161,8 @@ class DatabaseConnector:
             table: Table name
             data: Data to write
             format: Data format identifier
+            mode: 'replace' (recreate the table), 'append', or 'upsert' (replace rows
+                with the same ticker and timestamp); defaults to REDLINE_SHARED_WRITE_MODE
         """
         try:
             # Convert to pandas if needed
@@ -171,7 +176,6 @@ class DatabaseConnector:
             
             # Create table and insert data
             conn = self.create_connection()
-            conn.execute(f"DROP TABLE IF EXISTS {table}")
             
             # Convert Stooq format to standard format for database storage
             db_data = data.copy()
@@ -227,26 +231,15 @@ class DatabaseConnector:
                 vol DOUBLE
             )
             """
-            conn.execute(create_table_sql)
-            
-            # Insert data only if we have valid data
-            if len(db_data) > 0 and len(db_data.columns) > 0:
-                # Ensure column order matches table schema exactly
-                ordered_columns = [col for col in standard_columns if col in db_data.columns]
-                db_data_ordered = db_data[ordered_columns]
-                
-                conn.register('temp_df', db_data_ordered)
-                # Use explicit column list in INSERT to ensure correct order
-                columns_str = ', '.join(ordered_columns)
-                insert_sql = f"INSERT INTO {table} ({columns_str}) SELECT {columns_str} FROM temp_df"
-                conn.execute(insert_sql)
-                conn.unregister('temp_df')
-            else:
-                self.logger.warning(f"No data to insert into {table}")
             
-            conn.close()
+            # Columns are matched by name; append/upsert modes write only the new rows
+            mode = mode or default_write_mode()
+            try:
+                rows = write_frame(conn, table, db_data, mode, create_table_sql)
+            finally:
+                conn.close()
             
-            self.logger.info(f"Wrote data to {table} in format {format}")
+            self.logger.info(f"Wrote {rows} rows to {table} in format {format} ({mode})")
             
         except Exception as e:
             self.logger.exception(f"Failed to write to {table}: {str(e)}")
@@ -4,6 +4,7 @@ REDLINE Optimized Database Connector
 Enhanced database connector with connection pooling and query caching for improved performance.
 """
 
+import os
 import logging
 import pandas as pd
 from typing import Union, Dict, Any, Optional, List
@@ -26,16 +27,18 @@ except ImportError:
 
 from .connection_pool import ConnectionPool
 from .query_cache import QueryCache
+from .shared_tables import write_frame, default_write_mode
+from ..core.load_filters import quote_identifier
 
 logger = logging.getLogger(__name__)
 
 class OptimizedDatabaseConnector:
     """Optimized database connector with connection pooling and query caching."""
     
-    def __init__(self, db_path: str = None, max_connections: int = 10, cache_size: int = 128, cache_ttl: int = 300):
+    def __init__(self, db_path: str = None, max_connections: int = 10, cache_size: int = 128, cache_ttl: int = 300,
+                 cache_max_mb: Optional[float] = None):
         """Initialize optimized database connector."""
         if db_path is None:
-            import os
             db_path = os.path.join(os.getcwd(), 'redline_data.duckdb')
         
         self.db_path = db_path
@@ -43,7 +46,8 @@ class OptimizedDatabaseConnector:
         
         # Initialize connection pool and query cache
         self.connection_pool = ConnectionPool(db_path, max_connections)
-        self.query_cache = QueryCache(cache_size, cache_ttl)
+        cache_max_bytes = int(cache_max_mb * 1024 * 1024) if cache_max_mb is not None else None
+        self.query_cache = QueryCache(cache_size, cache_ttl, cache_max_bytes)
         
         self.logger.info(f"Initialized optimized database connector with {max_connections} connections and {cache_size} cache entries")
     
@@ -80,6 +84,106 @@ class OptimizedDatabaseConnector:
             self.logger.error(f"Failed to execute query: {str(e)}")
             raise
     
+    def execute_query_arrow(self, query: str, params: Dict[str, Any] = None, use_cache: bool = True) -> 'pa.Table':
+        """Execute a SQL query and return an Arrow table (cache hits are not copied)."""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow query results")
+        try:
+            if use_cache:
+                cached_result = self.query_cache.get_arrow(query, params)
+                if cached_result is not None:
+                    return cached_result
+            
+            conn = self.connection_pool.get_connection()
+            
+            try:
+                cursor = conn.execute(query, params) if params else conn.execute(query)
+                # to_arrow_table replaces fetch_arrow_table in newer DuckDB releases
+                fetch_table = getattr(cursor, 'to_arrow_table', None) or cursor.fetch_arrow_table
+                result = fetch_table()
+                
+                if use_cache:
+                    self.query_cache.set(query, result, params)
+                
+                return result
+                
+            finally:
+                self.connection_pool.return_connection(conn)
+                
+        except Exception as e:
+            self.logger.error(f"Failed to execute query: {str(e)}")
+            raise
+    
+    def query_partitioned(self, root: str = None, tickers: Optional[List[str]] = None, start=None, end=None,
+                          columns: Optional[List[str]] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Query the ticker/year partitioned Parquet lake.
+        
+        Ticker and year predicates are applied to the Hive partition columns,
+        so DuckDB only opens the matching partition directories; the timestamp
+        range is checked against row-group statistics.
+        
+        Args:
+            root: Lake directory (defaults to REDLINE_LAKE_DIR or data/lake)
+            tickers: Tickers to read (all if None)
+            start: First timestamp to include
+            end: Last timestamp to include
+            columns: Columns to return (all if None)
+            limit: Maximum rows to return
+            
+        Returns:
+            Rows ordered by ticker and timestamp
+            
+        Raises:
+            ValueError: If a requested column is not in the lake
+        """
+        from ..core.partitioned_store import PartitionedStore
+        root = PartitionedStore(root).root
+        if not os.path.isdir(root):
+            return pd.DataFrame(columns=columns or ['ticker', 'timestamp'])
+        pattern = os.path.join(root, '*', '*', '*.parquet').replace("'", "''")
+        source = (f"read_parquet('{pattern}', hive_partitioning = true, "
+                  f"hive_types = {{'ticker': VARCHAR, 'year': INTEGER}})")
+        if columns:
+            schema = set(self._query_columns(f"SELECT * FROM {source}"))
+            unknown = [col for col in columns if col not in schema]
+            if unknown:
+                raise ValueError(f"Unknown lake column(s): {', '.join(map(str, unknown))}")
+            select = ', '.join(quote_identifier(col) for col in columns)
+        else:
+            select = '* EXCLUDE (year)'
+        
+        conditions, params = [], []
+        if tickers:
+            conditions.append(f"ticker IN ({', '.join('?' for _ in tickers)})")
+            params.extend(str(t) for t in tickers)
+        if start:
+            start = pd.Timestamp(start)
+            conditions.extend(["year >= ?", "timestamp >= ?"])
+            params.extend([start.year, start.to_pydatetime()])
+        if end:
+            end = pd.Timestamp(end)
+            conditions.extend(["year <= ?", "timestamp <= ?"])
+            params.extend([end.year, end.to_pydatetime()])
+        
+        query = f"SELECT {select} FROM {source}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY ticker, timestamp"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        
+        # The lake changes outside this connector, so its results are not cached
+        return self.execute_query(query, params or None, use_cache=False)
+    
+    def _query_columns(self, query: str) -> List[str]:
+        """Column names a query returns, without running it."""
+        conn = self.connection_pool.get_connection()
+        try:
+            return [row[0] for row in conn.execute(f"DESCRIBE {query}").fetchall()]
+        finally:
+            self.connection_pool.return_connection(conn)
+    
     @lru_cache(maxsize=32)
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
         """Get table information with caching."""
@@ -269,8 +373,18 @@ class OptimizedDatabaseConnector:
             self.logger.error(f"Failed to read from {table}: {str(e)}")
             raise
     
-    def write_shared_data(self, table: str, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table'], format: str) -> None:
-        """Write data to a shared table with connection pooling."""
+    def write_shared_data(self, table: str, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table'], format: str,
+                          mode: str = None) -> None:
+        """
+        Write data to a shared table with connection pooling.
+        
+        Args:
+            table: Table name
+            data: Data to write
+            format: Data format identifier
+            mode: 'replace' (recreate the table), 'append', or 'upsert' (replace rows
+                with the same ticker and timestamp); defaults to REDLINE_SHARED_WRITE_MODE
+        """
         try:
             # Convert to pandas if needed
             if POLARS_AVAILABLE and isinstance(data, pl.DataFrame):
@@ -284,9 +398,6 @@ class OptimizedDatabaseConnector:
             conn = self.connection_pool.get_connection()
             
             try:
-                # Drop table if exists
-                conn.execute(f"DROP TABLE IF EXISTS {table}")
-                
                 # Handle Stooq format columns
                 db_data = data.copy()
                 if '<TICKER>' in db_data.columns:
@@ -325,13 +436,10 @@ class OptimizedDatabaseConnector:
                     vol DOUBLE
                 )
                 """
-                conn.execute(create_table_sql)
                 
-                # Insert data
-                if len(db_data) > 0:
-                    conn.register('temp_df', db_data)
-                    conn.execute(f"INSERT INTO {table} SELECT * FROM temp_df")
-                    conn.unregister('temp_df')
+                # Append/upsert modes write only the new rows; existing indexes are updated in place
+                mode = mode or default_write_mode()
+                rows = write_frame(conn, table, db_data, mode, create_table_sql)
                 
                 # Create indexes for better query performance
                 try:
@@ -352,9 +460,12 @@ class OptimizedDatabaseConnector:
                 except Exception as e:
                     self.logger.warning(f"Failed to create indexes: {str(e)}")
                 
-                self.logger.info(f"Wrote data to {table} in format {format}")
+                self.logger.info(f"Wrote {rows} rows to {table} in format {format} ({mode})")
                 
             finally:
+                # A failed write may still have changed the table, so drop dependent results either way
+                self.query_cache.invalidate_table(table)
+                self.get_table_info.cache_clear()
                 self.connection_pool.return_connection(conn)
                 
         except Exception as e:
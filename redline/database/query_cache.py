@@ -1,83 +1,239 @@
 #!/usr/bin/env python3
 """
 REDLINE Query Cache
-Thread-safe query result cache with TTL.
+Thread-safe query result cache with TTL, LRU eviction and a memory budget.
+
+Results are stored as immutable Arrow tables, so a cached result can be
+handed out without copying (get_arrow) and each lookup that needs a pandas
+frame gets a fresh one (get). Entries are kept in an OrderedDict in least
+recently used order and evicted from the front while the cache is over its
+entry count or byte budget. Each entry remembers the tables its query reads,
+so writers can drop just the results that depend on a table they changed.
 """
 
+import os
+import re
 import logging
 import threading
 import time
 import hashlib
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, FrozenSet, Optional, Union
 import pandas as pd
 
+# Optional dependencies
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_MB = 256
+
+_TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+("?)([A-Za-z_][\w.]*)\1', re.IGNORECASE)
+
+
+def referenced_tables(query: str) -> FrozenSet[str]:
+    """
+    Find the tables a query reads (lower-cased, schema prefix dropped).
+
+    Args:
+        query: SQL text
+
+    Returns:
+        Table names; empty when none could be found
+    """
+    return frozenset(match.group(2).split('.')[-1].lower() for match in _TABLE_PATTERN.finditer(query))
+
+
+@dataclass
+class _CacheEntry:
+    value: Union['pa.Table', pd.DataFrame]
+    nbytes: int
+    timestamp: float
+    tables: FrozenSet[str]
+
 
 class QueryCache:
-    """Thread-safe query result cache with TTL."""
-    
-    def __init__(self, max_size: int = 128, ttl_seconds: int = 300):
-        """Initialize query cache."""
+    """Thread-safe LRU query result cache with TTL and a byte budget."""
+
+    def __init__(self, max_size: int = 128, ttl_seconds: int = 300, max_bytes: Optional[int] = None):
+        """
+        Initialize query cache.
+
+        Args:
+            max_size: Maximum number of cached results
+            ttl_seconds: Seconds a result stays valid
+            max_bytes: Memory budget in bytes (defaults to REDLINE_QUERY_CACHE_MB)
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('REDLINE_QUERY_CACHE_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.max_bytes = max_bytes
+        self.cache: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
         self.lock = threading.RLock()
         self.logger = logging.getLogger(__name__)
-    
+        self._bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0,
+                       'expirations': 0, 'invalidations': 0, 'rejected': 0}
+
     def _generate_key(self, query: str, params: Dict[str, Any] = None) -> str:
         """Generate cache key for query and parameters."""
         cache_string = f"{query}:{str(params) if params else ''}"
         return hashlib.md5(cache_string.encode()).hexdigest()
-    
-    def get(self, query: str, params: Dict[str, Any] = None) -> Optional[pd.DataFrame]:
-        """Get cached query result."""
+
+    def _lookup(self, query: str, params: Optional[Dict[str, Any]]) -> Optional[_CacheEntry]:
+        """Find a live entry and mark it most recently used."""
         with self.lock:
             key = self._generate_key(query, params)
-            
-            if key in self.cache:
-                cached_item = self.cache[key]
-                
-                # Check TTL
-                if time.time() - cached_item['timestamp'] < self.ttl_seconds:
-                    self.logger.debug(f"Cache hit for query: {query[:50]}...")
-                    return cached_item['result'].copy()
-                else:
-                    # Expired, remove from cache
-                    del self.cache[key]
-                    self.logger.debug(f"Cache expired for query: {query[:50]}...")
-            
+            entry = self.cache.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            if time.time() - entry.timestamp >= self.ttl_seconds:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                self.logger.debug(f"Cache expired for query: {query[:50]}...")
+                return None
+            self.cache.move_to_end(key)
+            self._stats['hits'] += 1
+            self.logger.debug(f"Cache hit for query: {query[:50]}...")
+            return entry
+
+    def get(self, query: str, params: Dict[str, Any] = None) -> Optional[pd.DataFrame]:
+        """
+        Get cached query result.
+
+        Returns:
+            A new DataFrame the caller may modify, or None on a miss
+        """
+        entry = self._lookup(query, params)
+        if entry is None:
             return None
-    
-    def set(self, query: str, result: pd.DataFrame, params: Dict[str, Any] = None):
-        """Cache query result."""
+        if isinstance(entry.value, pd.DataFrame):
+            return entry.value.copy()
+        return entry.value.to_pandas()
+
+    def get_arrow(self, query: str, params: Dict[str, Any] = None) -> Optional['pa.Table']:
+        """
+        Get cached query result as an Arrow table.
+
+        The cached table is returned as is (Arrow tables are immutable), so a
+        hit costs no copy.
+
+        Returns:
+            Arrow table, or None on a miss
+        """
+        entry = self._lookup(query, params)
+        if entry is None:
+            return None
+        if isinstance(entry.value, pd.DataFrame):
+            return pa.Table.from_pandas(entry.value, preserve_index=False) if PYARROW_AVAILABLE else None
+        return entry.value
+
+    def set(self, query: str, result: Union[pd.DataFrame, 'pa.Table'], params: Dict[str, Any] = None):
+        """
+        Cache query result.
+
+        Args:
+            query: SQL text (also used to find the tables the result depends on)
+            result: Query result as a DataFrame or Arrow table
+            params: Query parameters
+        """
+        value = self._freeze(result)
+        if value is None:
+            return
+        nbytes = self._nbytes(value)
+        key = self._generate_key(query, params)
+
         with self.lock:
-            # Remove oldest entries if cache is full
-            while len(self.cache) >= self.max_size:
-                oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k]['timestamp'])
-                del self.cache[oldest_key]
-            
-            key = self._generate_key(query, params)
-            self.cache[key] = {
-                'result': result.copy(),
-                'timestamp': time.time()
-            }
+            if nbytes > self.max_bytes:
+                self._stats['rejected'] += 1
+                self.logger.debug(f"Query result ({nbytes} bytes) exceeds cache budget: {query[:50]}...")
+                return
+            self._remove(key)
+            self.cache[key] = _CacheEntry(value, nbytes, time.time(), referenced_tables(query))
+            self._bytes += nbytes
+            self._stats['stores'] += 1
+            while len(self.cache) > self.max_size or self._bytes > self.max_bytes:
+                _, evicted = self.cache.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._stats['evictions'] += 1
             self.logger.debug(f"Cached query result: {query[:50]}...")
-    
+
+    def _freeze(self, result: Union[pd.DataFrame, 'pa.Table']) -> Union['pa.Table', pd.DataFrame, None]:
+        """Convert a result into the immutable form that is stored."""
+        if PYARROW_AVAILABLE and isinstance(result, pa.Table):
+            return result
+        if not isinstance(result, pd.DataFrame):
+            return None
+        if PYARROW_AVAILABLE:
+            try:
+                return pa.Table.from_pandas(result, preserve_index=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                # Mixed-type object columns cannot always be expressed in Arrow
+                self.logger.debug(f"Caching query result as a DataFrame copy: {str(e)}")
+        return result.copy()
+
+    @staticmethod
+    def _nbytes(value: Union['pa.Table', pd.DataFrame]) -> int:
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        return int(value.nbytes)
+
+    def _remove(self, key: str):
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def invalidate_table(self, table: str) -> int:
+        """
+        Drop every cached result that depends on a table.
+
+        Results whose query names no table are dropped as well, since their
+        dependencies are unknown.
+
+        Args:
+            table: Table that was modified
+
+        Returns:
+            Number of entries dropped
+        """
+        name = table.split('.')[-1].strip('"').lower()
+        with self.lock:
+            stale = [key for key, entry in self.cache.items() if not entry.tables or name in entry.tables]
+            for key in stale:
+                self._remove(key)
+            self._stats['invalidations'] += len(stale)
+        if stale:
+            self.logger.debug(f"Invalidated {len(stale)} cached result(s) for table {table}")
+        return len(stale)
+
     def clear(self):
         """Clear all cached results."""
         with self.lock:
             self.cache.clear()
+            self._bytes = 0
         self.logger.info("Cleared query cache")
-    
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         with self.lock:
+            lookups = self._stats['hits'] + self._stats['misses']
             return {
+                **self._stats,
                 'size': len(self.cache),
                 'max_size': self.max_size,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hit_ratio': round(self._stats['hits'] / lookups, 4) if lookups else 0.0,
                 'ttl_seconds': self.ttl_seconds,
-                'oldest_entry': min((item['timestamp'] for item in self.cache.values()), default=None),
-                'newest_entry': max((item['timestamp'] for item in self.cache.values()), default=None)
+                'oldest_entry': min((item.timestamp for item in self.cache.values()), default=None),
+                'newest_entry': max((item.timestamp for item in self.cache.values()), default=None)
             }
-
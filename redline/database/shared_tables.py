@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+REDLINE Shared Tables
+Write modes for the shared DuckDB price tables.
+
+``replace`` drops and recreates the table (the historical behaviour).
+``append`` inserts the rows into the existing table. ``upsert`` inserts the
+rows and replaces existing rows with the same (ticker, timestamp) key, using
+``INSERT OR REPLACE`` against a unique index on the key. The incoming rows
+are registered with DuckDB as one Arrow table and inserted in a single
+statement, so only the new rows are written and existing indexes are
+updated in place instead of being rebuilt.
+"""
+
+import os
+import logging
+from typing import List, Optional, Sequence, Union
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    pl = None
+    POLARS_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+WRITE_MODES = ('replace', 'append', 'upsert')
+KEY_COLUMNS = ['ticker', 'timestamp']
+
+
+def default_write_mode() -> str:
+    """Write mode for shared tables (REDLINE_SHARED_WRITE_MODE, default 'replace')."""
+    mode = os.environ.get('REDLINE_SHARED_WRITE_MODE', 'replace').lower()
+    if mode not in WRITE_MODES:
+        logger.warning(f"Unknown REDLINE_SHARED_WRITE_MODE {mode!r}, using 'replace'")
+        return 'replace'
+    return mode
+
+
+def key_index_name(table: str) -> str:
+    """Name of the unique (ticker, timestamp) index of a table."""
+    return f"idx_{table}_key"
+
+
+def ensure_key_index(conn, table: str, key_columns: Sequence[str] = KEY_COLUMNS) -> bool:
+    """
+    Create the unique key index that INSERT OR REPLACE needs.
+
+    Args:
+        conn: DuckDB connection
+        table: Table name
+        key_columns: Key columns
+
+    Returns:
+        False if the table already holds duplicate keys (no index is created)
+    """
+    try:
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {key_index_name(table)} "
+                     f"ON {table}({', '.join(key_columns)})")
+        return True
+    except Exception as e:
+        logger.warning(f"Cannot create unique key index on {table}, upserts will delete and insert: {str(e)}")
+        return False
+
+
+def write_frame(conn, table: str, data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table'],
+                mode: str = 'replace', create_sql: Optional[str] = None,
+                key_columns: Sequence[str] = KEY_COLUMNS) -> int:
+    """
+    Write rows to a shared table.
+
+    Args:
+        conn: DuckDB connection
+        table: Table name
+        data: Rows to write; columns are matched to the table by name
+        mode: 'replace', 'append' or 'upsert'
+        create_sql: CREATE TABLE IF NOT EXISTS statement for the table
+            (defaults to the column types of ``data``)
+        key_columns: Columns identifying a row in upsert mode
+
+    Returns:
+        Number of rows written
+    """
+    if mode not in WRITE_MODES:
+        raise ValueError(f"Unknown write mode: {mode}. Expected one of {', '.join(WRITE_MODES)}")
+
+    batch = _to_arrow(data, key_columns if mode == 'upsert' else None)
+    columns: List[str] = list(batch.columns if isinstance(batch, pd.DataFrame) else batch.column_names)
+    column_list = ', '.join(f'"{col}"' for col in columns)
+
+    if mode == 'replace':
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+    conn.register('shared_batch', batch)
+    try:
+        if create_sql:
+            conn.execute(create_sql)
+        else:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} AS SELECT * FROM shared_batch LIMIT 0")
+
+        select = f"SELECT {column_list} FROM shared_batch"
+        if mode == 'upsert' and all(col in columns for col in key_columns):
+            if ensure_key_index(conn, table, key_columns):
+                conn.execute(f"INSERT OR REPLACE INTO {table} ({column_list}) {select}")
+            else:
+                keys = ', '.join(key_columns)
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    conn.execute(f"DELETE FROM {table} WHERE ({keys}) IN (SELECT {keys} FROM shared_batch)")
+                    conn.execute(f"INSERT INTO {table} ({column_list}) {select}")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+        else:
+            if mode == 'upsert':
+                logger.warning(f"Rows for {table} lack key columns {list(key_columns)}, appending instead")
+            conn.execute(f"INSERT INTO {table} ({column_list}) {select}")
+    finally:
+        conn.unregister('shared_batch')
+
+    return len(batch)
+
+
+def _to_arrow(data: Union[pd.DataFrame, 'pl.DataFrame', 'pa.Table'],
+              key_columns: Optional[Sequence[str]]) -> Union['pa.Table', pd.DataFrame]:
+    """Rows as an Arrow table (a DataFrame without pyarrow), keeping the last row per key."""
+    if POLARS_AVAILABLE and isinstance(data, pl.DataFrame):
+        data = data.to_arrow() if PYARROW_AVAILABLE else data.to_pandas()
+    if PYARROW_AVAILABLE and isinstance(data, pa.Table):
+        if key_columns is None or not all(col in data.column_names for col in key_columns):
+            return data
+        data = data.to_pandas()
+
+    if key_columns is not None and all(col in data.columns for col in key_columns):
+        # INSERT OR REPLACE cannot touch one key twice in a statement
+        data = data.drop_duplicates(subset=list(key_columns), keep='last')
+    if PYARROW_AVAILABLE:
+        try:
+            return pa.Table.from_pandas(data, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            # Mixed-type object columns cannot always be expressed in Arrow
+            logger.debug(f"Registering rows as a DataFrame: {str(e)}")
+    return data.reset_index(drop=True)
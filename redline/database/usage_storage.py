@@ -2,39 +2,109 @@
 """
 Usage Storage Module
 Persistent storage for user access data, usage history, and payment records
+
+Usage and access writes never touch the database on the caller's thread:
+log_* methods put a record on a bounded in-memory queue and return. A
+single writer thread drains the queue and flushes every
+REDLINE_USAGE_FLUSH_ROWS records or REDLINE_USAGE_FLUSH_MS milliseconds,
+inserting each table's rows as one Arrow batch. DuckDB lets only one
+process at a time open the file for writing, and every web worker has its
+own writer, so each flush and each read opens a short-lived connection,
+retrying for up to REDLINE_USAGE_LOCK_WAIT seconds while another worker
+holds the file. A flush that cannot open the file keeps its records and
+retries with backoff. When the queue is full, records wait briefly and are
+then dropped (and counted) so that request handlers are never stalled by
+the database. Payments are billing records and are never queued:
+log_payment writes them before it returns and raises if it cannot. Pending
+records are flushed on close() and at interpreter exit.
 """
 
 import os
+import time
+import queue
+import atexit
 import logging
+import threading
 import duckdb
+import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from threading import Lock
 
+# Optional dependencies
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_FLUSH_ROWS = 500
+DEFAULT_FLUSH_MS = 1000
+# Seconds a log call waits for queue space before the record is dropped
+ENQUEUE_TIMEOUT = 0.05
+# Seconds to wait for another process to release the database file
+DEFAULT_LOCK_WAIT = 10.0
+# Pauses between attempts to write a batch that could not be flushed
+MIN_RETRY_DELAY = 0.1
+MAX_RETRY_DELAY = 30.0
+
+# Append-only tables: column order of queued rows (the id comes from the table's sequence)
+APPEND_TABLES = {
+    'usage_history': ['license_key', 'session_id', 'hours_deducted', 'deduction_time',
+                      'hours_remaining_before', 'hours_remaining_after', 'api_endpoint'],
+    'payment_history': ['license_key', 'stripe_session_id', 'payment_id', 'hours_purchased',
+                        'amount_paid', 'currency', 'payment_status', 'payment_date'],
+    'access_logs': ['license_key', 'session_id', 'endpoint', 'method', 'ip_address',
+                    'user_agent', 'response_status', 'response_time_ms', 'access_time'],
+}
+
+
 class UsageStorage:
     """Persistent storage for usage and access data"""
     
-    def __init__(self, db_path: str = None):
-        """Initialize usage storage database"""
+    def __init__(self, db_path: str = None, flush_rows: Optional[int] = None,
+                 flush_ms: Optional[float] = None, queue_size: Optional[int] = None):
+        """
+        Initialize usage storage database and start the writer thread.
+        
+        Args:
+            db_path: DuckDB file (defaults to data/usage_data.duckdb)
+            flush_rows: Records per flush (defaults to REDLINE_USAGE_FLUSH_ROWS)
+            flush_ms: Longest wait before queued records are flushed (defaults to REDLINE_USAGE_FLUSH_MS)
+            queue_size: Queued records before writers wait (defaults to REDLINE_USAGE_QUEUE_SIZE)
+        """
         if db_path is None:
             db_path = os.path.join(os.getcwd(), 'data', 'usage_data.duckdb')
         
         self.db_path = db_path
         self.lock = Lock()
+        self.flush_rows = flush_rows or int(os.environ.get('REDLINE_USAGE_FLUSH_ROWS', DEFAULT_FLUSH_ROWS))
+        self.flush_ms = flush_ms if flush_ms is not None else float(
+            os.environ.get('REDLINE_USAGE_FLUSH_MS', DEFAULT_FLUSH_MS))
+        queue_size = queue_size or int(os.environ.get('REDLINE_USAGE_QUEUE_SIZE', DEFAULT_QUEUE_SIZE))
+        self.lock_wait = float(os.environ.get('REDLINE_USAGE_LOCK_WAIT', DEFAULT_LOCK_WAIT))
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=queue_size)
+        self._stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'flushes': 0}
+        self._closed = False
+        
         # Initialize database schema
         self._initialize_schema()
+        
+        self._writer = threading.Thread(target=self._writer_loop, name='usage-storage-writer', daemon=True)
+        self._writer.start()
     
     def _initialize_schema(self):
         """Create database tables if they don't exist"""
+        conn = self._connect()
         try:
-            conn = duckdb.connect(self.db_path)
-            
             # Usage sessions table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS usage_sessions (
@@ -117,126 +187,313 @@ class UsageStorage:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_access_logs_license ON access_logs(license_key)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_access_logs_time ON access_logs(access_time)")
             
-            conn.close()
             logger.info(f"Usage storage database initialized: {self.db_path}")
             
         except Exception as e:
             logger.error(f"Error initializing usage storage: {str(e)}")
             raise
+        finally:
+            conn.close()
+    
+    def _connect(self) -> 'duckdb.DuckDBPyConnection':
+        """
+        Open a connection to the database file for one flush or read.
+        
+        Another process holding the file makes connect fail with a lock
+        conflict; retry with backoff for up to lock_wait seconds.
+        """
+        deadline = time.monotonic() + self.lock_wait
+        delay = 0.01
+        while True:
+            try:
+                return duckdb.connect(self.db_path)
+            except duckdb.IOException as e:
+                if 'lock' not in str(e).lower() or time.monotonic() + delay > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
     
     def log_session_start(self, session_id: str, license_key: str, user_id: Optional[str] = None):
         """Log the start of a usage session"""
-        try:
-            conn = duckdb.connect(self.db_path)
-            # Check if session exists first (DuckDB doesn't support ON CONFLICT reliably)
-            existing = conn.execute("""
-                SELECT session_id FROM usage_sessions WHERE session_id = ?
-            """, [session_id]).fetchone()
-            
-            if existing:
-                # Update existing session (duplicate detected, update instead)
-                conn.execute("""
-                    UPDATE usage_sessions
-                    SET start_time = ?, status = 'active', license_key = ?, user_id = ?
-                    WHERE session_id = ?
-                """, [datetime.now(), license_key, user_id, session_id])
-                logger.debug(f"Updated existing session: {session_id}")
-            else:
-                # Insert new session
-                conn.execute("""
-                    INSERT INTO usage_sessions (session_id, license_key, user_id, start_time, status)
-                    VALUES (?, ?, ?, ?, 'active')
-                """, [session_id, license_key, user_id, datetime.now()])
-                logger.debug(f"Logged session start: {session_id}")
-            conn.close()
-        except Exception as e:
-            logger.error(f"Error logging session start: {str(e)}")
-            # Don't raise - allow session to continue even if logging fails
+        self._enqueue(('session_start', (session_id, license_key, user_id, datetime.now())))
     
     def log_session_end(self, session_id: str, total_hours: float, total_seconds: float):
         """Log the end of a usage session"""
-        try:
-            conn = duckdb.connect(self.db_path)
-            conn.execute("""
-                UPDATE usage_sessions
-                SET end_time = ?, total_hours = ?, total_seconds = ?, status = 'completed'
-                WHERE session_id = ?
-            """, [datetime.now(), total_hours, total_seconds, session_id])
-            conn.close()
-            logger.debug(f"Logged session end: {session_id}, hours: {total_hours}")
-        except Exception as e:
-            logger.error(f"Error logging session end: {str(e)}")
+        self._enqueue(('session_end', (session_id, total_hours, total_seconds, datetime.now())))
     
     def log_hour_deduction(self, license_key: str, hours: float, session_id: Optional[str] = None,
                           hours_before: Optional[float] = None, hours_after: Optional[float] = None,
                           api_endpoint: Optional[str] = None):
         """Log an hour deduction event"""
-        try:
-            conn = duckdb.connect(self.db_path)
-            # Get next ID from sequence
-            next_id = conn.execute("SELECT nextval('usage_history_id_seq')").fetchone()[0]
-            conn.execute("""
-                INSERT INTO usage_history 
-                (id, license_key, session_id, hours_deducted, deduction_time, 
-                 hours_remaining_before, hours_remaining_after, api_endpoint)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, [next_id, license_key, session_id, hours, datetime.now(), 
-                  hours_before, hours_after, api_endpoint])
-            conn.close()
-            logger.debug(f"Logged hour deduction: {license_key}, {hours} hours")
-        except Exception as e:
-            logger.error(f"Error logging hour deduction: {str(e)}")
+        self._enqueue(('usage_history', (license_key, session_id, hours, datetime.now(),
+                                         hours_before, hours_after, api_endpoint)))
     
     def log_payment(self, license_key: str, hours_purchased: float, amount_paid: float,
                    stripe_session_id: Optional[str] = None, payment_id: Optional[str] = None,
                    payment_status: str = 'completed', currency: str = 'usd'):
-        """Log a payment transaction"""
+        """
+        Log a payment transaction.
+        
+        Written synchronously, so a payment is on disk when this returns.
+        
+        Raises:
+            Exception: If the record could not be written
+        """
+        row = (license_key, stripe_session_id, payment_id, hours_purchased,
+               amount_paid, currency, payment_status, datetime.now())
         try:
-            conn = duckdb.connect(self.db_path)
-            # Get next ID from sequence
-            next_id = conn.execute("SELECT nextval('payment_history_id_seq')").fetchone()[0]
-            conn.execute("""
-                INSERT INTO payment_history 
-                (id, license_key, stripe_session_id, payment_id, hours_purchased, 
-                 amount_paid, currency, payment_status, payment_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, [next_id, license_key, stripe_session_id, payment_id, hours_purchased,
-                  amount_paid, currency, payment_status, datetime.now()])
-            conn.close()
-            logger.info(f"Logged payment: {license_key}, {hours_purchased} hours, ${amount_paid}")
+            conn = self._connect()
+            try:
+                self._append(conn, 'payment_history', [row])
+            finally:
+                conn.close()
         except Exception as e:
-            logger.error(f"Error logging payment: {str(e)}")
+            logger.error(f"Error logging payment for {license_key} ({stripe_session_id or payment_id}): {str(e)}")
+            raise
+        logger.info(f"Logged payment: {license_key}, {hours_purchased} hours, ${amount_paid}")
     
     def log_access(self, license_key: str, endpoint: str, method: str,
                   session_id: Optional[str] = None, ip_address: Optional[str] = None,
                   user_agent: Optional[str] = None, response_status: Optional[int] = None,
                   response_time_ms: Optional[int] = None):
         """Log an API access event"""
+        self._enqueue(('access_logs', (license_key, session_id, endpoint, method, ip_address,
+                                       user_agent, response_status, response_time_ms, datetime.now())))
+    
+    def _enqueue(self, record: tuple):
+        """Hand a record to the writer thread."""
+        if self._closed:
+            logger.warning(f"Usage storage is closed, dropping {record[0]} record")
+            return
         try:
-            conn = duckdb.connect(self.db_path)
-            # Get next ID from sequence
-            next_id = conn.execute("SELECT nextval('access_logs_id_seq')").fetchone()[0]
-            conn.execute("""
-                INSERT INTO access_logs 
-                (id, license_key, session_id, endpoint, method, ip_address, 
-                 user_agent, response_status, response_time_ms, access_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, [next_id, license_key, session_id, endpoint, method, ip_address,
-                  user_agent, response_status, response_time_ms, datetime.now()])
-            conn.close()
+            self._queue.put(record, timeout=ENQUEUE_TIMEOUT)
+        except queue.Full:
+            with self.lock:
+                self._stats['dropped'] += 1
+            logger.warning(f"Usage storage queue full, dropping {record[0]} record")
+            return
+        with self.lock:
+            self._stats['enqueued'] += 1
+    
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Wait until every record queued so far has been written.
+        
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+        
+        Returns:
+            True if the queued records were written in time
+        """
+        if self._closed or not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(('flush', done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+    
+    def close(self, timeout: Optional[float] = 10.0):
+        """Flush pending records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer.is_alive():
+            self._queue.put(('stop', None))
+            self._writer.join(timeout)
+        logger.info(f"Closed usage storage: {self._stats['written']} record(s) written, "
+                    f"{self._stats['dropped']} dropped")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        with self.lock:
+            return {
+                **self._stats,
+                'queued': self._queue.qsize(),
+                'queue_size': self._queue.maxsize,
+                'flush_rows': self.flush_rows,
+                'flush_ms': self.flush_ms
+            }
+    
+    def _writer_loop(self):
+        """Drain the queue, flushing by record count or age, and retrying failed flushes."""
+        batch: List[tuple] = []
+        waiters: List[threading.Event] = []
+        deadline = None
+        retry_delay = 0.0
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                kind, payload = self._queue.get(timeout=timeout)
+                if kind == 'stop':
+                    stopping = True
+                elif kind == 'flush':
+                    waiters.append(payload)
+                else:
+                    batch.append((kind, payload))
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_ms / 1000.0
+            except queue.Empty:
+                pass
+            
+            due = deadline is not None and time.monotonic() >= deadline
+            if retry_delay and not stopping:
+                # After a failed flush, wait out the backoff whatever else arrives
+                ready = due
+            else:
+                ready = stopping or waiters or len(batch) >= self.flush_rows or due
+            if batch and ready:
+                if self._write_batch(batch):
+                    batch = []
+                    deadline = None
+                    retry_delay = 0.0
+                elif stopping:
+                    logger.error(f"Usage storage stopped with {len(batch)} record(s) unwritten")
+                    with self.lock:
+                        self._stats['failed'] += len(batch)
+                else:
+                    retry_delay = min(max(retry_delay * 2, MIN_RETRY_DELAY), MAX_RETRY_DELAY)
+                    deadline = time.monotonic() + retry_delay
+                    batch = self._trim_retained(batch)
+            if not batch:
+                # Waiters are released once their records are written
+                for done in waiters:
+                    done.set()
+                waiters = []
+    
+    def _trim_retained(self, batch: List[tuple]) -> List[tuple]:
+        """Bound a batch kept for retry to the queue size, dropping the oldest access logs first."""
+        excess = len(batch) - self._queue.maxsize
+        if excess <= 0:
+            return batch
+        kept = []
+        for record in batch:
+            if excess and record[0] == 'access_logs':
+                excess -= 1
+                with self.lock:
+                    self._stats['dropped'] += 1
+                continue
+            kept.append(record)
+        return kept
+    
+    def _write_batch(self, batch: List[tuple]) -> bool:
+        """
+        Write one batch of queued records on a connection opened for the flush.
+        
+        Returns:
+            False if the database could not be opened (the batch is kept for a retry)
+        """
+        try:
+            conn = self._connect()
         except Exception as e:
-            logger.error(f"Error logging access: {str(e)}")
+            logger.error(f"Could not open usage storage to write {len(batch)} record(s), will retry: {str(e)}")
+            return False
+        try:
+            self._write_records(conn, batch)
+        finally:
+            conn.close()
+        return True
+    
+    def _write_records(self, conn: 'duckdb.DuckDBPyConnection', batch: List[tuple]):
+        rows: Dict[str, List[tuple]] = {table: [] for table in APPEND_TABLES}
+        session_ops = []
+        for kind, payload in batch:
+            if kind in rows:
+                rows[kind].append(payload)
+            else:
+                session_ops.append((kind, payload))
+        
+        written = 0
+        for table, table_rows in rows.items():
+            if not table_rows:
+                continue
+            try:
+                self._append(conn, table, table_rows)
+                written += len(table_rows)
+            except Exception as e:
+                logger.error(f"Error writing {len(table_rows)} row(s) to {table}: {str(e)}")
+                with self.lock:
+                    self._stats['failed'] += len(table_rows)
+        
+        # Session updates depend on each other, so apply them in order
+        for kind, payload in session_ops:
+            try:
+                if kind == 'session_start':
+                    self._write_session_start(conn, *payload)
+                else:
+                    self._write_session_end(conn, *payload)
+                written += 1
+            except Exception as e:
+                logger.error(f"Error logging {kind.replace('_', ' ')}: {str(e)}")
+                with self.lock:
+                    self._stats['failed'] += 1
+        
+        with self.lock:
+            self._stats['written'] += written
+            self._stats['flushes'] += 1
+        logger.debug(f"Flushed {written} usage record(s)")
+    
+    def _append(self, conn: 'duckdb.DuckDBPyConnection', table: str, table_rows: List[tuple]):
+        """Insert rows into an append-only table as one Arrow (or pandas) batch."""
+        columns = APPEND_TABLES[table]
+        values = {col: [row[i] for row in table_rows] for i, col in enumerate(columns)}
+        batch = pa.table(values) if PYARROW_AVAILABLE else pd.DataFrame(values, columns=columns)
+        column_list = ', '.join(columns)
+        conn.register('usage_batch', batch)
+        try:
+            conn.execute(f"""
+                INSERT INTO {table} (id, {column_list})
+                SELECT nextval('{table}_id_seq'), {column_list} FROM usage_batch
+            """)
+        finally:
+            conn.unregister('usage_batch')
+    
+    def _write_session_start(self, conn: 'duckdb.DuckDBPyConnection', session_id: str, license_key: str,
+                             user_id: Optional[str], start_time: datetime):
+        # Check if session exists first (DuckDB doesn't support ON CONFLICT reliably)
+        existing = conn.execute("""
+            SELECT session_id FROM usage_sessions WHERE session_id = ?
+        """, [session_id]).fetchone()
+        
+        if existing:
+            # Update existing session (duplicate detected, update instead)
+            conn.execute("""
+                UPDATE usage_sessions
+                SET start_time = ?, status = 'active', license_key = ?, user_id = ?
+                WHERE session_id = ?
+            """, [start_time, license_key, user_id, session_id])
+            logger.debug(f"Updated existing session: {session_id}")
+        else:
+            conn.execute("""
+                INSERT INTO usage_sessions (session_id, license_key, user_id, start_time, status)
+                VALUES (?, ?, ?, ?, 'active')
+            """, [session_id, license_key, user_id, start_time])
+            logger.debug(f"Logged session start: {session_id}")
+    
+    def _write_session_end(self, conn: 'duckdb.DuckDBPyConnection', session_id: str, total_hours: float,
+                           total_seconds: float, end_time: datetime):
+        conn.execute("""
+            UPDATE usage_sessions
+            SET end_time = ?, total_hours = ?, total_seconds = ?, status = 'completed'
+            WHERE session_id = ?
+        """, [end_time, total_hours, total_seconds, session_id])
+        logger.debug(f"Logged session end: {session_id}, hours: {total_hours}")
     
     def get_usage_history(self, license_key: str, limit: int = 100) -> List[Dict]:
         """Get usage history for a license"""
         try:
-            conn = duckdb.connect(self.db_path)
-            result = conn.execute("""
-                SELECT * FROM usage_history
-                WHERE license_key = ?
-                ORDER BY deduction_time DESC
-                LIMIT ?
-            """, [license_key, limit]).fetchall()
+            conn = self._reader()
+            try:
+                result = conn.execute("""
+                    SELECT * FROM usage_history
+                    WHERE license_key = ?
+                    ORDER BY deduction_time DESC
+                    LIMIT ?
+                """, [license_key, limit]).fetchall()
+            finally:
+                conn.close()
             
             columns = ['id', 'license_key', 'session_id', 'hours_deducted', 'deduction_time',
                       'hours_remaining_before', 'hours_remaining_after', 'api_endpoint', 'created_at']
@@ -245,7 +502,6 @@ class UsageStorage:
             for row in result:
                 history.append(dict(zip(columns, row)))
             
-            conn.close()
             return history
         except Exception as e:
             logger.error(f"Error getting usage history: {str(e)}")
@@ -254,13 +510,16 @@ class UsageStorage:
     def get_payment_history(self, license_key: str, limit: int = 50) -> List[Dict]:
         """Get payment history for a license"""
         try:
-            conn = duckdb.connect(self.db_path)
-            result = conn.execute("""
-                SELECT * FROM payment_history
-                WHERE license_key = ?
-                ORDER BY payment_date DESC
-                LIMIT ?
-            """, [license_key, limit]).fetchall()
+            conn = self._reader()
+            try:
+                result = conn.execute("""
+                    SELECT * FROM payment_history
+                    WHERE license_key = ?
+                    ORDER BY payment_date DESC
+                    LIMIT ?
+                """, [license_key, limit]).fetchall()
+            finally:
+                conn.close()
             
             columns = ['id', 'license_key', 'stripe_session_id', 'payment_id', 'hours_purchased',
                       'amount_paid', 'currency', 'payment_status', 'payment_date', 'created_at']
@@ -269,7 +528,6 @@ class UsageStorage:
             for row in result:
                 history.append(dict(zip(columns, row)))
             
-            conn.close()
             return history
         except Exception as e:
             logger.error(f"Error getting payment history: {str(e)}")
@@ -278,13 +536,16 @@ class UsageStorage:
     def get_session_history(self, license_key: str, limit: int = 50) -> List[Dict]:
         """Get session history for a license"""
         try:
-            conn = duckdb.connect(self.db_path)
-            result = conn.execute("""
-                SELECT * FROM usage_sessions
-                WHERE license_key = ?
-                ORDER BY start_time DESC
-                LIMIT ?
-            """, [license_key, limit]).fetchall()
+            conn = self._reader()
+            try:
+                result = conn.execute("""
+                    SELECT * FROM usage_sessions
+                    WHERE license_key = ?
+                    ORDER BY start_time DESC
+                    LIMIT ?
+                """, [license_key, limit]).fetchall()
+            finally:
+                conn.close()
             
             columns = ['session_id', 'license_key', 'user_id', 'start_time', 'end_time',
                       'total_hours', 'total_seconds', 'api_endpoints', 'status', 'created_at']
@@ -293,7 +554,6 @@ class UsageStorage:
             for row in result:
                 sessions.append(dict(zip(columns, row)))
             
-            conn.close()
             return sessions
         except Exception as e:
             logger.error(f"Error getting session history: {str(e)}")
@@ -302,31 +562,31 @@ class UsageStorage:
     def get_access_stats(self, license_key: str, days: int = 30) -> Dict:
         """Get access statistics for a license"""
         try:
-            conn = duckdb.connect(self.db_path)
-            
-            # Total API calls (DuckDB doesn't support parameterized INTERVAL, use string formatting)
-            total_calls = conn.execute(f"""
-                SELECT COUNT(*) FROM access_logs
-                WHERE license_key = ? AND access_time >= CURRENT_TIMESTAMP - INTERVAL '{days}' DAYS
-            """, [license_key]).fetchone()[0]
-            
-            # Total hours used
-            total_hours = conn.execute(f"""
-                SELECT COALESCE(SUM(hours_deducted), 0) FROM usage_history
-                WHERE license_key = ? AND deduction_time >= CURRENT_TIMESTAMP - INTERVAL '{days}' DAYS
-            """, [license_key]).fetchone()[0]
-            
-            # Most used endpoints
-            top_endpoints = conn.execute(f"""
-                SELECT endpoint, COUNT(*) as count
-                FROM access_logs
-                WHERE license_key = ? AND access_time >= CURRENT_TIMESTAMP - INTERVAL '{days}' DAYS
-                GROUP BY endpoint
-                ORDER BY count DESC
-                LIMIT 10
-            """, [license_key]).fetchall()
-            
-            conn.close()
+            conn = self._reader()
+            try:
+                # Total API calls (DuckDB doesn't support parameterized INTERVAL, use string formatting)
+                total_calls = conn.execute(f"""
+                    SELECT COUNT(*) FROM access_logs
+                    WHERE license_key = ? AND access_time >= CURRENT_TIMESTAMP - INTERVAL '{days}' DAYS
+                """, [license_key]).fetchone()[0]
+                
+                # Total hours used
+                total_hours = conn.execute(f"""
+                    SELECT COALESCE(SUM(hours_deducted), 0) FROM usage_history
+                    WHERE license_key = ? AND deduction_time >= CURRENT_TIMESTAMP - INTERVAL '{days}' DAYS
+                """, [license_key]).fetchone()[0]
+                
+                # Most used endpoints
+                top_endpoints = conn.execute(f"""
+                    SELECT endpoint, COUNT(*) as count
+                    FROM access_logs
+                    WHERE license_key = ? AND access_time >= CURRENT_TIMESTAMP - INTERVAL '{days}' DAYS
+                    GROUP BY endpoint
+                    ORDER BY count DESC
+                    LIMIT 10
+                """, [license_key]).fetchall()
+            finally:
+                conn.close()
             
             return {
                 'total_api_calls': total_calls,
@@ -337,7 +597,14 @@ class UsageStorage:
         except Exception as e:
             logger.error(f"Error getting access stats: {str(e)}")
             return {}
+    
+    def _reader(self) -> 'duckdb.DuckDBPyConnection':
+        """Connection for one read (closed by the caller), after pending writes are flushed."""
+        self.flush(timeout=1.0)
+        return self._connect()
+
 
 # Global usage storage instance
 usage_storage = UsageStorage()
+atexit.register(usage_storage.close)
 
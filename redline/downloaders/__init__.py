@@ -8,6 +8,9 @@ from .yahoo_downloader import YahooDownloader
 from .stooq_downloader import StooqDownloader
 from .multi_source import MultiSourceDownloader
 from .generic_api_downloader import GenericAPIDownloader
+from .download_engine import DownloadEngine, DownloadReport, DownloadCancelled
+from .download_history import DownloadHistory, get_download_history
+from .response_cache import ResponseCache, CacheMiss, get_response_cache
 from .exceptions import RateLimitError
 
 # Conditionally export Massive.com downloader if available
@@ -23,6 +26,14 @@ try:
             'GenericAPIDownloader',
             'MassiveDownloader',
             'MassiveWebSocketClient',
+            'DownloadEngine',
+            'DownloadReport',
+            'DownloadCancelled',
+            'DownloadHistory',
+            'get_download_history',
+            'ResponseCache',
+            'CacheMiss',
+            'get_response_cache',
             'RateLimitError'
         ]
     except ImportError:
@@ -33,6 +44,14 @@ try:
             'MultiSourceDownloader',
             'GenericAPIDownloader',
             'MassiveDownloader',
+            'DownloadEngine',
+            'DownloadReport',
+            'DownloadCancelled',
+            'DownloadHistory',
+            'get_download_history',
+            'ResponseCache',
+            'CacheMiss',
+            'get_response_cache',
             'RateLimitError'
         ]
 except ImportError:
@@ -42,6 +61,14 @@ except ImportError:
         'StooqDownloader',
         'MultiSourceDownloader',
         'GenericAPIDownloader',
+        'DownloadEngine',
+        'DownloadReport',
+        'DownloadCancelled',
+        'DownloadHistory',
+        'get_download_history',
+        'ResponseCache',
+        'CacheMiss',
+        'get_response_cache',
         'RateLimitError'
     ]
 
@@ -4,12 +4,13 @@ REDLINE Alpha Vantage Downloader
 Downloads historical data from Alpha Vantage API.
 """
 
+import os
 import logging
 import pandas as pd
 import requests
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import Dict, Optional, Any
 from .base_downloader import BaseDownloader
 
 logger = logging.getLogger(__name__)
@@ -33,7 +34,9 @@ class AlphaVantageDownloader(BaseDownloader):
         # Rate limiting - Alpha Vantage allows 5 calls per minute for free
         self.last_request_time = 0
         self.min_request_interval = 12.0  # 12 seconds between requests (5 per minute)
-        # rate_limit_lock will be initialized by base class _rate_limit() method
+        self.pipelined_fetch = True
+        # Refreshes ask for the compact series when the local history is recent
+        self.incremental = True
     
     def download_single_ticker(self, ticker: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
@@ -51,73 +54,8 @@ class AlphaVantageDownloader(BaseDownloader):
             # Apply rate limiting
             self._rate_limit()
             
-            # Alpha Vantage API parameters
-            params = {
-                'function': 'TIME_SERIES_DAILY',
-                'symbol': ticker,
-                'outputsize': 'full',  # Get all available data
-                'apikey': self.api_key
-            }
-            
-            self.logger.info(f"Downloading {ticker} from Alpha Vantage...")
-            
-            # Make API request
-            response = requests.get(self.base_url, params=params, timeout=self.timeout)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check for API errors
-                if 'Error Message' in data:
-                    self.logger.error(f"Alpha Vantage API error: {data['Error Message']}")
-                    return pd.DataFrame()
-                
-                if 'Note' in data:
-                    self.logger.warning(f"Alpha Vantage API note: {data['Note']}")
-                    return pd.DataFrame()
-                
-                # Extract time series data
-                if 'Time Series (Daily)' in data:
-                    time_series = data['Time Series (Daily)']
-                    
-                    # Convert to DataFrame
-                    df = pd.DataFrame.from_dict(time_series, orient='index')
-                    df.index = pd.to_datetime(df.index)
-                    df = df.sort_index()
-                    
-                    # Rename columns to standard format
-                    df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-                    
-                    # Convert to numeric
-                    for col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                    
-                    # Filter by date range if provided
-                    if start_date:
-                        start_dt = pd.to_datetime(start_date)
-                        df = df[df.index >= start_dt]
-                    
-                    if end_date:
-                        end_dt = pd.to_datetime(end_date)
-                        df = df[df.index <= end_dt]
-                    
-                    if df.empty:
-                        self.logger.warning(f"No data found for {ticker} in specified date range")
-                        return pd.DataFrame()
-                    
-                    # Standardize the data
-                    standardized_data = self.standardize_alpha_vantage_data(df, ticker)
-                    
-                    self.logger.info(f"Downloaded {len(standardized_data)} records for {ticker}")
-                    return standardized_data
-                    
-                else:
-                    self.logger.error(f"No time series data found for {ticker}")
-                    return pd.DataFrame()
-                    
-            else:
-                self.logger.error(f"HTTP error {response.status_code} for {ticker}")
-                return pd.DataFrame()
+            response = self.fetch_raw(ticker, start_date, end_date)
+            return self.parse_raw(ticker, response, start_date, end_date)
                 
         except Exception as e:
             error_msg = str(e)
@@ -129,6 +67,112 @@ class AlphaVantageDownloader(BaseDownloader):
                 self.logger.error(f"Error downloading {ticker} from Alpha Vantage: {error_msg}")
             return pd.DataFrame()
     
+    def fetch_raw(self, ticker: str, start_date: str = None, end_date: str = None) -> requests.Response:
+        """
+        Request a ticker's daily series (the caller has taken a rate-limit token).
+        
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD) - not sent; a recent one selects the compact series
+            end_date: End date (YYYY-MM-DD) - not sent, Alpha Vantage returns up to the latest day
+            
+        Returns:
+            HTTP response
+        """
+        # Alpha Vantage API parameters
+        params = {
+            'function': 'TIME_SERIES_DAILY',
+            'symbol': ticker,
+            'outputsize': self._output_size(start_date),
+            'apikey': self.api_key
+        }
+        
+        self.logger.info(f"Downloading {ticker} from Alpha Vantage...")
+        
+        # Make API request; a 429 raises RateLimitError after blocking the source
+        return self._make_request(self.base_url, params=params)
+    
+    def _cacheable(self, response: requests.Response) -> bool:
+        """Alpha Vantage answers errors and quota notes with a 200; only a series is cached."""
+        try:
+            data = response.json()
+        except ValueError:
+            return False
+        return isinstance(data, dict) and not any(key in data for key in ('Error Message', 'Note', 'Information'))
+    
+    @staticmethod
+    def _output_size(start_date: str = None) -> str:
+        """'compact' (the latest 100 trading days) if that reaches back to start_date, else 'full'."""
+        # 100 trading days span a little over 140 calendar days
+        if start_date and datetime.strptime(start_date, '%Y-%m-%d') >= datetime.now() - timedelta(days=140):
+            return 'compact'
+        return 'full'
+    
+    def parse_raw(self, ticker: str, payload: requests.Response, start_date: str = None,
+                  end_date: str = None) -> pd.DataFrame:
+        """
+        Parse an Alpha Vantage daily series response.
+        
+        Args:
+            ticker: Stock ticker symbol
+            payload: Response from fetch_raw
+            start_date: Start date (YYYY-MM-DD) to keep from
+            end_date: End date (YYYY-MM-DD) to keep until
+            
+        Returns:
+            DataFrame with historical data
+        """
+        data = payload.json()
+        
+        # Check for API errors
+        if 'Error Message' in data:
+            self.logger.error(f"Alpha Vantage API error: {data['Error Message']}")
+            return pd.DataFrame()
+        
+        if 'Note' in data:
+            # Alpha Vantage reports an exhausted call quota as a Note
+            self.logger.warning(f"Alpha Vantage API note: {data['Note']}")
+            self._note_rate_limited(retry_after=60)
+            return pd.DataFrame()
+        
+        # Extract time series data
+        if 'Time Series (Daily)' not in data:
+            self.logger.error(f"No time series data found for {ticker}")
+            return pd.DataFrame()
+        
+        time_series = data['Time Series (Daily)']
+        
+        # Convert to DataFrame
+        df = pd.DataFrame.from_dict(time_series, orient='index')
+        df.index = pd.to_datetime(df.index)
+        df = df.sort_index()
+        
+        # Rename columns to standard format
+        df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+        
+        # Convert to numeric
+        for col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        # Filter by date range if provided
+        if start_date:
+            start_dt = pd.to_datetime(start_date)
+            df = df[df.index >= start_dt]
+        
+        if end_date:
+            end_dt = pd.to_datetime(end_date)
+            df = df[df.index <= end_dt]
+        
+        if df.empty:
+            self.logger.warning(f"No data found for {ticker} in specified date range")
+            return pd.DataFrame()
+        
+        # Standardize the data
+        standardized_data = self.standardize_alpha_vantage_data(df, ticker)
+        
+        self.logger.info(f"Downloaded {len(standardized_data)} records for {ticker}")
+        return standardized_data
+    
     def standardize_alpha_vantage_data(self, data: pd.DataFrame, ticker: str) -> pd.DataFrame:
         """
         Standardize Alpha Vantage data format.
@@ -180,51 +224,3 @@ class AlphaVantageDownloader(BaseDownloader):
             'historical_data': True,
             'real_time_data': False
         }
-    
-    def download_multiple_tickers(self, tickers: List[str], start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
-        """
-        Download data for multiple tickers from Alpha Vantage.
-        
-        Args:
-            tickers: List of ticker symbols
-            start_date: Start date (YYYY-MM-DD)
-            end_date: End date (YYYY-MM-DD)
-            
-        Returns:
-            Dictionary mapping ticker to DataFrame
-        """
-        results = {}
-        failed_tickers = []
-        
-        self.logger.info(f"Starting batch download of {len(tickers)} tickers from Alpha Vantage")
-        
-        for i, ticker in enumerate(tickers):
-            try:
-                self.logger.info(f"Downloading {ticker} ({i+1}/{len(tickers)})")
-                
-                # Download data
-                data = self.download_single_ticker(ticker, start_date, end_date)
-                
-                if not data.empty:
-                    results[ticker] = data
-                    self.stats['successful_requests'] += 1
-                    self.stats['total_data_points'] += len(data)
-                else:
-                    failed_tickers.append(ticker)
-                    self.stats['failed_requests'] += 1
-                
-                self.stats['total_requests'] += 1
-                self.stats['last_request_time'] = datetime.now()
-                
-            except Exception as e:
-                self.logger.error(f"Failed to download {ticker}: {str(e)}")
-                failed_tickers.append(ticker)
-                self.stats['failed_requests'] += 1
-                self.stats['total_requests'] += 1
-        
-        if failed_tickers:
-            self.logger.warning(f"Failed to download {len(failed_tickers)} tickers from Alpha Vantage: {', '.join(failed_tickers)}")
-        
-        return results
-
-
@@ -4,15 +4,23 @@ REDLINE Base Downloader
 Base class for all data downloaders with common functionality.
 """
 
+import os
 import logging
 import pandas as pd
 import requests
 import time
-import threading
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 
+from .download_engine import DownloadEngine, DownloadReport
+from .download_history import DownloadHistory, get_download_history, incremental_downloads_enabled
+from .exceptions import RateLimitError
+from .rate_limiter import get_rate_limiter, parse_retry_after, source_key
+from .response_cache import ResponseCache, get_response_cache
+
+DEFAULT_MAX_RATE_LIMIT_WAIT = 120.0
+
 logger = logging.getLogger(__name__)
 
 class BaseDownloader(ABC):
@@ -45,11 +53,34 @@ class BaseDownloader(ABC):
             'last_request_time': None
         }
         
-        # Rate limiting attributes (initialized by child classes if needed)
-        # Child classes can set: last_request_time, min_request_interval, rate_limit_lock
+        # Rate limiting: requests draw from a token bucket per source shared by
+        # all processes on the host (see rate_limiter). Child classes can set
+        # min_request_interval; REDLINE_RATE_LIMIT_<SOURCE> overrides it.
+        self.rate_limit_source = source_key(name)
         self.last_request_time = 0
         self.min_request_interval = None  # Will use rate_limit_delay if not set
-        self.rate_limit_lock = None  # Will be created on first use if needed
+        self.rate_limit_burst = 1
+        # Longest a request waits out a 429 before giving up with RateLimitError
+        self.max_rate_limit_wait = float(os.environ.get('REDLINE_RATE_LIMIT_MAX_WAIT', DEFAULT_MAX_RATE_LIMIT_WAIT))
+        
+        # Sources that implement fetch_raw/parse_raw set this so the download
+        # engine can parse one response while the next request is in flight
+        self.pipelined_fetch = False
+        
+        # Sources whose requests honour a date range set this so the download
+        # engine fetches only bars newer than the locally stored history
+        self.incremental = False
+        
+        # GET responses are answered from the on-disk response cache while
+        # fresh (see response_cache); None sends every request to the network
+        self.response_cache: Optional[ResponseCache] = get_response_cache()
+    
+    @property
+    def download_history(self) -> Optional[DownloadHistory]:
+        """The local bar history downloads of this source are merged into, if incremental."""
+        if not self.incremental or not incremental_downloads_enabled():
+            return None
+        return get_download_history()
     
     @abstractmethod
     def download_single_ticker(self, ticker: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
@@ -66,55 +97,90 @@ class BaseDownloader(ABC):
         """
         pass
     
-    def download_multiple_tickers(self, tickers: List[str], start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
+    def fetch_raw(self, ticker: str, start_date: str = None, end_date: str = None) -> Any:
         """
-        Download data for multiple tickers.
+        Fetch a ticker's raw payload (the network half of a pipelined download).
+        
+        Sources that set ``pipelined_fetch`` implement this and parse_raw; the
+        caller has already taken a rate-limit token.
         
         Args:
-            tickers: List of ticker symbols
+            ticker: Ticker symbol
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
             
         Returns:
-            Dictionary mapping ticker to DataFrame
+            Payload for parse_raw (typically the HTTP response)
         """
-        results = {}
-        failed_tickers = []
+        raise NotImplementedError(f"{self.name} does not split downloads into fetch and parse")
+    
+    def parse_raw(self, ticker: str, payload: Any, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """
+        Parse and standardize a payload from fetch_raw (the CPU half of a pipelined download).
         
-        self.logger.info(f"Starting download of {len(tickers)} tickers from {self.name}")
+        Args:
+            ticker: Ticker symbol
+            payload: Result of fetch_raw
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            
+        Returns:
+            DataFrame with ticker data
+        """
+        raise NotImplementedError(f"{self.name} does not split downloads into fetch and parse")
+    
+    def download_report(self, tickers: List[str], start_date: str = None, end_date: str = None,
+                        concurrency: int = None, progress_callback=None, cancel=None,
+                        start_callback=None) -> DownloadReport:
+        """
+        Download tickers concurrently and report each one's outcome and latency.
         
-        for i, ticker in enumerate(tickers):
-            try:
-                self.logger.info(f"Downloading {ticker} ({i+1}/{len(tickers)})")
-                
-                # Rate limiting
-                self._apply_rate_limit()
-                
-                # Download data
-                data = self.download_single_ticker(ticker, start_date, end_date)
-                
-                if not data.empty:
-                    results[ticker] = data
-                    self.stats['successful_requests'] += 1
-                    self.stats['total_data_points'] += len(data)
-                else:
-                    failed_tickers.append(ticker)
-                    self.stats['failed_requests'] += 1
-                
-                self.stats['total_requests'] += 1
-                self.stats['last_request_time'] = datetime.now()
-                
-            except Exception as e:
-                self.logger.error(f"Failed to download {ticker}: {str(e)}")
-                failed_tickers.append(ticker)
+        Args:
+            tickers: List of ticker symbols
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            concurrency: Requests in flight (defaults to REDLINE_DOWNLOAD_CONCURRENCY)
+            progress_callback: Called as (finished, total, TickerDownload) after each ticker
+            cancel: Returns True to stop starting new requests
+            start_callback: Called with each TickerDownload as its request starts
+            
+        Returns:
+            DownloadReport with one TickerDownload per ticker
+        """
+        self.logger.info(f"Starting download of {len(tickers)} tickers from {self.name}")
+        report = DownloadEngine(concurrency).download(self, tickers, start_date, end_date,
+                                                      progress_callback=progress_callback, cancel=cancel,
+                                                      start_callback=start_callback)
+        for item in report.downloads.values():
+            self.stats['total_requests'] += 1
+            if item.ok:
+                self.stats['successful_requests'] += 1
+                self.stats['total_data_points'] += item.rows
+            else:
                 self.stats['failed_requests'] += 1
-                self.stats['total_requests'] += 1
+        self.stats['last_request_time'] = datetime.now()
+        return report
+    
+    def download_multiple_tickers(self, tickers: List[str], start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
+        """
+        Download data for multiple tickers, several requests at a time.
+        
+        Args:
+            tickers: List of ticker symbols
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            
+        Returns:
+            Dictionary mapping ticker to DataFrame
+        """
+        report = self.download_report(tickers, start_date, end_date)
+        failed_tickers = report.failed
         
         if failed_tickers:
             self.logger.warning(f"Failed to download {len(failed_tickers)} tickers: {', '.join(failed_tickers)}")
         
-        self.logger.info(f"Download complete: {len(results)} successful, {len(failed_tickers)} failed")
-        return results
+        self.logger.info(f"Download complete: {len(report.results)} successful, {len(failed_tickers)} failed")
+        return report.results
     
     def download_bulk_data(self, tickers: List[str], start_date: str = None, end_date: str = None, 
                           batch_size: int = 10) -> Dict[str, pd.DataFrame]:
@@ -137,38 +203,28 @@ class BaseDownloader(ABC):
             batch = tickers[i:i + batch_size]
             self.logger.info(f"Processing batch {i//batch_size + 1} ({len(batch)} tickers)")
             
+            # Each batch downloads concurrently, paced by the rate limiter
             batch_results = self.download_multiple_tickers(batch, start_date, end_date)
             all_results.update(batch_results)
-            
-            # Longer delay between batches
-            if i + batch_size < len(tickers):
-                time.sleep(self.rate_limit_delay * 2)
         
         return all_results
     
     def _rate_limit(self):
         """
-        Enforce rate limiting between requests.
-        Uses threading locks for thread safety and time.time() for precision.
-        Child classes can override min_request_interval for custom rate limits.
-        """
-        # Initialize lock if not already created
-        if self.rate_limit_lock is None:
-            self.rate_limit_lock = threading.Lock()
+        Wait for this source's next request slot.
         
-        # Use min_request_interval if set by child class, otherwise use rate_limit_delay
+        Takes a token from the source's shared bucket, which refills at one
+        token per min_request_interval (or rate_limit_delay) seconds unless
+        REDLINE_RATE_LIMIT_<SOURCE> configures it. Threads and processes
+        downloading from the same source queue on the one bucket.
+        """
+        get_rate_limiter().acquire(self.rate_limit_source, rate=self._request_rate(), burst=self.rate_limit_burst)
+        self.last_request_time = time.time()
+    
+    def _request_rate(self) -> Optional[float]:
+        """Requests per second this downloader declares (None for the limiter's default)."""
         interval = self.min_request_interval if self.min_request_interval is not None else self.rate_limit_delay
-        
-        with self.rate_limit_lock:
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-            
-            if time_since_last_request < interval:
-                sleep_time = interval - time_since_last_request
-                self.logger.info(f"{self.name} rate limiting: sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-            
-            self.last_request_time = time.time()
+        return 1.0 / interval if interval and interval > 0 else None
     
     def _apply_rate_limit(self):
         """
@@ -177,10 +233,51 @@ class BaseDownloader(ABC):
         """
         self._rate_limit()
     
+    def _note_rate_limited(self, response: Optional[requests.Response] = None,
+                           retry_after: Optional[float] = None) -> float:
+        """
+        Record that the source refused a request for exceeding its rate limit.
+        
+        Blocks the source's bucket for the response's Retry-After (or
+        ``retry_after``, or a minute), so every process backs off together.
+        
+        Args:
+            response: The 429 response, if any
+            retry_after: Seconds to back off when the response gives none
+            
+        Returns:
+            Seconds until the source may be called again
+        """
+        if response is not None:
+            header = parse_retry_after(response.headers.get('Retry-After'))
+            retry_after = header if header is not None else retry_after
+        return get_rate_limiter().block(self.rate_limit_source, retry_after)
+    
+    def _check_rate_limited(self, response: requests.Response):
+        """
+        Raise RateLimitError if a response is a 429, after blocking the source.
+        
+        Args:
+            response: HTTP response
+        """
+        if response.status_code == 429:
+            retry_after = self._note_rate_limited(response)
+            raise RateLimitError(f"Rate limit exceeded for {self.name}.", retry_after=int(round(retry_after)),
+                                 source=self.rate_limit_source)
+    
     def _make_request(self, url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> requests.Response:
         """
         Make HTTP request with retry logic.
         
+        A fresh response in the response cache is returned without a
+        request, and the rate-limit token the caller took is given back. A
+        stale one is revalidated with its ETag/Last-Modified, and 200
+        answers the downloader deems cacheable are stored for the next caller.
+        
+        A 429 answer blocks the source for its Retry-After; the request is
+        retried once the block lifts if that is within max_rate_limit_wait,
+        otherwise RateLimitError is raised.
+        
         Args:
             url: Request URL
             params: Query parameters
@@ -188,7 +285,22 @@ class BaseDownloader(ABC):
             
         Returns:
             Response object
+            
+        Raises:
+            CacheMiss: In replay mode, if no response was recorded for the request
         """
+        cache = self.response_cache
+        cached = authorization = None
+        if cache is not None and cache.mode != 'off':
+            authorization = (headers or {}).get('Authorization') or self.session.headers.get('Authorization')
+            cached = cache.lookup(self.rate_limit_source, url, params, authorization)
+            if cached is not None and cached.fresh:
+                get_rate_limiter().refund(self.rate_limit_source, rate=self._request_rate(),
+                                          burst=self.rate_limit_burst)
+                return cached.response
+            if cached is not None:
+                headers = {**(headers or {}), **cached.validators()}
+        
         for attempt in range(self.max_retries):
             try:
                 if headers:
@@ -196,7 +308,20 @@ class BaseDownloader(ABC):
                 else:
                     response = self.session.get(url, params=params, timeout=self.timeout)
                 
+                if response.status_code == 429:
+                    retry_after = self._note_rate_limited(response)
+                    if attempt < self.max_retries - 1 and retry_after <= self.max_rate_limit_wait:
+                        self._rate_limit()
+                        continue
+                    raise RateLimitError(f"Rate limit exceeded for {self.name}.", retry_after=int(round(retry_after)),
+                                         source=self.rate_limit_source)
+                
+                if response.status_code == 304 and cached is not None:
+                    return cache.refresh(cached, response)
+                
                 response.raise_for_status()
+                if cache is not None and cache.mode != 'off' and self._cacheable(response):
+                    self._cache_response(url, params, response, authorization)
                 return response
                 
             except requests.exceptions.RequestException as e:
@@ -207,6 +332,23 @@ class BaseDownloader(ABC):
                 else:
                     raise
     
+    def _cacheable(self, response: requests.Response) -> bool:
+        """
+        Whether a 200 response carries data worth caching.
+        
+        Override in downloaders whose API answers errors or quota notices
+        with a 200, so those are not served from the cache afterwards.
+        """
+        return True
+    
+    def _cache_response(self, url: str, params: Optional[Dict[str, Any]], response: requests.Response,
+                        authorization: Optional[str]):
+        """Store a response in the response cache; a cache failure never fails the download."""
+        try:
+            self.response_cache.store(self.rate_limit_source, url, params, response, authorization)
+        except Exception as e:
+            self.logger.warning(f"Could not cache response from {self.name}: {str(e)}")
+    
     def standardize_data(self, data: pd.DataFrame, ticker: str, source: str = None) -> pd.DataFrame:
         """
         Standardize data format to REDLINE schema.
@@ -343,6 +485,8 @@ class BaseDownloader(ABC):
         stats['success_rate'] = (
             stats['successful_requests'] / max(stats['total_requests'], 1) * 100
         )
+        if self.response_cache is not None:
+            stats['cache'] = self.response_cache.get_stats().get(self.rate_limit_source)
         return stats
     
     def reset_statistics(self):
@@ -8,7 +8,6 @@ import logging
 import pandas as pd
 from typing import List, Dict, Optional, Union, Any
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 from .base_downloader import BaseDownloader
 from .multi_source import MultiSourceDownloader
@@ -95,11 +94,6 @@ class BulkDownloader(BaseDownloader):
             if self.progress_callback:
                 progress = (batch_end / total_tickers) * 100
                 self.progress_callback(progress, f"Processed {batch_end} of {total_tickers} tickers")
-            
-            # Rate limiting between batches
-            if batch_end < total_tickers:
-                import time
-                time.sleep(2)  # 2 second delay between batches
         
         self.logger.info(f"Bulk download complete: {len(results)} successful, {len(failed_tickers)} failed")
         return results
@@ -108,6 +102,9 @@ class BulkDownloader(BaseDownloader):
         """
         Download a batch of tickers in parallel.
         
+        Up to max_workers requests per source are in flight, paced by the
+        source's rate limiter; tickers a source fails fall back to the next.
+        
         Args:
             tickers: List of ticker symbols for this batch
             start_date: Start date (YYYY-MM-DD)
@@ -116,59 +113,23 @@ class BulkDownloader(BaseDownloader):
         Returns:
             Dictionary with 'successful' and 'failed' keys
         """
-        successful = {}
-        failed = []
-        
-        # Use ThreadPoolExecutor for parallel downloads
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all download tasks
-            future_to_ticker = {
-                executor.submit(self._download_with_error_handling, ticker, start_date, end_date): ticker
-                for ticker in tickers
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_ticker):
-                if self.cancel_requested:
-                    break
-                
-                ticker = future_to_ticker[future]
-                
-                try:
-                    result = future.result()
-                    if not result.empty:
-                        successful[ticker] = result
-                        
-                        with self.lock:
-                            self.stats['successful_requests'] += 1
-                            self.stats['total_data_points'] += len(result)
-                    else:
-                        failed.append(ticker)
-                        
-                        with self.lock:
-                            self.stats['failed_requests'] += 1
-                
-                except Exception as e:
-                    self.logger.error(f"Error in parallel download for {ticker}: {str(e)}")
-                    failed.append(ticker)
-                    
-                    with self.lock:
-                        self.stats['failed_requests'] += 1
-                
-                with self.lock:
-                    self.stats['total_requests'] += 1
-                    self.stats['last_request_time'] = datetime.now()
-        
+        report = self.multi_source.download_report(tickers, start_date, end_date, concurrency=self.max_workers,
+                                                   cancel=lambda: self.cancel_requested)
+        successful = report.results
+        failed = report.failed
+        
+        with self.lock:
+            self.stats['successful_requests'] += len(successful)
+            self.stats['total_data_points'] += sum(len(data) for data in successful.values())
+            self.stats['failed_requests'] += len(failed)
+            self.stats['total_requests'] += len(report.downloads)
+            self.stats['last_request_time'] = datetime.now()
+        
+        latency = report.latency_summary()
+        self.logger.info(f"Batch of {len(tickers)} tickers took {report.seconds:.2f}s "
+                         f"(ticker latency p50 {latency['p50']:.2f}s, max {latency['max']:.2f}s)")
         return {'successful': successful, 'failed': failed}
     
-    def _download_with_error_handling(self, ticker: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
-        """Download a single ticker with error handling."""
-        try:
-            return self.multi_source.download_single_ticker(ticker, start_date, end_date)
-        except Exception as e:
-            self.logger.error(f"Error downloading {ticker}: {str(e)}")
-            return pd.DataFrame()
-    
     def download_sector_data(self, sectors: List[str], start_date: str = None, end_date: str = None) -> Dict[str, Dict[str, pd.DataFrame]]:
         """
         Download data for all tickers in specified sectors.
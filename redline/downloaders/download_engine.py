@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+REDLINE Download Engine
+Downloads many tickers from one source concurrently.
+
+Each source keeps up to N requests in flight (REDLINE_DOWNLOAD_CONCURRENCY,
+or REDLINE_DOWNLOAD_CONCURRENCY_<SOURCE> for one source) on a pool of
+network threads sharing the downloader's keep-alive connections. The cap is
+held per process, so two batches for the same source share it, and every
+request still takes a token from the source's shared rate limiter first.
+
+Downloaders that split a download into ``fetch_raw`` (the request) and
+``parse_raw`` (decoding and standardising the payload) are pipelined: the
+network thread hands the raw payload to a separate parse pool and moves on
+to the next request. Other downloaders run ``download_single_ticker`` whole
+on the network threads.
+
+Sources marked ``incremental`` consult the local download history first
+(see download_history): a range already stored is served without a
+request, and otherwise only the bars after the last stored one are
+fetched. The fetched bars are upserted into the history, and the caller
+gets the requested range from it.
+
+Every ticker's rate-limit wait, fetch time, parse time and end-to-end
+latency is recorded in the returned DownloadReport.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import source_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4  # requests in flight per source
+DEFAULT_PARSE_WORKERS = 2
+
+
+class DownloadCancelled(Exception):
+    """Raised for tickers not started because the download was cancelled."""
+
+
+def source_concurrency(source: str) -> int:
+    """
+    Requests a source may have in flight at once in this process.
+
+    Reads REDLINE_DOWNLOAD_CONCURRENCY_<SOURCE>, then REDLINE_DOWNLOAD_CONCURRENCY.
+    """
+    for name in (f"REDLINE_DOWNLOAD_CONCURRENCY_{source_key(source).upper()}", 'REDLINE_DOWNLOAD_CONCURRENCY'):
+        value = os.environ.get(name)
+        if value:
+            try:
+                return max(1, int(value))
+            except ValueError:
+                logger.warning(f"Ignoring invalid {name}: {value!r}")
+    return DEFAULT_CONCURRENCY
+
+
+_source_slots: Dict[str, threading.BoundedSemaphore] = {}
+_source_slots_lock = threading.Lock()
+
+
+def _slots(source: str) -> threading.BoundedSemaphore:
+    """The per-process semaphore capping a source's requests in flight."""
+    source = source_key(source)
+    with _source_slots_lock:
+        if source not in _source_slots:
+            _source_slots[source] = threading.BoundedSemaphore(source_concurrency(source))
+        return _source_slots[source]
+
+
+@dataclass
+class TickerDownload:
+    """Outcome and timings of one ticker's download."""
+    ticker: str
+    source: str
+    data: Optional[pd.DataFrame] = field(default=None, repr=False)
+    error: Optional[BaseException] = None
+    wait_seconds: float = 0.0
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    latency_seconds: float = 0.0
+    fetch_mode: str = 'full'  # 'full', 'tail' (bars after the stored history) or 'local' (no request)
+    started_at: float = field(default=0.0, repr=False)
+    fetch_range: tuple = field(default=(None, None), repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.data is not None and not self.data.empty
+
+    @property
+    def rows(self) -> int:
+        return 0 if self.data is None else len(self.data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Outcome and timings without the data."""
+        return {
+            'ticker': self.ticker,
+            'source': self.source,
+            'success': self.ok,
+            'rows': self.rows,
+            'error': str(self.error) if self.error is not None else None,
+            'wait_seconds': round(self.wait_seconds, 4),
+            'fetch_seconds': round(self.fetch_seconds, 4),
+            'parse_seconds': round(self.parse_seconds, 4),
+            'latency_seconds': round(self.latency_seconds, 4),
+            'fetch_mode': self.fetch_mode
+        }
+
+
+@dataclass
+class DownloadReport:
+    """Per-ticker outcomes of a concurrent download, in request order."""
+    downloads: Dict[str, TickerDownload] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def results(self) -> Dict[str, pd.DataFrame]:
+        """Data of the tickers that downloaded."""
+        return {ticker: item.data for ticker, item in self.downloads.items() if item.ok}
+
+    @property
+    def failed(self) -> List[str]:
+        return [ticker for ticker, item in self.downloads.items() if not item.ok]
+
+    def latency_summary(self) -> Dict[str, float]:
+        """Count, mean, median, 95th percentile and maximum ticker latency in seconds."""
+        latencies = pd.Series([item.latency_seconds for item in self.downloads.values()], dtype='float64')
+        if latencies.empty:
+            return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        return {
+            'count': int(latencies.size),
+            'mean': round(float(latencies.mean()), 4),
+            'p50': round(float(latencies.quantile(0.5)), 4),
+            'p95': round(float(latencies.quantile(0.95)), 4),
+            'max': round(float(latencies.max()), 4)
+        }
+
+    def fetch_modes(self) -> Dict[str, int]:
+        """Tickers fetched in full, fetched from the end of the local history, and served locally."""
+        modes = {'full': 0, 'tail': 0, 'local': 0}
+        for item in self.downloads.values():
+            modes[item.fetch_mode] += 1
+        return modes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'seconds': round(self.seconds, 4),
+            'successful': len(self.downloads) - len(self.failed),
+            'failed': len(self.failed),
+            'latency': self.latency_summary(),
+            'fetch_modes': self.fetch_modes(),
+            'tickers': [item.to_dict() for item in self.downloads.values()]
+        }
+
+
+class DownloadEngine:
+    """Concurrent, pipelined downloads of many tickers from one source."""
+
+    def __init__(self, concurrency: Optional[int] = None, parse_workers: Optional[int] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            concurrency: Network threads per download (defaults to the
+                source's configured concurrency, see source_concurrency)
+            parse_workers: Threads parsing payloads (REDLINE_DOWNLOAD_PARSE_WORKERS,
+                default 2)
+        """
+        self.concurrency = concurrency
+        self.parse_workers = parse_workers or int(os.environ.get('REDLINE_DOWNLOAD_PARSE_WORKERS',
+                                                                 DEFAULT_PARSE_WORKERS))
+        self.logger = logging.getLogger(__name__)
+
+    def download(self, downloader, tickers: List[str], start_date: str = None, end_date: str = None,
+                 progress_callback: Optional[Callable[[int, int, TickerDownload], None]] = None,
+                 cancel: Optional[Callable[[], bool]] = None,
+                 start_callback: Optional[Callable[[TickerDownload], None]] = None) -> DownloadReport:
+        """
+        Download tickers from one source.
+
+        Args:
+            downloader: BaseDownloader for the source
+            tickers: Ticker symbols (duplicates are downloaded once)
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            progress_callback: Called as (finished, total, TickerDownload) after each ticker
+            cancel: Returns True to stop starting new requests; tickers not
+                started fail with DownloadCancelled
+            start_callback: Called with the TickerDownload as a network thread
+                starts on it (on that thread)
+
+        Returns:
+            DownloadReport with one TickerDownload per ticker
+        """
+        started = time.perf_counter()
+        source = downloader.rate_limit_source
+        report = DownloadReport({ticker: TickerDownload(ticker, source) for ticker in dict.fromkeys(tickers)})
+        if not report.downloads:
+            return report
+
+        workers = max(1, min(len(report.downloads), self.concurrency or source_concurrency(source)))
+        self._size_connection_pool(downloader, workers)
+        pipelined = getattr(downloader, 'pipelined_fetch', False)
+
+        network = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"redline-{source}")
+        parsers = ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix='redline-parse')
+        try:
+            pending = {
+                network.submit(self._fetch, downloader, item, start_date, end_date, pipelined, cancel, start_callback): item
+                for item in report.downloads.values()
+            }
+            finished = 0
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    payload = future.result()
+                    if payload is not None:
+                        pending[parsers.submit(self._parse, downloader, item, payload[0],
+                                               start_date, end_date)] = item
+                        continue
+                    finished += 1
+                    self.logger.debug(f"{item.ticker} from {source}: {item.rows} rows in "
+                                      f"{item.latency_seconds:.3f}s (wait {item.wait_seconds:.3f}s, "
+                                      f"fetch {item.fetch_seconds:.3f}s, parse {item.parse_seconds:.3f}s)")
+                    if progress_callback:
+                        progress_callback(finished, len(report.downloads), item)
+        finally:
+            network.shutdown(wait=True)
+            parsers.shutdown(wait=True)
+
+        report.seconds = time.perf_counter() - started
+        summary = report.latency_summary()
+        modes = report.fetch_modes()
+        self.logger.info(f"Downloaded {len(report.results)}/{len(report.downloads)} tickers from {source} "
+                         f"in {report.seconds:.2f}s with {workers} in flight "
+                         f"(latency p50 {summary['p50']:.2f}s, max {summary['max']:.2f}s; "
+                         f"{modes['tail']} incremental, {modes['local']} served locally)")
+        return report
+
+    def _fetch(self, downloader, item: TickerDownload, start_date, end_date, pipelined: bool,
+               cancel, start_callback) -> Optional[tuple]:
+        """
+        Network stage (runs on a network thread). A ticker's latency is
+        counted from here, when a network thread takes it up.
+
+        Returns:
+            (payload,) to hand to the parse stage, or None when the ticker is finished
+        """
+        slots = _slots(item.source)
+        item.started_at = queued = time.perf_counter()
+        with slots:
+            try:
+                if cancel is not None and cancel():
+                    raise DownloadCancelled(f"Download of {item.ticker} cancelled")
+                if start_callback is not None:
+                    start_callback(item)
+                history = downloader.download_history
+                item.fetch_range = (start_date, end_date)
+                if history is not None:
+                    fetch_range = history.plan(item.ticker, item.source, start_date, end_date)
+                    if fetch_range is None:
+                        item.fetch_mode = 'local'
+                        item.data = history.read(item.ticker, item.source, start_date, end_date)
+                        return None
+                    if fetch_range != item.fetch_range:
+                        item.fetch_mode, item.fetch_range = 'tail', fetch_range
+                if not pipelined:
+                    fetched = time.perf_counter()
+                    data = downloader.download_single_ticker(item.ticker, *item.fetch_range)
+                    item.fetch_seconds = time.perf_counter() - fetched
+                    item.data = self._store(history, item, data, start_date, end_date)
+                    return None
+                downloader._rate_limit()
+                fetched = time.perf_counter()
+                item.wait_seconds = fetched - queued
+                payload = downloader.fetch_raw(item.ticker, *item.fetch_range)
+                item.fetch_seconds = time.perf_counter() - fetched
+                return (payload,)
+            except DownloadCancelled as e:
+                item.error = e
+                return None
+            except Exception as e:
+                self.logger.error(f"Failed to download {item.ticker} from {item.source}: {str(e)}")
+                item.error = e
+                return None
+            finally:
+                item.latency_seconds = time.perf_counter() - item.started_at
+
+    def _parse(self, downloader, item: TickerDownload, payload, start_date, end_date) -> None:
+        """Parse stage (runs on a parse thread)."""
+        parsing = time.perf_counter()
+        try:
+            data = downloader.parse_raw(item.ticker, payload, *item.fetch_range)
+            item.data = self._store(downloader.download_history, item, data, start_date, end_date)
+        except Exception as e:
+            self.logger.error(f"Failed to parse {item.ticker} from {item.source}: {str(e)}")
+            item.error = e
+        finally:
+            item.parse_seconds = time.perf_counter() - parsing
+            item.latency_seconds = time.perf_counter() - item.started_at
+
+    @staticmethod
+    def _store(history, item: TickerDownload, data, start_date, end_date):
+        """Merge fetched bars into the history and return the requested range."""
+        if history is None:
+            return data
+        return history.upsert(item.ticker, item.source, data, item.fetch_range[0], start_date, end_date,
+                              fetch_end=item.fetch_range[1])
+
+    @staticmethod
+    def _size_connection_pool(downloader, size: int):
+        """Let the downloader's session keep a connection per network thread alive."""
+        session = getattr(downloader, 'session', None)
+        if not isinstance(session, requests.Session):
+            return
+        for prefix in ('https://', 'http://'):
+            adapter = session.get_adapter(prefix)
+            if getattr(adapter, '_pool_maxsize', 0) < size:
+                session.mount(prefix, HTTPAdapter(pool_connections=size, pool_maxsize=size))
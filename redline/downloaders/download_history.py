@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+REDLINE Download History
+Locally stored bars per (ticker, source), so repeat downloads fetch only what is new.
+
+Every bar a downloader returns is upserted into a Parquet file per source
+and ticker under REDLINE_DOWNLOAD_HISTORY_DIR (default
+data/downloaded/history), keyed by bar timestamp: a re-downloaded bar
+replaces the stored one. A SQLite index next to the files keeps each
+pair's watermark, meaning its last stored bar, the earliest date from
+which its history is known to run without gaps up to that bar, and
+whether that run holds the whole of the source's default range (it
+reaches back to the start of a fetch made without a start date).
+
+Before a download, ``plan`` compares the requested range with the
+watermark:
+- A range the history already covers is served locally, with no request,
+  unless it ends today: today's bar may still be provisional.
+- A range running past the last bar fetches only the tail, from the last
+  bar on. The last bar is fetched again, so a provisional bar is
+  corrected by the upsert.
+- A range starting before the covered history, or a pair with no
+  history, is fetched in full. So is a range with no start date (the
+  source's default history), unless the covered history holds one.
+
+Either way the caller gets the requested range from the merged history.
+A nightly refresh of thousands of tickers therefore asks each source for
+a day or two of bars per ticker instead of years.
+
+Set REDLINE_INCREMENTAL_DOWNLOADS=false to always fetch the full range.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+# Optional dependencies
+try:
+    import pyarrow  # noqa: F401 (Parquet engine for the history files)
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .rate_limiter import source_key
+
+logger = logging.getLogger(__name__)
+
+DateLike = Optional[str]
+
+
+def incremental_downloads_enabled() -> bool:
+    """Whether downloads consult the local history (REDLINE_INCREMENTAL_DOWNLOADS, default true)."""
+    return PYARROW_AVAILABLE and os.environ.get('REDLINE_INCREMENTAL_DOWNLOADS', 'true').lower() != 'false'
+
+
+def bar_timestamps(data: pd.DataFrame) -> Optional[pd.Series]:
+    """
+    Timestamps of a downloader's bars, whatever its output format.
+
+    Reads the Stooq-style <DATE> column (Yahoo, Stooq), a timestamp or date
+    column, or a DatetimeIndex (Alpha Vantage).
+
+    Args:
+        data: Downloaded bars
+
+    Returns:
+        Timezone-naive timestamps, one per row in row order, or None if the
+        bars carry no dates
+    """
+    if '<DATE>' in data.columns:
+        values = pd.to_datetime(data['<DATE>'].astype(str).str[:8], format='%Y%m%d', errors='coerce')
+    else:
+        column = next((col for col in ('timestamp', 'date', 'Date') if col in data.columns), None)
+        if column is not None:
+            values = pd.to_datetime(data[column], errors='coerce', utc=True).dt.tz_localize(None)
+        elif isinstance(data.index, pd.DatetimeIndex):
+            index = data.index.tz_convert(None) if data.index.tz is not None else data.index
+            values = pd.Series(index, index=data.index)
+        else:
+            return None
+    return pd.Series(values.to_numpy(), index=pd.RangeIndex(len(data)))
+
+
+def _day(value: pd.Timestamp) -> str:
+    return value.strftime('%Y-%m-%d')
+
+
+class DownloadHistory:
+    """Per-(ticker, source) bar history with watermarks, shared by every process on the host."""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the history.
+
+        Args:
+            root: Directory of the history files (defaults to
+                REDLINE_DOWNLOAD_HISTORY_DIR or data/downloaded/history)
+        """
+        self.root = root or os.environ.get('REDLINE_DOWNLOAD_HISTORY_DIR') or os.path.join(
+            os.getcwd(), 'data', 'downloaded', 'history')
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.root, exist_ok=True)
+        self.index_path = os.path.join(self.root, 'watermarks.sqlite')
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks ("
+                "source TEXT NOT NULL, ticker TEXT NOT NULL, covered_start TEXT, first_bar TEXT NOT NULL, "
+                "last_bar TEXT NOT NULL, rows INTEGER NOT NULL, updated REAL NOT NULL, "
+                "full_history INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (source, ticker))"
+            )
+            # Indexes written by earlier versions have no full_history column
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(watermarks)")]
+            if 'full_history' not in columns:
+                conn.execute("ALTER TABLE watermarks ADD COLUMN full_history INTEGER NOT NULL DEFAULT 0")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+
+    def path(self, ticker: str, source: str) -> str:
+        """Parquet file holding a pair's bars."""
+        safe_ticker = ''.join(ch if ch.isalnum() or ch in '.-_^=' else '_' for ch in ticker.upper())
+        return os.path.join(self.root, source_key(source), f"{safe_ticker}.parquet")
+
+    def watermark(self, ticker: str, source: str) -> Optional[Dict[str, Any]]:
+        """
+        A pair's watermark, or None.
+
+        Returns:
+            covered_start, first_bar, last_bar (YYYY-MM-DD), rows, and
+            full_history: whether the covered history holds the source's
+            default range
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT covered_start, first_bar, last_bar, rows, full_history FROM watermarks "
+                               "WHERE source = ? AND ticker = ?", (source_key(source), ticker.upper())).fetchone()
+        if row is None:
+            return None
+        return {'covered_start': row[0], 'first_bar': row[1], 'last_bar': row[2], 'rows': row[3],
+                'full_history': bool(row[4])}
+
+    def plan(self, ticker: str, source: str, start_date: DateLike = None,
+             end_date: DateLike = None) -> Optional[Tuple[DateLike, DateLike]]:
+        """
+        The range to fetch for a requested range.
+
+        Args:
+            ticker: Ticker symbol
+            source: Data source
+            start_date: Requested start date (YYYY-MM-DD)
+            end_date: Requested end date (YYYY-MM-DD)
+
+        Returns:
+            (start_date, end_date) to fetch, or None if the history covers the
+            request and it ends before today. A request without a start date
+            is covered only by a history holding the source's default range.
+        """
+        mark = self.watermark(ticker, source)
+        if mark is None or not os.path.exists(self.path(ticker, source)):
+            return start_date, end_date
+        if not start_date and not mark['full_history']:
+            return start_date, end_date
+        if start_date and (mark['covered_start'] is None or start_date < mark['covered_start']):
+            return start_date, end_date
+        if end_date and end_date <= mark['last_bar'] and end_date < _day(pd.Timestamp.now()):
+            return None
+        # Either past the last bar, or the last bar is today's and may still be provisional
+        return mark['last_bar'], end_date
+
+    def read(self, ticker: str, source: str, start_date: DateLike = None,
+             end_date: DateLike = None) -> pd.DataFrame:
+        """A pair's stored bars between two dates (inclusive), empty if none are stored."""
+        path = self.path(ticker, source)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return self._slice(pd.read_parquet(path), start_date, end_date)
+
+    def upsert(self, ticker: str, source: str, data: pd.DataFrame, fetch_start: DateLike = None,
+               start_date: DateLike = None, end_date: DateLike = None,
+               fetch_end: DateLike = None) -> pd.DataFrame:
+        """
+        Store fetched bars, replacing stored bars with the same timestamp.
+
+        Args:
+            ticker: Ticker symbol
+            source: Data source
+            data: Bars fetched from the source
+            fetch_start: Start date the bars were fetched from (None for the
+                source's default range)
+            start_date: Requested start date, to slice the result to
+            end_date: Requested end date, to slice the result to
+            fetch_end: End date the bars were fetched to (None for the
+                source's default range)
+
+        Returns:
+            The merged history between start_date and end_date; the fetched
+            bars unchanged if they cannot be stored
+        """
+        if data is None or data.empty:
+            return self.read(ticker, source, start_date, end_date)
+        fetched = bar_timestamps(data)
+        if fetched is None or fetched.isna().all():
+            self.logger.debug(f"Bars for {ticker} from {source} have no dates, not storing them")
+            return data
+
+        path = self.path(ticker, source)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        try:
+            # Serialises writers of the history across threads and processes
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT covered_start, last_bar, full_history FROM watermarks "
+                               "WHERE source = ? AND ticker = ?", (source_key(source), ticker.upper())).fetchone()
+            stored = pd.read_parquet(path) if row is not None and os.path.exists(path) else None
+            merged = self._merge(stored, data)
+            timestamps = bar_timestamps(merged)
+
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            merged.to_parquet(temp_path)
+            os.replace(temp_path, path)
+
+            covered_start = self._covered_start(row[:2] if row else None, fetch_start or _day(fetched.min()),
+                                                fetch_end or _day(fetched.max()))
+            # The covered history holds the default range if it reaches back to the start of a
+            # fetch without a start date, now or in the run it extends
+            full_history = ((not fetch_start and covered_start <= _day(fetched.min()))
+                            or (row is not None and bool(row[2]) and covered_start <= row[0]))
+            conn.execute("INSERT OR REPLACE INTO watermarks (source, ticker, covered_start, first_bar, last_bar, "
+                         "rows, updated, full_history) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (source_key(source), ticker.upper(), covered_start, _day(timestamps.min()),
+                          _day(timestamps.max()), len(merged), time.time(), int(full_history)))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.logger.warning(f"Could not store bars for {ticker} from {source}: {str(e)}")
+            return data
+        finally:
+            conn.close()
+
+        added = len(merged) - (len(stored) if stored is not None else 0)
+        self.logger.debug(f"Stored {len(data)} bars for {ticker} from {source} ({added} new, {len(merged)} total)")
+        return self._slice(merged, start_date, end_date)
+
+    def forget(self, ticker: str, source: str):
+        """Drop a pair's history, so its next download is a full one."""
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM watermarks WHERE source = ? AND ticker = ?",
+                         (source_key(source), ticker.upper()))
+        path = self.path(ticker, source)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pairs and bars stored, per source."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT source, COUNT(*), SUM(rows), MAX(last_bar) FROM watermarks "
+                                "GROUP BY source").fetchall()
+        return {
+            source: {'tickers': tickers, 'rows': int(total or 0), 'latest_bar': latest}
+            for source, tickers, total, latest in rows
+        }
+
+    @staticmethod
+    def _covered_start(row: Optional[Tuple[Optional[str], str]], fetch_start: str, fetch_end: str) -> str:
+        """
+        Start of the gapless history, from covered_start up to the last bar, after a fetch.
+
+        The fetched range extends the covered history only if the two meet;
+        a range apart from it leaves a gap that ``plan`` must not serve
+        locally. A range below the history leaves covered_start as it was,
+        a range past the last bar starts the covered history anew.
+        """
+        covered_start, last_bar = row if row else (None, None)
+        if covered_start is None:
+            return fetch_start
+        day = pd.Timedelta(days=1)
+        if pd.Timestamp(fetch_start) > pd.Timestamp(last_bar) + day:
+            return fetch_start
+        if pd.Timestamp(fetch_end) < pd.Timestamp(covered_start) - day:
+            return covered_start
+        return min(covered_start, fetch_start)
+
+    @staticmethod
+    def _merge(stored: Optional[pd.DataFrame], fetched: pd.DataFrame) -> pd.DataFrame:
+        """Stored and fetched bars, one per timestamp (the fetched one wins), in time order."""
+        keep_index = isinstance(fetched.index, pd.DatetimeIndex)
+        frames = [fetched] if stored is None or stored.empty else [stored, fetched]
+        merged = pd.concat(frames, ignore_index=not keep_index)
+        timestamps = bar_timestamps(merged)
+        keep = (timestamps.notna() & ~timestamps.duplicated(keep='last')).to_numpy()
+        merged, timestamps = merged[keep], timestamps[keep]
+        merged = merged.iloc[timestamps.to_numpy().argsort(kind='stable')]
+        return merged if keep_index else merged.reset_index(drop=True)
+
+    @staticmethod
+    def _slice(data: pd.DataFrame, start_date: DateLike, end_date: DateLike) -> pd.DataFrame:
+        if data.empty or not (start_date or end_date):
+            return data
+        timestamps = bar_timestamps(data)
+        if timestamps is None:
+            return data
+        mask = pd.Series(True, index=timestamps.index)
+        if start_date:
+            mask &= timestamps >= pd.Timestamp(start_date)
+        if end_date:
+            mask &= timestamps < pd.Timestamp(end_date) + pd.Timedelta(days=1)
+        return data[mask.to_numpy()]
+
+
+_download_history: Optional[DownloadHistory] = None
+_download_history_lock = threading.Lock()
+
+
+def get_download_history() -> DownloadHistory:
+    """
+    Get the process-wide download history.
+
+    Configured from the environment on first use:
+        REDLINE_DOWNLOAD_HISTORY_DIR     directory of the history files and watermarks (default: data/downloaded/history)
+        REDLINE_INCREMENTAL_DOWNLOADS    'false' to always fetch the full requested range
+    """
+    global _download_history
+    with _download_history_lock:
+        if _download_history is None:
+            _download_history = DownloadHistory()
+        return _download_history
@@ -4,12 +4,12 @@ REDLINE Finnhub Downloader
 Downloads historical data from Finnhub API.
 """
 
+import os
 import logging
 import pandas as pd
-import requests
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import Dict, Optional, Any
 from .base_downloader import BaseDownloader
 
 logger = logging.getLogger(__name__)
@@ -33,7 +33,6 @@ class FinnhubDownloader(BaseDownloader):
         # Rate limiting - Finnhub allows 60 calls per minute for free
         self.last_request_time = 0
         self.min_request_interval = 1.0  # 1 second between requests
-        # rate_limit_lock will be initialized by base class _rate_limit() method
     
     def download_single_ticker(self, ticker: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
@@ -71,7 +70,8 @@ class FinnhubDownloader(BaseDownloader):
             
             # Make API request
             url = f"{self.base_url}/stock/candle"
-            response = requests.get(url, params=params, timeout=self.timeout)
+            # Through the shared session and response cache; a 429 raises RateLimitError
+            response = self._make_request(url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -183,51 +183,3 @@ class FinnhubDownloader(BaseDownloader):
             'historical_data': True,
             'real_time_data': True
         }
-    
-    def download_multiple_tickers(self, tickers: List[str], start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
-        """
-        Download data for multiple tickers from Finnhub.
-        
-        Args:
-            tickers: List of ticker symbols
-            start_date: Start date (YYYY-MM-DD)
-            end_date: End date (YYYY-MM-DD)
-            
-        Returns:
-            Dictionary mapping ticker to DataFrame
-        """
-        results = {}
-        failed_tickers = []
-        
-        self.logger.info(f"Starting batch download of {len(tickers)} tickers from Finnhub")
-        
-        for i, ticker in enumerate(tickers):
-            try:
-                self.logger.info(f"Downloading {ticker} ({i+1}/{len(tickers)})")
-                
-                # Download data
-                data = self.download_single_ticker(ticker, start_date, end_date)
-                
-                if not data.empty:
-                    results[ticker] = data
-                    self.stats['successful_requests'] += 1
-                    self.stats['total_data_points'] += len(data)
-                else:
-                    failed_tickers.append(ticker)
-                    self.stats['failed_requests'] += 1
-                
-                self.stats['total_requests'] += 1
-                self.stats['last_request_time'] = datetime.now()
-                
-            except Exception as e:
-                self.logger.error(f"Failed to download {ticker}: {str(e)}")
-                failed_tickers.append(ticker)
-                self.stats['failed_requests'] += 1
-                self.stats['total_requests'] += 1
-        
-        if failed_tickers:
-            self.logger.warning(f"Failed to download {len(failed_tickers)} tickers from Finnhub: {', '.join(failed_tickers)}")
-        
-        return results
-
-
@@ -45,7 +45,6 @@ class GenericAPIDownloader(BaseDownloader):
         rate_limit_per_minute = api_config.get('rate_limit_per_minute', 60)
         self.min_request_interval = 60.0 / rate_limit_per_minute
         self.last_request_time = 0
-        # rate_limit_lock will be initialized by base class _rate_limit() method
         
         # Custom headers
         if api_config.get('headers'):
@@ -98,6 +97,7 @@ class GenericAPIDownloader(BaseDownloader):
             params.update(self.api_config.get('additional_params', {}))
             
             response = self.session.get(url, params=params, timeout=self.timeout)
+            self._check_rate_limited(response)
             response.raise_for_status()
             
             if self.response_format == 'csv':
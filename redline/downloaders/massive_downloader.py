@@ -28,6 +28,7 @@ class MassiveDownloader(BaseDownloader):
     def __init__(self, api_key: str, output_dir: str = "data", use_client_library: bool = True):
         """Initialize Massive.com downloader."""
         super().__init__("Massive.com", "https://api.massive.com")
+        self.rate_limit_source = 'massive'
         self.output_dir = output_dir
         self.api_key = api_key
         self.use_client_library = use_client_library and MASSIVE_AVAILABLE
@@ -54,6 +55,9 @@ class MassiveDownloader(BaseDownloader):
         # Rate limiting: Free=5/min, Paid=<100/sec, Default=10/min
         self.rate_limit_delay = 6.0  # 10 requests/minute (conservative default)
         
+        # Aggregates take a date range: fetch only bars newer than the local history
+        self.incremental = True
+        
     def download_single_ticker(self, ticker: str, start_date: str = None, 
                               end_date: str = None) -> pd.DataFrame:
         """Download historical data for a single ticker."""
@@ -100,16 +104,9 @@ class MassiveDownloader(BaseDownloader):
             if end_date:
                 params["end_date"] = end_date
             
+            # A 429 is retried after its Retry-After by _make_request
             response = self._make_request(url, params=params)
             
-            # Handle rate limiting (429 Too Many Requests)
-            if response.status_code == 429:
-                logger.warning("Rate limit exceeded, backing off for 60 seconds")
-                import time
-                time.sleep(60)
-                # Retry once
-                response = self._make_request(url, params=params)
-            
             if response.status_code != 200:
                 logger.error(f"API request failed: {response.status_code}")
                 return pd.DataFrame()
@@ -4,11 +4,13 @@ REDLINE Multi-Source Downloader
 Downloads data from multiple sources with fallback capabilities.
 """
 
+import time
 import logging
 import pandas as pd
 from typing import List, Dict, Optional, Union
 from datetime import datetime
 from .base_downloader import BaseDownloader
+from .download_engine import DownloadEngine, DownloadReport
 from .yahoo_downloader import YahooDownloader
 from .stooq_downloader import StooqDownloader
 import os
@@ -113,6 +115,69 @@ class MultiSourceDownloader(BaseDownloader):
         
         return pd.DataFrame()
     
+    def download_report(self, tickers: List[str], start_date: str = None, end_date: str = None,
+                        concurrency: int = None, progress_callback=None, cancel=None,
+                        start_callback=None, preferred_source: str = None) -> DownloadReport:
+        """
+        Download tickers concurrently from each source in turn.
+        
+        Every ticker goes to the first source; the ones it fails are retried
+        together on the next source, and so on.
+        
+        Args:
+            tickers: List of ticker symbols
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            concurrency: Requests in flight per source
+            progress_callback: Called as (finished, total, TickerDownload) after each attempt
+            cancel: Returns True to stop starting new requests
+            start_callback: Called with each TickerDownload as its request starts
+            preferred_source: Preferred source ('massive', 'yahoo', 'stooq')
+            
+        Returns:
+            DownloadReport holding each ticker's successful or last attempt
+        """
+        started = time.perf_counter()
+        report = DownloadReport()
+        remaining = list(dict.fromkeys(tickers))
+        
+        self.logger.info(f"Starting multi-source download of {len(remaining)} tickers")
+        
+        for source_name in self._get_source_order(preferred_source):
+            if not remaining or (cancel is not None and cancel()):
+                break
+            
+            self.logger.info(f"Trying {source_name} for {len(remaining)} tickers")
+            source_report = DownloadEngine(concurrency).download(
+                self.downloaders[source_name], remaining, start_date, end_date,
+                progress_callback=progress_callback, cancel=cancel, start_callback=start_callback)
+            
+            self.source_stats[source_name]['attempts'] += len(remaining)
+            for ticker, item in source_report.downloads.items():
+                report.downloads[ticker] = item
+                if item.ok:
+                    self.source_stats[source_name]['successes'] += 1
+                    # Add source metadata
+                    item.data['data_source'] = source_name
+                else:
+                    self.source_stats[source_name]['failures'] += 1
+            remaining = source_report.failed
+        
+        # Keep the order the tickers were requested in
+        report.downloads = {ticker: report.downloads[ticker] for ticker in dict.fromkeys(tickers)
+                            if ticker in report.downloads}
+        report.seconds = time.perf_counter() - started
+        
+        for item in report.downloads.values():
+            self.stats['total_requests'] += 1
+            if item.ok:
+                self.stats['successful_requests'] += 1
+                self.stats['total_data_points'] += item.rows
+            else:
+                self.stats['failed_requests'] += 1
+        self.stats['last_request_time'] = datetime.now()
+        return report
+    
     def download_multiple_tickers(self, tickers: List[str], start_date: str = None, end_date: str = None,
                                 preferred_source: str = None) -> Dict[str, pd.DataFrame]:
         """
@@ -127,37 +192,14 @@ class MultiSourceDownloader(BaseDownloader):
         Returns:
             Dictionary mapping ticker to DataFrame
         """
-        results = {}
-        failed_tickers = []
-        
-        self.logger.info(f"Starting multi-source download of {len(tickers)} tickers")
-        
-        for i, ticker in enumerate(tickers):
-            try:
-                self.logger.info(f"Downloading {ticker} ({i+1}/{len(tickers)})")
-                
-                # Download data with fallback
-                data = self.download_single_ticker(ticker, start_date, end_date, preferred_source)
-                
-                if not data.empty:
-                    results[ticker] = data
-                else:
-                    failed_tickers.append(ticker)
-                
-                self.stats['total_requests'] += 1
-                self.stats['last_request_time'] = datetime.now()
-                
-            except Exception as e:
-                self.logger.error(f"Failed to download {ticker}: {str(e)}")
-                failed_tickers.append(ticker)
-                self.stats['failed_requests'] += 1
-                self.stats['total_requests'] += 1
+        report = self.download_report(tickers, start_date, end_date, preferred_source=preferred_source)
+        failed_tickers = report.failed
         
         if failed_tickers:
             self.logger.warning(f"Failed to download {len(failed_tickers)} tickers: {', '.join(failed_tickers)}")
         
-        self.logger.info(f"Multi-source download complete: {len(results)} successful, {len(failed_tickers)} failed")
-        return results
+        self.logger.info(f"Multi-source download complete: {len(report.results)} successful, {len(failed_tickers)} failed")
+        return report.results
     
     def _get_source_order(self, preferred_source: str = None) -> List[str]:
         """Get ordered list of sources to try."""
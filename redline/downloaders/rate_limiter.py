@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+REDLINE Rate Limiter
+Per-source token buckets shared by every thread and process on the host.
+
+Each data source (yahoo, stooq, massive, ...) has one bucket holding up to
+``burst`` tokens that refill at ``rate`` tokens per second; a request takes
+one token. The bucket state lives in a small SQLite database
+(REDLINE_RATE_LIMIT_DB), updated inside an exclusive transaction, so four
+web workers and a CLI run on the same host draw from one budget instead of
+each assuming it owns the whole quota.
+
+A request that finds the bucket empty reserves the next token and sleeps
+until it is due, so concurrent callers queue in order rather than polling.
+When a source answers 429, ``block`` empties its bucket until the
+Retry-After time has passed; every caller then waits for that moment.
+
+Limits default to the interval each downloader declares and can be set per
+source with REDLINE_RATE_LIMIT_<SOURCE>="<requests>/<seconds>[,<burst>]",
+e.g. REDLINE_RATE_LIMIT_MASSIVE="5/60,5".
+"""
+
+import os
+import re
+import time
+import sqlite3
+import logging
+import tempfile
+import threading
+from contextlib import closing
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 1.0  # tokens per second
+DEFAULT_BURST = 1.0
+DEFAULT_RETRY_AFTER = 60.0
+
+_LIMIT_SPEC = re.compile(r'^\s*([\d.]+)\s*/\s*([\d.]+)\s*(?:,\s*([\d.]+))?\s*$')
+
+
+def source_key(name: str) -> str:
+    """Normalise a source name to a bucket key ('Alpha Vantage' -> 'alpha_vantage')."""
+    return re.sub(r'[^a-z0-9]+', '_', str(name).lower()).strip('_') or 'default'
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+        now: Current time (defaults to time.time())
+
+    Returns:
+        Seconds to wait (never negative), or None if the value is missing or invalid
+    """
+    if value is None or not str(value).strip():
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+def configured_limit(source: str) -> Optional[Tuple[float, float]]:
+    """
+    The (rate, burst) set for a source in the environment, if any.
+
+    Reads REDLINE_RATE_LIMIT_<SOURCE> as "<requests>/<seconds>[,<burst>]".
+    """
+    spec = os.environ.get(f"REDLINE_RATE_LIMIT_{source_key(source).upper()}")
+    if not spec:
+        return None
+    match = _LIMIT_SPEC.match(spec)
+    if not match or float(match.group(2)) <= 0 or float(match.group(1)) <= 0:
+        logger.warning(f"Ignoring invalid rate limit for {source}: {spec!r}")
+        return None
+    requests, seconds, burst = match.groups()
+    return float(requests) / float(seconds), float(burst) if burst else max(1.0, float(requests))
+
+
+class RateLimiter:
+    """Token buckets keyed by source, stored in SQLite so all processes share them."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            path: SQLite file holding the bucket state (defaults to
+                REDLINE_RATE_LIMIT_DB or <tmp>/redline_rate_limits.sqlite)
+        """
+        self.path = path or os.environ.get('REDLINE_RATE_LIMIT_DB') or os.path.join(
+            tempfile.gettempdir(), 'redline_rate_limits.sqlite')
+        self.logger = logging.getLogger(__name__)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "source TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, "
+                "blocked_until REAL NOT NULL DEFAULT 0)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _transaction(self, source: str, update) -> Any:
+        """Run update(row, now) -> (result, new row or None) on a source's bucket atomically."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT tokens, updated, blocked_until FROM buckets WHERE source = ?",
+                               (source,)).fetchone()
+            result, state = update(row, time.time())
+            if state is not None:
+                conn.execute("INSERT OR REPLACE INTO buckets (source, tokens, updated, blocked_until) "
+                             "VALUES (?, ?, ?, ?)", (source, *state))
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _limits(source: str, rate: Optional[float], burst: Optional[float]) -> Tuple[float, float]:
+        configured = configured_limit(source)
+        if configured is not None:
+            return configured
+        rate = rate if rate and rate > 0 else DEFAULT_RATE
+        return rate, max(1.0, burst or DEFAULT_BURST)
+
+    def reserve(self, source: str, tokens: float = 1.0, rate: Optional[float] = None,
+                burst: Optional[float] = None, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve tokens and return how long to wait before using them.
+
+        The bucket state is the token count at time ``updated``, which may lie
+        in the future when earlier callers have reserved tokens not yet due.
+
+        Args:
+            source: Bucket key (see source_key)
+            tokens: Tokens to take
+            rate: Refill rate in tokens/second, unless configured in the environment
+            burst: Bucket capacity, unless configured in the environment
+            max_wait: Do not reserve if the wait would be longer than this
+
+        Returns:
+            Seconds to wait, or None if that exceeds max_wait (nothing reserved)
+        """
+        source = source_key(source)
+        rate, burst = self._limits(source, rate, burst)
+
+        def update(row, now):
+            level, updated, blocked_until = row if row else (burst, now, 0.0)
+            if blocked_until > updated:
+                level, updated = 0.0, blocked_until
+            if updated < now:
+                level, updated = min(burst, level + (now - updated) * rate), now
+            ready = updated + max(0.0, tokens - level) / rate
+            wait = ready - now
+            if max_wait is not None and wait > max_wait:
+                return None, None
+            return wait, (max(level, tokens) - tokens, ready, blocked_until)
+
+        return self._transaction(source, update)
+
+    def acquire(self, source: str, tokens: float = 1.0, rate: Optional[float] = None,
+                burst: Optional[float] = None, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take tokens, sleeping until they are available.
+
+        Args:
+            source: Bucket key
+            tokens: Tokens to take
+            rate: Refill rate in tokens/second, unless configured in the environment
+            burst: Bucket capacity, unless configured in the environment
+            max_wait: Give up without waiting if the wait would exceed this
+
+        Returns:
+            Seconds waited, or None if the wait would exceed max_wait
+        """
+        wait = self.reserve(source, tokens, rate, burst, max_wait)
+        if wait is not None and wait > 0:
+            self.logger.info(f"{source} rate limiting: sleeping for {wait:.2f} seconds")
+            time.sleep(wait)
+        return wait
+
+    def refund(self, source: str, tokens: float = 1.0, rate: Optional[float] = None,
+               burst: Optional[float] = None):
+        """
+        Give back tokens taken for a request that was never sent (e.g. answered from a cache).
+
+        Reservations not yet due move forward; otherwise the bucket refills,
+        never beyond its capacity. A blocked source stays blocked.
+        """
+        source = source_key(source)
+        rate, burst = self._limits(source, rate, burst)
+
+        def update(row, now):
+            if row is None or row[2] > now:
+                return None, None
+            level, updated, blocked_until = row
+            if updated > now:
+                return None, (level, max(now, updated - tokens / rate), blocked_until)
+            level = min(burst, level + (now - updated) * rate + tokens)
+            return None, (level, now, blocked_until)
+
+        self._transaction(source, update)
+
+    def block(self, source: str, seconds: Optional[float] = None) -> float:
+        """
+        Empty a source's bucket until ``seconds`` from now (a 429 Retry-After).
+
+        A shorter block never shortens one already in force.
+
+        Returns:
+            Seconds until the source may be called again
+        """
+        source = source_key(source)
+        seconds = DEFAULT_RETRY_AFTER if seconds is None else max(0.0, float(seconds))
+
+        def update(row, now):
+            level, updated, blocked_until = row if row else (0.0, now, 0.0)
+            blocked_until = max(blocked_until, now + seconds)
+            return blocked_until - now, (level, updated, blocked_until)
+
+        remaining = self._transaction(source, update)
+        self.logger.warning(f"{source} rate limited by the server; blocked for {remaining:.0f} seconds")
+        return remaining
+
+    def blocked_for(self, source: str) -> float:
+        """Seconds until a blocked source may be called again (0 if not blocked)."""
+        source = source_key(source)
+        return self._transaction(source, lambda row, now: (max(0.0, row[2] - now) if row else 0.0, None))
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Current state of every bucket."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT source, tokens, updated, blocked_until FROM buckets").fetchall()
+        return {
+            source: {'tokens': tokens, 'next_free_in': max(0.0, updated - now),
+                     'blocked_for': max(0.0, blocked_until - now)}
+            for source, tokens, updated, blocked_until in rows
+        }
+
+    def reset(self, source: Optional[str] = None):
+        """Forget one bucket, or all of them."""
+        with closing(self._connect()) as conn:
+            if source is None:
+                conn.execute("DELETE FROM buckets")
+            else:
+                conn.execute("DELETE FROM buckets WHERE source = ?", (source_key(source),))
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide rate limiter.
+
+    Configured from the environment on first use:
+        REDLINE_RATE_LIMIT_DB          SQLite file shared by all processes (default: <tmp>/redline_rate_limits.sqlite)
+        REDLINE_RATE_LIMIT_<SOURCE>    "<requests>/<seconds>[,<burst>]" for one source
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
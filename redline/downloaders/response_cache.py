@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+REDLINE Response Cache
+On-disk cache of downloader HTTP responses, shared by every thread and process on the host.
+
+Successful GET responses are stored in SQLite (REDLINE_HTTP_CACHE_DB),
+keyed by a hash of the normalised request. The hash covers the URL with
+scheme and host lowercased and the query parameters, from the URL and the
+params dict, merged and sorted. It also covers the Authorization header,
+so callers with different credentials never share entries. API keys only
+ever appear in the hashed key, never in the stored URL.
+
+An entry is fresh for its source's TTL (REDLINE_HTTP_CACHE_TTL_<SOURCE>,
+else REDLINE_HTTP_CACHE_TTL, default 300 seconds; 0 disables caching for
+the source). An identical request made while an entry is fresh is answered
+from disk, without a request or a rate-limit token. When a stale entry
+carries an ETag or Last-Modified, the request is sent with If-None-Match /
+If-Modified-Since. A 304 answer renews the entry and serves the stored
+body. Responses marked Cache-Control: no-store are never kept.
+
+REDLINE_HTTP_CACHE selects the mode:
+    on       serve fresh entries, revalidate stale ones (default)
+    off      no caching
+    record   always request, and store every response whatever the TTL
+    replay   never touch the network: serve stored entries however old,
+             and raise CacheMiss for anything not stored (deterministic
+             tests and benchmarks against recorded responses)
+
+Hits, revalidations and misses are counted per source in the same
+database, so ``get_stats`` reports each source's hit rate across all
+workers.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .rate_limiter import source_key
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ('on', 'off', 'record', 'replay')
+DEFAULT_TTL = 300.0  # seconds an entry is served without revalidation
+DEFAULT_KEEP_SECONDS = 86400.0  # stale entries kept for revalidation this long
+_PRUNE_INTERVAL = 300.0
+
+# Query parameters that carry credentials; redacted from stored URLs
+_SECRET_PARAMS = ('token', 'key', 'secret', 'password', 'signature', 'auth')
+# Headers that describe the transfer rather than the content
+_DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection',
+                    'keep-alive', 'set-cookie')
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """Raised in replay mode for a request with no stored response."""
+
+
+def cache_mode() -> str:
+    """Response cache mode (REDLINE_HTTP_CACHE, default 'on')."""
+    mode = os.environ.get('REDLINE_HTTP_CACHE', 'on').lower()
+    if mode not in CACHE_MODES:
+        logger.warning(f"Unknown REDLINE_HTTP_CACHE {mode!r}, using 'on'")
+        return 'on'
+    return mode
+
+
+def source_ttl(source: str) -> float:
+    """
+    Seconds a source's responses stay fresh.
+
+    Reads REDLINE_HTTP_CACHE_TTL_<SOURCE>, then REDLINE_HTTP_CACHE_TTL.
+    """
+    for name in (f"REDLINE_HTTP_CACHE_TTL_{source_key(source).upper()}", 'REDLINE_HTTP_CACHE_TTL'):
+        value = os.environ.get(name)
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                logger.warning(f"Ignoring invalid {name}: {value!r}")
+    return DEFAULT_TTL
+
+
+def normalise_request(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Canonical form of a GET request: lowercase scheme and host, no fragment,
+    and the URL's query merged with ``params`` and sorted.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.extend((str(name), str(item)) for item in values)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/',
+                       urlencode(sorted(query)), ''))
+
+
+def _redact(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(name, '***' if any(secret in name.lower() for secret in _SECRET_PARAMS) else value)
+             for name, value in parse_qsl(parts.query, keep_blank_values=True)]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+@dataclass
+class CachedResponse:
+    """A stored response found for a request."""
+    key: str
+    source: str
+    response: requests.Response = field(repr=False)
+    fresh: bool
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate the entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """HTTP responses keyed by normalised request, in SQLite so all processes share them."""
+
+    def __init__(self, path: Optional[str] = None, mode: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file (defaults to REDLINE_HTTP_CACHE_DB or
+                <tmp>/redline_http_cache.sqlite)
+            mode: 'on', 'record' or 'replay' (defaults to REDLINE_HTTP_CACHE)
+        """
+        self.path = path or os.environ.get('REDLINE_HTTP_CACHE_DB') or os.path.join(
+            tempfile.gettempdir(), 'redline_http_cache.sqlite')
+        self.mode = mode or cache_mode()
+        self.keep_seconds = float(os.environ.get('REDLINE_HTTP_CACHE_KEEP_SECONDS', DEFAULT_KEEP_SECONDS))
+        self.logger = logging.getLogger(__name__)
+        self._pruned = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, source TEXT NOT NULL, url TEXT NOT NULL, status INTEGER NOT NULL, "
+                "headers TEXT NOT NULL, body BLOB NOT NULL, encoding TEXT, etag TEXT, last_modified TEXT, "
+                "stored REAL NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats ("
+                "source TEXT PRIMARY KEY, hits INTEGER NOT NULL DEFAULT 0, "
+                "revalidated INTEGER NOT NULL DEFAULT 0, misses INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @staticmethod
+    def request_key(url: str, params: Optional[Dict[str, Any]] = None,
+                    authorization: Optional[str] = None) -> str:
+        """Cache key of a GET request (a hash, so credentials are never stored)."""
+        material = f"GET {normalise_request(url, params)}\n{authorization or ''}"
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def lookup(self, source: str, url: str, params: Optional[Dict[str, Any]] = None,
+               authorization: Optional[str] = None) -> Optional[CachedResponse]:
+        """
+        Find the stored response for a request.
+
+        Counts a hit when the entry can be served as is, and a miss when
+        there is no entry or it must be revalidated or fetched again.
+
+        Args:
+            source: Data source
+            url: Request URL
+            params: Query parameters
+            authorization: Authorization header sent with the request
+
+        Returns:
+            The stored response (check ``fresh``), or None if nothing is stored
+            (always None in record mode)
+
+        Raises:
+            CacheMiss: In replay mode, if nothing is stored for the request
+        """
+        if self.mode == 'record':
+            return None
+        source = source_key(source)
+        key = self.request_key(url, params, authorization)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT url, status, headers, body, encoding, etag, last_modified, expires "
+                               "FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            if self.mode == 'replay':
+                self._count(source, 'misses')
+                raise CacheMiss(f"No recorded response for {_redact(normalise_request(url, params))}")
+            return None
+
+        stored_url, status, headers, body, encoding, etag, last_modified, expires = row
+        fresh = self.mode == 'replay' or (self.mode == 'on' and expires > time.time())
+        if fresh:
+            self._count(source, 'hits')
+        response = self._response(stored_url, status, headers, body, encoding)
+        return CachedResponse(key, source, response, fresh, etag, last_modified)
+
+    def store(self, source: str, url: str, params: Optional[Dict[str, Any]], response: requests.Response,
+              authorization: Optional[str] = None) -> bool:
+        """
+        Store a response fetched from the network (counted as a miss).
+
+        Only 200 answers are kept, and none marked Cache-Control: no-store
+        or from a source whose TTL is 0 (outside record mode).
+
+        Returns:
+            True if the response was stored
+        """
+        source = source_key(source)
+        self._count(source, 'misses')
+        ttl = source_ttl(source)
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if (response.status_code != 200 or response.content is None or 'no-store' in cache_control
+                or (ttl <= 0 and self.mode != 'record')):
+            return False
+
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in _DROPPED_HEADERS}
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT OR REPLACE INTO responses (key, source, url, status, headers, body, encoding, "
+                         "etag, last_modified, stored, expires) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (self.request_key(url, params, authorization), source,
+                          _redact(normalise_request(url, params)), response.status_code, json.dumps(headers),
+                          sqlite3.Binary(response.content), response.encoding, response.headers.get('ETag'),
+                          response.headers.get('Last-Modified'), now, now + ttl))
+        if now - self._pruned > _PRUNE_INTERVAL:
+            self.prune()
+        return True
+
+    def refresh(self, cached: CachedResponse, response: requests.Response) -> requests.Response:
+        """
+        Renew an entry the server confirmed unchanged (304) and return the stored response.
+
+        Args:
+            cached: Entry that was revalidated
+            response: The 304 response, whose validators replace the stored ones
+        """
+        now = time.time()
+        etag = response.headers.get('ETag') or cached.etag
+        last_modified = response.headers.get('Last-Modified') or cached.last_modified
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE responses SET expires = ?, etag = ?, last_modified = ? WHERE key = ?",
+                         (now + source_ttl(cached.source), etag, last_modified, cached.key))
+        self._count(cached.source, 'revalidated')
+        return cached.response
+
+    def prune(self) -> int:
+        """Delete entries stale for longer than REDLINE_HTTP_CACHE_KEEP_SECONDS; returns how many."""
+        self._pruned = time.time()
+        if self.mode == 'replay':
+            return 0
+        with closing(self._connect()) as conn:
+            return conn.execute("DELETE FROM responses WHERE expires < ?",
+                                (self._pruned - self.keep_seconds,)).rowcount
+
+    def clear(self, source: Optional[str] = None):
+        """Forget the stored responses and counts of one source, or of all."""
+        with closing(self._connect()) as conn:
+            if source is None:
+                conn.execute("DELETE FROM responses")
+                conn.execute("DELETE FROM stats")
+            else:
+                conn.execute("DELETE FROM responses WHERE source = ?", (source_key(source),))
+                conn.execute("DELETE FROM stats WHERE source = ?", (source_key(source),))
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per source: hits, revalidations, misses, hit rate, and entries and bytes stored."""
+        with closing(self._connect()) as conn:
+            counts = conn.execute("SELECT source, hits, revalidated, misses FROM stats").fetchall()
+            sizes = {source: (entries, size) for source, entries, size in conn.execute(
+                "SELECT source, COUNT(*), SUM(LENGTH(body)) FROM responses GROUP BY source").fetchall()}
+        stats = {}
+        for source, hits, revalidated, misses in counts:
+            entries, size = sizes.pop(source, (0, 0))
+            total = hits + revalidated + misses
+            stats[source] = {
+                'hits': hits,
+                'revalidated': revalidated,
+                'misses': misses,
+                # Requests answered without downloading the body
+                'hit_rate': round((hits + revalidated) / total, 4) if total else 0.0,
+                'entries': entries,
+                'bytes': int(size or 0)
+            }
+        for source, (entries, size) in sizes.items():
+            stats[source] = {'hits': 0, 'revalidated': 0, 'misses': 0, 'hit_rate': 0.0,
+                             'entries': entries, 'bytes': int(size or 0)}
+        return stats
+
+    def _count(self, source: str, counter: str):
+        with closing(self._connect()) as conn:
+            conn.execute(f"INSERT INTO stats (source, {counter}) VALUES (?, 1) "
+                         f"ON CONFLICT(source) DO UPDATE SET {counter} = {counter} + 1", (source,))
+
+    @staticmethod
+    def _response(url: str, status: int, headers: str, body: bytes, encoding: Optional[str]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.reason = 'OK'
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = bytes(body)
+        response.encoding = encoding
+        response.elapsed = timedelta(0)
+        response.from_cache = True
+        return response
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache, or None when caching is off.
+
+    Configured from the environment on first use:
+        REDLINE_HTTP_CACHE                 'on' (default), 'off', 'record' or 'replay'
+        REDLINE_HTTP_CACHE_DB              SQLite file shared by all processes (default: <tmp>/redline_http_cache.sqlite)
+        REDLINE_HTTP_CACHE_TTL[_<SOURCE>]  seconds a response stays fresh (default 300; 0 disables a source)
+        REDLINE_HTTP_CACHE_KEEP_SECONDS    how long stale entries are kept for revalidation (default 86400)
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None and cache_mode() != 'off':
+            _response_cache = ResponseCache()
+        return _response_cache
@@ -8,9 +8,11 @@ import logging
 import pandas as pd
 import requests
 import webbrowser
-from datetime import datetime, timedelta
+from io import StringIO
+from datetime import timedelta
 from typing import List, Dict, Optional, Any
 from .base_downloader import BaseDownloader
+from .exceptions import RateLimitError
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,22 @@ class StooqDownloader(BaseDownloader):
         # Stooq-specific configuration
         self.timeout = 15  # Shorter timeout for Stooq
         self.max_retries = 2  # Fewer retries due to 2FA issues
+        self.min_request_interval = 2.0  # One request every 2 seconds to avoid rate limiting
+        
+        # Stooq-specific headers
+        self.request_headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
+        
+        # The engine fetches the daily CSV endpoint and parses it on a separate thread,
+        # asking only for the bars newer than the local history
+        self.pipelined_fetch = True
+        self.incremental = True
         
         # Multiple endpoints to try
         self.endpoints = [
@@ -66,51 +84,35 @@ class StooqDownloader(BaseDownloader):
                     url = endpoint.format(ticker=ticker)
                     self.logger.info(f"Trying Stooq endpoint: {url}")
                     
-                    # Make request with Stooq-specific headers
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                        'Accept-Encoding': 'gzip, deflate',
-                        'Connection': 'keep-alive',
-                        'Upgrade-Insecure-Requests': '1'
-                    }
-                    
-                    response = self._make_request(url, headers=headers)
+                    self._rate_limit()
+                    response = self._make_request(url, headers=self.request_headers)
                     
                     # Check for bandwidth limit errors
-                    if response.status_code == 200:
-                        response_text_lower = response.text.lower()
-                        if 'bandwidth' in response_text_lower and 'limit' in response_text_lower:
-                            error_msg = "Stooq daily bandwidth limit exceeded. Please try again tomorrow or use manual download."
-                            self.logger.error(error_msg)
-                            print(f"\n⚠️  {error_msg}")
-                            print("   You can manually download from: https://stooq.com/q/d/l/?s={ticker}")
-                            print("   Files will auto-copy from your Downloads folder.\n")
-                            return pd.DataFrame()
+                    if response.status_code == 200 and self._bandwidth_exceeded(response.text):
+                        error_msg = "Stooq daily bandwidth limit exceeded. Please try again tomorrow or use manual download."
+                        self.logger.error(error_msg)
+                        print(f"\n⚠️  {error_msg}")
+                        print("   You can manually download from: https://stooq.com/q/d/l/?s={ticker}")
+                        print("   Files will auto-copy from your Downloads folder.\n")
+                        return pd.DataFrame()
                     
                     if response.status_code == 200:
                         # Try to parse as CSV
                         try:
-                            from io import StringIO
-                            csv_data = StringIO(response.text)
-                            data = pd.read_csv(csv_data)
-                            
-                            if not data.empty and self._is_valid_stooq_data(data):
-                                standardized_data = self.standardize_stooq_data(data, ticker)
-                                self.logger.info(f"Successfully downloaded {ticker} from Stooq")
+                            standardized_data = self._parse_csv(ticker, response)
+                            if not standardized_data.empty:
                                 return standardized_data
                                 
                         except Exception as e:
                             self.logger.warning(f"Failed to parse CSV from {url}: {str(e)}")
                             continue
-                    elif response.status_code == 429:
-                        # Rate limiting
-                        error_msg = "Stooq rate limit exceeded. Please wait a few minutes before trying again."
-                        self.logger.warning(error_msg)
-                        print(f"\n⚠️  {error_msg}\n")
-                        return pd.DataFrame()
                     
+                except RateLimitError as e:
+                    # The limiter now holds back Stooq requests until Retry-After
+                    error_msg = "Stooq rate limit exceeded. Please wait a few minutes before trying again."
+                    self.logger.warning(f"{error_msg} ({str(e)})")
+                    print(f"\n⚠️  {error_msg}\n")
+                    return pd.DataFrame()
                 except Exception as e:
                     self.logger.warning(f"Failed to access {url}: {str(e)}")
                     continue
@@ -123,6 +125,74 @@ class StooqDownloader(BaseDownloader):
             self.logger.error(f"Error downloading {ticker} from Stooq: {str(e)}")
             return pd.DataFrame()
     
+    def fetch_raw(self, ticker: str, start_date: str = None, end_date: str = None) -> requests.Response:
+        """
+        Request a ticker's daily CSV from the first endpoint (the caller has taken a rate-limit token).
+        
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD), sent as d1 (full history if None)
+            end_date: End date (YYYY-MM-DD), sent as d2
+            
+        Returns:
+            HTTP response
+        """
+        # Stooq limits daily bandwidth; d1/d2 trim the CSV to the requested range
+        params = {}
+        if start_date:
+            params['d1'] = start_date.replace('-', '')
+        if end_date:
+            params['d2'] = end_date.replace('-', '')
+        return self._make_request(self.endpoints[0].format(ticker=ticker), params=params or None,
+                                  headers=self.request_headers)
+    
+    def parse_raw(self, ticker: str, payload: requests.Response, start_date: str = None,
+                  end_date: str = None) -> pd.DataFrame:
+        """
+        Parse a Stooq CSV response.
+        
+        The daily endpoint does not serve every ticker, so if the response
+        holds no Stooq data the ticker is downloaded again with
+        download_single_ticker, which falls back to the other endpoints.
+        
+        Args:
+            ticker: Stock ticker symbol
+            payload: Response from fetch_raw
+            start_date: Start date (YYYY-MM-DD), for the fallback download
+            end_date: End date (YYYY-MM-DD), for the fallback download
+            
+        Returns:
+            Standardized DataFrame, empty if no endpoint has Stooq data
+        """
+        if self._bandwidth_exceeded(payload.text):
+            self.logger.error("Stooq daily bandwidth limit exceeded. Please try again tomorrow or use manual download.")
+            return pd.DataFrame()
+        
+        standardized_data = self._parse_csv(ticker, payload)
+        if standardized_data.empty:
+            self.logger.info(f"No daily Stooq data for {ticker}, trying the other endpoints")
+            return self.download_single_ticker(ticker, start_date, end_date)
+        return standardized_data
+    
+    def _parse_csv(self, ticker: str, payload: requests.Response) -> pd.DataFrame:
+        """Standardized data from a Stooq CSV response, empty if it holds none."""
+        try:
+            data = pd.read_csv(StringIO(payload.text))
+        except (pd.errors.EmptyDataError, pd.errors.ParserError):
+            return pd.DataFrame()
+        if data.empty or not self._is_valid_stooq_data(data):
+            return pd.DataFrame()
+        
+        standardized_data = self.standardize_stooq_data(data, ticker)
+        self.logger.info(f"Successfully downloaded {ticker} from Stooq")
+        return standardized_data
+    
+    @staticmethod
+    def _bandwidth_exceeded(text: str) -> bool:
+        """Check whether Stooq answered with its daily bandwidth limit page."""
+        text_lower = text.lower()
+        return 'bandwidth' in text_lower and 'limit' in text_lower
+    
     def _is_valid_stooq_data(self, data: pd.DataFrame) -> bool:
         """Check if the downloaded data is valid Stooq format."""
         required_columns = ['<TICKER>', '<DATE>', '<OPEN>', '<HIGH>', '<LOW>', '<CLOSE>', '<VOL>']
@@ -265,42 +335,13 @@ Alternative URL: https://stooq.com/historical/{ticker}/
         Returns:
             Dictionary mapping ticker to DataFrame
         """
-        results = {}
-        failed_tickers = []
-        
         self.logger.warning("Stooq download may fail due to 2FA requirements. Consider using manual download.")
         
-        for i, ticker in enumerate(tickers):
-            try:
-                self.logger.info(f"Downloading {ticker} ({i+1}/{len(tickers)})")
-                
-                # Longer delay for Stooq to avoid rate limiting
-                if i > 0:
-                    import time
-                    time.sleep(2)  # 2 second delay between requests
-                
-                # Download data
-                data = self.download_single_ticker(ticker, start_date, end_date)
-                
-                if not data.empty:
-                    results[ticker] = data
-                    self.stats['successful_requests'] += 1
-                    self.stats['total_data_points'] += len(data)
-                else:
-                    failed_tickers.append(ticker)
-                    self.stats['failed_requests'] += 1
-                
-                self.stats['total_requests'] += 1
-                self.stats['last_request_time'] = datetime.now()
-                
-            except Exception as e:
-                self.logger.error(f"Failed to download {ticker}: {str(e)}")
-                failed_tickers.append(ticker)
-                self.stats['failed_requests'] += 1
-                self.stats['total_requests'] += 1
+        report = self.download_report(tickers, start_date, end_date)
+        failed_tickers = report.failed
         
         if failed_tickers:
             self.logger.warning(f"Failed to download {len(failed_tickers)} tickers from Stooq: {', '.join(failed_tickers)}")
             self.logger.info("Consider using manual download or alternative data sources like Yahoo Finance.")
         
-        return results
+        return report.results
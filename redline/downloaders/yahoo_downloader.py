@@ -7,8 +7,8 @@ Downloads historical data from Yahoo Finance using yfinance library.
 import logging
 import os
 import pandas as pd
-import time
-from datetime import datetime, timedelta
+import requests
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Any
 from .base_downloader import BaseDownloader
 from .exceptions import RateLimitError
@@ -72,12 +72,10 @@ class YahooDownloader(BaseDownloader):
         
         # Rate limiting - increased delay to avoid rate limiting
         # Yahoo Finance is very aggressive with rate limiting, so we use longer delays
-        self.last_request_time = 0
+        self.rate_limit_source = 'yahoo'
         self.min_request_interval = 60.0  # 60 seconds (1 minute) between requests to avoid rate limiting
         self.rate_limit_backoff_multiplier = 2.0  # Double the delay after each rate limit
         self.max_request_interval = 600.0  # Maximum 10 minutes between requests
-        self.initial_delay = 10.0  # Wait 10 seconds before first request
-        # rate_limit_lock will be initialized by base class _rate_limit() method
         
         # Note: yfinance 0.2.66+ uses curl_cffi by default
         # Browser impersonation is disabled via YF_NO_BROWSER_IMPERSONATION=1 (set before import)
@@ -88,6 +86,14 @@ class YahooDownloader(BaseDownloader):
         self.date_handler = YahooDateHandler()
         self.error_handler = YahooErrorHandler()
         self.data_formatter = YahooDataFormatter()
+        
+        # Fetch through a Yahoo-compatible chart endpoint (a mirror, proxy or
+        # recorded-payload server) instead of yfinance when configured
+        self.chart_url = os.environ.get('REDLINE_YAHOO_CHART_URL')
+        # The engine parses and standardizes bars on a separate thread
+        self.pipelined_fetch = True
+        # and fetches only bars newer than the local history
+        self.incremental = True
     
     def download_single_ticker(self, ticker: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
@@ -102,138 +108,11 @@ class YahooDownloader(BaseDownloader):
             DataFrame with historical data
         """
         try:
-            # Apply rate limiting
-            # Add initial delay if this is the first request
-            if self.last_request_time == 0:
-                self.logger.info(f"Initial delay of {self.initial_delay} seconds before first Yahoo Finance request")
-                time.sleep(self.initial_delay)
-            
+            # Apply rate limiting (shared with every other Yahoo download on this host)
             self._rate_limit()
             
-            # Parse and validate dates using helper
-            start_dt, end_dt, start_date, end_date = self.date_handler.parse_and_validate_dates(start_date, end_date)
-            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)  # Normalize to midnight
-            
-            # Download data using yfinance
-            # yfinance 0.2.66+ uses curl_cffi by default (not requests)
-            # We removed CURL_IMPERSONATE=0 to avoid curl error 43
-            ticker_obj = yf.Ticker(ticker)
-            
-            try:
-                # Download historical data
-                # Note: yfinance's end parameter is exclusive, so we need to handle it carefully
-                if start_dt and end_dt:
-                    # If end date is today, use period-based approach to avoid future date issues
-                    if end_dt.date() == today.date():
-                        # End date is today - use period-based download to avoid future date issues
-                        days_diff = (end_dt - start_dt).days
-                        period = self.date_handler.calculate_period(days_diff)
-                        
-                        self.logger.debug(f"Using period-based download: {period} (date range: {days_diff} days)")
-                        data = ticker_obj.history(period=period)
-                        
-                        # If period-based fails, try using yesterday as end date (safer for yfinance)
-                        if data.empty:
-                            self.logger.debug(f"Period-based download returned empty, trying with yesterday as end date")
-                            yesterday = today - timedelta(days=1)
-                            end_dt_yesterday = yesterday
-                            end_dt_inclusive = end_dt_yesterday + timedelta(days=1)
-                            if end_dt_inclusive > today:
-                                end_dt_inclusive = today
-                            try:
-                                data = ticker_obj.history(start=start_dt, end=end_dt_inclusive)
-                                self.logger.debug(f"Date range download with yesterday end date succeeded")
-                            except Exception as fallback_error:
-                                self.logger.debug(f"Fallback to yesterday end date also failed: {fallback_error}")
-                        
-                        # Filter to the requested date range using helper
-                        data = self.date_handler.normalize_timezone(data, start_dt, end_dt)
-                    else:
-                        # End date is in the past - safe to add 1 day for inclusive end
-                        end_dt_inclusive = self.date_handler.get_inclusive_end_date(end_dt, today)
-                        data = ticker_obj.history(start=start_dt, end=end_dt_inclusive)
-                elif start_dt:
-                    data = ticker_obj.history(start=start_dt)
-                else:
-                    # Default to 1 year if no dates provided
-                    data = ticker_obj.history(period="1y")
-            except Exception as history_error:
-                # Use error handler to detect and handle errors
-                error_msg = str(history_error)
-                error_type, is_rate_limit = self.error_handler.detect_error_type(history_error, error_msg)
-                
-                if is_rate_limit:
-                    # Increase delay for next request with exponential backoff
-                    self.min_request_interval = min(
-                        self.min_request_interval * self.rate_limit_backoff_multiplier,
-                        self.max_request_interval
-                    )
-                    self.logger.warning(
-                        f"Rate limit detected for {ticker}. "
-                        f"Increasing delay to {self.min_request_interval:.1f} seconds"
-                    )
-                    # Raise RateLimitError with retry information
-                    raise self.error_handler.handle_rate_limit_error(ticker, self.min_request_interval)
-                elif error_type in ('yfinance_error', 'curl_error'):
-                    # yfinance/curl library error - raise with descriptive message
-                    self.logger.error(f"{error_type} for {ticker}: {error_msg}")
-                    helpful_msg = self.error_handler.create_error_message(error_type, error_msg, ticker)
-                    raise Exception(helpful_msg)
-                else:
-                    # Re-raise other errors
-                    raise
-            
-            # Normalize timezone-aware index to timezone-naive for consistency
-            data = self.data_formatter.normalize_timezone_index(data)
-            
-            # Check if data is empty - this could indicate rate limiting or no data
-            if data.empty:
-                # Check if this might be due to rate limiting or invalid date range
-                date_range_info = ""
-                if start_dt and end_dt:
-                    days_diff = (end_dt - start_dt).days
-                    date_range_info = f" for date range {start_date} to {end_date} ({days_diff} days)"
-                
-                # Check if date range might be the issue
-                if start_dt and end_dt:
-                    if days_diff < 7:
-                        self.logger.warning(
-                            f"No data found for ticker {ticker}{date_range_info}. "
-                            f"Date range is very short ({days_diff} days). "
-                            f"Try a longer date range (e.g., 1 year)."
-                        )
-                    elif end_dt > today:
-                        self.logger.warning(
-                            f"No data found for ticker {ticker}{date_range_info}. "
-                            f"End date is in the future. Try setting end date to today or earlier."
-                        )
-                    elif end_dt.date() == today.date():
-                        # End date is today - likely rate limiting or API issue
-                        self.logger.warning(
-                            f"No data found for ticker {ticker}{date_range_info}. "
-                            f"End date is today - this often indicates Yahoo Finance rate limiting. "
-                            f"Suggestions: (1) Wait 5-10 minutes and retry, (2) Use end date of yesterday, "
-                            f"(3) Try a shorter date range, or (4) Use Stooq data source instead."
-                        )
-                    else:
-                        self.logger.warning(
-                            f"No data found for ticker {ticker}{date_range_info}. "
-                            f"This might be due to: (1) Rate limiting, (2) Ticker delisted/no data, "
-                            f"or (3) Yahoo Finance API issues. Try a different date range or data source (e.g., Stooq)."
-                        )
-                else:
-                    self.logger.warning(
-                        f"No data found for ticker {ticker}. "
-                        f"This might be due to rate limiting or the ticker having no data. "
-                        f"Try a different date range or data source (e.g., Stooq)."
-                    )
-                return pd.DataFrame()
-            
-            # Standardize the data using formatter
-            standardized_data = self.data_formatter.standardize_data(data, ticker)
-            
-            self.logger.info(f"Downloaded {len(standardized_data)} records for {ticker}")
-            return standardized_data
+            data = self.fetch_raw(ticker, start_date, end_date)
+            return self.parse_raw(ticker, data, start_date, end_date)
             
         except RateLimitError:
             # Re-raise RateLimitError to be handled by route
@@ -252,6 +131,202 @@ class YahooDownloader(BaseDownloader):
             self.logger.error(f"Error downloading {ticker} from Yahoo Finance: {error_msg}")
             return pd.DataFrame()
     
+    def fetch_raw(self, ticker: str, start_date: str = None, end_date: str = None) -> Any:
+        """
+        Fetch a ticker's bars (the caller has taken a rate-limit token).
+        
+        Uses yfinance, or the chart endpoint at REDLINE_YAHOO_CHART_URL when set.
+        
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            
+        Returns:
+            yfinance history DataFrame, or the chart endpoint's HTTP response
+        """
+        # Parse and validate dates using helper
+        start_dt, end_dt, start_date, end_date = self.date_handler.parse_and_validate_dates(start_date, end_date)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)  # Normalize to midnight
+        
+        if self.chart_url:
+            return self._make_request(self.chart_url.format(ticker=ticker), params=self._chart_params(start_dt, end_dt))
+        
+        # Download data using yfinance
+        # yfinance 0.2.66+ uses curl_cffi by default (not requests)
+        # We removed CURL_IMPERSONATE=0 to avoid curl error 43
+        ticker_obj = yf.Ticker(ticker)
+        
+        try:
+            # Download historical data
+            # Note: yfinance's end parameter is exclusive, so we need to handle it carefully
+            if start_dt and end_dt:
+                # If end date is today, use period-based approach to avoid future date issues
+                if end_dt.date() == today.date():
+                    # End date is today - use period-based download to avoid future date issues
+                    days_diff = (end_dt - start_dt).days
+                    period = self.date_handler.calculate_period(days_diff)
+                    
+                    self.logger.debug(f"Using period-based download: {period} (date range: {days_diff} days)")
+                    data = ticker_obj.history(period=period)
+                    
+                    # If period-based fails, try using yesterday as end date (safer for yfinance)
+                    if data.empty:
+                        self.logger.debug(f"Period-based download returned empty, trying with yesterday as end date")
+                        yesterday = today - timedelta(days=1)
+                        end_dt_yesterday = yesterday
+                        end_dt_inclusive = end_dt_yesterday + timedelta(days=1)
+                        if end_dt_inclusive > today:
+                            end_dt_inclusive = today
+                        try:
+                            data = ticker_obj.history(start=start_dt, end=end_dt_inclusive)
+                            self.logger.debug(f"Date range download with yesterday end date succeeded")
+                        except Exception as fallback_error:
+                            self.logger.debug(f"Fallback to yesterday end date also failed: {fallback_error}")
+                    
+                    # Filter to the requested date range using helper
+                    data = self.date_handler.normalize_timezone(data, start_dt, end_dt)
+                else:
+                    # End date is in the past - safe to add 1 day for inclusive end
+                    end_dt_inclusive = self.date_handler.get_inclusive_end_date(end_dt, today)
+                    data = ticker_obj.history(start=start_dt, end=end_dt_inclusive)
+            elif start_dt:
+                data = ticker_obj.history(start=start_dt)
+            else:
+                # Default to 1 year if no dates provided
+                data = ticker_obj.history(period="1y")
+        except Exception as history_error:
+            # Use error handler to detect and handle errors
+            error_msg = str(history_error)
+            error_type, is_rate_limit = self.error_handler.detect_error_type(history_error, error_msg)
+            
+            if is_rate_limit:
+                # Increase delay for next request with exponential backoff
+                self.min_request_interval = min(
+                    self.min_request_interval * self.rate_limit_backoff_multiplier,
+                    self.max_request_interval
+                )
+                self.logger.warning(
+                    f"Rate limit detected for {ticker}. "
+                    f"Increasing delay to {self.min_request_interval:.1f} seconds"
+                )
+                # Raise RateLimitError with retry information, and hold back
+                # other Yahoo downloads on this host until then
+                error = self.error_handler.handle_rate_limit_error(ticker, self.min_request_interval)
+                self._note_rate_limited(retry_after=error.retry_after)
+                raise error
+            elif error_type in ('yfinance_error', 'curl_error'):
+                # yfinance/curl library error - raise with descriptive message
+                self.logger.error(f"{error_type} for {ticker}: {error_msg}")
+                helpful_msg = self.error_handler.create_error_message(error_type, error_msg, ticker)
+                raise Exception(helpful_msg)
+            else:
+                # Re-raise other errors
+                raise
+        
+        return data
+    
+    def parse_raw(self, ticker: str, payload: Any, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """
+        Standardize bars fetched by fetch_raw.
+        
+        Args:
+            ticker: Stock ticker symbol
+            payload: yfinance history DataFrame or chart endpoint response
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            
+        Returns:
+            DataFrame with historical data
+        """
+        data = self._chart_frame(payload.json()) if isinstance(payload, requests.Response) else payload
+        
+        # Normalize timezone-aware index to timezone-naive for consistency
+        data = self.data_formatter.normalize_timezone_index(data)
+        
+        # Check if data is empty - this could indicate rate limiting or no data
+        if data.empty:
+            start_dt, end_dt, start_date, end_date = self.date_handler.parse_and_validate_dates(start_date, end_date)
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            # Check if this might be due to rate limiting or invalid date range
+            date_range_info = ""
+            if start_dt and end_dt:
+                days_diff = (end_dt - start_dt).days
+                date_range_info = f" for date range {start_date} to {end_date} ({days_diff} days)"
+            
+            # Check if date range might be the issue
+            if start_dt and end_dt:
+                if days_diff < 7:
+                    self.logger.warning(
+                        f"No data found for ticker {ticker}{date_range_info}. "
+                        f"Date range is very short ({days_diff} days). "
+                        f"Try a longer date range (e.g., 1 year)."
+                    )
+                elif end_dt > today:
+                    self.logger.warning(
+                        f"No data found for ticker {ticker}{date_range_info}. "
+                        f"End date is in the future. Try setting end date to today or earlier."
+                    )
+                elif end_dt.date() == today.date():
+                    # End date is today - likely rate limiting or API issue
+                    self.logger.warning(
+                        f"No data found for ticker {ticker}{date_range_info}. "
+                        f"End date is today - this often indicates Yahoo Finance rate limiting. "
+                        f"Suggestions: (1) Wait 5-10 minutes and retry, (2) Use end date of yesterday, "
+                        f"(3) Try a shorter date range, or (4) Use Stooq data source instead."
+                    )
+                else:
+                    self.logger.warning(
+                        f"No data found for ticker {ticker}{date_range_info}. "
+                        f"This might be due to: (1) Rate limiting, (2) Ticker delisted/no data, "
+                        f"or (3) Yahoo Finance API issues. Try a different date range or data source (e.g., Stooq)."
+                    )
+            else:
+                self.logger.warning(
+                    f"No data found for ticker {ticker}. "
+                    f"This might be due to rate limiting or the ticker having no data. "
+                    f"Try a different date range or data source (e.g., Stooq)."
+                )
+            return pd.DataFrame()
+        
+        # Standardize the data using formatter
+        standardized_data = self.data_formatter.standardize_data(data, ticker)
+        
+        self.logger.info(f"Downloaded {len(standardized_data)} records for {ticker}")
+        return standardized_data
+    
+    def _chart_params(self, start_dt: Optional[datetime], end_dt: Optional[datetime]) -> Dict[str, Any]:
+        """Query parameters of a daily chart request for a date range (inclusive end)."""
+        params = {'interval': '1d', 'events': 'history'}
+        if start_dt:
+            params['period1'] = int(start_dt.replace(tzinfo=timezone.utc).timestamp())
+            params['period2'] = int(((end_dt or datetime.now()) + timedelta(days=1)).replace(tzinfo=timezone.utc).timestamp())
+        else:
+            params['range'] = '1y'
+        return params
+    
+    def _chart_frame(self, payload: Dict[str, Any]) -> pd.DataFrame:
+        """Bars of a chart endpoint response, shaped like a yfinance history frame."""
+        chart = payload.get('chart') or {}
+        results = chart.get('result') or []
+        if not results:
+            if chart.get('error'):
+                self.logger.error(f"Yahoo chart error: {chart['error']}")
+            return pd.DataFrame()
+        result = results[0]
+        quote = (result.get('indicators', {}).get('quote') or [{}])[0]
+        index = pd.to_datetime(result.get('timestamp') or [], unit='s', utc=True)
+        timezone_name = result.get('meta', {}).get('exchangeTimezoneName')
+        if timezone_name:
+            index = index.tz_convert(timezone_name)
+        return pd.DataFrame({
+            'Open': quote.get('open'),
+            'High': quote.get('high'),
+            'Low': quote.get('low'),
+            'Close': quote.get('close'),
+            'Volume': quote.get('volume')
+        }, index=pd.DatetimeIndex(index, name='Date'))
+    
     def get_ticker_info(self, ticker: str) -> Dict[str, Any]:
         """
         Get additional information about a ticker.
@@ -321,56 +396,25 @@ class YahooDownloader(BaseDownloader):
             
         Returns:
             Dictionary mapping ticker to DataFrame
+            
+        Raises:
+            RateLimitError: If Yahoo rate limited the batch and nothing downloaded
         """
-        results = {}
-        failed_tickers = []
+        report = self.download_report(tickers, start_date, end_date)
+        failed_tickers = report.failed
         
-        self.logger.info(f"Starting Yahoo Finance download of {len(tickers)} tickers")
-        
-        for i, ticker in enumerate(tickers):
-            try:
-                self.logger.info(f"Downloading {ticker} ({i+1}/{len(tickers)})")
-                
-                # Yahoo Finance has rate limits, so we add a small delay
-                if i > 0:
-                    import time
-                    time.sleep(0.5)  # 500ms delay between requests
-                
-                # Download data
-                data = self.download_single_ticker(ticker, start_date, end_date)
-                
-                if not data.empty:
-                    results[ticker] = data
-                    self.stats['successful_requests'] += 1
-                    self.stats['total_data_points'] += len(data)
-                else:
-                    failed_tickers.append(ticker)
-                    self.stats['failed_requests'] += 1
-                
-                self.stats['total_requests'] += 1
-                self.stats['last_request_time'] = datetime.now()
-                
-            except RateLimitError as e:
-                # Rate limit error - propagate to caller
-                self.logger.warning(f"Rate limited while downloading {ticker}: {e.message}")
-                failed_tickers.append(ticker)
-                self.stats['failed_requests'] += 1
-                self.stats['total_requests'] += 1
-                # If this is the first rate limit error, raise it to stop batch processing
-                # Otherwise, continue with other tickers
-                if len(failed_tickers) == 1:
-                    raise
-            except Exception as e:
-                self.logger.error(f"Failed to download {ticker}: {str(e)}")
-                failed_tickers.append(ticker)
-                self.stats['failed_requests'] += 1
-                self.stats['total_requests'] += 1
+        rate_limited = [report.downloads[ticker].error for ticker in failed_tickers
+                        if isinstance(report.downloads[ticker].error, RateLimitError)]
+        if rate_limited and not report.results:
+            # Rate limit error - propagate to caller
+            self.logger.warning(f"Rate limited while downloading {len(rate_limited)} tickers: {rate_limited[0].message}")
+            raise rate_limited[0]
         
         if failed_tickers:
             self.logger.warning(f"Failed to download {len(failed_tickers)} tickers: {', '.join(failed_tickers)}")
         
-        self.logger.info(f"Yahoo Finance download complete: {len(results)} successful, {len(failed_tickers)} failed")
-        return results
+        self.logger.info(f"Yahoo Finance download complete: {len(report.results)} successful, {len(failed_tickers)} failed")
+        return report.results
     
     def get_supported_periods(self) -> List[str]:
         """Get list of supported data periods."""
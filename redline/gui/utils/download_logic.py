@@ -131,10 +131,7 @@ class DownloadLogicHelper:
                         df = self.download_tab.multi_downloader.download_from_source("yahoo", ticker, start_date, end_date)
                         source_name = "Multi-Source"
                     
-                    # Add delay to avoid rate limiting
-                    if i < total_tickers - 1:  # Don't delay after last ticker
-                        import time
-                        time.sleep(0.5)  # 0.5 second delay
+                    # The downloaders pace themselves through the shared rate limiter
                     
                     # Process results
                     if df is not None and not df.empty:
@@ -9,6 +9,8 @@ import pandas as pd
 from typing import Optional
 import tkinter as tk
 
+from ...core.time_index import TIME_COLUMN, is_time_sorted, slice_date_range
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +49,15 @@ class FilterLogicHelper:
                 self.logger.info(f"Using date column: {date_col}")
                 self.logger.info(f"Date column type: {filtered_data[date_col].dtype}")
                 
+                if date_col == TIME_COLUMN and is_time_sorted(filtered_data) and (start_date or end_date):
+                    # Loaded frames are sorted by time: binary-search the range
+                    try:
+                        filtered_data = slice_date_range(filtered_data, start_date or None, end_date or None)
+                        self.logger.info(f"Applied date range filter (sorted index): {start_date} to {end_date}")
+                    except Exception as e:
+                        self.logger.warning(f"Failed to apply date range filter: {str(e)}")
+                    start_date = end_date = ''
+                
                 if start_date:
                     try:
                         start_dt = pd.to_datetime(start_date)
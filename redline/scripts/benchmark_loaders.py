@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CSV/TXT loading engines of DataLoadingService.
+
+Generates a synthetic Stooq-format file (or uses the one given) and times
+the chunked pandas path against the multi-process Arrow parser.
+
+Usage:
+    python -m redline.scripts.benchmark_loaders --rows 2000000 --workers 4
+    python -m redline.scripts.benchmark_loaders --file data/stooq/aapl.us.txt
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from redline.core.data_loading_service import DataLoadingService
+from redline.core.parallel_csv_loader import ParallelCSVLoader, get_parse_pool
+
+
+def write_stooq_file(path: str, rows: int):
+    """Write a synthetic Stooq TXT file with ``rows`` data rows."""
+    timestamps = pd.date_range('2000-01-03 09:00', periods=rows, freq='min')
+    rng = np.random.default_rng(42)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    pd.DataFrame({
+        '<TICKER>': np.repeat(['AAPL.US', 'MSFT.US', 'NVDA.US', 'SPY.US'], -(-rows // 4))[:rows],
+        '<PER>': 5,
+        '<DATE>': timestamps.strftime('%Y%m%d'),
+        '<TIME>': timestamps.strftime('%H%M%S'),
+        '<OPEN>': close.round(4),
+        '<HIGH>': (close + 0.5).round(4),
+        '<LOW>': (close - 0.5).round(4),
+        '<CLOSE>': close.round(4),
+        '<VOL>': rng.integers(100, 100000, rows),
+        '<OPENINT>': 0,
+    }).to_csv(path, index=False)
+
+
+def time_engine(service: DataLoadingService, path: str, engine: str, repeat: int) -> float:
+    """Best wall-clock time of ``repeat`` loads with one engine."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = service.load_file(path, 'txt', engine=engine)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {engine:<9} {best:8.3f}s  {len(data):>10,} rows  {data.memory_usage(deep=False).sum() / 1e6:8.1f} MB")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark REDLINE CSV/TXT loading engines')
+    parser.add_argument('--file', help='Existing Stooq/CSV file to load (default: generate one)')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows to generate')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Parser processes')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per engine (best is reported)')
+    args = parser.parse_args()
+
+    os.environ['REDLINE_PARSE_WORKERS'] = str(args.workers)
+    temp_dir = None
+    path = args.file
+    if path is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, 'bench.us.txt')
+        write_stooq_file(path, args.rows)
+
+    print(f"{path}: {os.path.getsize(path) / 1e6:.1f} MB, {args.workers} workers")
+    # Start the worker processes before timing
+    get_parse_pool(ParallelCSVLoader().workers)
+
+    service = DataLoadingService()
+    # Time the large-file (chunked) path rather than the frame cache
+    service.max_file_size_mb = 0
+    baseline = time_engine(service, path, 'pandas', args.repeat)
+    parallel = time_engine(service, path, 'parallel', args.repeat)
+    print(f"  speedup   {baseline / parallel:8.2f}x")
+
+    if temp_dir is not None:
+        temp_dir.cleanup()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark appending one day of bars to a large shared DuckDB table.
+
+Builds a tickers_data table of synthetic daily bars with the indexes that
+OptimizedDatabaseConnector.create_indexes creates, then times adding one
+new day for every ticker by rewriting the table (the old DROP/CREATE save
+path) against write_frame's append and upsert modes.
+
+Usage:
+    python -m redline.scripts.benchmark_upsert --rows 100000000 --tickers 10000
+    python -m redline.scripts.benchmark_upsert --rows 1000000 --skip-replace
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from redline.database.shared_tables import write_frame
+
+INDEXES = [
+    "CREATE INDEX idx_tickers_data_ticker ON tickers_data(ticker)",
+    "CREATE INDEX idx_tickers_data_timestamp ON tickers_data(timestamp)",
+    "CREATE INDEX idx_tickers_data_ticker_timestamp ON tickers_data(ticker, timestamp)",
+]
+
+
+def build_table(path: str, rows: int, tickers: int):
+    """Write a tickers_data table with ``rows`` bars spread over ``tickers`` tickers."""
+    days = -(-rows // tickers)
+    conn = duckdb.connect(path)
+    conn.execute(f"""
+        CREATE TABLE tickers_data AS
+        SELECT 'T' || lpad(CAST(i % {tickers} AS VARCHAR), 5, '0') AS ticker,
+               TIMESTAMP '1990-01-01' + INTERVAL (i // {tickers}) DAY AS timestamp,
+               100 + (i % 97) * 0.5 AS open, 101 + (i % 97) * 0.5 AS high,
+               99 + (i % 97) * 0.5 AS low, 100 + (i % 89) * 0.5 AS close,
+               CAST(1000 + i % 5000 AS DOUBLE) AS vol
+        FROM range({rows}) t(i)
+    """)
+    for index_sql in INDEXES:
+        conn.execute(index_sql)
+    conn.close()
+    return days
+
+
+def new_day(tickers: int, day: int) -> pd.DataFrame:
+    """One bar per ticker for the day after the last one in the table."""
+    rng = np.random.default_rng(day)
+    close = 100 + rng.standard_normal(tickers)
+    return pd.DataFrame({
+        'ticker': [f"T{i:05d}" for i in range(tickers)],
+        'timestamp': pd.Timestamp('1990-01-01') + pd.Timedelta(days=day),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'vol': rng.integers(100, 100000, tickers).astype(float)
+    })
+
+
+def time_rewrite(path: str, day: pd.DataFrame) -> float:
+    """Old save path: rebuild the whole table with the new rows, then its indexes."""
+    conn = duckdb.connect(path)
+    start = time.perf_counter()
+    conn.register('new_rows', day)
+    conn.execute("CREATE TABLE rebuilt AS SELECT * FROM tickers_data UNION ALL SELECT * FROM new_rows")
+    conn.execute("DROP TABLE tickers_data")
+    conn.execute("ALTER TABLE rebuilt RENAME TO tickers_data")
+    for index_sql in INDEXES:
+        conn.execute(index_sql)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def time_mode(path: str, day: pd.DataFrame, mode: str) -> float:
+    """Append or upsert one day with write_frame."""
+    conn = duckdb.connect(path)
+    start = time.perf_counter()
+    write_frame(conn, 'tickers_data', day, mode)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark appending one day to a shared DuckDB table')
+    parser.add_argument('--rows', type=int, default=10_000_000, help='Rows in the existing table')
+    parser.add_argument('--tickers', type=int, default=5000, help='Tickers (rows in the new day)')
+    parser.add_argument('--skip-replace', action='store_true', help='Skip the full-table rewrite')
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        base = os.path.join(temp_dir, 'base.duckdb')
+        start = time.perf_counter()
+        days = build_table(base, args.rows, args.tickers)
+        print(f"Built {args.rows:,} rows ({args.tickers:,} tickers x {days:,} days) "
+              f"in {time.perf_counter() - start:.1f}s, {os.path.getsize(base) / 1e6:.0f} MB")
+
+        day = new_day(args.tickers, days)
+        modes = ['append', 'upsert'] if args.skip_replace else ['replace', 'append', 'upsert']
+        for mode in modes:
+            path = os.path.join(temp_dir, f'{mode}.duckdb')
+            shutil.copy(base, path)
+            elapsed = time_rewrite(path, day) if mode == 'replace' else time_mode(path, day, mode)
+            print(f"  {mode:<8} {elapsed:8.3f}s")
+            os.remove(path)
+        # The first upsert builds the unique key index; later days only touch it
+        path = os.path.join(temp_dir, 'upsert.duckdb')
+        shutil.copy(base, path)
+        time_mode(path, day, 'upsert')
+        print(f"  upsert (key index present) {time_mode(path, new_day(args.tickers, days + 1), 'upsert'):8.3f}s")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
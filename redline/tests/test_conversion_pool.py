@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+REDLINE Conversion Pool Tests
+Tests for parallel batch conversion jobs.
+"""
+
+import unittest
+import tempfile
+import shutil
+import time
+import os
+import sys
+import pandas as pd
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.background.conversion_pool import ConversionPool, ConversionJobStore
+
+
+class TestConversionPool(unittest.TestCase):
+    """Test cases for ConversionPool class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start one pool for all tests (spawning workers is slow)."""
+        cls.store_dir = tempfile.mkdtemp()
+        cls.store = ConversionJobStore(os.path.join(cls.store_dir, 'jobs.sqlite'))
+        cls.pool = ConversionPool(workers=2, memory_budget_mb=1, store=cls.store)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the worker processes."""
+        cls.pool.shutdown()
+        shutil.rmtree(cls.store_dir, ignore_errors=True)
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.items = []
+        for n in range(4):
+            path = os.path.join(self.temp_dir, f'ticker{n}.csv')
+            pd.DataFrame({'ticker': [f'T{n}'] * (n + 1), 'close': range(n + 1)}).to_csv(path, index=False)
+            self.items.append({
+                'input_path': path,
+                'output_path': os.path.join(self.temp_dir, 'out', f'ticker{n}.parquet'),
+                'output_format': 'parquet',
+                'meta': {'input_file': f'ticker{n}.csv'}
+            })
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_run_reports_every_file(self):
+        """Each file finishes with a progress event; failures do not stop the job."""
+        self.items.append({'input_path': os.path.join(self.temp_dir, 'missing.csv'),
+                           'output_path': os.path.join(self.temp_dir, 'out', 'missing.parquet'),
+                           'output_format': 'parquet'})
+        events = []
+        job = self.pool.run(self.items, progress_callback=events.append,
+                            errors=[{'input_file': 'rejected.csv', 'error': 'Output file already exists'}])
+
+        self.assertEqual(job.status, 'SUCCESS')
+        self.assertEqual((job.completed, job.failed, job.total), (4, 2, 6))
+        self.assertEqual(sorted(r['records'] for r in job.results), [1, 2, 3, 4])
+        self.assertEqual(len(pd.read_parquet(self.items[3]['output_path'])), 4)
+        self.assertEqual([e['event'] for e in events].count('file_completed'), 4)
+        self.assertEqual(events[-1]['event'], 'job_completed')
+
+    def test_submit_returns_job_id(self):
+        """Submitted jobs run in the background and can be looked up by id."""
+        job_id = self.pool.submit(self.items)
+        deadline = time.time() + 60
+        while not self.pool.get_job(job_id).done and time.time() < deadline:
+            time.sleep(0.05)
+        result = self.pool.get_job(job_id).to_dict()
+        self.assertEqual(result['status'], 'SUCCESS')
+        self.assertEqual(result['successful'], 4)
+        self.assertEqual(result['progress'], 100)
+        self.assertIsNone(self.pool.get_job('unknown'))
+
+        # Another process's pool (another web worker) sees the same job
+        other = ConversionPool(workers=1, store=ConversionJobStore(self.store.path))
+        self.assertEqual(other.get_job(job_id).to_dict(), result)
+
+    def test_broken_pool_fails_each_unfinished_file(self):
+        """A pool failure records one error per file not yet finished, with the file's meta."""
+        class BrokenExecutor:
+            def submit(self, *args, **kwargs):
+                future = Future()
+                future.set_exception(BrokenProcessPool('A worker died'))
+                return future
+
+        pool = ConversionPool(workers=2, store=self.store)
+        with mock.patch.object(pool, '_get_executor', return_value=BrokenExecutor()):
+            job = pool.run(self.items)
+
+        self.assertEqual(job.status, 'FAILURE')
+        self.assertEqual((job.completed, job.failed), (0, 4))
+        self.assertEqual(sorted(e['input_file'] for e in job.errors),
+                         [f'ticker{n}.csv' for n in range(4)])
+        self.assertTrue(all('A worker died' in e['error'] for e in job.errors))
+        self.assertEqual(self.store.get(job.job_id).failed, 4)
+
+    def test_running_job_is_not_saved_per_file(self):
+        """A quick job is saved when submitted and when finished, not after every file."""
+        pool = ConversionPool(workers=1, store=self.store)
+        with mock.patch.object(pool, '_get_executor', return_value=None), \
+                mock.patch.object(self.store, 'save', wraps=self.store.save) as save:
+            job = pool.run(self.items)
+        self.assertEqual(job.completed, 4)
+        self.assertEqual(save.call_count, 2)
+        self.assertEqual(self.store.get(job.job_id).completed, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
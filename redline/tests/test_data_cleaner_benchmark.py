@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+REDLINE Data Cleaner Regression Tests
+Checks the vectorised cleaning paths stay correct, keep numeric dtypes and
+agree with the per-row string implementations they replaced.
+
+Set REDLINE_BENCH_ROWS (e.g. 200000) to also check they beat those
+implementations on a frame of that many rows.
+"""
+
+import unittest
+import timeit
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.data_cleaner import DataCleaner
+
+BENCH_ROWS = int(os.environ.get('REDLINE_BENCH_ROWS', 0))
+PARITY_ROWS = 5_000
+
+
+def _stooq(rows):
+    """A synthetic Stooq frame of minute bars and its expected timestamps."""
+    rng = np.random.default_rng(7)
+    timestamps = pd.date_range('2005-01-03', periods=rows, freq='min')
+    close = 100 + rng.standard_normal(rows).cumsum()
+    stooq = pd.DataFrame({
+        '<TICKER>': 'AAPL.US',
+        '<DATE>': timestamps.strftime('%Y%m%d').astype(np.int64),
+        '<TIME>': timestamps.strftime('%H%M%S').astype(np.int64),
+        '<OPEN>': close,
+        '<HIGH>': close + 0.5,
+        '<LOW>': close - 0.5,
+        '<CLOSE>': close,
+        '<VOL>': rng.integers(100, 100000, rows),
+    })
+    return stooq, pd.Series(timestamps)
+
+
+def _string_parse(stooq):
+    """The replaced timestamp parse: concatenate date and time strings, then parse them."""
+    text = stooq['<DATE>'].astype(str) + ' ' + stooq['<TIME>'].astype(str).str.zfill(6)
+    return pd.to_datetime(text, format='%Y%m%d %H%M%S', errors='coerce')
+
+
+def _messy(stooq):
+    """Close prices as objects with a missing-value marker every thousand rows."""
+    messy = stooq['<CLOSE>'].astype(object)
+    messy.iloc[::1000] = 'n/a'
+    return messy
+
+
+def _per_element(messy):
+    """The replaced numeric cleaning: to_numeric, then a per-element apply."""
+    cleaned = pd.to_numeric(messy, errors='coerce')
+    return cleaned.apply(lambda x: float(x) if pd.notnull(x) else None)
+
+
+class TestDataCleanerBenchmark(unittest.TestCase):
+    """Regression tests for DataCleaner on Stooq-shaped data."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one synthetic Stooq frame shared by all tests."""
+        cls.stooq, cls.expected_timestamps = _stooq(PARITY_ROWS)
+        cls.cleaner = DataCleaner()
+
+    def test_standardize_txt_columns(self):
+        """Timestamps are exact and OHLCV columns keep float64/int64 dtypes."""
+        result = self.cleaner.standardize_txt_columns(self.stooq)
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result['timestamp']))
+        pd.testing.assert_series_equal(result['timestamp'].dt.as_unit('ns'),
+                                       self.expected_timestamps.dt.as_unit('ns'), check_names=False)
+        for col in ('open', 'high', 'low', 'close'):
+            self.assertEqual(result[col].dtype, np.float64)
+        self.assertEqual(result['vol'].dtype, np.int64)
+
+    def test_stooq_timestamps_match_string_parse(self):
+        """Arithmetic date/time assembly gives the timestamps the string parse gave."""
+        result = self.cleaner.stooq_timestamps(self.stooq['<DATE>'], self.stooq['<TIME>'])
+        # pandas 3 parses to microseconds; compare the instants, not the unit
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result))
+        pd.testing.assert_series_equal(result.dt.as_unit('ns'), _string_parse(self.stooq).dt.as_unit('ns'))
+
+    def test_clean_and_select_columns_with_repeated_labels(self):
+        """A repeated column name keeps its first column instead of failing the selection."""
+        data = pd.DataFrame([['AAPL', '2024-01-02', '1.5', 'x', 10]],
+                            columns=['ticker', 'timestamp', 'close', 'close', 'vol'])
+        result = self.cleaner.clean_and_select_columns(data)
+        self.assertFalse(result.columns.has_duplicates)
+        self.assertEqual(result['close'].iloc[0], 1.5)
+        self.assertEqual(result['vol'].iloc[0], 10)
+
+    def test_clean_numeric_column_matches_apply(self):
+        """Numeric cleaning returns float64 with the values the per-element apply gave."""
+        messy = _messy(self.stooq)
+        result = self.cleaner._clean_numeric_column(messy)
+
+        self.assertEqual(result.dtype, np.float64)
+        pd.testing.assert_series_equal(result, _per_element(messy).astype(np.float64))
+
+    @unittest.skipUnless(BENCH_ROWS, "set REDLINE_BENCH_ROWS to run the benchmark")
+    def test_vectorised_paths_faster(self):
+        """Both vectorised paths beat the implementations they replaced on a large frame."""
+        stooq = _stooq(BENCH_ROWS)[0]
+        messy = _messy(stooq)
+        cases = [
+            (lambda: _string_parse(stooq),
+             lambda: self.cleaner.stooq_timestamps(stooq['<DATE>'], stooq['<TIME>'])),
+            (lambda: _per_element(messy), lambda: self.cleaner._clean_numeric_column(messy)),
+        ]
+        for old, new in cases:
+            baseline = timeit.timeit(old, number=1)
+            elapsed = min(timeit.repeat(new, number=1, repeat=3))
+            self.assertLess(elapsed, baseline)
+
+
+if __name__ == '__main__':
+    unittest.main()
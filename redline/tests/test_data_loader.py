@@ -131,6 +131,36 @@ class TestDataValidator(unittest.TestCase):
         future_data['timestamp'] = pd.to_datetime('2030-01-01')
         result = self.validator.validate_date_range(future_data)
         self.assertFalse(result)
+    
+    def test_validate_data_from_header_and_metadata(self):
+        """Test file validation reads only headers and metadata."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            csv_path = os.path.join(temp_dir, 'prices.csv')
+            with open(csv_path, 'w') as f:
+                # The body is not valid CSV, so a full parse would fail
+                f.write('ticker,timestamp,close\n"unterminated\n')
+            self.assertTrue(self.validator.validate_data(csv_path, 'csv'))
+            
+            # A UTF-8 byte order mark is not part of the first column name
+            with open(csv_path, 'w', encoding='utf-8-sig') as f:
+                f.write('ticker,timestamp,close\nAAPL,2024-01-02,1.0\n')
+            self.assertEqual(self.validator.read_columns(csv_path, 'csv'), ['ticker', 'timestamp', 'close'])
+            self.assertTrue(self.validator.validate_data(csv_path, 'csv'))
+            
+            stooq_path = os.path.join(temp_dir, 'aapl.us.txt')
+            with open(stooq_path, 'w') as f:
+                f.write('<TICKER>,<DATE>,<OPEN>\nAAPL.US,20240102,1.0\n')
+            self.assertFalse(self.validator.validate_data(stooq_path, 'txt'))
+            
+            parquet_path = os.path.join(temp_dir, 'prices.parquet')
+            self.invalid_data.to_parquet(parquet_path)
+            self.assertFalse(self.validator.validate_data(parquet_path, 'parquet'))
+            self.valid_data.to_parquet(parquet_path)
+            self.assertTrue(self.validator.validate_data(parquet_path, 'parquet'))
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
 class TestDataCleaner(unittest.TestCase):
     """Test cases for DataCleaner class."""
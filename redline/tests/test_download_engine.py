@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+REDLINE Download Engine Tests
+Tests for concurrent, pipelined downloads against a local server replaying
+recorded Yahoo, Stooq and Alpha Vantage payloads.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import urlparse, parse_qs
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.downloaders import rate_limiter, download_engine, download_history, response_cache
+from redline.downloaders.download_history import DownloadHistory
+from redline.downloaders.response_cache import ResponseCache
+from redline.downloaders.rate_limiter import RateLimiter
+from redline.downloaders.stooq_downloader import StooqDownloader
+from redline.downloaders.alpha_vantage_downloader import AlphaVantageDownloader
+from redline.downloaders.yahoo_downloader import YahooDownloader
+from redline.downloaders.multi_source import MultiSourceDownloader
+
+# Recorded payloads, trimmed to three sessions
+YAHOO_CHART = {
+    "chart": {"result": [{
+        "meta": {"currency": "USD", "symbol": "AAPL", "exchangeName": "NMS",
+                 "exchangeTimezoneName": "America/New_York", "dataGranularity": "1d"},
+        "timestamp": [1704205800, 1704292200, 1704378600],
+        "indicators": {
+            "quote": [{"open": [187.15, 184.22, 182.15], "high": [188.44, 185.88, 183.09],
+                       "low": [183.89, 183.43, 180.88], "close": [185.64, 184.25, 181.91],
+                       "volume": [82488700, 58414500, 71983600]}],
+            "adjclose": [{"adjclose": [184.94, 183.55, 181.22]}]
+        }
+    }], "error": None}
+}
+YAHOO_NOT_FOUND = {"chart": {"result": None, "error": {"code": "Not Found",
+                                                       "description": "No data found, symbol may be delisted"}}}
+STOOQ_CSV = (
+    "<TICKER>,<PER>,<DATE>,<TIME>,<OPEN>,<HIGH>,<LOW>,<CLOSE>,<VOL>,<OPENINT>\n"
+    "{ticker}.US,D,20240102,000000,187.15,188.44,183.885,185.64,82488674,0\n"
+    "{ticker}.US,D,20240103,000000,184.22,185.88,183.43,184.25,58414460,0\n"
+    "{ticker}.US,D,20240104,000000,182.15,183.0872,180.88,181.91,71983570,0\n"
+)
+ALPHA_VANTAGE_DAILY = {
+    "Meta Data": {"1. Information": "Daily Prices (open, high, low, close) and Volumes",
+                  "2. Symbol": "{ticker}", "3. Last Refreshed": "2024-01-04",
+                  "4. Output Size": "Full size", "5. Time Zone": "US/Eastern"},
+    "Time Series (Daily)": {
+        "2024-01-04": {"1. open": "182.1500", "2. high": "183.0872", "3. low": "180.8800",
+                       "4. close": "181.9100", "5. volume": "71983570"},
+        "2024-01-03": {"1. open": "184.2200", "2. high": "185.8800", "3. low": "183.4300",
+                       "4. close": "184.2500", "5. volume": "58414460"},
+        "2024-01-02": {"1. open": "187.1500", "2. high": "188.4400", "3. low": "183.8850",
+                       "4. close": "185.6400", "5. volume": "82488674"}
+    }
+}
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is visible
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.clients.add(self.client_address)
+            server.requests.append(url.path)
+        try:
+            time.sleep(server.delay)
+            if url.path.startswith('/yahoo/v8/finance/chart/'):
+                ticker = url.path.rsplit('/', 1)[1]
+                status, body, kind = ((404, YAHOO_NOT_FOUND, 'json') if ticker in server.missing
+                                      else (200, YAHOO_CHART, 'json'))
+            elif url.path == '/stooq/q/d/l/':
+                ticker = query['s'][0].upper()
+                # Stooq answers 200 'No data' for tickers its daily endpoint does not serve
+                status, body, kind = ((200, 'No data', 'csv') if query['i'] == ['d'] and ticker in server.daily_missing
+                                      else (200, STOOQ_CSV.format(ticker=ticker), 'csv'))
+            elif url.path == '/av/query':
+                ticker = query['symbol'][0]
+                status, body, kind = 200, json.loads(json.dumps(ALPHA_VANTAGE_DAILY).replace('{ticker}', ticker)), 'json'
+            else:
+                ticker, status, body, kind = None, 404, 'not found', 'csv'
+
+            with server.lock:
+                limited = ticker in server.rate_limit_once
+                server.rate_limit_once.discard(ticker)
+            if limited:
+                status, body, kind = 429, 'Too Many Requests', 'csv'
+
+            data = (json.dumps(body) if kind == 'json' else body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json' if kind == 'json' else 'text/csv')
+            self.send_header('Content-Length', str(len(data)))
+            if limited:
+                self.send_header('Retry-After', '0')
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadEngine(unittest.TestCase):
+    """Test cases for DownloadEngine class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _ReplayHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.delay = 0.0
+        self.server.in_flight = self.server.max_in_flight = 0
+        self.server.clients, self.server.requests = set(), []
+        self.server.missing, self.server.rate_limit_once, self.server.daily_missing = set(), set(), set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        patches = [
+            mock.patch.object(rate_limiter, '_rate_limiter', RateLimiter(os.path.join(self.temp_dir, 'limits.sqlite'))),
+            mock.patch.object(download_engine, '_source_slots', {}),
+            mock.patch.object(download_history, '_download_history', DownloadHistory(os.path.join(self.temp_dir, 'history'))),
+            mock.patch.object(response_cache, '_response_cache', ResponseCache(os.path.join(self.temp_dir, 'responses.sqlite'))),
+            mock.patch.dict(os.environ, {'REDLINE_YAHOO_CHART_URL': f"{self.base}/yahoo/v8/finance/chart/{{ticker}}",
+                                         'REDLINE_DOWNLOAD_CONCURRENCY': '4'})
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _unthrottled(self, downloader):
+        downloader.min_request_interval = 0.001
+        downloader.rate_limit_burst = 100
+        return downloader
+
+    def _stooq(self):
+        downloader = self._unthrottled(StooqDownloader(output_dir=self.temp_dir))
+        downloader.endpoints = [f"{self.base}/stooq/q/d/l/?s={{ticker}}&i=d"]
+        return downloader
+
+    def test_replays_recorded_payloads(self):
+        """Each source's payloads parse on the parse pool into standardized frames."""
+        alpha_vantage = self._unthrottled(AlphaVantageDownloader(output_dir=self.temp_dir, api_key='demo'))
+        alpha_vantage.base_url = f"{self.base}/av/query"
+        downloaders = [self._unthrottled(YahooDownloader(self.temp_dir)), self._stooq(), alpha_vantage]
+
+        for downloader in downloaders:
+            parse_threads = []
+            parse_raw = downloader.parse_raw
+
+            def recording_parse(*args, parse_raw=parse_raw, parse_threads=parse_threads):
+                parse_threads.append(threading.current_thread().name)
+                return parse_raw(*args)
+
+            with mock.patch.object(downloader, 'parse_raw', side_effect=recording_parse):
+                report = downloader.download_report(['AAPL', 'MSFT'], '2024-01-01', '2024-01-31')
+
+            self.assertEqual(report.failed, [], downloader.name)
+            self.assertTrue(all(name.startswith('redline-parse') for name in parse_threads), parse_threads)
+            self.assertEqual(len(parse_threads), 2)
+            for ticker, data in report.results.items():
+                close = data['<CLOSE>'] if '<CLOSE>' in data.columns else data['Close']
+                self.assertEqual(sorted(close.round(2).tolist()), [181.91, 184.25, 185.64])
+                self.assertGreater(report.downloads[ticker].latency_seconds, 0)
+            self.assertEqual(downloader.get_statistics()['successful_requests'], 2)
+
+        self.assertEqual(report.results['MSFT'].index.min().strftime('%Y-%m-%d'), '2024-01-02')
+        yahoo = downloaders[0].download_single_ticker('AAPL', '2024-01-01', '2024-01-31')
+        self.assertEqual(yahoo['<DATE>'].tolist(), ['20240102', '20240103', '20240104'])
+
+    def test_requests_in_flight_and_latency(self):
+        """Requests overlap up to the source's cap, over reused connections."""
+        self.server.delay = 0.2
+        tickers = [f"T{i}" for i in range(8)]
+        started = time.perf_counter()
+        report = self._stooq().download_report(tickers)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(list(report.results), tickers)
+        self.assertEqual(self.server.max_in_flight, 4)
+        self.assertLessEqual(len(self.server.clients), 4)
+        self.assertLess(elapsed, 8 * 0.2 * 0.75)
+        for item in report.downloads.values():
+            self.assertGreaterEqual(item.fetch_seconds, 0.2)
+            self.assertGreaterEqual(item.latency_seconds, item.fetch_seconds + item.parse_seconds)
+        summary = report.to_dict()
+        self.assertEqual((summary['successful'], summary['latency']['count']), (8, 8))
+
+    def test_retry_after_and_fallback(self):
+        """A 429 is waited out, and tickers one source lacks fall back to the next."""
+        self.server.rate_limit_once.add('AAPL')
+        self.server.missing.add('STQ')
+        multi_source = MultiSourceDownloader(self.temp_dir)
+        self._unthrottled(multi_source.downloaders['yahoo'])
+        multi_source.downloaders['stooq'] = self._stooq()
+
+        report = multi_source.download_report(['AAPL', 'STQ'], '2024-01-01', '2024-01-31')
+        self.assertEqual(report.failed, [])
+        self.assertEqual((report.downloads['AAPL'].source, report.downloads['STQ'].source), ('yahoo', 'stooq'))
+        self.assertEqual(set(report.results['STQ']['data_source']), {'stooq'})
+        self.assertEqual(self.server.requests.count('/yahoo/v8/finance/chart/AAPL'), 2)
+        self.assertEqual(multi_source.get_source_statistics()['yahoo'],
+                         {'attempts': 2, 'successes': 1, 'failures': 1})
+
+    def test_stooq_falls_back_to_other_endpoints(self):
+        """A ticker the daily endpoint lacks is fetched from the next Stooq endpoint."""
+        self.server.daily_missing.add('WEEKLY')
+        downloader = self._stooq()
+        downloader.endpoints.append(f"{self.base}/stooq/q/d/l/?s={{ticker}}&i=w")
+
+        report = downloader.download_report(['AAPL', 'WEEKLY'], '2024-01-01', '2024-01-31')
+        self.assertEqual(report.failed, [])
+        self.assertEqual(len(report.results['WEEKLY']), 3)
+        self.assertEqual(self.server.requests.count('/stooq/q/d/l/'), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
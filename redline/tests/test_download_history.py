@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+REDLINE Download History Tests
+Tests for incremental downloads against the locally stored bar history.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from unittest import mock
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.downloaders import download_engine, download_history
+from redline.downloaders.base_downloader import BaseDownloader
+from redline.downloaders.download_history import DownloadHistory, bar_timestamps
+from redline.downloaders.alpha_vantage_downloader import AlphaVantageDownloader
+from redline.downloaders.stooq_downloader import StooqDownloader
+
+
+class _FakeDownloader(BaseDownloader):
+    """Serves Stooq-format daily bars from a dict of closes, recording each requested range."""
+
+    def __init__(self, closes):
+        super().__init__('Fake')
+        self.incremental = True
+        self.closes = closes
+        self.requests = []
+
+    def download_single_ticker(self, ticker, start_date=None, end_date=None):
+        self.requests.append((start_date, end_date))
+        days = [day for day in sorted(self.closes)
+                if (not start_date or day >= start_date) and (not end_date or day <= end_date)]
+        return pd.DataFrame({
+            '<TICKER>': ticker,
+            '<DATE>': [day.replace('-', '') for day in days],
+            '<TIME>': '000000',
+            '<CLOSE>': [self.closes[day] for day in days]
+        })
+
+
+class TestDownloadHistory(unittest.TestCase):
+    """Test cases for DownloadHistory class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history = DownloadHistory(self.temp_dir)
+        self.closes = {day.strftime('%Y-%m-%d'): float(i) for i, day in
+                       enumerate(pd.bdate_range('2024-01-02', '2024-01-31'))}
+        patches = [
+            mock.patch.object(download_history, '_download_history', self.history),
+            mock.patch.object(download_engine, '_source_slots', {})
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _download(self, downloader, start_date, end_date):
+        report = downloader.download_report(['AAPL'], start_date, end_date)
+        item = report.downloads['AAPL']
+        self.assertIsNone(item.error)
+        return item
+
+    def test_refresh_fetches_only_the_tail(self):
+        """A repeat download fetches from the watermark on, upserts, and a covered range needs no request."""
+        downloader = _FakeDownloader(self.closes)
+        first = self._download(downloader, '2024-01-01', '2024-01-10')
+        self.assertEqual((first.fetch_mode, first.rows), ('full', 7))
+        self.assertEqual(self.history.watermark('AAPL', 'fake')['last_bar'], '2024-01-10')
+
+        # The last stored bar was provisional: the refresh re-fetches and replaces it
+        self.closes['2024-01-10'] = 99.0
+        refresh = self._download(downloader, '2024-01-01', '2024-01-17')
+        self.assertEqual(refresh.fetch_mode, 'tail')
+        self.assertEqual(downloader.requests[-1], ('2024-01-10', '2024-01-17'))
+        dates = refresh.data['<DATE>'].astype(str).tolist()
+        self.assertEqual(dates, sorted(set(dates)))
+        self.assertEqual((dates[0], dates[-1], len(dates)), ('20240102', '20240117', 12))
+        self.assertEqual(refresh.data.set_index('<DATE>').loc['20240110', '<CLOSE>'], 99.0)
+        self.assertEqual(self.history.watermark('AAPL', 'fake')['rows'], 12)
+
+        # Already stored: served locally without a request
+        local = self._download(downloader, '2024-01-03', '2024-01-12')
+        self.assertEqual((local.fetch_mode, local.rows, len(downloader.requests)), ('local', 8, 2))
+
+        # Reaching back before the covered history fetches the whole range again
+        earlier = self._download(downloader, '2023-12-15', '2024-01-17')
+        self.assertEqual((earlier.fetch_mode, downloader.requests[-1]), ('full', ('2023-12-15', '2024-01-17')))
+        self.assertEqual(self.history.plan('AAPL', 'fake', '2023-12-20', '2024-01-05'), None)
+
+        with mock.patch.dict(os.environ, {'REDLINE_INCREMENTAL_DOWNLOADS': 'false'}):
+            self.assertEqual(self._download(downloader, '2024-01-01', '2024-01-10').fetch_mode, 'full')
+        self.assertEqual(self.history.get_stats()['fake']['rows'], 12)
+
+    def test_todays_bar_is_fetched_again(self):
+        """A stored bar for today is provisional, so a range ending today refreshes it."""
+        today = pd.Timestamp.now().normalize()
+        yesterday, today = (today - pd.Timedelta(days=1)).strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+        self.closes = {yesterday: 1.0, today: 2.0}
+        downloader = _FakeDownloader(self.closes)
+        self._download(downloader, yesterday, today)
+        self.assertEqual(self.history.plan('AAPL', 'fake', yesterday, today), (today, today))
+        self.assertIsNone(self.history.plan('AAPL', 'fake', yesterday, yesterday))
+
+        self.closes[today] = 3.0
+        refresh = self._download(downloader, yesterday, today)
+        self.assertEqual((refresh.fetch_mode, downloader.requests[-1]), ('tail', (today, today)))
+        self.assertEqual(refresh.data['<CLOSE>'].tolist(), [1.0, 3.0])
+
+    def test_disjoint_fetch_leaves_the_gap_uncovered(self):
+        """A fetch that does not meet the stored history does not mark the gap between them as covered."""
+        self.closes = {day.strftime('%Y-%m-%d'): float(i) for i, day in
+                       enumerate(pd.bdate_range('2024-01-01', '2024-06-28'))}
+        downloader = _FakeDownloader(self.closes)
+        self._download(downloader, '2024-06-01', '2024-06-30')
+        self._download(downloader, '2024-01-01', '2024-03-31')
+        self.assertEqual(self.history.watermark('AAPL', 'fake')['covered_start'], '2024-06-01')
+
+        spring = self._download(downloader, '2024-01-01', '2024-05-31')
+        self.assertEqual((spring.fetch_mode, spring.rows), ('full', 110))
+        self.assertEqual(self.history.watermark('AAPL', 'fake')['covered_start'], '2024-01-01')
+        self.assertIsNone(self.history.plan('AAPL', 'fake', '2024-02-01', '2024-06-28'))
+
+        # Bars stored past the last bar start the covered history anew
+        later = _FakeDownloader({'2024-08-01': 1.0, '2024-08-02': 2.0}).download_single_ticker('AAPL')
+        self.history.upsert('AAPL', 'fake', later, '2024-08-01', fetch_end='2024-08-02')
+        self.assertEqual(self.history.plan('AAPL', 'fake', '2024-07-01', '2024-08-02'), ('2024-07-01', '2024-08-02'))
+
+    def test_unbounded_request_after_bounded_fetch(self):
+        """A request for the default history is fetched in full until the history holds one."""
+        downloader = _FakeDownloader(self.closes)
+        self._download(downloader, '2024-01-02', '2024-01-04')
+        self.assertEqual(self.history.plan('AAPL', 'fake', None, None), (None, None))
+
+        full = self._download(downloader, None, None)
+        self.assertEqual((full.fetch_mode, downloader.requests[-1]), ('full', (None, None)))
+        self.assertEqual((full.rows, self.history.watermark('AAPL', 'fake')['full_history']), (22, True))
+        self.assertEqual(self.history.plan('AAPL', 'fake', None, None), ('2024-01-31', None))
+
+        # A run started anew past the last bar no longer holds the default range
+        later = _FakeDownloader({'2024-03-01': 1.0}).download_single_ticker('AAPL')
+        self.history.upsert('AAPL', 'fake', later, '2024-03-01', fetch_end='2024-03-01')
+        self.assertFalse(self.history.watermark('AAPL', 'fake')['full_history'])
+        self.assertEqual(self.history.plan('AAPL', 'fake', None, '2024-03-01'), (None, '2024-03-01'))
+
+    def test_bar_formats_and_source_requests(self):
+        """Bars are dated from <DATE>, timestamp columns or a DatetimeIndex, and sources ask for less."""
+        index = pd.date_range('2024-01-02', periods=3)
+        frames = [
+            pd.DataFrame({'<DATE>': [20240102, 20240103, 20240104]}),
+            pd.DataFrame({'timestamp': index.tz_localize('UTC')}),
+            pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=index)
+        ]
+        for frame in frames:
+            self.assertEqual(bar_timestamps(frame).tolist(), list(index))
+        self.assertIsNone(bar_timestamps(pd.DataFrame({'close': [1.0]})))
+
+        # Alpha Vantage history keeps its DatetimeIndex through the upsert
+        stored = self.history.upsert('IBM', 'Alpha Vantage', frames[2])
+        tail = pd.DataFrame({'Close': [30.0, 4.0]}, index=pd.date_range('2024-01-04', periods=2))
+        merged = self.history.upsert('IBM', 'Alpha Vantage', tail, '2024-01-04', '2024-01-03')
+        self.assertEqual(len(stored), 3)
+        self.assertEqual(merged['Close'].tolist(), [2.0, 30.0, 4.0])
+        self.assertIsInstance(merged.index, pd.DatetimeIndex)
+
+        recent = (pd.Timestamp.now() - pd.Timedelta(days=3)).strftime('%Y-%m-%d')
+        self.assertEqual(AlphaVantageDownloader._output_size(recent), 'compact')
+        self.assertEqual(AlphaVantageDownloader._output_size('2000-01-01'), 'full')
+
+        stooq = StooqDownloader(output_dir=self.temp_dir)
+        with mock.patch.object(stooq, '_make_request') as request:
+            stooq.fetch_raw('AAPL', '2024-01-10', '2024-01-17')
+        self.assertEqual(request.call_args.kwargs['params'], {'d1': '20240110', 'd2': '20240117'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+REDLINE Download Job Tests
+Tests for resumable batch download jobs.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.downloaders import download_engine
+from redline.downloaders.base_downloader import BaseDownloader
+from redline.downloaders.exceptions import RateLimitError
+from redline.background import download_jobs
+from redline.background.download_jobs import DownloadJobManager, DownloadJobStore
+
+
+class _FakeDownloader(BaseDownloader):
+    """Returns three bars per ticker; 'EMPTY' has no data and 'LIMIT' is rate limited."""
+
+    def __init__(self, on_download=None):
+        super().__init__('Fake')
+        self.calls = []
+        self.lock = threading.Lock()
+        self.on_download = on_download
+
+    def download_single_ticker(self, ticker, start_date=None, end_date=None):
+        with self.lock:
+            self.calls.append(ticker)
+        if self.on_download:
+            self.on_download(ticker)
+        if ticker == 'LIMIT':
+            raise RateLimitError('Too many requests', source='fake', retry_after=120)
+        if ticker == 'EMPTY':
+            return pd.DataFrame()
+        return pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=pd.date_range('2024-01-02', periods=3))
+
+
+class TestDownloadJobs(unittest.TestCase):
+    """Test cases for DownloadJobManager class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir)  # downloads are saved under data/downloaded
+        self.store = DownloadJobStore(os.path.join(self.temp_dir, 'jobs.sqlite'))
+        self.manager = DownloadJobManager(self.store, lease_seconds=0.3)
+        patches = [
+            mock.patch.object(download_engine, '_source_slots', {}),
+            mock.patch.dict(os.environ, {'REDLINE_DOWNLOAD_CONCURRENCY': '1', 'REDLINE_TEST_MODE': 'false'})
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _states(self, job_id):
+        return {row['ticker']: row['state'] for row in self.store.get(job_id)['tickers']}
+
+    def test_run_records_ticker_states(self):
+        """Each ticker ends done or failed, with progress events and the old response fields."""
+        events = []
+        job_id = self.manager.create(['AAPL', 'EMPTY', 'LIMIT', 'AAPL'], 'fake', '2024-01-01', '2024-01-31')
+        summary = self.manager.run(job_id, progress_callback=events.append, downloader=_FakeDownloader())
+
+        self.assertEqual(self._states(job_id), {'AAPL': 'done', 'EMPTY': 'failed', 'LIMIT': 'failed'})
+        self.assertEqual((summary['status'], summary['total_requested']), ('SUCCESS', 3))
+        self.assertEqual((summary['successful'], summary['failed'], summary['progress']), (1, 2, 100))
+        self.assertEqual(summary['results'][0]['filename'], 'AAPL_fake_2024-01-01_to_2024-01-31.csv')
+        self.assertTrue(os.path.exists(os.path.join('data', 'downloaded', summary['results'][0]['filename'])))
+        self.assertEqual(summary['rate_limit_failures'], 1)
+        self.assertEqual(summary['retry_after'], 120)
+        self.assertEqual([e['event'] for e in events if e.get('ticker') == 'AAPL'], ['ticker_started', 'ticker_done'])
+        self.assertEqual(events[-1]['event'], 'job_completed')
+        # A finished job is not run again
+        self.assertIsNone(self.manager.run(job_id, downloader=_FakeDownloader()))
+
+    def test_resume_after_crash(self):
+        """A job whose owner stopped renewing its lease is resumed from the tickers not yet done."""
+        job_id = self.manager.create(['AAPL', 'MSFT', 'IBM', 'GE'], 'fake', '2024-01-01', '2024-01-31')
+        crashed = DownloadJobManager(self.store, lease_seconds=0.3)
+        self.assertTrue(self.store.claim(job_id, crashed.owner, crashed.lease_seconds))
+        self.store.set_status(job_id, 'PROGRESS')
+        self.store.set_ticker(job_id, 'AAPL', 'done', records=3, filename='AAPL.csv')
+        self.store.set_ticker(job_id, 'MSFT', 'fetching')
+
+        # Still leased: nobody else may take it
+        self.assertFalse(self.store.claim(job_id, self.manager.owner, self.manager.lease_seconds))
+        self.assertEqual(self.store.stalled(self.manager.lease_seconds), [])
+
+        # The owner dies; once its lease lapses the job is picked up again
+        self.store._execute("UPDATE jobs SET heartbeat = heartbeat - 1 WHERE job_id = ?", (job_id,))
+        self.assertEqual(self.store.stalled(self.manager.lease_seconds), [job_id])
+        downloader = _FakeDownloader()
+        summary = self.manager.run(job_id, downloader=downloader)
+
+        self.assertEqual(sorted(downloader.calls), ['GE', 'IBM', 'MSFT'])
+        self.assertEqual(set(self._states(job_id).values()), {'done'})
+        self.assertEqual((summary['status'], summary['successful']), ('SUCCESS', 4))
+        self.assertEqual(self.store.get(job_id)['owner'], self.manager.owner)
+        self.assertFalse(self.store.heartbeat(job_id, crashed.owner))
+
+    def test_cancel_leaves_remaining_tickers_pending(self):
+        """Cancelling stops new requests; unstarted tickers stay pending and a finished job cannot be cancelled."""
+        tickers = ['AAPL', 'MSFT', 'IBM', 'GE']
+        job_id = self.manager.create(tickers, 'fake', '2024-01-01', '2024-01-31')
+        downloader = _FakeDownloader(on_download=lambda ticker: self.manager.cancel(job_id))
+        summary = self.manager.run(job_id, downloader=downloader)
+
+        self.assertEqual(downloader.calls, ['AAPL'])
+        self.assertEqual(self._states(job_id), {'AAPL': 'done', 'MSFT': 'pending', 'IBM': 'pending', 'GE': 'pending'})
+        self.assertEqual((summary['status'], summary['pending'], summary['failed']), ('CANCELLED', 3, 0))
+        self.assertFalse(self.manager.cancel(job_id))
+        self.assertFalse(self.manager.cancel('unknown'))
+
+    def test_owner_stops_when_its_lease_is_taken(self):
+        """An owner whose job was taken over starts no more requests and records nothing more."""
+        job_id = self.manager.create(['AAPL', 'MSFT', 'IBM'], 'fake', '2024-01-01', '2024-01-31')
+
+        def taken_over(ticker):
+            # Another worker's watchdog claims the job while this one is stalled
+            self.store._execute("UPDATE jobs SET owner = 'other', heartbeat = ? WHERE job_id = ?",
+                                (time.time(), job_id))
+
+        downloader = _FakeDownloader(on_download=taken_over)
+        self.assertIsNone(self.manager.run(job_id, downloader=downloader))
+        self.assertEqual(downloader.calls, ['AAPL'])
+        job = self.store.get(job_id)
+        self.assertEqual((job['status'], job['owner']), ('PROGRESS', 'other'))
+        self.assertEqual(self._states(job_id), {'AAPL': 'fetching', 'MSFT': 'pending', 'IBM': 'pending'})
+
+    def test_api_keys_are_not_stored(self):
+        """The submitted key reaches the downloader but never the job database; a resumed job looks it up again."""
+        job_id = self.manager.create(['AAPL'], 'fake', '2024-01-01', '2024-01-31', api_key='SECRET-KEY')
+        with open(self.store.path, 'rb') as f:
+            self.assertNotIn(b'SECRET-KEY', f.read())
+        self.assertEqual(self.store.get(job_id)['options'], {})
+
+        def create_downloader(source, api_key=None):
+            if not api_key:
+                raise ValueError('API key is required')
+            return _FakeDownloader()
+
+        with mock.patch.object(download_jobs, 'create_downloader', side_effect=create_downloader) as create:
+            self.manager.run(job_id)
+            create.assert_called_once_with('fake', 'SECRET-KEY')
+
+            resumed = self.manager.create(['MSFT'], 'fake', '2024-01-01', '2024-01-31', api_key='SECRET-KEY')
+            other_worker = DownloadJobManager(self.store, lease_seconds=0.3)
+            with mock.patch.object(download_jobs, 'stored_api_key', return_value='SAVED-KEY'):
+                other_worker.run(resumed)
+            self.assertEqual(create.call_args.args, ('fake', 'SAVED-KEY'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+REDLINE File Catalog Tests
+Tests for the shared filename index used by web routes.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.file_catalog import FileCatalog
+
+
+class TestFileCatalog(unittest.TestCase):
+    """Test cases for FileCatalog class."""
+
+    def setUp(self):
+        """Set up a small data directory tree."""
+        self.data_dir = tempfile.mkdtemp()
+        for subdir in ('stooq', 'downloaded', 'uploads', os.path.join('converted', 'parquet')):
+            os.makedirs(os.path.join(self.data_dir, subdir))
+        self._touch('root.csv')
+        self._touch(os.path.join('stooq', 'aapl.us.txt'))
+        self._touch(os.path.join('downloaded', 'dup.csv'))
+        self._touch(os.path.join('converted', 'dup.csv'))
+        self._touch(os.path.join('converted', 'parquet', 'deep.parquet'))
+        self.catalog = FileCatalog(self.data_dir, watch=False)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.catalog.stop()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def _touch(self, rel_path):
+        path = os.path.join(self.data_dir, rel_path)
+        with open(path, 'w') as f:
+            f.write('a,b\n1,2\n')
+        return path
+
+    def test_resolve_priority_and_recursion(self):
+        """Flat locations win over converted/, and converted/ is searched recursively."""
+        self.assertEqual(self.catalog.resolve('dup.csv'),
+                         os.path.join(self.data_dir, 'downloaded', 'dup.csv'))
+        self.assertEqual(self.catalog.resolve('deep.parquet'),
+                         os.path.join(self.data_dir, 'converted', 'parquet', 'deep.parquet'))
+        self.assertIsNone(self.catalog.resolve('missing.csv'))
+
+    def test_resolve_restricted_locations(self):
+        """Only the requested locations are searched."""
+        self.assertIsNone(self.catalog.resolve('deep.parquet', locations=('root', 'downloaded')))
+        self.assertEqual(self.catalog.resolve('dup.csv', locations=('converted',)),
+                         os.path.join(self.data_dir, 'converted', 'dup.csv'))
+
+    def test_new_and_deleted_files(self):
+        """Files written after the build resolve, deleted files stop resolving."""
+        self.catalog.resolve('root.csv')
+        new_path = self._touch('new.csv')
+        self.assertEqual(self.catalog.resolve('new.csv'), new_path)
+
+        os.remove(os.path.join(self.data_dir, 'downloaded', 'dup.csv'))
+        self.assertEqual(self.catalog.resolve('dup.csv'),
+                         os.path.join(self.data_dir, 'converted', 'dup.csv'))
+
+    def test_list_files(self):
+        """Listing returns indexed entries with their location."""
+        entries = self.catalog.list_files()
+        self.assertEqual(len(entries), 5)
+        locations = {e.name: e.location for e in entries if e.name != 'dup.csv'}
+        self.assertEqual(locations['aapl.us.txt'], 'stooq')
+        self.assertEqual(locations['deep.parquet'], 'converted')
+        self.assertEqual(len(self.catalog.list_files(locations=('root',))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
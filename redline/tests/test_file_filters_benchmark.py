@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+REDLINE Form Filter Regression Tests
+Checks the compiled filter kernels select the same rows as the
+per-condition implementation they replaced.
+
+Set REDLINE_BENCH_ROWS (e.g. 1000000) to also check they beat it on a
+frame of that many rows.
+"""
+
+import unittest
+import timeit
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.web.utils.file_filters import apply_filters, FilterColumns
+
+BENCH_ROWS = int(os.environ.get('REDLINE_BENCH_ROWS', 0))
+PARITY_ROWS = 5_000
+
+
+def _bars(rows):
+    """A synthetic multi-ticker frame and five filters over it."""
+    rng = np.random.default_rng(7)
+    bars = pd.DataFrame({
+        'ticker': pd.Categorical(rng.choice(['AAPL', 'MSFT', 'GOOG', 'AMZN', 'TSLA'], rows)),
+        'timestamp': pd.date_range('2005-01-03', periods=rows, freq='min'),
+        'close': 100 + rng.standard_normal(rows).cumsum(),
+        'vol': rng.integers(100, 100000, rows),
+        'exchange': rng.choice(np.array(['NASDAQ', 'NYSE', 'ARCA'], dtype=object), rows),
+    })
+    start, end = bars['timestamp'].iloc[rows // 4], bars['timestamp'].iloc[rows // 2]
+    filters = {
+        'ticker': {'type': 'equals', 'value': 'AAPL'},
+        'timestamp': {'type': 'date_range', 'value': f"{start} to {end}"},
+        'close': {'type': 'greater_than', 'value': str(bars['close'].median())},
+        'vol': {'type': 'less_than', 'value': '60000'},
+        'exchange': {'type': 'contains', 'value': 'nas'},
+    }
+    return bars, filters
+
+
+def _reference_filters(df, filters):
+    """The original apply_filters: one astype/parse and one frame copy per condition."""
+    filtered_df = df.copy()
+    for column, filter_config in filters.items():
+        if column not in filtered_df.columns:
+            continue
+        filter_type = filter_config.get('type')
+        filter_value = filter_config.get('value')
+        if not filter_type or not filter_value:
+            continue
+        try:
+            if filter_type == 'equals':
+                filtered_df = filtered_df[filtered_df[column].astype(str) == str(filter_value)]
+            elif filter_type == 'contains':
+                filtered_df = filtered_df[filtered_df[column].astype(str).str.contains(
+                    str(filter_value), case=False, na=False)]
+            elif filter_type == 'greater_than':
+                filtered_df = filtered_df[pd.to_numeric(filtered_df[column], errors='coerce') > float(filter_value)]
+            elif filter_type == 'less_than':
+                filtered_df = filtered_df[pd.to_numeric(filtered_df[column], errors='coerce') < float(filter_value)]
+            elif filter_type == 'date_range' and ' to ' in filter_value:
+                start_date, end_date = filter_value.split(' to ')
+                filtered_df = filtered_df[
+                    (pd.to_datetime(filtered_df[column], errors='coerce') >= pd.to_datetime(start_date)) &
+                    (pd.to_datetime(filtered_df[column], errors='coerce') <= pd.to_datetime(end_date))
+                ]
+        except Exception:
+            continue
+    return filtered_df
+
+
+class TestFileFiltersBenchmark(unittest.TestCase):
+    """Regression tests for the form filters on bar-shaped data."""
+
+    def test_five_conditions_match_reference(self):
+        """Five conditions select the rows the per-condition filter selects."""
+        bars, filters = _bars(PARITY_ROWS)
+        result = apply_filters(bars, filters)
+        self.assertGreater(len(result), 0)
+        pd.testing.assert_frame_equal(result, _reference_filters(bars, filters))
+
+    @unittest.skipUnless(BENCH_ROWS, "set REDLINE_BENCH_ROWS to run the benchmark")
+    def test_five_conditions_faster_than_reference(self):
+        """Five conditions beat the per-condition filter on a large frame."""
+        bars, filters = _bars(BENCH_ROWS)
+        baseline = timeit.timeit(lambda: _reference_filters(bars, filters), number=1)
+        elapsed = min(timeit.repeat(lambda: apply_filters(bars, filters), number=1, repeat=3))
+        self.assertLess(elapsed, baseline)
+
+    def test_text_semantics_preserved(self):
+        """Every kernel matches the text comparison the filters are defined by."""
+        frame = pd.DataFrame({
+            'price': [1.0, 1.5, np.nan, 10.0],
+            'count': [1, 10, 100, 1],
+            'mixed': ['1', 1, None, 'AAPL'],
+            'code': pd.Categorical(['a', None, 'b', 'a']),
+            'flag': [True, False, True, False],
+            'when': ['2024-01-03', '2024-01-01', 'bad', '2024-01-02'],
+            'stamp': pd.to_datetime(['2024-01-01 00:00', '2024-01-01 10:00', None, '2024-01-02 00:00']),
+        })
+        cases = [
+            {'price': {'type': 'equals', 'value': '1'}},
+            {'price': {'type': 'equals', 'value': '1.0'}},
+            {'price': {'type': 'equals', 'value': 'nan'}},
+            {'count': {'type': 'equals', 'value': '1'}},
+            {'count': {'type': 'contains', 'value': '0'}},
+            {'mixed': {'type': 'equals', 'value': '1'}},
+            {'mixed': {'type': 'contains', 'value': 'none'}},
+            {'code': {'type': 'equals', 'value': 'nan'}},
+            {'flag': {'type': 'equals', 'value': 'True'}},
+            {'stamp': {'type': 'equals', 'value': '2024-01-01'}},
+            {'stamp': {'type': 'equals', 'value': '2024-01-01 00:00:00'}},
+            {'flag': {'type': 'greater_than', 'value': '0.5'}},
+            {'mixed': {'type': 'less_than', 'value': '5'}},
+            {'when': {'type': 'date_range', 'value': '2024-01-02 to 2024-01-03'}},
+            {'when': {'type': 'date_range', 'value': 'garbage to 2024-01-03'}},
+            {'price': {'type': 'greater_than', 'value': 'x'}, 'count': {'type': 'less_than', 'value': '50'}},
+        ]
+        for filters in cases:
+            pd.testing.assert_frame_equal(apply_filters(frame, filters), _reference_filters(frame, filters),
+                                          obj=str(filters))
+
+    def test_column_cache_reused(self):
+        """A FilterColumns cache parses a date column once across calls."""
+        frame = pd.DataFrame({'when': ['2024-01-02', '2024-01-01', '2024-01-03']})
+        columns = FilterColumns(frame)
+        apply_filters(frame, {'when': {'type': 'date_range', 'value': '2024-01-01 to 2024-01-02'}}, columns)
+        parsed = columns.dates('when')
+        result = apply_filters(frame, {'when': {'type': 'date_range', 'value': '2024-01-02 to 2024-01-03'}}, columns)
+        self.assertIs(columns.dates('when'), parsed)
+        self.assertEqual(result['when'].tolist(), ['2024-01-02', '2024-01-03'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+REDLINE File Metadata Tests
+Tests for quick stats read from file metadata.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.file_metadata import FileMetadataReader
+
+
+class TestFileMetadataReader(unittest.TestCase):
+    """Test cases for FileMetadataReader class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.reader = FileMetadataReader()
+        self.data = pd.DataFrame({
+            'ticker': ['AAPL'] * 1200,
+            'close': np.arange(1200, dtype=float),
+        })
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_csv_stats(self):
+        """Test CSV row count and preview."""
+        path = self._path('data.csv')
+        self.data.to_csv(path, index=False)
+        stats = self.reader.get_quick_stats(path, 'csv')
+        self.assertEqual(stats['total_rows'], 1200)
+        self.assertEqual(stats['columns'], ['ticker', 'close'])
+        self.assertEqual(len(stats['preview']), 5)
+
+    def test_parquet_stats(self):
+        """Test Parquet row count comes from the footer."""
+        path = self._path('data.parquet')
+        self.data.to_parquet(path, index=False)
+        stats = self.reader.get_quick_stats(path, 'parquet')
+        self.assertEqual(stats['total_rows'], 1200)
+        self.assertEqual(list(stats['preview']['close']), [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_npz_stats(self):
+        """Test NPZ shape and column names come from the archive headers."""
+        path = self._path('data.npz')
+        np.savez(path, data=np.arange(30, dtype=float).reshape(10, 3), columns=np.array(['a', 'b', 'c']))
+        stats = self.reader.get_quick_stats(path, 'npz')
+        self.assertEqual(stats['total_rows'], 10)
+        self.assertEqual(stats['columns'], ['a', 'b', 'c'])
+        self.assertEqual(list(stats['preview']['b']), [1.0, 4.0, 7.0, 10.0, 13.0])
+
+    def test_cache_invalidated_on_change(self):
+        """Test stats are recomputed when the file changes."""
+        path = self._path('data.csv')
+        self.data.to_csv(path, index=False)
+        self.assertEqual(self.reader.get_quick_stats(path, 'csv')['total_rows'], 1200)
+        self.data.head(10).to_csv(path, index=False)
+        os.utime(path, ns=(1, 1))
+        self.assertEqual(self.reader.get_quick_stats(path, 'csv')['total_rows'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+REDLINE Frame Cache Tests
+Tests for the parsed-DataFrame cache used by FormatLoaders.
+"""
+
+import unittest
+import tempfile
+import shutil
+import time
+import os
+import sys
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.frame_cache import FrameCache
+
+
+class TestFrameCache(unittest.TestCase):
+    """Test cases for FrameCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'prices.csv')
+        self.frame = pd.DataFrame({'ticker': ['AAPL', 'MSFT'], 'close': [100.0, 200.0]})
+        self.frame.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_hit_returns_independent_copy(self):
+        """Cached frames are returned as copies callers may mutate."""
+        cache = FrameCache()
+        self.assertIsNone(cache.get(self.csv_path, 'csv'))
+        cache.put(self.csv_path, 'csv', self.frame)
+
+        first = cache.get(self.csv_path, 'csv')
+        pd.testing.assert_frame_equal(first, self.frame)
+        first.loc[0, 'close'] = -1.0
+        self.assertEqual(cache.get(self.csv_path, 'csv').loc[0, 'close'], 100.0)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_file_change_misses(self):
+        """Rewriting the file changes its identity and misses the cache."""
+        cache = FrameCache()
+        cache.put(self.csv_path, 'csv', self.frame)
+        time.sleep(0.01)
+        self.frame.iloc[:1].to_csv(self.csv_path, index=False)
+        self.assertIsNone(cache.get(self.csv_path, 'csv'))
+
+    def test_byte_budget_evicts_lru(self):
+        """Least recently used entries are evicted once over the byte budget."""
+        other_path = os.path.join(self.temp_dir, 'other.csv')
+        self.frame.to_csv(other_path, index=False)
+        nbytes = int(self.frame.memory_usage(index=True, deep=True).sum())
+
+        cache = FrameCache(max_bytes=nbytes + nbytes // 2)
+        cache.put(self.csv_path, 'csv', self.frame)
+        cache.put(other_path, 'csv', self.frame)
+
+        self.assertIsNone(cache.get(self.csv_path, 'csv'))
+        self.assertIsNotNone(cache.get(other_path, 'csv'))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_shared_spill_directory(self):
+        """A second cache instance (another worker) reads the Arrow spill file."""
+        shm_dir = os.path.join(self.temp_dir, 'shm')
+        FrameCache(shm_dir=shm_dir).put(self.csv_path, 'csv', self.frame)
+
+        worker_cache = FrameCache(shm_dir=shm_dir)
+        pd.testing.assert_frame_equal(worker_cache.get(self.csv_path, 'csv'), self.frame)
+        self.assertEqual(worker_cache.get_stats()['shm_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+REDLINE Load Filters Tests
+Tests for column and row pushdown through FormatLoaders.load_file_by_type.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.format_loaders import FormatLoaders, PUSHDOWN_FORMATS
+from redline.core.format_savers import FormatSavers
+from redline.core.load_filters import normalize_filters, apply_to_frame
+from redline.web.utils.file_filters import apply_filters, to_load_filters
+
+
+class TestLoadFilters(unittest.TestCase):
+    """Test cases for load filters."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data = pd.DataFrame({
+            'ticker': ['AAPL', 'MSFT', 'AAPL', 'GOOG'] * 3,
+            'timestamp': pd.date_range('2024-01-01', periods=12, freq='D'),
+            'close': [float(i) for i in range(12)],
+            'vol': [i * 10 for i in range(12)]
+        })
+        self.filters = [('ticker', 'in', ['AAPL']), ('timestamp', 'between', ('2024-01-03', '2024-01-10')),
+                        ('vol', '>=', '20'), ('missing', '==', 1)]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pushdown_matches_across_formats(self):
+        """Every pushdown format returns the same rows and requested columns."""
+        loader = FormatLoaders()
+        for format_type in ('csv', 'parquet', 'feather', 'duckdb', 'json'):
+            path = os.path.join(self.temp_dir, f'data.{format_type}')
+            FormatSavers().save_file_by_type(self.data, path, format_type)
+            result = loader.load_file_by_type(path, format_type, use_cache=False,
+                                              columns=['close', 'timestamp'], filters=self.filters)
+            self.assertEqual(list(result.columns), ['close', 'timestamp'], format_type)
+            self.assertEqual(result['close'].tolist(), [2.0, 4.0, 6.0, 8.0], format_type)
+        self.assertIn('duckdb', PUSHDOWN_FORMATS)
+
+    def test_normalize_and_frame_fallback(self):
+        """between expands to two bounds; text columns compare as numbers or dates."""
+        self.assertEqual(normalize_filters([{'column': 'close', 'op': 'between', 'value': [1, None]}]),
+                         [('close', '>=', 1)])
+        with self.assertRaises(ValueError):
+            normalize_filters([('close', 'like', 1)])
+
+        text = self.data.astype(str)
+        result = apply_to_frame(text, normalize_filters([('close', '>', 9), ('timestamp', '<=', '2024-01-11')]))
+        self.assertEqual(result['close'].tolist(), ['10.0'])
+
+    def test_form_filters_translate(self):
+        """Range form filters push down and give the same rows as apply_filters."""
+        form = {'close': {'type': 'greater_than', 'value': '5'},
+                'timestamp': {'type': 'date_range', 'value': '2024-01-01 to 2024-01-09'},
+                'ticker': {'type': 'contains', 'value': 'a'}}
+        pushed = apply_to_frame(self.data, normalize_filters(to_load_filters(form)))
+        self.assertEqual(apply_filters(pushed, form)['close'].tolist(),
+                         apply_filters(self.data, form)['close'].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+REDLINE Merge Engine Tests
+Tests for out-of-core file merging.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.merge_engine import MergeEngine
+from redline.web.utils.converter_helpers import merge_dataframes
+
+
+class TestMergeEngine(unittest.TestCase):
+    """Test cases for MergeEngine class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.frames = [
+            pd.DataFrame({'ticker': ['AAPL', 'AAPL'], 'date': ['2024-01-02', '2024-01-01'], 'close': [2.0, 1.0]}),
+            pd.DataFrame({'ticker': ['MSFT'], 'date': ['2024-01-01'], 'Close': [3.0], 'vol': [10]}),
+            pd.DataFrame({'ticker': ['AAPL'], 'date': ['2024-01-01'], 'close': [1.0]}),
+        ]
+        self.sources = []
+        for n, (frame, fmt) in enumerate(zip(self.frames, ['csv', 'parquet', 'feather'])):
+            path = os.path.join(self.temp_dir, f'part{n}.{fmt}')
+            if fmt == 'csv':
+                frame.to_csv(path, index=False)
+            elif fmt == 'parquet':
+                frame.to_parquet(path, index=False)
+            else:
+                frame.to_feather(path)
+            self.sources.append((path, fmt))
+        self.engine = MergeEngine(memory_limit_mb=64, temp_dir=self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_matches_in_memory_merge(self):
+        """Column mappings and the column union match merge_dataframes."""
+        output = os.path.join(self.temp_dir, 'merged.parquet')
+        stats = self.engine.merge(self.sources, output, 'parquet', column_mappings={'Close': 'close'})
+        expected = merge_dataframes(self.frames, {'Close': 'close'})
+
+        self.assertEqual(stats.rows, 4)
+        self.assertEqual(stats.columns, ['ticker', 'date', 'close', 'vol'])
+        result = pd.read_parquet(output)
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertEqual(result['close'].tolist(), expected['close'].tolist())
+        self.assertEqual(result['vol'].isna().sum(), 3)
+
+    def test_dedup_and_sort(self):
+        """Keyed de-duplication and sorting run inside DuckDB."""
+        output = os.path.join(self.temp_dir, 'merged.feather')
+        stats = self.engine.merge(self.sources, output, 'feather', column_mappings={'Close': 'close'},
+                                  deduplicate=['ticker', 'date'], sort_by=['ticker', 'date'])
+        result = pd.read_feather(output)
+        self.assertEqual(stats.rows, 3)
+        self.assertEqual(list(zip(result['ticker'], result['close'])),
+                         [('AAPL', 1.0), ('AAPL', 2.0), ('MSFT', 3.0)])
+
+    def test_dedup_keeps_first_row(self):
+        """Keyed de-duplication keeps each key's first row in file order, like pandas keep='first'."""
+        sources = []
+        for n in range(3):
+            path = os.path.join(self.temp_dir, f'dup{n}.csv')
+            pd.DataFrame({'ticker': ['AAPL'] * 100, 'date': range(100), 'close': float(n)}).to_csv(path, index=False)
+            sources.append((path, 'csv'))
+        output = os.path.join(self.temp_dir, 'merged.parquet')
+        # Each CSV scan holds a read buffer of about 30 MB
+        engine = MergeEngine(memory_limit_mb=256, temp_dir=self.temp_dir)
+        engine.merge(sources, output, 'parquet', deduplicate=['ticker', 'date'], sort_by=['date'])
+        result = pd.read_parquet(output)
+        self.assertEqual(list(result.columns), ['ticker', 'date', 'close'])
+        self.assertEqual((len(result), set(result['close'])), (100, {0.0}))
+
+    def test_duckdb_output_and_column_order(self):
+        """DuckDB targets get a tickers_data table in the preferred column order."""
+        import duckdb
+        output = os.path.join(self.temp_dir, 'merged.duckdb')
+        self.engine.merge(self.sources[:1], output, 'duckdb', column_order=['close', 'ticker'])
+        conn = duckdb.connect(output, read_only=True)
+        try:
+            columns = [row[0] for row in conn.execute("DESCRIBE tickers_data").fetchall()]
+        finally:
+            conn.close()
+        self.assertEqual(columns, ['close', 'ticker', 'date'])
+
+    def test_probe_rejects_unreadable_file(self):
+        """Files DuckDB cannot scan raise from probe."""
+        empty = os.path.join(self.temp_dir, 'empty.parquet')
+        open(empty, 'w').close()
+        with self.assertRaises(Exception):
+            self.engine.probe(empty, 'parquet')
+        self.assertFalse(self.engine.can_merge(['csv', 'tensorflow'], 'parquet'))
+
+
+if __name__ == '__main__':
+    unittest.main()
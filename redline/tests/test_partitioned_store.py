@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+REDLINE Partitioned Store Tests
+Tests for the ticker/year partitioned Parquet lake.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import time
+import pandas as pd
+import duckdb
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core import partitioned_store
+from redline.core.partitioned_store import PartitionedStore
+from redline.core.data_loader import DataLoader
+from redline.core.format_loaders import FormatLoaders
+
+
+class TestPartitionedStore(unittest.TestCase):
+    """Test cases for PartitionedStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, 'lake')
+        self.store = PartitionedStore(self.root)
+        self.data = pd.DataFrame({
+            'ticker': ['AAPL', 'AAPL', 'MSFT', 'BRK/B'],
+            'timestamp': pd.to_datetime(['2023-12-29', '2024-01-02', '2024-01-02', '2024-03-01']),
+            'close': [1.0, 2.0, 3.0, 4.0]
+        })
+        self.store.write(self.data)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_layout_and_pruning(self):
+        """Rows land in ticker/year directories; filters select only matching files."""
+        self.assertTrue(os.path.isdir(os.path.join(self.root, 'ticker=AAPL', 'year=2023')))
+        self.assertTrue(self.store.has_ticker('BRK/B'))
+        self.assertEqual(len(self.store.partitions()), 4)
+
+        fragments = list(self.store.dataset().get_fragments(
+            filter=self.store.build_filter(['AAPL'], start='2024-01-01')))
+        self.assertEqual(len(fragments), 1)
+
+        result = self.store.read(['AAPL', 'BRK/B'], start='2024-01-01', end='2024-02-01')
+        self.assertEqual(result['close'].tolist(), [2.0])
+        self.assertEqual(list(result.columns), ['ticker', 'timestamp', 'close'])
+
+    def test_compaction_merges_small_files(self):
+        """Repeated writes are merged into one file per partition, newest rows kept."""
+        update = self.data.copy()
+        update['close'] = update['close'] * 10
+        self.store.write(update)
+        self.assertEqual(self.store.get_stats()['files'], 8)
+
+        stats = self.store.compact()
+        self.assertEqual((stats['compacted'], stats['files_after']), (4, 4))
+        self.assertEqual(self.store.read()['close'].tolist(), [10.0, 20.0, 40.0, 30.0])
+
+    def test_loaders_and_connector_push_down(self):
+        """FormatLoaders and OptimizedDatabaseConnector read the lake with filters."""
+        loaded = FormatLoaders().load_file_by_type(self.root, 'parquet')
+        self.assertEqual(len(loaded), 4)
+        filtered = FormatLoaders().load_partitioned(self.root, tickers=['MSFT'], columns=['close'])
+        self.assertEqual(filtered['close'].tolist(), [3.0])
+
+        from redline.database.optimized_connector import OptimizedDatabaseConnector
+        connector = OptimizedDatabaseConnector(os.path.join(self.temp_dir, 'test.duckdb'), max_connections=1)
+        try:
+            result = connector.query_partitioned(self.root, tickers=['AAPL', 'BRK/B'], start='2024-01-01')
+            selected = connector.query_partitioned(self.root, tickers=['MSFT'], columns=['ticker', 'close'])
+            # Column names are checked against the lake schema, never pasted into the SQL
+            with self.assertRaises(ValueError):
+                connector.query_partitioned(self.root, columns=[
+                    'close" , (SELECT content FROM read_text(\'/etc/hostname\')) AS "leak'])
+        finally:
+            connector.close()
+        self.assertEqual(list(zip(result['ticker'], result['close'])), [('AAPL', 2.0), ('BRK/B', 4.0)])
+        self.assertEqual(selected.to_dict('list'), {'ticker': ['MSFT'], 'close': [3.0]})
+
+    def test_ticker_load_merges_lake_and_database(self):
+        """A lake partition holding part of a range is merged with the table rows, not preferred over them."""
+        loader = DataLoader()
+        loader.db_path = os.path.join(self.temp_dir, 'ticker.duckdb')
+        conn = duckdb.connect(loader.db_path)
+        conn.execute("CREATE TABLE tickers_data AS SELECT 'AAPL' AS ticker, "
+                     "TIMESTAMP '2024-01-01' + INTERVAL (i) DAY AS timestamp, 100.0 + i AS close FROM range(5) t(i)")
+        conn.close()
+
+        with mock.patch.object(partitioned_store, '_partitioned_store', self.store):
+            result = loader.load_ticker_data('AAPL', start='2024-01-01', end='2024-01-05')
+        self.assertEqual(result['timestamp'].dt.day.tolist(), [1, 2, 3, 4, 5])
+        # The lake's 2024-01-02 row wins over the table's
+        self.assertEqual(result['close'].tolist(), [100.0, 2.0, 102.0, 103.0, 104.0])
+
+    def test_compact_route_compacts_the_lake(self):
+        """POST /api/lake/compact runs the compaction, not only submits it."""
+        from flask import Flask
+        from redline.web.routes.api_database import api_database_bp
+        from redline.background.task_manager import task_manager
+
+        self.store.write(self.data)
+        self.assertEqual(self.store.get_stats()['files'], 8)
+        app = Flask(__name__)
+        app.register_blueprint(api_database_bp, url_prefix='/api')
+
+        with mock.patch.object(partitioned_store, '_partitioned_store', self.store), \
+                mock.patch.object(task_manager, 'celery_app', None):
+            response = app.test_client().post('/api/lake/compact', json={'options': {'root': self.temp_dir}})
+            self.assertEqual(response.status_code, 202)
+            task_id = response.get_json()['task_id']
+            deadline = time.time() + 30
+            while task_manager.get_task_status(task_id)['status'] not in ('SUCCESS', 'FAILURE'):
+                self.assertLess(time.time(), deadline)
+                time.sleep(0.05)
+
+        status = task_manager.get_task_status(task_id)
+        self.assertEqual(status['status'], 'SUCCESS', status.get('error'))
+        self.assertEqual(status['result']['files_after'], 4)
+        self.assertEqual(self.store.get_stats()['files'], 4)
+        self.assertEqual(len(self.store.read()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
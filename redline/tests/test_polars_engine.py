@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+REDLINE Polars Engine Tests
+Tests that the lazy polars paths match the pandas paths they replace.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.polars_engine import POLARS_AVAILABLE, resolve_engine, scan, collect, clean_plan
+from redline.core.data_cleaner import DataCleaner
+from redline.web.utils.file_filters import apply_filters, polars_filter_expression
+from redline.web.routes.analysis_basic import perform_basic_analysis, perform_basic_analysis_lazy
+
+
+@unittest.skipUnless(POLARS_AVAILABLE, "polars is not installed")
+class TestPolarsEngine(unittest.TestCase):
+    """Test cases for the polars engine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(7)
+        rows = 200
+        data = pd.DataFrame({
+            'ticker': rng.choice(['AAPL', 'MSFT', 'GOOG'], rows),
+            'timestamp': pd.date_range('2024-01-01', periods=rows, freq='h').astype(str),
+            'close': rng.normal(100, 5, rows).round(2),
+            'vol': rng.integers(100, 10000, rows)
+        })
+        data.loc[3, 'close'] = np.nan
+        self.data = pd.concat([data, data.iloc[:5]], ignore_index=True)
+        self.csv_path = os.path.join(self.temp_dir, 'bars.csv')
+        self.data.to_csv(self.csv_path, index=False)
+        self.parquet_path = os.path.join(self.temp_dir, 'bars.parquet')
+        self.data.iloc[10:].to_parquet(self.parquet_path)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_resolve_engine(self):
+        """The engine defaults to pandas and rejects unknown names."""
+        self.assertEqual(resolve_engine('polars'), 'polars')
+        self.assertEqual(resolve_engine('pandas'), 'pandas')
+        with self.assertRaises(ValueError):
+            resolve_engine('spark')
+
+    def test_filters_match_apply_filters(self):
+        """Form filters select the same rows lazily as apply_filters does."""
+        filters = {
+            'close': {'type': 'greater_than', 'value': '101'},
+            'ticker': {'type': 'contains', 'value': 'a'},
+            'timestamp': {'type': 'date_range', 'value': '2024-01-02 to 2024-01-06'},
+            'missing': {'type': 'equals', 'value': 'x'}
+        }
+        frame = scan(self.csv_path, 'csv')
+        expression = polars_filter_expression(filters, frame.collect_schema())
+        lazy = collect(frame.filter(expression), streaming=True).to_pandas()
+        expected = apply_filters(pd.read_csv(self.csv_path), filters).reset_index(drop=True)
+        pd.testing.assert_frame_equal(lazy, expected, check_dtype=False)
+
+    def test_clean_plan_matches_data_cleaner(self):
+        """Lazy de-duplication and null handling match DataCleaner."""
+        cleaner = DataCleaner()
+        expected = cleaner.handle_missing_values(
+            cleaner.remove_duplicates(pd.read_csv(self.csv_path), subset=['ticker', 'timestamp']), 'drop')
+        lazy = collect(clean_plan(scan(self.csv_path, 'csv'), ['ticker', 'timestamp'])).to_pandas()
+        pd.testing.assert_frame_equal(lazy, expected.reset_index(drop=True), check_dtype=False)
+
+    def test_basic_analysis_matches(self):
+        """The lazy basic analysis reports the pandas statistics (pandas index columns hidden)."""
+        expected = perform_basic_analysis(pd.read_parquet(self.parquet_path))
+        lazy = perform_basic_analysis_lazy(scan(self.parquet_path, 'parquet'))
+        for key in ('shape', 'data_types', 'null_counts', 'categorical_summary'):
+            self.assertEqual(lazy[key], expected[key], key)
+        for stat in ('count', 'mean', 'std', 'min', 'max'):
+            for col, value in expected['numeric_summary'][stat].items():
+                self.assertAlmostEqual(lazy['numeric_summary'][stat][col], value, places=6)
+        self.assertEqual(lazy['numeric_summary']['percentiles']['50%'],
+                         expected['numeric_summary']['percentiles']['50%'])
+
+
+if __name__ == '__main__':
+    unittest.main()
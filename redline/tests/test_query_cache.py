@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+REDLINE Query Cache Tests
+Tests for the LRU, byte-bounded query result cache.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.database.query_cache import QueryCache, referenced_tables
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test cases for QueryCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.frame = pd.DataFrame({'ticker': ['AAPL', 'MSFT'], 'close': [1.0, 2.0]})
+        self.cache = QueryCache(max_size=3, ttl_seconds=300, max_bytes=1024 * 1024)
+
+    def test_hits_are_independent_and_zero_copy(self):
+        """get() hands out fresh frames; get_arrow() hands out the cached table."""
+        self.cache.set("SELECT * FROM tickers_data", self.frame)
+        first = self.cache.get("SELECT * FROM tickers_data")
+        first.loc[0, 'close'] = 99.0
+        self.assertEqual(self.cache.get("SELECT * FROM tickers_data")['close'].tolist(), [1.0, 2.0])
+        self.assertIs(self.cache.get_arrow("SELECT * FROM tickers_data"),
+                      self.cache.get_arrow("SELECT * FROM tickers_data"))
+        self.assertIsNone(self.cache.get("SELECT 1"))
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (4, 1))
+        self.assertEqual(stats['hit_ratio'], 0.8)
+        self.assertGreater(stats['bytes'], 0)
+
+    def test_lru_eviction_by_count_and_bytes(self):
+        """The least recently used entry goes first; oversized results are not kept."""
+        for n in range(3):
+            self.cache.set(f"SELECT {n} FROM t", self.frame)
+        self.cache.get("SELECT 0 FROM t")
+        self.cache.set("SELECT 3 FROM t", self.frame)
+        self.assertIsNone(self.cache.get("SELECT 1 FROM t"))
+        self.assertIsNotNone(self.cache.get("SELECT 0 FROM t"))
+
+        small = QueryCache(max_size=10, max_bytes=self.cache.get_stats()['bytes'] // 3 + 1)
+        small.set("SELECT a FROM t", self.frame)
+        small.set("SELECT b FROM t", self.frame)
+        small.set("SELECT big FROM t", pd.DataFrame({'x': range(1000)}))
+        stats = small.get_stats()
+        self.assertEqual((stats['size'], stats['evictions'], stats['rejected']), (1, 1, 1))
+        self.assertLessEqual(stats['bytes'], stats['max_bytes'])
+
+    def test_invalidate_table(self):
+        """Only results that read the modified table are dropped."""
+        self.cache.set("SELECT * FROM main.tickers_data WHERE ticker = 'AAPL'", self.frame)
+        self.cache.set('SELECT * FROM "other"', self.frame)
+        self.assertEqual(referenced_tables("SELECT * FROM a JOIN b ON a.x = b.x"), {'a', 'b'})
+        self.assertEqual(self.cache.invalidate_table('TICKERS_DATA'), 1)
+        self.assertIsNone(self.cache.get("SELECT * FROM main.tickers_data WHERE ticker = 'AAPL'"))
+        self.assertIsNotNone(self.cache.get('SELECT * FROM "other"'))
+
+
+class TestConnectorInvalidation(unittest.TestCase):
+    """Writes through OptimizedDatabaseConnector drop stale cached results."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_write_shared_data_invalidates(self):
+        """A query re-run after a write sees the new rows."""
+        from redline.database.optimized_connector import OptimizedDatabaseConnector
+        connector = OptimizedDatabaseConnector(os.path.join(self.temp_dir, 'test.duckdb'), max_connections=1)
+        try:
+            data = pd.DataFrame({'ticker': ['AAPL'], 'timestamp': pd.to_datetime(['2024-01-01']),
+                                 'open': [1.0], 'high': [1.0], 'low': [1.0], 'close': [1.0], 'vol': [10.0]})
+            connector.write_shared_data('tickers_data', data, 'csv')
+            query = "SELECT COUNT(*) AS n FROM tickers_data"
+            self.assertEqual(connector.execute_query(query)['n'].iloc[0], 1)
+
+            connector.write_shared_data('tickers_data', pd.concat([data, data]), 'csv')
+            self.assertEqual(connector.execute_query(query)['n'].iloc[0], 2)
+            self.assertEqual(connector.execute_query_arrow(query).column('n')[0].as_py(), 2)
+            self.assertEqual(connector.get_performance_stats()['cache']['invalidations'], 1)
+        finally:
+            connector.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
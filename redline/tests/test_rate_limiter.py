@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+REDLINE Rate Limiter Tests
+Tests for the shared per-source token buckets.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import multiprocessing
+from email.utils import formatdate
+from unittest import mock
+
+import pandas as pd
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.downloaders import rate_limiter
+from redline.downloaders.rate_limiter import RateLimiter, parse_retry_after, configured_limit
+from redline.downloaders.base_downloader import BaseDownloader
+from redline.downloaders.exceptions import RateLimitError
+
+
+def _reserve_in_process(path, queue):
+    queue.put(RateLimiter(path).reserve('yahoo', rate=1.0, burst=1))
+
+
+class _FakeDownloader(BaseDownloader):
+    def download_single_ticker(self, ticker, start_date=None, end_date=None):
+        return pd.DataFrame()
+
+
+def _response(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return response
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'limits.sqlite')
+        self.limiter = RateLimiter(self.path)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_bucket_and_block(self):
+        """A burst is served at once, later tokens queue, and Retry-After blocks the source."""
+        waits = [self.limiter.reserve('stooq', rate=10.0, burst=2) for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, delta=0.02)
+        self.assertAlmostEqual(waits[3], 0.2, delta=0.02)
+        self.assertIsNone(self.limiter.reserve('stooq', rate=10.0, burst=2, max_wait=0.05))
+
+        self.limiter.block('massive', 30)
+        self.assertAlmostEqual(self.limiter.blocked_for('massive'), 30, delta=1)
+        self.assertAlmostEqual(self.limiter.reserve('massive', rate=100.0), 30, delta=1)
+        self.assertEqual(self.limiter.reserve('finnhub', rate=1.0), 0.0)
+
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertAlmostEqual(parse_retry_after(formatdate(1000 + 90, usegmt=True), now=1000), 90, delta=1)
+        self.assertIsNone(parse_retry_after('soon'))
+        with mock.patch.dict(os.environ, {'REDLINE_RATE_LIMIT_ALPHA_VANTAGE': '5/60,5'}):
+            self.assertEqual(configured_limit('Alpha Vantage'), (5 / 60, 5.0))
+
+    def test_processes_share_budget(self):
+        """Processes drawing from one source queue on a single bucket."""
+        queue = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_reserve_in_process, args=(self.path, queue)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        waits = sorted(round(queue.get(timeout=5)) for _ in workers)
+        self.assertEqual(waits, [0, 1, 2, 3])
+
+    def test_downloader_honours_retry_after(self):
+        """A 429 blocks the source; short blocks are waited out, long ones raise RateLimitError."""
+        with mock.patch.object(rate_limiter, '_rate_limiter', self.limiter):
+            downloader = _FakeDownloader('Test Source')
+            downloader.rate_limit_delay = 0.001
+            downloader.response_cache = None
+            downloader.session.get = mock.Mock(side_effect=[_response(429, '0'), _response(200)])
+            self.assertEqual(downloader._make_request('http://example.invalid').status_code, 200)
+            self.assertEqual(downloader.session.get.call_count, 2)
+
+            downloader.session.get = mock.Mock(return_value=_response(429, '3600'))
+            with self.assertRaises(RateLimitError) as raised:
+                downloader._make_request('http://example.invalid')
+            self.assertEqual(raised.exception.source, 'test_source')
+            self.assertAlmostEqual(raised.exception.retry_after, 3600, delta=2)
+            self.assertEqual(downloader.session.get.call_count, 1)
+            self.assertAlmostEqual(self.limiter.blocked_for('Test Source'), 3600, delta=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
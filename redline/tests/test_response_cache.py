@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+REDLINE Response Cache Tests
+Tests for the on-disk cache of downloader HTTP responses.
+"""
+
+import unittest
+import tempfile
+import shutil
+import sqlite3
+import os
+import sys
+from unittest import mock
+
+import pandas as pd
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.downloaders import rate_limiter
+from redline.downloaders.rate_limiter import RateLimiter
+from redline.downloaders.base_downloader import BaseDownloader
+from redline.downloaders.alpha_vantage_downloader import AlphaVantageDownloader
+from redline.downloaders.response_cache import ResponseCache, CacheMiss, normalise_request
+
+
+def _response(status, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class _FakeDownloader(BaseDownloader):
+    def download_single_ticker(self, ticker, start_date=None, end_date=None):
+        return pd.DataFrame()
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ResponseCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'responses.sqlite')
+        self.limiter = RateLimiter(os.path.join(self.temp_dir, 'limits.sqlite'))
+        patch = mock.patch.object(rate_limiter, '_rate_limiter', self.limiter)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _downloader(self, cache):
+        downloader = _FakeDownloader('Test Source')
+        downloader.response_cache = cache
+        downloader.retry_delay = 0
+        return downloader
+
+    def test_request_keys(self):
+        """Equivalent requests share a key, credentials separate keys, and stored URLs hide API keys."""
+        self.assertEqual(normalise_request('HTTP://Example.COM/q?b=2&a=1#top'), 'http://example.com/q?a=1&b=2')
+        self.assertEqual(ResponseCache.request_key('http://example.com/q?b=2', {'a': 1}),
+                         ResponseCache.request_key('http://EXAMPLE.com/q', {'b': '2', 'a': '1', 'c': None}))
+        self.assertNotEqual(ResponseCache.request_key('http://example.com/q', authorization='Bearer one'),
+                            ResponseCache.request_key('http://example.com/q', authorization='Bearer two'))
+
+        cache = ResponseCache(self.path)
+        cache.store('Test Source', 'http://example.com/q', {'symbol': 'IBM', 'apikey': 'SECRET'},
+                    _response(200, b'{}'))
+        with sqlite3.connect(self.path) as conn:
+            stored_url = conn.execute("SELECT url FROM responses").fetchone()[0]
+        self.assertEqual(stored_url, 'http://example.com/q?apikey=%2A%2A%2A&symbol=IBM')
+
+        # Only cacheable 200 answers are kept
+        self.assertFalse(cache.store('Test Source', 'http://example.com/n', None,
+                                     _response(200, b'{}', {'Cache-Control': 'no-store'})))
+        with mock.patch.dict(os.environ, {'REDLINE_HTTP_CACHE_TTL_TEST_SOURCE': '0'}):
+            self.assertFalse(cache.store('Test Source', 'http://example.com/t', None, _response(200, b'{}')))
+        self.assertEqual(cache.get_stats()['test_source']['entries'], 1)
+
+    def test_hits_revalidation_and_stats(self):
+        """A fresh entry is served without a request or a token; a stale one is revalidated."""
+        cache = ResponseCache(self.path, mode='on')
+        downloader = self._downloader(cache)
+        downloader.min_request_interval = 60.0
+        downloader.session.get = mock.Mock(return_value=_response(200, b'day 1', {'ETag': '"v1"'}))
+        params = {'symbol': 'IBM', 'apikey': 'SECRET'}
+
+        downloader._rate_limit()
+        self.assertEqual(downloader._make_request('http://example.com/q', params=params).content, b'day 1')
+        cached = downloader._make_request('http://example.com/q', params=dict(reversed(params.items())))
+        self.assertEqual((cached.content, cached.status_code, cached.from_cache), (b'day 1', 200, True))
+        self.assertEqual(cached.headers['etag'], '"v1"')
+        self.assertEqual(downloader.session.get.call_count, 1)
+        # The hit gave its token back: the next request need not wait a minute
+        self.assertLess(self.limiter.reserve('test_source', rate=1 / 60.0, burst=1), 1.0)
+
+        # Once stale, the entry is revalidated with its ETag and a 304 serves the stored body
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("UPDATE responses SET expires = 0")
+        downloader.session.get = mock.Mock(return_value=_response(304))
+        revalidated = downloader._make_request('http://example.com/q', params=params)
+        self.assertEqual(revalidated.content, b'day 1')
+        self.assertEqual(downloader.session.get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        self.assertTrue(cache.lookup('test_source', 'http://example.com/q', params).fresh)
+
+        stats = downloader.get_statistics()['cache']
+        self.assertEqual((stats['hits'], stats['revalidated'], stats['misses']), (2, 1, 1))
+        self.assertEqual((stats['hit_rate'], stats['entries'], stats['bytes']), (0.75, 1, 5))
+        cache.clear('Test Source')
+        self.assertEqual(cache.get_stats(), {})
+
+    def test_error_answers_are_not_cached(self):
+        """A 200 that the downloader reads as an error or quota note is not stored."""
+        downloader = AlphaVantageDownloader(output_dir=self.temp_dir, api_key='SECRET')
+        downloader.response_cache = cache = ResponseCache(self.path, mode='on')
+        downloader.session.get = mock.Mock(side_effect=[
+            _response(200, b'{"Note": "Thank you for using Alpha Vantage!"}'),
+            _response(200, b'{"Time Series (Daily)": {}}')
+        ])
+        params = {'function': 'TIME_SERIES_DAILY', 'symbol': 'IBM', 'apikey': 'SECRET'}
+        for _ in range(2):
+            downloader._make_request('http://example.com/q', params=params)
+        self.assertEqual(downloader.session.get.call_count, 2)
+        self.assertEqual(cache.lookup('alpha_vantage', 'http://example.com/q', params).response.content,
+                         b'{"Time Series (Daily)": {}}')
+
+    def test_record_and_replay(self):
+        """Record mode always fetches and stores; replay mode never touches the network."""
+        with mock.patch.dict(os.environ, {'REDLINE_HTTP_CACHE_TTL': '0'}):
+            recorder = self._downloader(ResponseCache(self.path, mode='record'))
+            recorder.session.get = mock.Mock(return_value=_response(200, b'recorded'))
+            for _ in range(2):
+                recorder._make_request('http://example.com/q', params={'symbol': 'IBM'})
+            self.assertEqual(recorder.session.get.call_count, 2)
+
+            player = self._downloader(ResponseCache(self.path, mode='replay'))
+            player.session.get = mock.Mock(side_effect=AssertionError('network used in replay mode'))
+            # Served however old the recording is
+            self.assertEqual(player._make_request('http://example.com/q', params={'symbol': 'IBM'}).content,
+                             b'recorded')
+            with self.assertRaises(CacheMiss):
+                player._make_request('http://example.com/q', params={'symbol': 'MSFT'})
+        self.assertEqual(player.session.get.call_count, 0)
+        self.assertEqual(player.response_cache.get_stats()['test_source']['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+REDLINE Result Store Tests
+Tests for materialised filter results and their pagination.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import time
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.result_store import ResultStore
+
+
+class TestResultStore(unittest.TestCase):
+    """Test cases for ResultStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ResultStore(self.temp_dir, ttl_seconds=60)
+        self.data = pd.DataFrame({'ticker': ['AAPL', 'MSFT'] * 150, 'close': [float(i) for i in range(300)],
+                                  'note': [1, 'a', None] * 100})
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_create_and_page(self):
+        """A result is stored once and read back in slices."""
+        info = self.store.create(self.data, {'filename': 'bars.csv'})
+        self.assertEqual((info['rows'], info['columns'], info['filename']), (300, ['ticker', 'close', 'note'], 'bars.csv'))
+
+        page, total = self.store.page(info['result_id'], 250, 100)
+        self.assertEqual(total, 300)
+        self.assertEqual(page['close'].tolist(), [float(i) for i in range(250, 300)])
+        # Mixed-type text columns are stored as text, and records show missing values as None
+        records, _ = self.store.page_records(info['result_id'], 250, 3)
+        self.assertEqual([record['note'] for record in records], ['a', None, '1'])
+
+    def test_expiry_and_ids(self):
+        """Idle results expire; malformed ids are rejected."""
+        info = self.store.create(self.data)
+        old = time.time() - 120
+        os.utime(self.store.path(info['result_id']), (old, old))
+        self.assertIsNone(self.store.get(info['result_id']))
+        self.assertFalse(os.path.exists(self.store.path(info['result_id'])))
+
+        self.assertIsNone(self.store.get('../../etc/passwd'))
+        with self.assertRaises(KeyError):
+            self.store.page('0' * 32)
+
+
+if __name__ == '__main__':
+    unittest.main()
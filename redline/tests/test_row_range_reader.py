@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+REDLINE Row Range Reader Tests
+Tests for page reads that avoid materialising whole files.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.row_range_reader import RowRangeReader
+from redline.core.line_index import LineIndex, sidecar_path
+
+
+class TestRowRangeReader(unittest.TestCase):
+    """Test cases for RowRangeReader class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.reader = RowRangeReader()
+        self.data = pd.DataFrame({
+            'ticker': ['AAPL'] * 2500,
+            'close': np.arange(2500, dtype=float),
+            'vol': np.arange(2500, dtype=np.int64)
+        })
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def _assert_page(self, path, format_type):
+        page, total = self.reader.read_range(path, format_type, 1499, 5)
+        self.assertEqual(total, 2500)
+        self.assertEqual(page['close'].tolist(), [1499.0, 1500.0, 1501.0, 1502.0, 1503.0])
+        self.assertEqual(self.reader.count_rows(path, format_type), 2500)
+
+    def test_csv_range(self):
+        """CSV pages are read through the sidecar line index."""
+        path = self._path('prices.csv')
+        self.data.to_csv(path, index=False)
+        self._assert_page(path, 'csv')
+        self.assertTrue(os.path.exists(sidecar_path(path)))
+
+    def test_stooq_txt_range(self):
+        """Stooq TXT files keep their comma separator."""
+        path = self._path('aapl.us.txt')
+        self.data.rename(columns={'ticker': '<TICKER>', 'close': '<CLOSE>', 'vol': '<VOL>'}).to_csv(path, index=False)
+        page, total = self.reader.read_range(path, 'txt', 10, 2)
+        self.assertEqual(total, 2500)
+        self.assertEqual(page['<CLOSE>'].tolist(), [10.0, 11.0])
+
+    def test_parquet_range(self):
+        """Parquet pages span row-group boundaries correctly."""
+        path = self._path('prices.parquet')
+        self.data.to_parquet(path, row_group_size=300)
+        self._assert_page(path, 'parquet')
+
+    def test_feather_range(self):
+        """Feather pages are sliced from IPC record batches."""
+        path = self._path('prices.feather')
+        self.data.to_feather(path)
+        self._assert_page(path, 'feather')
+
+    def test_duckdb_range(self):
+        """DuckDB pages follow the order the rows were written in."""
+        import duckdb
+        path = self._path('prices.duckdb')
+        conn = duckdb.connect(path)
+        try:
+            conn.register("data", self.data)
+            conn.execute("CREATE TABLE tickers_data AS SELECT * FROM data")
+        finally:
+            conn.close()
+        self._assert_page(path, 'duckdb')
+
+    def test_range_past_end(self):
+        """Reading past the end returns an empty page with the real total."""
+        path = self._path('prices.csv')
+        self.data.to_csv(path, index=False)
+        page, total = self.reader.read_range(path, 'csv', 5000, 10)
+        self.assertTrue(page.empty)
+        self.assertEqual(total, 2500)
+
+    def test_line_index_without_trailing_newline(self):
+        """The last row counts even when the file does not end in a newline."""
+        path = self._path('short.csv')
+        with open(path, 'w') as f:
+            f.write('a,b\n1,2\n3,4')
+        index = LineIndex.build(path, stride=1)
+        self.assertEqual(index.total_rows, 2)
+        self.assertEqual(index.offsets.tolist(), [4, 8])
+
+    def test_date_range_prunes_blocks(self):
+        """Date-range reads only touch blocks whose timestamps overlap."""
+        path = self._path('prices.csv')
+        data = self.data.assign(timestamp=pd.date_range('2020-01-01', periods=2500, freq='D'))
+        data.to_csv(path, index=False)
+        rows = self.reader.read_date_range(path, 'csv', '2022-01-01', '2022-01-10')
+        self.assertEqual(rows['close'].tolist(), [float(v) for v in range(731, 741)])
+        # Timezone-aware bounds are compared in UTC
+        aware = self.reader.read_date_range(path, 'csv', pd.Timestamp('2022-01-01 05:00', tz='US/Eastern'),
+                                            pd.Timestamp('2022-01-10', tz='UTC'))
+        self.assertEqual(aware['close'].tolist(), [float(v) for v in range(732, 741)])
+
+        index = LineIndex.load(path)
+        self.assertTrue(index.has_block_stats)
+        self.assertEqual(index.blocks_for('2022-01-01', '2022-01-10').tolist(), [0])
+        self.assertEqual(index.blocks_for(tickers=['MSFT']).tolist(), [])
+
+    def test_date_range_loads_use_pruned_blocks(self):
+        """DataLoader and form-filter loads of CSV/TXT parse only overlapping blocks and match a full filter."""
+        from unittest import mock
+        from redline.core.data_loader import DataLoader
+        from redline.core.format_loaders import FormatLoaders
+        from redline.web.utils.file_filters import apply_filters, to_load_filters
+        data = self.data.assign(timestamp=pd.date_range('2020-01-01', periods=2500, freq='D').astype(str))
+        csv_path, txt_path = self._path('prices.csv'), self._path('prices.txt')
+        data.to_csv(csv_path, index=False)
+        data.to_csv(txt_path, index=False, sep='\t')
+
+        read_blocks = RowRangeReader.read_candidate_rows
+        parsed = []
+
+        def spy(reader, *args, **kwargs):
+            rows = read_blocks(reader, *args, **kwargs)
+            parsed.append(len(rows))
+            return rows
+
+        with mock.patch.object(RowRangeReader, 'read_candidate_rows', spy):
+            loaded = DataLoader().load_date_range(csv_path, 'csv', '2022-01-01', '2022-01-10')
+            form = {'timestamp': {'type': 'date_range', 'value': '2023-06-01 to 2023-06-30'}}
+            filtered = FormatLoaders().load_file_by_type(txt_path, 'txt', use_cache=False,
+                                                         filters=to_load_filters(form))
+        self.assertEqual(parsed, [1000, 1000])
+        self.assertEqual(loaded['close'].tolist(), [float(v) for v in range(731, 741)])
+        expected = apply_filters(data, form)
+        self.assertEqual(filtered['close'].tolist(), expected['close'].tolist())
+
+    def test_block_stats_count_blank_lines(self):
+        """Blank lines take up rows of their block, so later blocks keep their own dates."""
+        path = self._path('gaps.csv')
+        with open(path, 'w') as f:
+            f.write('timestamp,close\n2020-01-01,1\n\n\n2020-01-02,2\n2020-01-03,3\n2020-01-04,4\n')
+        index = LineIndex.build(path, stride=2)
+        index.build_block_stats()
+        days = [pd.Timestamp(value).strftime('%Y-%m-%d') for value in index.ts_min]
+        self.assertEqual(days, ['2020-01-01', '2020-01-02', '2020-01-03'])
+
+    def test_split_covers_all_rows(self):
+        """Split ranges are contiguous and cover every data row."""
+        path = self._path('prices.csv')
+        self.data.to_csv(path, index=False)
+        index = LineIndex.build(path, stride=100)
+        ranges = index.split(4)
+        self.assertEqual(len(ranges), 4)
+        self.assertEqual(sum(rows for _, _, _, rows in ranges), 2500)
+        self.assertEqual(ranges[0][0], index.header_end)
+        self.assertEqual(ranges[-1][1], index.size)
+        for previous, current in zip(ranges, ranges[1:]):
+            self.assertEqual(previous[1], current[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
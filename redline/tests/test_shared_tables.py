@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+REDLINE Shared Tables Tests
+Tests for replace, append and upsert writes to shared DuckDB tables.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import duckdb
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.database.shared_tables import write_frame
+from redline.core.format_savers import FormatSavers
+
+
+def bars(ticker, days, close):
+    """Daily bars for one ticker."""
+    return pd.DataFrame({
+        'ticker': ticker,
+        'timestamp': pd.date_range('2024-01-01', periods=days, freq='D'),
+        'close': [float(close)] * days
+    })
+
+
+class TestSharedTables(unittest.TestCase):
+    """Test cases for write_frame."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'shared.duckdb')
+        self.conn = duckdb.connect(self.db_path)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.conn.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _rows(self, table='tickers_data'):
+        return self.conn.execute(f"SELECT ticker, timestamp, close FROM {table} ORDER BY ticker, timestamp").fetchall()
+
+    def test_upsert_replaces_keys_and_keeps_indexes(self):
+        """Overlapping keys are replaced, new keys added, indexes kept."""
+        write_frame(self.conn, 'tickers_data', bars('AAPL', 3, 1), mode='replace')
+        self.conn.execute("CREATE INDEX idx_tickers_data_ticker ON tickers_data(ticker)")
+
+        incoming = pd.concat([bars('AAPL', 4, 2).iloc[2:], bars('MSFT', 1, 5), bars('MSFT', 1, 6)])
+        self.assertEqual(write_frame(self.conn, 'tickers_data', incoming, mode='upsert'), 3)
+
+        rows = self._rows()
+        self.assertEqual([r[2] for r in rows], [1.0, 1.0, 2.0, 2.0, 6.0])
+        indexes = {r[0] for r in self.conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()}
+        self.assertIn('idx_tickers_data_ticker', indexes)
+        self.assertIn('idx_tickers_data_key', indexes)
+
+    def test_append_and_duplicate_fallback(self):
+        """Append keeps duplicates; upsert on such a table deletes then inserts."""
+        write_frame(self.conn, 'tickers_data', bars('AAPL', 2, 1), mode='replace')
+        write_frame(self.conn, 'tickers_data', bars('AAPL', 1, 1), mode='append')
+        self.assertEqual(len(self._rows()), 3)
+
+        write_frame(self.conn, 'tickers_data', bars('AAPL', 1, 9), mode='upsert')
+        self.assertEqual([r[2] for r in self._rows()], [9.0, 1.0])
+        with self.assertRaises(ValueError):
+            write_frame(self.conn, 'tickers_data', bars('AAPL', 1, 1), mode='merge')
+
+    def test_format_saver_upsert(self):
+        """DuckDB file targets can be upserted into instead of recreated."""
+        self.conn.close()
+        saver = FormatSavers()
+        saver.save_file_by_type(bars('AAPL', 3, 1), self.db_path, 'duckdb')
+        saver.save_file_by_type(bars('AAPL', 5, 2).iloc[3:], self.db_path, 'duckdb', mode='upsert')
+        self.conn = duckdb.connect(self.db_path)
+        self.assertEqual([r[2] for r in self._rows()], [1.0, 1.0, 1.0, 2.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+REDLINE Streaming Converter Tests
+Tests for batch-by-batch format conversion.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.streaming_converter import StreamingConverter
+from redline.core.format_converter import FormatConverter
+
+
+class TestStreamingConverter(unittest.TestCase):
+    """Test cases for StreamingConverter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'prices.csv')
+        self.rows = 3000
+        self.data = pd.DataFrame({
+            'ticker': np.where(np.arange(self.rows) % 2, 'AAPL', 'MSFT'),
+            'close': np.arange(self.rows, dtype=float),
+            'vol': np.arange(self.rows),
+        })
+        # A decimal far past the first CSV block forces the widened-types restart
+        self.data['vol'] = self.data['vol'].astype(object)
+        self.data.loc[self.rows - 1, 'vol'] = 1.5
+        self.data.to_csv(self.csv_path, index=False)
+        self.converter = StreamingConverter(batch_rows=500, row_group_rows=1000)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _output(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_csv_to_parquet_round_trip(self):
+        """Every row survives a streamed CSV -> Parquet -> Feather conversion."""
+        import pyarrow.parquet as pq
+        import redline.core.streaming_converter as streaming_module
+        original_block = streaming_module.CSV_BLOCK_BYTES
+        streaming_module.CSV_BLOCK_BYTES = 4096
+        try:
+            stats = self.converter.convert(self.csv_path, 'csv', self._output('p.parquet'), 'parquet')
+        finally:
+            streaming_module.CSV_BLOCK_BYTES = original_block
+        self.assertEqual(stats.rows, self.rows)
+        self.assertEqual(stats.columns, ['ticker', 'close', 'vol'])
+        self.assertGreater(pq.ParquetFile(self._output('p.parquet')).num_row_groups, 1)
+
+        self.converter.convert(self._output('p.parquet'), 'parquet', self._output('p.feather'), 'feather')
+        result = pd.read_feather(self._output('p.feather'))
+        self.assertEqual(len(result), self.rows)
+        self.assertEqual(result['vol'].iloc[-1], 1.5)
+        self.assertEqual(result['close'].sum(), self.data['close'].sum())
+
+    def test_json_outputs(self):
+        """JSON targets are a record array; JSON Lines targets stream back in."""
+        self.converter.convert(self.csv_path, 'csv', self._output('p.json'), 'json')
+        self.assertEqual(len(pd.read_json(self._output('p.json'))), self.rows)
+
+        self.converter.convert(self.csv_path, 'csv', self._output('p.jsonl'), 'jsonl')
+        self.assertTrue(self.converter.can_stream(self._output('p.jsonl'), 'json', 'csv'))
+        self.assertFalse(self.converter.can_stream(self._output('p.json'), 'json', 'csv'))
+        stats = self.converter.convert(self._output('p.jsonl'), 'json', self._output('back.csv'), 'csv')
+        self.assertEqual(stats.rows, self.rows)
+        self.assertEqual(pd.read_csv(self._output('back.csv'))['ticker'].iloc[1], 'AAPL')
+
+    def test_duckdb_target(self):
+        """DuckDB targets hold every row in the tickers_data table."""
+        import duckdb
+        stats = self.converter.convert(self.csv_path, 'csv', self._output('p.duckdb'), 'duckdb')
+        self.assertEqual(stats.rows, self.rows)
+        conn = duckdb.connect(self._output('p.duckdb'), read_only=True)
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM tickers_data").fetchone()[0], self.rows)
+        finally:
+            conn.close()
+
+    def test_format_converter_chooses_path(self):
+        """FormatConverter.convert_file streams on request and loads whole otherwise."""
+        converter = FormatConverter()
+        streamed = converter.convert_file(self.csv_path, 'csv', self._output('s.parquet'), 'parquet', stream=True)
+        loaded = converter.convert_file(self.csv_path, 'csv', self._output('l.parquet'), 'parquet', stream=False)
+        self.assertTrue(streamed.streamed)
+        self.assertFalse(loaded.streamed)
+        self.assertEqual(streamed.rows, loaded.rows)
+        self.assertEqual(loaded.to_dict()['rows'], self.rows)
+
+    def test_streamed_output_matches_loaded_output(self):
+        """A conversion writes the same values whether or not the input is streamed."""
+        from redline.core.format_loaders import FormatLoaders
+        data = pd.DataFrame({
+            'ticker': ['AAPL', None, 'MSFT', 'NA', 'GOOG'] * 200,
+            'timestamp': pd.date_range('2024-01-01', periods=1000, freq='D').astype(str),
+            'close': np.linspace(1, 2, 1000).round(4),
+            'note': ['a, "quoted" note', '', 'plain', None, 'x'] * 200,
+        })
+        data.to_csv(self.csv_path, index=False)
+        converter = FormatConverter()
+        loaders = FormatLoaders()
+        for output_format in ('csv', 'txt', 'parquet', 'json', 'duckdb'):
+            streamed_path = self._output(f'streamed.{output_format}')
+            loaded_path = self._output(f'loaded.{output_format}')
+            self.assertTrue(converter.convert_file(self.csv_path, 'csv', streamed_path, output_format,
+                                                   stream=True).streamed)
+            converter.convert_file(self.csv_path, 'csv', loaded_path, output_format, stream=False)
+            if output_format in ('csv', 'txt'):
+                with open(streamed_path) as streamed, open(loaded_path) as loaded:
+                    self.assertEqual(streamed.read(), loaded.read(), output_format)
+            else:
+                pd.testing.assert_frame_equal(loaders.load_file_by_type(streamed_path, output_format, use_cache=False),
+                                              loaders.load_file_by_type(loaded_path, output_format, use_cache=False),
+                                              obj=output_format)
+
+    def test_format_converter_falls_back_when_types_do_not_settle(self):
+        """Text in a numeric column past the first block makes convert_file load the file whole."""
+        import redline.core.streaming_converter as streaming_module
+        data = self.data.assign(vol=self.data['vol'].astype(object))
+        data.loc[self.rows - 1, 'vol'] = 'halted'
+        data.to_csv(self.csv_path, index=False)
+        original_block = streaming_module.CSV_BLOCK_BYTES
+        streaming_module.CSV_BLOCK_BYTES = 4096
+        try:
+            stats = FormatConverter().convert_file(self.csv_path, 'csv', self._output('f.parquet'), 'parquet',
+                                                   stream=True)
+        finally:
+            streaming_module.CSV_BLOCK_BYTES = original_block
+        self.assertFalse(stats.streamed)
+        self.assertEqual(len(pd.read_parquet(self._output('f.parquet'))), self.rows)
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith('.part')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+REDLINE Time Index Tests
+Tests for sorted timestamp indexing and binary-search slicing.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.core.time_index import index_by_time, sorted_by, slice_date_range, slice_ticker
+from redline.core.format_loaders import FormatLoaders
+from redline.web.utils.file_filters import apply_filters
+
+
+class TestTimeIndex(unittest.TestCase):
+    """Test cases for the time index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(3)
+        rows = 300
+        self.data = pd.DataFrame({
+            'ticker': rng.choice(['MSFT', 'AAPL', 'GOOG'], rows),
+            'timestamp': pd.Series(pd.date_range('2024-01-01', periods=rows, freq='h')).sample(frac=1, random_state=1)
+                           .astype(str).to_numpy(),
+            'close': rng.normal(100, 5, rows)
+        })
+        self.data.loc[5, 'timestamp'] = None
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_index_and_slice(self):
+        """Indexed frames slice to the same rows a mask selects, as views when contiguous."""
+        indexed = index_by_time(self.data)
+        self.assertEqual(sorted_by(indexed), ('ticker', 'timestamp'))
+        self.assertIsNone(sorted_by(self.data))
+
+        timestamps = pd.to_datetime(self.data['timestamp'])
+        mask = (timestamps >= '2024-01-03') & (timestamps <= '2024-01-05 12:00')
+        expected = self.data[mask].assign(timestamp=timestamps[mask]).sort_values(['ticker', 'timestamp'])
+        result = slice_date_range(indexed, '2024-01-03', '2024-01-05 12:00')
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+        aapl = slice_date_range(indexed, '2024-01-03', None, tickers=['AAPL'])
+        self.assertTrue(np.shares_memory(aapl['close'].to_numpy(), indexed['close'].to_numpy()))
+        self.assertEqual(set(aapl['ticker']), {'AAPL'})
+        self.assertTrue((aapl['timestamp'] >= '2024-01-03').all())
+        self.assertEqual(len(slice_ticker(indexed, 'GOOG')), (self.data['ticker'] == 'GOOG').sum())
+
+        # Reordering the rows voids the order flag, even with a fresh index or when concatenated
+        self.assertIsNone(sorted_by(indexed.sort_values('close')))
+        shuffled = indexed.sort_values('close').reset_index(drop=True)
+        self.assertEqual(shuffled.attrs['redline_sorted_by'], ('ticker', 'timestamp'))
+        self.assertIsNone(sorted_by(shuffled))
+        in_range = slice_date_range(shuffled, '2024-01-03', '2024-01-05 12:00')
+        self.assertEqual(len(in_range), len(result))
+        self.assertTrue(in_range['timestamp'].between('2024-01-03', '2024-01-05 12:00').all())
+
+        combined = pd.concat([slice_ticker(indexed, 'MSFT'), slice_ticker(indexed, 'AAPL')], ignore_index=True)
+        self.assertIsNone(sorted_by(combined))
+        self.assertEqual(set(slice_date_range(combined, '2024-01-03', '2024-01-05 12:00')['ticker']),
+                         {'MSFT', 'AAPL'} & set(result['ticker']))
+
+    def test_loaders_and_filters_use_index(self):
+        """Sorted files load flagged, and form filters give the same rows either way."""
+        path = os.path.join(self.temp_dir, 'bars.parquet')
+        index_by_time(self.data).to_parquet(path, index=False)
+        loaded = FormatLoaders().load_file_by_type(path, 'parquet', use_cache=False)
+        self.assertEqual(sorted_by(loaded), ('ticker', 'timestamp'))
+
+        filters = {'timestamp': {'type': 'date_range', 'value': '2024-01-02 to 2024-01-04'},
+                   'ticker': {'type': 'equals', 'value': 'MSFT'}}
+        plain = loaded.copy()
+        plain.attrs.clear()
+        pd.testing.assert_frame_equal(apply_filters(loaded, filters), apply_filters(plain, filters))
+
+    def test_coarse_units_slice(self):
+        """Columns stored in microseconds or milliseconds slice to the same rows as nanoseconds."""
+        indexed = index_by_time(self.data)
+        expected = slice_date_range(indexed, '2024-01-03', '2024-01-05 12:00')
+        self.assertGreater(len(expected), 0)
+        for unit in ('us', 'ms'):
+            coarse = index_by_time(indexed.assign(timestamp=indexed['timestamp'].dt.as_unit(unit)))
+            self.assertEqual(coarse['timestamp'].dt.unit, unit)
+            result = slice_date_range(coarse, '2024-01-03', '2024-01-05 12:00')
+            self.assertEqual(len(result), len(expected))
+            self.assertTrue((result['close'].to_numpy() == expected['close'].to_numpy()).all())
+
+            # A bound between two representable values is rounded inwards
+            first = coarse['timestamp'].dropna().iloc[0]
+            past_first = first + pd.Timedelta(1, unit='ns')
+            self.assertNotIn(first, slice_date_range(coarse, past_first, None)['timestamp'].tolist())
+            self.assertNotIn(first, slice_date_range(coarse, None, first - pd.Timedelta(1, unit='ns'))['timestamp'].tolist())
+
+            path = os.path.join(self.temp_dir, f'bars_{unit}.parquet')
+            coarse.to_parquet(path, index=False)
+            loaded = FormatLoaders().load_file_by_type(path, 'parquet', use_cache=False)
+            filters = {'timestamp': {'type': 'date_range', 'value': '2024-01-03 to 2024-01-05 12:00'}}
+            self.assertEqual(len(apply_filters(loaded, filters)), len(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+REDLINE Usage Storage Tests
+Tests for queued, batched usage logging.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import multiprocessing
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from redline.database.usage_storage import UsageStorage
+
+
+def _log_in_process(path, worker, queue):
+    storage = UsageStorage(path, flush_rows=5, flush_ms=10)
+    for n in range(20):
+        storage.log_access('RL-TEST', f'/api/{worker}', 'GET')
+    queue.put(storage.flush(timeout=30))
+    storage.close()
+
+
+class TestUsageStorage(unittest.TestCase):
+    """Test cases for UsageStorage class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = UsageStorage(os.path.join(self.temp_dir, 'usage.duckdb'), flush_rows=50, flush_ms=60000)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_records_are_batched(self):
+        """Log calls only enqueue; rows land in batches with sequence ids."""
+        for n in range(120):
+            self.storage.log_access('RL-TEST', f'/api/{n % 3}', 'GET', session_id='s1', response_status=200)
+        self.storage.log_hour_deduction('RL-TEST', 0.25, session_id='s1', hours_before=1.0, hours_after=0.75)
+        self.storage.log_payment('RL-TEST', 10.0, 25.0, stripe_session_id='cs_1')
+        self.assertTrue(self.storage.flush())
+
+        stats = self.storage.get_stats()
+        self.assertEqual((stats['written'], stats['dropped'], stats['failed']), (121, 0, 0))
+        self.assertLess(stats['flushes'], 10)
+        self.assertEqual(self.storage.get_access_stats('RL-TEST')['total_api_calls'], 120)
+        self.assertEqual(self.storage.get_usage_history('RL-TEST')[0]['hours_deducted'], 0.25)
+        self.assertEqual(self.storage.get_payment_history('RL-TEST')[0]['hours_purchased'], 10.0)
+
+        conn = self.storage._connect()
+        try:
+            ids = [row[0] for row in conn.execute("SELECT id FROM access_logs ORDER BY id").fetchall()]
+        finally:
+            conn.close()
+        self.assertEqual(ids, list(range(1, 121)))
+
+    def test_payments_are_written_before_returning(self):
+        """A payment is on disk without a flush, and a failed write raises."""
+        self.storage.log_payment('RL-TEST', 5.0, 12.5, stripe_session_id='cs_2')
+        conn = self.storage._connect()
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM payment_history").fetchone()[0], 1)
+        finally:
+            conn.close()
+
+        original_connect = self.storage._connect
+        self.storage._connect = lambda: (_ for _ in ()).throw(IOError('locked'))
+        try:
+            with self.assertRaises(IOError):
+                self.storage.log_payment('RL-TEST', 1.0, 2.5)
+        finally:
+            self.storage._connect = original_connect
+
+    def test_failed_flush_is_retried(self):
+        """Records whose flush cannot open the database are kept and written later."""
+        original_connect = self.storage._connect
+        attempts = []
+
+        def flaky_connect():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise IOError('locked')
+            return original_connect()
+
+        self.storage._connect = flaky_connect
+        self.storage.log_hour_deduction('RL-TEST', 0.5)
+        self.assertTrue(self.storage.flush(timeout=10))
+        self.storage._connect = original_connect
+        self.assertGreaterEqual(len(attempts), 2)
+        stats = self.storage.get_stats()
+        self.assertEqual((stats['written'], stats['failed']), (1, 0))
+        self.assertEqual(self.storage.get_usage_history('RL-TEST')[0]['hours_deducted'], 0.5)
+
+    def test_sessions_apply_in_order(self):
+        """A session started and ended in one batch ends up completed."""
+        self.storage.log_session_start('s1', 'RL-TEST')
+        self.storage.log_session_end('s1', 0.5, 1800.0)
+        self.storage.log_session_start('s2', 'RL-TEST', user_id='u2')
+        sessions = {s['session_id']: s for s in self.storage.get_session_history('RL-TEST')}
+        self.assertEqual(sessions['s1']['status'], 'completed')
+        self.assertEqual(sessions['s1']['total_hours'], 0.5)
+        self.assertEqual(sessions['s2']['status'], 'active')
+
+    def test_close_flushes_pending_records(self):
+        """Records still queued at shutdown are written."""
+        path = self.storage.db_path
+        self.storage.log_access('RL-TEST', '/api/x', 'POST')
+        self.storage.close()
+        reopened = UsageStorage(path)
+        try:
+            self.assertEqual(reopened.get_access_stats('RL-TEST')['total_api_calls'], 1)
+        finally:
+            reopened.close()
+
+    def test_worker_processes_share_the_file(self):
+        """Several processes log to one database; none is locked out by another's connection."""
+        queue = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_log_in_process, args=(self.storage.db_path, n, queue))
+                   for n in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+        self.assertEqual([queue.get(timeout=5) for _ in workers], [True, True, True])
+        self.assertEqual(self.storage.get_access_stats('RL-TEST')['total_api_calls'], 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
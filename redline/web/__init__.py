@@ -27,6 +27,8 @@ def create_app():
     # Initialize SocketIO for real-time updates
     allowed_origins = os.environ.get('CORS_ORIGINS', 'http://localhost:8080,http://127.0.0.1:8080').split(',')
     socketio = SocketIO(app, cors_allowed_origins=allowed_origins)
+    # Routes that report background progress emit through this instance
+    app.config['socketio'] = socketio
     
     # Register blueprints
     from .routes.main import main_bp
@@ -45,4 +47,9 @@ def create_app():
     app.register_blueprint(converter_bp, url_prefix='/converter')
     app.register_blueprint(settings_bp, url_prefix='/settings')
     
+    # Push batch download progress over SocketIO and resume download jobs
+    # interrupted by a crash or restart
+    from ..background.download_jobs import get_download_jobs
+    get_download_jobs().start(lambda event: socketio.emit('batch_download_progress', event))
+    
     return app, socketio
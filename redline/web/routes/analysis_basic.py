@@ -67,3 +67,121 @@ def perform_basic_analysis(df):
         logger.error(f"Error in basic analysis: {str(e)}")
         return {'error': str(e)}
 
+
+
+def perform_basic_analysis_lazy(frame, streaming=False):
+    """
+    Perform basic data analysis on a polars LazyFrame.
+
+    Produces the same result as perform_basic_analysis. All statistics are
+    expressed as one aggregate plan, plus one top-values plan per text
+    column, and collected together in a single pass over the input.
+    memory_usage is an estimate of the pandas size, since the frame itself
+    is never materialised.
+
+    Args:
+        frame: polars LazyFrame (columns already cleaned)
+        streaming: Collect with the streaming engine
+
+    Returns:
+        Analysis dict
+    """
+    try:
+        import polars as pl
+        from redline.core.polars_engine import collect, pandas_dtypes
+        from ..utils.analysis_helpers import is_date_like_numeric
+
+        schema = frame.collect_schema()
+        names = schema.names()
+        numeric_cols = [col for col in names if schema[col].is_numeric()]
+        text_cols = [col for col in names if schema[col] in (pl.String, pl.Categorical)]
+
+        aggregates = [pl.len().alias('rows')]
+        for i, col in enumerate(names):
+            aggregates.append(pl.col(col).null_count().alias(f'{i}:nulls'))
+        for i, col in enumerate(names):
+            values = pl.col(col)
+            if col in numeric_cols:
+                aggregates += [
+                    values.count().alias(f'{i}:count'), values.mean().alias(f'{i}:mean'),
+                    values.std().alias(f'{i}:std'), values.min().alias(f'{i}:min'),
+                    values.max().alias(f'{i}:max'), values.drop_nulls().n_unique().alias(f'{i}:unique'),
+                    values.quantile(0.25, 'linear').alias(f'{i}:25%'),
+                    values.quantile(0.50, 'linear').alias(f'{i}:50%'),
+                    values.quantile(0.75, 'linear').alias(f'{i}:75%')
+                ]
+            elif col in text_cols:
+                aggregates += [
+                    values.drop_nulls().n_unique().alias(f'{i}:unique'),
+                    values.cast(pl.String).str.len_bytes().sum().alias(f'{i}:bytes')
+                ]
+        top_values = [
+            # Ties keep first-seen order, as value_counts does
+            frame.select(pl.col(col)).drop_nulls().group_by(col, maintain_order=True).len()
+                 .sort('len', descending=True, maintain_order=True).head(5)
+            for col in text_cols
+        ]
+
+        results = collect([frame.select(aggregates)] + top_values, streaming=streaming)
+        stats = results[0].row(0, named=True)
+        rows = stats['rows']
+
+        # pandas keeps one object per string (about 49 bytes plus the text)
+        # and 8 bytes per value for other columns, plus a 128-byte index
+        memory = 128 + sum(stats[f'{i}:bytes'] + 49 * rows if col in text_cols else 8 * rows
+                           for i, col in enumerate(names))
+
+        analysis = {
+            'shape': {
+                'rows': int(rows),
+                'columns': int(len(names))
+            },
+            'data_types': pandas_dtypes(schema),
+            'null_counts': {col: int(stats[f'{i}:nulls']) for i, col in enumerate(names)},
+            'memory_usage': int(memory),
+            'numeric_summary': {},
+            'categorical_summary': {}
+        }
+
+        # Exclude date/datetime columns from numeric analysis
+        date_keywords = ['date', 'time', 'timestamp', 'year', 'month', 'day']
+        summary_cols = []
+        for i, col in enumerate(names):
+            if col not in numeric_cols or any(keyword in str(col).lower() for keyword in date_keywords):
+                continue
+            if stats[f'{i}:count'] and is_date_like_numeric(col, schema[col].is_integer(), stats[f'{i}:min'],
+                                                            stats[f'{i}:max'], stats[f'{i}:unique'],
+                                                            stats[f'{i}:count']):
+                continue
+            summary_cols.append((i, col))
+
+        if summary_cols:
+            def column_stat(name):
+                return convert_numpy_types({col: stats[f'{i}:{name}'] for i, col in summary_cols})
+
+            analysis['numeric_summary'] = {
+                'count': column_stat('count'),
+                'mean': column_stat('mean'),
+                'std': column_stat('std'),
+                'min': column_stat('min'),
+                'max': column_stat('max'),
+                'percentiles': {
+                    '25%': column_stat('25%'),
+                    '50%': column_stat('50%'),
+                    '75%': column_stat('75%')
+                }
+            }
+
+        for (col, top) in zip(text_cols, results[1:]):
+            i = names.index(col)
+            analysis['categorical_summary'][col] = {
+                'unique_count': int(stats[f'{i}:unique']),
+                'most_common': convert_numpy_types(dict(zip(top[col].to_list(), top['len'].to_list()))),
+                'null_count': int(stats[f'{i}:nulls'])
+            }
+
+        return analysis
+
+    except Exception as e:
+        logger.error(f"Error in basic analysis: {str(e)}")
+        return {'error': str(e)}
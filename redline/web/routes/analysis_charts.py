@@ -33,29 +33,8 @@ def get_chart_data():
         converter = FormatConverter()
         
         # Find file (same logic as analysis endpoint)
-        data_dir = os.path.join(os.getcwd(), 'data')
-        data_path = None
-        
-        if file_path_hint and os.path.exists(file_path_hint):
-            data_path = file_path_hint
-        else:
-            search_paths = [
-                os.path.join(data_dir, filename),
-                os.path.join(data_dir, 'stooq', filename),
-                os.path.join(data_dir, 'downloaded', filename),
-                os.path.join(data_dir, 'uploads', filename)
-            ]
-            
-            converted_dir = os.path.join(data_dir, 'converted')
-            if os.path.exists(converted_dir):
-                for root, dirs, files in os.walk(converted_dir):
-                    if filename in files:
-                        search_paths.append(os.path.join(root, filename))
-            
-            for path in search_paths:
-                if os.path.exists(path):
-                    data_path = path
-                    break
+        from redline.core.file_catalog import resolve_data_file
+        data_path = resolve_data_file(filename, file_path_hint=file_path_hint)
         
         if not data_path or not os.path.exists(data_path):
             return jsonify({'error': f'File not found: {filename}'}), 404
@@ -64,44 +43,37 @@ def get_chart_data():
         ext = os.path.splitext(data_path)[1].lower()
         format_type = EXT_TO_FORMAT.get(ext, 'csv')
         
-        if format_type == 'csv':
-            df = pd.read_csv(data_path)
-        elif format_type == 'parquet':
-            df = pd.read_parquet(data_path)
-        elif format_type == 'feather':
-            df = pd.read_feather(data_path)
-        elif format_type == 'json':
-            df = pd.read_json(data_path)
-        elif format_type == 'duckdb':
-            import duckdb
-            conn = duckdb.connect(data_path)
-            df = conn.execute("SELECT * FROM tickers_data").fetchdf()
-            conn.close()
-        else:
-            df = converter.load_file_by_type(data_path, format_type)
-        
-        if not isinstance(df, pd.DataFrame):
+        # Detect the price and label columns on the first rows, then load
+        # just those two columns
+        sample = converter.loaders.peek(data_path, format_type)
+        if not isinstance(sample, pd.DataFrame):
             return jsonify({'error': 'Invalid data format'}), 400
         
-        df = clean_dataframe_columns(df)
+        raw_names = {str(col).strip(): col for col in sample.columns}
+        sample = clean_dataframe_columns(sample)
         
         # Prepare chart data based on type
         if chart_type == 'price':
-            price_col = detect_price_column(df)
+            price_col = detect_price_column(sample)
             if price_col:
-                # Sample up to 1000 points for performance
-                sample_size = min(1000, len(df))
-                sample_df = df.sample(n=sample_size).sort_index() if len(df) > sample_size else df
-                
-                prices = pd.to_numeric(sample_df[price_col], errors='coerce').dropna().tolist()
-                
                 # Get labels (try timestamp, date, or index)
                 timestamp_col = None
-                for col in df.columns:
+                for col in sample.columns:
                     if any(term in str(col).lower() for term in ['date', 'time', 'timestamp']):
                         timestamp_col = col
                         break
                 
+                wanted = [col for col in (timestamp_col, price_col) if col is not None]
+                df = converter.load_file_by_type(data_path, format_type,
+                                                 columns=[raw_names.get(col, col) for col in wanted])
+                df.columns = wanted
+                
+                # Sample up to 1000 points for performance
+                sample_size = min(1000, len(df))
+                sample_df = df.sample(n=sample_size).sort_index() if len(df) > sample_size else df
+                
+                prices = pd.to_numeric(sample_df[price_col], errors='coerce').dropna().tolist()
+                
                 if timestamp_col:
                     labels = sample_df[timestamp_col].astype(str).tolist()[:len(prices)]
                 else:
@@ -9,7 +9,7 @@ import pandas as pd
 import os
 from ..utils.analysis_helpers import convert_numpy_types
 from ..utils.data_helpers import clean_dataframe_columns
-from .analysis_basic import perform_basic_analysis
+from .analysis_basic import perform_basic_analysis, perform_basic_analysis_lazy
 from .analysis_financial import perform_financial_analysis
 from .analysis_statistical import perform_statistical_analysis
 from .analysis_correlation import perform_correlation_analysis
@@ -40,40 +40,10 @@ def analyze_data():
         
         converter = FormatConverter()
         
-        # Determine file path - check multiple locations including converted files
-        data_dir = os.path.join(os.getcwd(), 'data')
-        data_path = None
-        
-        # If file_path is provided (from converted files), use it directly
-        file_path_hint = data.get('file_path')
-        if file_path_hint and os.path.exists(file_path_hint):
-            data_path = file_path_hint
-        else:
-            # Check locations in order of priority (same as /data/load endpoint):
-            # 1. Root data directory
-            # 2. data/stooq directory (for Stooq downloads)
-            # 3. data/downloaded directory (for other downloads)
-            # 4. data/uploads directory (for uploaded files)
-            # 5. data/converted directory (recursively, for converted files)
-            search_paths = [
-                os.path.join(data_dir, filename),
-                os.path.join(data_dir, 'stooq', filename),
-                os.path.join(data_dir, 'downloaded', filename),
-                os.path.join(data_dir, 'uploads', filename)
-            ]
-            
-            # Check converted directory recursively
-            converted_dir = os.path.join(data_dir, 'converted')
-            if os.path.exists(converted_dir):
-                for root, dirs, files in os.walk(converted_dir):
-                    if filename in files:
-                        search_paths.append(os.path.join(root, filename))
-            
-            # Try each path
-            for path in search_paths:
-                if os.path.exists(path):
-                    data_path = path
-                    break
+        # Determine file path - file_path hint (from converted files) wins, otherwise
+        # search data/, stooq/, downloaded/, uploads/ and converted/ via the file catalog
+        from redline.core.file_catalog import resolve_data_file
+        data_path = resolve_data_file(filename, file_path_hint=data.get('file_path'))
         
         if not data_path or not os.path.exists(data_path):
             return jsonify({'error': f'File not found: {filename}'}), 404
@@ -82,9 +52,13 @@ def analyze_data():
         ext = os.path.splitext(data_path)[1].lower()
         format_type = EXT_TO_FORMAT.get(ext, 'csv')
         
-        # Use direct pandas loading for speed (same as data routes)
-        if format_type == 'csv':
-            df = pd.read_csv(data_path)
+        from redline.core.polars_engine import resolve_engine, can_scan
+        if resolve_engine(data.get('engine')) == 'polars' and can_scan(data_path, format_type):
+            return _analyze_lazy(filename, data_path, format_type, analysis_type)
+        
+        # Tabular formats go through the shared loader so repeat analyses hit the frame cache
+        if format_type in ('csv', 'parquet', 'feather', 'json', 'duckdb'):
+            df = converter.load_file_by_type(data_path, format_type)
         elif format_type == 'txt':
             # Try different separators for TXT files
             df = None
@@ -101,17 +75,6 @@ def analyze_data():
             if df is None:
                 # If all separators fail, try reading as fixed-width
                 df = pd.read_fwf(data_path)
-        elif format_type == 'parquet':
-            df = pd.read_parquet(data_path)
-        elif format_type == 'feather':
-            df = pd.read_feather(data_path)
-        elif format_type == 'json':
-            df = pd.read_json(data_path)
-        elif format_type == 'duckdb':
-            import duckdb
-            conn = duckdb.connect(data_path)
-            df = conn.execute("SELECT * FROM tickers_data").fetchdf()
-            conn.close()
         elif format_type in ('tensorflow', 'npz'):
             import numpy as np
             # Use allow_pickle=True for .npz files that may contain object arrays
@@ -202,3 +165,43 @@ def analyze_data():
         logger.error(f"Error performing analysis: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+
+
+def _analyze_lazy(filename, data_path, format_type, analysis_type):
+    """Analyze a file with the polars engine."""
+    import polars as pl
+    from redline.core.polars_engine import scan, collect, should_stream
+    
+    frame = scan(data_path, format_type)
+    
+    # Same header clean-up as clean_dataframe_columns, applied to the plan
+    names = frame.collect_schema().names()
+    cleaned = clean_dataframe_columns(pd.DataFrame(columns=names)).columns
+    kept = [name for name in names if str(name).strip() in set(cleaned)]
+    frame = frame.select([pl.col(name).alias(str(name).strip()) for name in kept])
+    streaming = should_stream(data_path)
+    
+    if analysis_type == 'basic':
+        analysis_result = perform_basic_analysis_lazy(frame, streaming=streaming)
+        shape = (analysis_result.get('shape', {}).get('rows', 0), len(kept))
+    elif analysis_type in ('financial', 'statistical', 'correlation'):
+        # These analyses need the rows themselves; the plan is collected
+        # once and handed to the pandas implementation
+        df = collect(frame, streaming=streaming).to_pandas()
+        analysis_result = {
+            'financial': perform_financial_analysis,
+            'statistical': perform_statistical_analysis,
+            'correlation': perform_correlation_analysis
+        }[analysis_type](df)
+        shape = df.shape
+    else:
+        return jsonify({'error': f'Unknown analysis type: {analysis_type}'}), 400
+    
+    return jsonify({
+        'filename': filename,
+        'analysis_type': analysis_type,
+        'result': convert_numpy_types(analysis_result),
+        'data_shape': shape,
+        'columns': [str(name).strip() for name in kept],
+        'file_path': data_path
+    })
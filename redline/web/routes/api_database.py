@@ -1,9 +1,10 @@
 """
 API routes for database operations.
-Handles database index management.
+Handles database index management and the partitioned Parquet lake.
 """
 
 from flask import Blueprint, request, jsonify
+import json
 import logging
 
 api_database_bp = Blueprint('api_database', __name__)
@@ -62,3 +63,107 @@ def manage_indexes():
         logger.error(f"Error managing indexes: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+
+
+@api_database_bp.route('/lake', methods=['GET'])
+def lake_status():
+    """Get partitioned Parquet lake contents."""
+    try:
+        from redline.core.partitioned_store import get_partitioned_store
+        
+        store = get_partitioned_store()
+        result = store.get_stats()
+        if request.args.get('partitions', 'false').lower() == 'true':
+            result['partition_list'] = [{k: v for k, v in p.items() if k != 'path'} for p in store.partitions()]
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"Error reading lake status: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+@api_database_bp.route('/lake/ingest', methods=['POST'])
+def lake_ingest():
+    """Write data files into the partitioned Parquet lake."""
+    try:
+        from redline.core.partitioned_store import get_partitioned_store
+        from redline.core.format_converter import FormatConverter
+        from redline.core.file_catalog import resolve_data_file
+        
+        data = request.get_json() or {}
+        files = data.get('files', [])
+        if not files:
+            return jsonify({'error': 'files is required'}), 400
+        
+        store = get_partitioned_store()
+        converter = FormatConverter()
+        results, errors = [], []
+        for filename in files:
+            try:
+                path = resolve_data_file(filename)
+                if not path:
+                    raise FileNotFoundError(f"File not found: {filename}")
+                frame = converter.load_file_by_type(path, converter.detect_format_from_extension(path))
+                results.append({'file': filename, **store.write(frame)})
+            except Exception as e:
+                logger.warning(f"Could not ingest {filename} into the lake: {str(e)}")
+                errors.append({'file': filename, 'error': str(e)})
+        
+        return jsonify({
+            'status': 'success' if results else 'error',
+            'results': results,
+            'errors': errors,
+            'lake': store.get_stats()
+        }), 200 if results else 400
+        
+    except Exception as e:
+        logger.error(f"Error ingesting into lake: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+@api_database_bp.route('/lake/compact', methods=['POST'])
+def lake_compact():
+    """Merge small files in the partitioned Parquet lake (background task)."""
+    try:
+        from redline.background.tasks.lake_tasks import submit_lake_compaction
+        
+        options = (request.get_json(silent=True) or {}).get('options', {})
+        # Only tuning options; the lake directory is never taken from the client
+        options = {key: options[key] for key in ('small_file_mb', 'deduplicate') if key in options}
+        task_id = submit_lake_compaction(options)
+        return jsonify({
+            'task_id': task_id,
+            'status': 'submitted',
+            'message': 'Lake compaction submitted'
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error submitting lake compaction: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+@api_database_bp.route('/lake/query', methods=['GET'])
+def lake_query():
+    """Read ticker/date ranges from the partitioned Parquet lake."""
+    try:
+        from redline.database.optimized_connector import OptimizedDatabaseConnector
+        
+        tickers = [t for value in request.args.getlist('ticker') for t in value.split(',') if t]
+        columns = [c for c in request.args.get('columns', '').split(',') if c] or None
+        limit = request.args.get('limit', 1000, type=int)
+        
+        optimized_db = OptimizedDatabaseConnector()
+        df = optimized_db.query_partitioned(tickers=tickers or None, start=request.args.get('start'),
+                                            end=request.args.get('end'), columns=columns, limit=limit)
+        return jsonify({
+            'columns': list(df.columns),
+            'rows': len(df),
+            # to_json turns NaN into null and timestamps into ISO strings
+            'data': json.loads(df.to_json(orient='records', date_format='iso'))
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error querying lake: {str(e)}")
+        return jsonify({'error': str(e)}), 500
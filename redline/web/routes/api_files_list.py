@@ -15,6 +15,8 @@ logger = logging.getLogger(__name__)
 SYSTEM_FILES = {
     'usage_data.duckdb',
     'redline_data.duckdb',
+    'conversion_jobs.sqlite',  # Batch conversion job state
+    'download_jobs.sqlite',  # Background download job state
     # These files are now in ~/.redline/ and should not be listed
     # 'api_keys.json',
     # 'custom_apis.json',
@@ -37,88 +39,23 @@ def api_list_files():
         data_dir = os.path.join(os.getcwd(), 'data')
         files = []
         
-        # Get files from main data directory
-        if os.path.exists(data_dir):
-            for filename in os.listdir(data_dir):
-                # Skip system files
-                if filename in SYSTEM_FILES:
-                    continue
-                file_path = os.path.join(data_dir, filename)
-                if os.path.isfile(file_path) and not filename.startswith('.'):
-                    file_stat = os.stat(file_path)
-                    files.append({
-                        'name': filename,
-                        'size': file_stat.st_size,
-                        'modified': file_stat.st_mtime,
-                        'path': file_path,
-                        'storage': 'local',
-                        'location': 'root'
-                    })
-        
-        # Get files from downloaded directory
-        downloaded_dir = os.path.join(data_dir, 'downloaded')
-        if os.path.exists(downloaded_dir):
-            for filename in os.listdir(downloaded_dir):
-                # Skip system files
-                if filename in SYSTEM_FILES:
-                    continue
-                file_path = os.path.join(downloaded_dir, filename)
-                if os.path.isfile(file_path) and not filename.startswith('.'):
-                    file_stat = os.stat(file_path)
-                    files.append({
-                        'name': filename,
-                        'size': file_stat.st_size,
-                        'modified': file_stat.st_mtime,
-                        'path': file_path,
-                        'storage': 'local',
-                        'location': 'downloaded'
-                    })
-        
-        # Get files from stooq directory (for Stooq downloads)
-        stooq_dir = os.path.join(data_dir, 'stooq')
-        if os.path.exists(stooq_dir):
-            try:
-                for filename in os.listdir(stooq_dir):
-                    # Skip system files
-                    if filename in SYSTEM_FILES:
-                        continue
-                    file_path = os.path.join(stooq_dir, filename)
-                    if os.path.isfile(file_path) and not filename.startswith('.'):
-                        file_stat = os.stat(file_path)
-                        files.append({
-                            'name': filename,
-                            'size': file_stat.st_size,
-                            'modified': file_stat.st_mtime,
-                            'path': file_path,
-                            'storage': 'local',
-                            'location': 'stooq'
-                        })
-            except Exception as e:
-                logger.warning(f"Error reading stooq directory: {str(e)}")
-
-        # Get files from converted/export directory (recursively including subdirectories)
-        converted_dir = os.path.join(data_dir, 'converted')
-        if os.path.exists(converted_dir):
-            # Recursively search subdirectories in converted/ (duckdb/, parquet/, etc.)
-            for root, dirs, filenames in os.walk(converted_dir):
-                for filename in filenames:
-                    # Skip system files
-                    if filename in SYSTEM_FILES:
-                        continue
-                    if not filename.startswith('.'):
-                        file_path = os.path.join(root, filename)
-                        if os.path.isfile(file_path):
-                            file_stat = os.stat(file_path)
-                            # Get relative path for location
-                            rel_path = os.path.relpath(file_path, data_dir)
-                            files.append({
-                                'name': filename,
-                                'size': file_stat.st_size,
-                                'modified': file_stat.st_mtime,
-                                'path': file_path,
-                                'storage': 'local',
-                                'location': rel_path
-                            })
+        # Local files from data/, downloaded/, stooq/ and converted/ (recursively).
+        # Served from the file catalog index instead of re-stat'ing every file.
+        from redline.core.file_catalog import get_file_catalog
+        catalog = get_file_catalog(data_dir)
+        for entry in catalog.list_files(locations=('root', 'downloaded', 'stooq', 'converted')):
+            # Skip system and hidden files
+            if entry.name in SYSTEM_FILES or entry.name.startswith('.'):
+                continue
+            files.append({
+                'name': entry.name,
+                'size': entry.size,
+                'modified': entry.modified,
+                'path': entry.path,
+                'storage': 'local',
+                # Converted files report their path relative to data/ (e.g. converted/parquet/x.parquet)
+                'location': os.path.relpath(entry.path, data_dir) if entry.location == 'converted' else entry.location
+            })
         
         # Get files from S3/R2 if configured
         use_s3 = os.environ.get('USE_S3_STORAGE', 'false').lower() == 'true'
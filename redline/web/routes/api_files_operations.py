@@ -52,36 +52,13 @@ def delete_file(filename):
             filenames_to_search.append(safe_filename)
         
         # Check locations in order of priority for both filename variants
-        search_paths = []
+        from redline.core.file_catalog import get_file_catalog
+        catalog = get_file_catalog(data_dir)
         for search_filename in filenames_to_search:
-            search_paths.extend([
-                os.path.join(data_dir, search_filename),
-                os.path.join(data_dir, 'downloaded', search_filename),
-                os.path.join(data_dir, 'stooq', search_filename),
-                os.path.join(data_dir, 'uploads', search_filename)
-            ])
-        
-        # Also search in converted directory recursively
-        converted_dir = os.path.join(data_dir, 'converted')
-        if os.path.exists(converted_dir):
-            for search_filename in filenames_to_search:
-                # First try direct path
-                direct_path = os.path.join(converted_dir, search_filename)
-                if os.path.exists(direct_path) and os.path.isfile(direct_path):
-                    search_paths.append(direct_path)
-                else:
-                    # Search recursively in all subdirectories
-                    for root, dirs, files in os.walk(converted_dir):
-                        if search_filename in files:
-                            potential_path = os.path.join(root, search_filename)
-                            if os.path.exists(potential_path) and os.path.isfile(potential_path):
-                                search_paths.append(potential_path)
-                                break  # Found it, no need to continue
-        
-        # Find the file
-        for path in search_paths:
-            if os.path.exists(path) and os.path.isfile(path):
-                file_path = path
+            file_path = catalog.resolve(
+                search_filename, locations=('root', 'downloaded', 'stooq', 'uploads', 'converted')
+            )
+            if file_path:
                 break
         
         if not file_path:
@@ -94,6 +71,7 @@ def delete_file(filename):
         # Delete the file
         try:
             os.remove(file_path)
+            catalog.discard(file_path)
             logger.info(f"Deleted file: {file_path}")
             return jsonify({
                 'success': True,
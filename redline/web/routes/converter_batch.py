@@ -3,10 +3,9 @@ Batch file conversion routes for REDLINE Web GUI.
 Handles multiple file format conversion operations.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 import logging
 import os
-import pandas as pd
 from ..utils.converter_helpers import find_input_file_path, adjust_output_filename
 
 converter_batch_bp = Blueprint('converter_batch', __name__)
@@ -14,130 +13,127 @@ logger = logging.getLogger(__name__)
 
 @converter_batch_bp.route('/batch-convert', methods=['POST'])
 def batch_convert():
-    """Convert multiple files in batch."""
+    """
+    Convert multiple files in batch.
+    
+    Files are converted in parallel by the shared conversion pool. The request
+    returns a job id straight away (202); per-file progress is emitted as
+    'batch_conversion_progress' SocketIO events and the job can be polled at
+    /converter/batch-convert/<job_id>. Pass "wait": true to block until the
+    job finishes and get the full result instead.
+    """
     try:
         data = request.get_json()
         files = data.get('files', [])  # List of {input_file, output_format, output_filename}
         overwrite = data.get('overwrite', False)
+        wait = data.get('wait', False)
         
         logger.info(f"Batch conversion started: {len(files)} file(s)")
         
         if not files:
             return jsonify({'error': 'No files provided for conversion'}), 400
         
-        results = []
+        items = []
         errors = []
         data_dir = os.path.join(os.getcwd(), 'data')
         
+        from redline.core.schema import EXT_TO_FORMAT
+        
         for idx, file_config in enumerate(files, 1):
-            try:
-                input_file = file_config.get('input_file')
-                output_format = file_config.get('output_format')
-                output_filename = file_config.get('output_filename')
-                
-                logger.info(f"Processing file {idx}/{len(files)}: {input_file}")
-                
-                if not all([input_file, output_format, output_filename]):
-                    errors.append({
-                        'input_file': input_file,
-                        'error': 'Missing required parameters'
-                    })
-                    continue
-                
-                # Adjust output filename extension
-                output_filename = adjust_output_filename(output_filename, output_format)
-                
-                # Check if output file exists
-                output_path = os.path.join(data_dir, 'converted', output_filename)
-                
-                if os.path.exists(output_path) and not overwrite:
+            input_file = file_config.get('input_file')
+            output_format = file_config.get('output_format')
+            output_filename = file_config.get('output_filename')
+            
+            logger.debug(f"Checking file {idx}/{len(files)}: {input_file}")
+            
+            if not all([input_file, output_format, output_filename]):
+                errors.append({
+                    'input_file': input_file,
+                    'error': 'Missing required parameters'
+                })
+                continue
+            
+            # Adjust output filename extension
+            output_filename = adjust_output_filename(output_filename, output_format)
+            
+            # Check if output file exists
+            output_path = os.path.join(data_dir, 'converted', output_filename)
+            
+            if os.path.exists(output_path) and not overwrite:
+                errors.append({
+                    'input_file': input_file,
+                    'output_file': output_filename,
+                    'error': 'Output file already exists'
+                })
+                continue
+            
+            # Find input file path
+            input_path = find_input_file_path(input_file, data_dir)
+            
+            if not input_path or not os.path.exists(input_path):
+                # Check if it's a system file
+                from ..utils.converter_helpers import is_system_file
+                if is_system_file(os.path.basename(input_file)):
                     errors.append({
                         'input_file': input_file,
-                        'output_file': output_filename,
-                        'error': 'Output file already exists'
+                        'error': 'System files cannot be converted'
                     })
-                    continue
-                
-                # Find input file path
-                input_path = find_input_file_path(input_file, data_dir)
-                
-                # Log debugging info
-                logger.debug(f"Input file search: {input_file}")
-                
-                if not input_path or not os.path.exists(input_path):
-                    # Check if it's a system file
-                    from ..utils.converter_helpers import is_system_file
-                    if is_system_file(os.path.basename(input_file)):
-                        errors.append({
-                            'input_file': input_file,
-                            'error': 'System files cannot be converted'
-                        })
-                    else:
-                        error_msg = f'Input file not found: {input_file}'
-                        logger.warning(error_msg)
-                        errors.append({
-                            'input_file': input_file,
-                            'error': error_msg
-                        })
-                    continue
-                
-                from redline.core.format_converter import FormatConverter
-                converter = FormatConverter()
-                
-                # Load and convert
-                from redline.core.schema import EXT_TO_FORMAT
-                
-                # Detect format from file extension
-                ext = os.path.splitext(input_path)[1].lower()
-                format_type = EXT_TO_FORMAT.get(ext, 'csv')
-                
-                logger.info(f"Loading file {input_file} as {format_type} format...")
-                data_obj = converter.load_file_by_type(input_path, format_type)
-                
-                if data_obj is None or (hasattr(data_obj, 'empty') and data_obj.empty):
-                    logger.warning(f"Failed to load or empty file: {input_file}")
+                else:
+                    error_msg = f'Input file not found: {input_file}'
+                    logger.warning(error_msg)
                     errors.append({
                         'input_file': input_file,
-                        'error': 'Failed to load input file or file is empty'
+                        'error': error_msg
                     })
-                    continue
-                
-                logger.info(f"Successfully loaded {input_file}: {len(data_obj)} rows")
-                
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                logger.info(f"Saving converted file to {output_path}...")
-                converter.save_file_by_type(data_obj, output_path, output_format)
-                
-                file_stat = os.stat(output_path)
-                logger.info(f"Successfully converted {input_file} to {output_filename} ({file_stat.st_size} bytes)")
-                
-                results.append({
-                    'input_file': input_file,
-                    'output_file': output_filename,
-                    'output_format': output_format,
-                    'file_size': file_stat.st_size,
-                    'records': len(data_obj) if isinstance(data_obj, pd.DataFrame) else 0,
-                    'success': True
-                })
-                
-            except Exception as e:
-                errors.append({
-                    'input_file': file_config.get('input_file', 'unknown'),
-                    'error': str(e)
-                })
+                continue
+            
+            # Detect format from file extension
+            ext = os.path.splitext(input_path)[1].lower()
+            items.append({
+                'input_path': input_path,
+                'input_format': EXT_TO_FORMAT.get(ext, 'csv'),
+                'output_path': output_path,
+                'output_format': output_format,
+                'meta': {'input_file': input_file, 'output_file': output_filename}
+            })
         
-        logger.info(f"Batch conversion completed: {len(results)} successful, {len(errors)} failed")
+        from redline.background.conversion_pool import get_conversion_pool
+        pool = get_conversion_pool()
+        
+        if wait:
+            job = pool.run(items, errors=errors)
+            logger.info(f"Batch conversion completed: {job.completed} successful, {job.failed} failed")
+            return jsonify(job.to_dict())
+        
+        socketio = current_app.config.get('socketio')
+        
+        def emit_progress(event):
+            if socketio is not None and hasattr(socketio, 'emit'):
+                socketio.emit('batch_conversion_progress', event)
+        
+        job_id = pool.submit(items, progress_callback=emit_progress, errors=errors)
+        logger.info(f"Batch conversion job {job_id} submitted: {len(items)} file(s), {len(errors)} rejected")
         
         return jsonify({
-            'message': f'Batch conversion completed. {len(results)} successful, {len(errors)} failed.',
-            'results': results,
-            'errors': errors,
+            'message': f'Batch conversion started for {len(items)} file(s).',
+            'job_id': job_id,
+            'status_url': f'/converter/batch-convert/{job_id}',
             'total_files': len(files),
-            'successful': len(results),
-            'failed': len(errors)
-        })
+            'queued': len(items),
+            'failed': len(errors),
+            'errors': errors
+        }), 202
         
     except Exception as e:
         logger.error(f"Error in batch conversion: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+
+@converter_batch_bp.route('/batch-convert/<job_id>', methods=['GET'])
+def batch_convert_status(job_id):
+    """Get the progress and results of a batch conversion job."""
+    from redline.background.conversion_pool import get_conversion_pool
+    job = get_conversion_pool().get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
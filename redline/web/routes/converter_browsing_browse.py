@@ -60,6 +60,8 @@ def browse_filesystem():
             SYSTEM_FILES = {
                 'usage_data.duckdb',
                 'redline_data.duckdb',
+                'conversion_jobs.sqlite',  # Batch conversion job state
+                'download_jobs.sqlite',  # Background download job state
                 'data_config.ini',
                 'config.ini',
                 'api_keys.json',      # API keys configuration (sensitive)
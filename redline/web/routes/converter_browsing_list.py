@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 SYSTEM_FILES = {
     'usage_data.duckdb',
     'redline_data.duckdb',
+    'conversion_jobs.sqlite',  # Batch conversion job state
+    'download_jobs.sqlite',  # Background download job state
     'data_config.ini',
     'config.ini',
     'api_keys.json',      # API keys configuration (sensitive)
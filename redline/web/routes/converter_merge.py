@@ -18,7 +18,13 @@ logger = logging.getLogger(__name__)
 
 @converter_merge_bp.route('/batch-merge', methods=['POST'])
 def batch_merge():
-    """Merge multiple files into one during batch conversion."""
+    """
+    Merge multiple files into one during batch conversion.
+    
+    Inputs are unioned out of core by the DuckDB merge engine whenever every
+    input and the output format support it (memory bounded by
+    REDLINE_MERGE_MEMORY_MB); otherwise each file is loaded with pandas.
+    """
     try:
         data = request.get_json()
         files = data.get('files', [])
@@ -26,6 +32,9 @@ def batch_merge():
         output_filename = data.get('output_filename', 'merged_data')
         column_mappings = data.get('column_mappings', {})
         column_order = data.get('column_order')
+        remove_duplicates = data.get('remove_duplicates', False)  # True, or list of key columns
+        sort_by = data.get('sort_by')
+        engine = data.get('engine', 'auto')  # 'auto' (DuckDB when possible) or 'pandas'
         overwrite = data.get('overwrite', False)
         
         if not files:
@@ -52,13 +61,13 @@ def batch_merge():
                 'output_file': output_filename
             }), 400
         
-        # Load all files
+        # Resolve all files
         from redline.core.format_converter import FormatConverter
+        from redline.core.merge_engine import MergeEngine
         from redline.core.schema import EXT_TO_FORMAT
         
         converter = FormatConverter()
-        dataframes = []
-        loaded_files = []
+        resolved = []
         errors = []
         
         for file_info in files:
@@ -99,6 +108,33 @@ def batch_merge():
                     })
                     continue
                 
+                resolved.append((input_file, input_path, format_type))
+                    
+            except Exception as e:
+                errors.append({
+                    'input_file': file_info if isinstance(file_info, str) else file_info.get('input_file', 'unknown'),
+                    'error': str(e)
+                })
+        
+        # Parse column_order if it's a string (comma-separated)
+        if column_order and isinstance(column_order, str):
+            column_order = [col.strip() for col in column_order.split(',') if col.strip()]
+        if sort_by and isinstance(sort_by, str):
+            sort_by = [col.strip() for col in sort_by.split(',') if col.strip()]
+        
+        # Merge out of core in DuckDB when every input and the output format allow it
+        merge_engine = MergeEngine()
+        if engine != 'pandas' and merge_engine.can_merge([fmt for _, _, fmt in resolved], normalized_format):
+            return _merge_out_of_core(merge_engine, resolved, errors, output_path, output_filename,
+                                      normalized_format, column_mappings, column_order,
+                                      remove_duplicates, sort_by)
+        
+        # Load all files
+        dataframes = []
+        loaded_files = []
+        
+        for input_file, input_path, format_type in resolved:
+            try:
                 data_obj = converter.load_file_by_type(input_path, format_type)
                 if data_obj is None or (hasattr(data_obj, 'empty') and data_obj.empty):
                     errors.append({
@@ -118,7 +154,7 @@ def batch_merge():
                     
             except Exception as e:
                 errors.append({
-                    'input_file': file_info if isinstance(file_info, str) else file_info.get('input_file', 'unknown'),
+                    'input_file': input_file,
                     'error': str(e)
                 })
         
@@ -130,11 +166,12 @@ def batch_merge():
         
         # Merge DataFrames
         try:
-            # Parse column_order if it's a string (comma-separated)
-            if column_order and isinstance(column_order, str):
-                column_order = [col.strip() for col in column_order.split(',') if col.strip()]
-            
             merged_df = merge_dataframes(dataframes, column_mappings, column_order=column_order)
+            if remove_duplicates:
+                merged_df = merged_df.drop_duplicates(
+                    subset=remove_duplicates if isinstance(remove_duplicates, list) else None, ignore_index=True)
+            if sort_by:
+                merged_df = merged_df.sort_values(sort_by, ignore_index=True)
             
             if merged_df.empty:
                 return jsonify({
@@ -184,7 +221,8 @@ def batch_merge():
                 'total_records': len(merged_df),
                 'columns': list(merged_df.columns),
                 'loaded_files': loaded_files,
-                'errors': errors
+                'errors': errors,
+                'engine': 'pandas'
             })
             
         except Exception as e:
@@ -198,3 +236,58 @@ def batch_merge():
         logger.error(f"Error in batch merge: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+
+
+def _merge_out_of_core(merge_engine, resolved, errors, output_path, output_filename, output_format,
+                       column_mappings, column_order, remove_duplicates, sort_by):
+    """Merge resolved files with the DuckDB merge engine and build the response."""
+    sources = []
+    loaded_files = []
+    for input_file, input_path, format_type in resolved:
+        try:
+            # Reads only the header/metadata, so unreadable files are reported per file
+            merge_engine.probe(input_path, format_type)
+            sources.append((input_path, format_type))
+            loaded_files.append(input_file)
+        except Exception as e:
+            errors.append({
+                'input_file': input_file,
+                'error': f'Failed to load file: {str(e)}'
+            })
+    
+    if not sources:
+        return jsonify({
+            'error': 'No valid files could be loaded for merge',
+            'errors': errors
+        }), 400
+    
+    try:
+        stats = merge_engine.merge(sources, output_path, output_format,
+                                   column_mappings=column_mappings, column_order=column_order,
+                                   deduplicate=remove_duplicates, sort_by=sort_by)
+    except Exception as e:
+        logger.error(f"Error merging files: {str(e)}")
+        return jsonify({
+            'error': f'Failed to merge files: {str(e)}',
+            'errors': errors
+        }), 500
+    
+    if stats.rows == 0:
+        os.remove(output_path)
+        return jsonify({
+            'error': 'Merged DataFrame is empty'
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'message': f'Successfully merged {len(loaded_files)} files',
+        'output_file': output_filename,
+        'output_format': output_format,
+        'file_size': stats.output_bytes,
+        'total_records': stats.rows,
+        'columns': stats.columns,
+        'loaded_files': loaded_files,
+        'errors': errors,
+        'engine': 'duckdb',
+        'merge_stats': stats.to_dict()
+    })
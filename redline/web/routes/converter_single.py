@@ -83,23 +83,27 @@ def convert_file():
         ext = os.path.splitext(input_path)[1].lower()
         format_type = EXT_TO_FORMAT.get(ext, 'csv')
         
-        data_obj = converter.load_file_by_type(input_path, format_type)
+        # Apply data cleaning options if provided
+        remove_duplicates = data.get('remove_duplicates', False)
+        handle_missing = data.get('handle_missing', 'none')
+        clean_column_names = data.get('clean_column_names', False)
+        column_order = data.get('column_order')
+        
+        # Without cleaning, large files are streamed by convert_file instead of loaded whole
+        stream = not (remove_duplicates or (handle_missing and handle_missing != 'none')
+                      or clean_column_names or column_order)
+        data_obj = None if stream else converter.load_file_by_type(input_path, format_type)
         
-        if data_obj is None or (hasattr(data_obj, 'empty') and data_obj.empty):
+        if not stream and (data_obj is None or (hasattr(data_obj, 'empty') and data_obj.empty)):
             logger.error(f"Failed to load data from {input_path}")
             return jsonify({
                 'error': 'Failed to load input file',
                 'details': f'Could not load data from {input_file} as {format_type} format'
             }), 400
         
-        # Apply data cleaning options if provided
-        remove_duplicates = data.get('remove_duplicates', False)
-        handle_missing = data.get('handle_missing', 'none')
-        clean_column_names = data.get('clean_column_names', False)
-        column_order = data.get('column_order')
-        
         original_rows = len(data_obj) if isinstance(data_obj, pd.DataFrame) else 0
         cleaning_stats = {}
+        conversion_stats = None
         
         if isinstance(data_obj, pd.DataFrame):
             # Remove duplicates
@@ -180,7 +184,12 @@ def convert_file():
         # Save in new format
         logger.info(f"Converting to {output_format} format")
         try:
-            converter.save_file_by_type(data_obj, output_path, output_format)
+            if stream:
+                conversion_stats = converter.convert_file(input_path, format_type, output_path,
+                                                          output_format).to_dict()
+                original_rows = conversion_stats['rows']
+            else:
+                converter.save_file_by_type(data_obj, output_path, output_format)
         except Exception as save_error:
             logger.error(f"Failed to save converted file: {str(save_error)}")
             return jsonify({
@@ -188,6 +197,8 @@ def convert_file():
                 'details': str(save_error)
             }), 400
         
+        records = len(data_obj) if isinstance(data_obj, pd.DataFrame) else original_rows
+        
         # Get file info
         file_stat = os.stat(output_path)
         
@@ -217,7 +228,7 @@ def convert_file():
                             'converted_from': input_file,
                             'original_format': format_type,
                             'converted_via': 'web_converter',
-                            'records': len(data_obj) if isinstance(data_obj, pd.DataFrame) else 0
+                            'records': records
                         }
                     )
                     user_file_id = file_info.get('file_id')
@@ -233,11 +244,12 @@ def convert_file():
             'output_format': output_format,
             'output_path': output_path,
             'file_size': file_stat.st_size,
-            'records': len(data_obj) if isinstance(data_obj, pd.DataFrame) else 0,
+            'records': records,
             'original_records': original_rows,
             'user_file_id': user_file_id,  # ID in user storage if saved
             'cleaning_applied': remove_duplicates or (handle_missing and handle_missing != 'none') or clean_column_names,
-            'cleaning_stats': cleaning_stats
+            'cleaning_stats': cleaning_stats,
+            'conversion_stats': conversion_stats
         }
         
         return jsonify(result)
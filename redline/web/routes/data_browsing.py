@@ -23,6 +23,8 @@ def list_files():
         SYSTEM_FILES = {
             'usage_data.duckdb',
             'redline_data.duckdb',
+            'conversion_jobs.sqlite',  # Batch conversion job state
+            'download_jobs.sqlite',  # Background download job state
             # These files are now in ~/.redline/ and should not be listed
             # 'api_keys.json',
             # 'custom_apis.json',
@@ -34,34 +34,10 @@ def clean_data():
             return jsonify({'error': 'No filename provided'}), 400
         
         # Load the file
-        data_dir = os.path.join(os.getcwd(), 'data')
-        file_path = None
-        
-        # Search for file in data directories
-        search_paths = [
-            os.path.join(data_dir, filename),
-            os.path.join(data_dir, 'downloaded', filename),
-            os.path.join(data_dir, 'stooq', filename),
-            os.path.join(data_dir, 'uploads', filename)
-        ]
-        
-        # Search in converted directory recursively
-        converted_dir = os.path.join(data_dir, 'converted')
-        if os.path.exists(converted_dir):
-            direct_path = os.path.join(converted_dir, filename)
-            if os.path.exists(direct_path) and os.path.isfile(direct_path):
-                search_paths.append(direct_path)
-            else:
-                for root, dirs, files in os.walk(converted_dir):
-                    if filename in files:
-                        search_paths.append(os.path.join(root, filename))
-                        break
-        
-        # Find the file
-        for path in search_paths:
-            if os.path.exists(path) and os.path.isfile(path):
-                file_path = path
-                break
+        from redline.core.file_catalog import resolve_data_file
+        file_path = resolve_data_file(
+            filename, locations=('root', 'downloaded', 'stooq', 'uploads', 'converted')
+        )
         
         if not file_path:
             return jsonify({
@@ -69,8 +45,19 @@ def clean_data():
                 'message': f'File "{filename}" not found in data directories'
             }), 404
         
-        # Load data
         format_type = _detect_format_from_path(file_path)
+        
+        from redline.core.polars_engine import resolve_engine, can_scan
+        if resolve_engine(data.get('engine')) == 'polars' and can_scan(file_path, format_type):
+            result = _clean_lazy(file_path, format_type, remove_duplicates, handle_missing)
+            if result is None:
+                return jsonify({
+                    'error': 'No data found',
+                    'message': f'The file "{filename}" contains no data'
+                }), 404
+            return jsonify({'success': True, 'filename': filename, **result})
+        
+        # Load data
         df = _load_file_by_format(file_path, format_type)
         
         if df.empty:
@@ -131,6 +118,51 @@ def clean_data():
         logger.error(f"Traceback: {traceback.format_exc()}")
         return jsonify({'error': str(e)}), 500
 
+def _clean_lazy(file_path: str, format_type: str, remove_duplicates: bool, handle_missing: str):
+    """Clean a file with the polars engine; returns the response fields, or None if it is empty."""
+    import polars as pl
+    from redline.core.polars_engine import scan, collect, clean_plan, should_stream
+    from ..utils.analysis_helpers import detect_ticker_column, detect_timestamp_column
+    
+    frame = scan(file_path, format_type)
+    
+    subset = None
+    if remove_duplicates:
+        # Key columns are detected on the first rows
+        sample = frame.head(1000).collect().to_pandas()
+        ticker_col = detect_ticker_column(sample)
+        timestamp_col = detect_timestamp_column(sample)
+        if ticker_col and timestamp_col:
+            subset = [ticker_col, timestamp_col]
+        elif timestamp_col:
+            subset = [timestamp_col]
+    
+    deduplicated = clean_plan(frame, subset, remove_duplicates=remove_duplicates, handle_missing=None)
+    cleaned = clean_plan(deduplicated, remove_duplicates=False, handle_missing=handle_missing)
+    
+    original, after_duplicates, total, preview = collect(
+        [frame.select(pl.len()), deduplicated.select(pl.len()), cleaned.select(pl.len()), cleaned.head(1000)],
+        streaming=should_stream(file_path)
+    )
+    original_rows = int(original.item())
+    if original_rows == 0:
+        return None
+    
+    stats = {}
+    if remove_duplicates:
+        stats['duplicates_removed'] = original_rows - int(after_duplicates.item())
+    if handle_missing and handle_missing != 'none':
+        stats['missing_handled'] = int(after_duplicates.item()) - int(total.item())
+    
+    preview = clean_dataframe_columns(preview.to_pandas())
+    return {
+        'columns': list(preview.columns),
+        'data': preview.to_dict('records'),
+        'total_rows': int(total.item()),
+        'original_rows': original_rows,
+        'stats': stats
+    }
+
 @data_filtering_clean_bp.route('/save-cleaned', methods=['POST'])
 @rate_limit("10 per minute")
 def save_cleaned_data():
@@ -11,8 +11,10 @@ from ..utils.file_loading import (
     detect_format_from_path as _detect_format_from_path,
     load_file_by_format as _load_file_by_format,
     save_file_by_format as _save_file_by_format,
-    apply_filters as _apply_filters
+    apply_filters as _apply_filters,
+    to_load_filters as _to_load_filters
 )
+from ..utils.api_helpers import normalize_pagination
 
 data_filtering_filter_bp = Blueprint('data_filtering_filter', __name__)
 logger = logging.getLogger(__name__)
@@ -20,7 +22,14 @@ logger = logging.getLogger(__name__)
 @data_filtering_filter_bp.route('/filter', methods=['POST'])
 @rate_limit("60 per minute")
 def filter_file_data():
-    """Apply filters to loaded data."""
+    """
+    Apply filters to a file and materialise the result.
+    
+    The filtered rows are stored once under a result id. The response
+    carries the counts and the first page; later pages come from
+    /filter/results/<result_id>, and /export can write the stored result
+    without filtering again.
+    """
     try:
         data = request.get_json()
         filename = data.get('filename')
@@ -39,39 +48,135 @@ def filter_file_data():
         if not file_path or not os.path.exists(file_path):
             return jsonify({'error': 'File not found'}), 404
         
-        # Load and filter data
         format_type = _detect_format_from_path(file_path)
-        df = _load_file_by_format(file_path, format_type)
-        
-        # Apply filters
-        filtered_df = _apply_filters(df, filters)
+        _, page_size = normalize_pagination(1, data.get('page_size'))
+        
+        from redline.core.result_store import get_result_store
+        from redline.core.polars_engine import resolve_engine, can_scan
+        if resolve_engine(data.get('engine')) == 'polars' and can_scan(file_path, format_type):
+            filtered, original_rows = _filter_lazy(file_path, format_type, filters)
+        else:
+            # Load data, skipping rows outside any range filters while reading
+            # (CSV/TXT date ranges parse only the line-index blocks they overlap)
+            load_filters = _to_load_filters(filters)
+            df = _load_file_by_format(file_path, format_type, filters=load_filters)
+            
+            # Apply filters
+            filtered = _apply_filters(df, filters)
+            if load_filters:
+                from redline.core.row_range_reader import RowRangeReader
+                original_rows = RowRangeReader().count_rows(file_path, format_type)
+            else:
+                original_rows = len(df)
+        
+        store = get_result_store()
+        result = store.create(filtered, {'filename': filename, 'filters': filters,
+                                         'original_rows': original_rows})
+        records, total_rows = store.page_records(result['result_id'], 0, page_size)
         
         return jsonify({
-            'data': filtered_df.to_dict('records'),
-            'columns': list(filtered_df.columns),
-            'total_rows': len(filtered_df),
-            'original_rows': len(df)
+            'result_id': result['result_id'],
+            'data': records,
+            'columns': result['columns'],
+            'total_rows': total_rows,
+            'original_rows': original_rows,
+            'next_cursor': _next_cursor(0, len(records), total_rows),
+            'expires_in': store.ttl_seconds
         })
         
     except Exception as e:
         logger.error(f"Error filtering data: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@data_filtering_filter_bp.route('/filter/results/<result_id>', methods=['GET'])
+def get_filter_results(result_id):
+    """
+    Fetch a page of a materialised filter result.
+    
+    Query parameters:
+        cursor: Position returned as next_cursor by the previous page (default: start)
+        limit: Rows per page (default 100, max 1000)
+    """
+    try:
+        from redline.core.result_store import get_result_store
+        
+        try:
+            offset = int(request.args.get('cursor') or 0)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        _, limit = normalize_pagination(1, request.args.get('limit'))
+        
+        store = get_result_store()
+        info = store.get(result_id)
+        if info is None:
+            return jsonify({'error': 'Result not found or expired', 'result_id': result_id}), 404
+        
+        records, total_rows = store.page_records(result_id, offset, limit)
+        return jsonify({
+            'result_id': result_id,
+            'data': records,
+            'columns': info['columns'],
+            'total_rows': total_rows,
+            'cursor': offset,
+            'next_cursor': _next_cursor(offset, len(records), total_rows),
+            'expires_in': store.ttl_seconds
+        })
+        
+    except Exception as e:
+        logger.error(f"Error reading filter result {result_id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@data_filtering_filter_bp.route('/filter/results/<result_id>', methods=['DELETE'])
+def delete_filter_results(result_id):
+    """Discard a materialised filter result before it expires."""
+    from redline.core.result_store import get_result_store
+    if not get_result_store().delete(result_id):
+        return jsonify({'error': 'Result not found or expired', 'result_id': result_id}), 404
+    return jsonify({'result_id': result_id, 'deleted': True})
+
+def _next_cursor(offset: int, page_rows: int, total_rows: int):
+    """Cursor for the page after one starting at offset, or None at the end."""
+    position = offset + page_rows
+    return str(position) if page_rows and position < total_rows else None
+
+def _filter_lazy(file_path: str, format_type: str, filters: dict):
+    """Plan a filter with the polars engine; returns (filtered LazyFrame, original row count)."""
+    import polars as pl
+    from redline.core.polars_engine import scan, collect, should_stream
+    from ..utils.file_filters import polars_filter_expression
+    
+    frame = scan(file_path, format_type)
+    expression = polars_filter_expression(filters, frame.collect_schema())
+    filtered = frame.filter(expression) if expression is not None else frame
+    
+    # The filtered plan is streamed into the result store, never collected
+    original_rows = int(collect(frame.select(pl.len()), streaming=should_stream(file_path)).item())
+    return filtered, original_rows
+
 @data_filtering_filter_bp.route('/export', methods=['POST'])
 def export_file_data():
-    """Export filtered data to a file."""
+    """
+    Export filtered data to a file.
+    
+    With a result_id from /filter the stored result is streamed to the
+    export file; otherwise the file is loaded and filtered again.
+    """
     try:
         data = request.get_json()
         filename = data.get('filename')
         format_type = data.get('format', 'csv')
         export_filename = data.get('export_filename')
         filters = data.get('filters', {})
+        result_id = data.get('result_id')
+        data_dir = os.path.join(os.getcwd(), 'data')
+        
+        if export_filename and result_id:
+            return _export_result(result_id, os.path.join(data_dir, export_filename), format_type)
         
         if not filename or not export_filename:
             return jsonify({'error': 'Filename and export filename are required'}), 400
         
         # Load and filter data
-        data_dir = os.path.join(os.getcwd(), 'data')
         root_path = os.path.join(data_dir, filename)
         downloaded_path = os.path.join(data_dir, 'downloaded', filename)
         
@@ -80,9 +185,9 @@ def export_file_data():
         if not file_path:
             return jsonify({'error': 'File not found'}), 404
         
-        # Load data
+        # Load data, skipping rows outside any range filters while reading
         original_format = _detect_format_from_path(file_path)
-        df = _load_file_by_format(file_path, original_format)
+        df = _load_file_by_format(file_path, original_format, filters=_to_load_filters(filters))
         
         # Apply filters if any
         if filters:
@@ -102,3 +207,29 @@ def export_file_data():
         logger.error(f"Error exporting data: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+
+def _export_result(result_id: str, export_path: str, format_type: str):
+    """Write a materialised filter result to a file without filtering again."""
+    from redline.core.result_store import get_result_store
+    from redline.core.streaming_converter import StreamingConverter
+    
+    store = get_result_store()
+    info = store.get(result_id)
+    if info is None:
+        return jsonify({'error': 'Result not found or expired; run the filter again',
+                        'result_id': result_id}), 404
+    
+    converter = StreamingConverter()
+    if converter.can_stream(store.path(result_id), 'arrow', format_type):
+        rows = converter.convert(store.path(result_id), 'arrow', export_path, format_type).rows
+    else:
+        df, rows = store.page(result_id, 0, info['rows'])
+        if not _save_file_by_format(df, export_path, format_type):
+            return jsonify({'error': f'Could not export to {format_type}'}), 500
+    
+    return jsonify({
+        'message': f'Data exported successfully to {os.path.basename(export_path)}',
+        'export_path': export_path,
+        'rows_exported': rows,
+        'result_id': result_id
+    })
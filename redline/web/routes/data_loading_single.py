@@ -12,6 +12,8 @@ from ..utils.file_loading import (
     load_file_by_format as _load_file_by_format
 )
 from ..utils.data_helpers import clean_dataframe_columns
+from redline.core.file_catalog import resolve_data_file
+from redline.core.row_range_reader import RowRangeReader
 
 data_loading_single_bp = Blueprint('data_loading_single', __name__)
 logger = logging.getLogger(__name__)
@@ -31,54 +33,23 @@ def load_data():
         
         # Determine file path - check multiple locations in order
         data_dir = os.path.join(os.getcwd(), 'data')
-        data_path = None
         
-        # Check locations in order of priority:
+        # Locations are searched in order of priority:
         # 1. Root data directory
         # 2. data/stooq directory (for Stooq downloads)
         # 3. data/downloaded directory (for other downloads)
         # 4. data/uploads directory (for uploaded files)
         # 5. data/converted directory (recursively - for converted files)
+        # The shared file catalog indexes these once instead of walking converted/ per request.
         search_paths = [
             os.path.join(data_dir, filename),
-            os.path.join(data_dir, 'stooq', filename),  # Already included
+            os.path.join(data_dir, 'stooq', filename),
             os.path.join(data_dir, 'downloaded', filename),
             os.path.join(data_dir, 'uploads', filename)
         ]
-        
-        # Also search in converted directory recursively
-        converted_dir = os.path.join(data_dir, 'converted')
-        converted_path = None
-        if os.path.exists(converted_dir):
-            # First try direct path (most common case)
-            direct_converted_path = os.path.join(converted_dir, filename)
-            logger.debug(f"Checking converted direct path: {direct_converted_path}")
-            if os.path.exists(direct_converted_path) and os.path.isfile(direct_converted_path):
-                converted_path = direct_converted_path
-                logger.info(f"Found file in converted directory: {converted_path}")
-            else:
-                # If not found, search recursively
-                logger.debug(f"File not in converted root, searching recursively...")
-                for root, dirs, files in os.walk(converted_dir):
-                    if filename in files:
-                        potential_path = os.path.join(root, filename)
-                        if os.path.exists(potential_path) and os.path.isfile(potential_path):
-                            converted_path = potential_path
-                            logger.info(f"Found file in converted subdirectory: {converted_path}")
-                            break
-        
-        # Add converted path to search paths if found
-        if converted_path:
-            search_paths.append(converted_path)
-            logger.debug(f"Added converted path to search: {converted_path}")
-        
-        # Try all search paths
-        logger.debug(f"Searching {len(search_paths)} paths for {filename}")
-        for path in search_paths:
-            if os.path.exists(path) and os.path.isfile(path):
-                data_path = path
-                logger.info(f"Found file at: {data_path}")
-                break
+        data_path = resolve_data_file(filename, data_dir=data_dir)
+        if data_path:
+            logger.info(f"Found file at: {data_path}")
         
         # If file not found locally, check S3/R2
         if not data_path:
@@ -147,43 +118,6 @@ def load_data():
         
         # Load data
         format_type = _detect_format_from_path(data_path)
-        logger.info(f"Loading file with format: {format_type}")
-        try:
-            df = _load_file_by_format(data_path, format_type)
-        except Exception as e:
-            logger.error(f"Error loading file {data_path}: {str(e)}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return jsonify({
-                'error': 'Failed to load file',
-                'message': str(e),
-                'format': format_type
-            }), 500
-        
-        if df.empty:
-            logger.warning(f"Loaded DataFrame is empty for {filename}")
-            return jsonify({
-                'error': 'No data found',
-                'message': f'The file "{filename}" contains no data or could not be parsed',
-                'format': format_type
-            }), 404
-        
-        # Clean up malformed CSV headers - remove unnamed/empty columns
-        df = clean_dataframe_columns(df)
-        
-        # Mask API keys if this is an API key file or contains API key columns
-        from ..utils.security_helpers import should_mask_file, mask_dataframe_columns
-        if should_mask_file(filename):
-            df = mask_dataframe_columns(df)
-            logger.info(f"Masked API keys in file: {filename}")
-        else:
-            # Still check for API key columns even if not an API key file
-            df = mask_dataframe_columns(df)
-        
-        # Check if file is in converted directory (suggests it may have been cleaned during conversion)
-        is_converted_file = 'converted' in data_path.replace(os.sep, '/')
-        logger.info(f"File {filename} is_converted_file: {is_converted_file} (path: {data_path})")
-        
         # Get pagination parameters
         page = data.get('page', 1)
         per_page = data.get('per_page', 500)
@@ -222,17 +156,52 @@ def load_data():
             logger.warning(f"Invalid per_page parameter '{data.get('per_page')}', defaulting to 500: {str(e)}")
             per_page = 500
         
+        logger.info(f"Loading file with format: {format_type}")
+        try:
+            # Read only the requested page; the total row count comes from file metadata
+            page_df, total_rows = RowRangeReader().read_range(
+                data_path, format_type, (page - 1) * per_page, per_page
+            )
+        except Exception as e:
+            logger.error(f"Error loading file {data_path}: {str(e)}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return jsonify({
+                'error': 'Failed to load file',
+                'message': str(e),
+                'format': format_type
+            }), 500
+        
+        if total_rows == 0:
+            logger.warning(f"Loaded DataFrame is empty for {filename}")
+            return jsonify({
+                'error': 'No data found',
+                'message': f'The file "{filename}" contains no data or could not be parsed',
+                'format': format_type
+            }), 404
+        
+        # Clean up malformed CSV headers - remove unnamed/empty columns
+        paginated_df = clean_dataframe_columns(page_df)
+        
+        # Mask API keys if this is an API key file or contains API key columns
+        from ..utils.security_helpers import should_mask_file, mask_dataframe_columns
+        if should_mask_file(filename):
+            paginated_df = mask_dataframe_columns(paginated_df)
+            logger.info(f"Masked API keys in file: {filename}")
+        else:
+            # Still check for API key columns even if not an API key file
+            paginated_df = mask_dataframe_columns(paginated_df)
+        
+        # Check if file is in converted directory (suggests it may have been cleaned during conversion)
+        is_converted_file = 'converted' in data_path.replace(os.sep, '/')
+        logger.info(f"File {filename} is_converted_file: {is_converted_file} (path: {data_path})")
+        
         # Calculate pagination
-        total_rows = len(df)
+        total_rows = int(total_rows)
         total_pages = (total_rows + per_page - 1) // per_page
-        start_idx = (page - 1) * per_page
-        end_idx = min(start_idx + per_page, total_rows)
-        
-        # Get paginated data
-        paginated_df = df.iloc[start_idx:end_idx]
         
         return jsonify({
-            'columns': list(df.columns),
+            'columns': list(paginated_df.columns),
             'data': paginated_df.to_dict('records'),
             'total_rows': total_rows,
             'filename': filename,
@@ -159,8 +159,7 @@ def get_balance():
                     'message': 'License not found on server - using local tracking'
                 }
                 try:
-                    from redline.database.usage_storage import UsageStorage
-                    usage_storage = UsageStorage()
+                    from redline.database.usage_storage import usage_storage
                     if usage_storage:
                         stats = usage_storage.get_access_stats(license_key, days=30)
                         result['usage_stats'] = stats
@@ -191,8 +190,7 @@ def get_balance():
             
             # Add usage statistics if storage is available
             try:
-                from redline.database.usage_storage import UsageStorage
-                usage_storage = UsageStorage()
+                from redline.database.usage_storage import usage_storage
                 if usage_storage:
                     stats = usage_storage.get_access_stats(license_key, days=30)
                     result['usage_stats'] = stats
@@ -272,8 +270,7 @@ def get_history():
         
         # Get usage history from storage
         try:
-            from redline.database.usage_storage import UsageStorage
-            usage_storage = UsageStorage()
+            from redline.database.usage_storage import usage_storage
             if usage_storage:
                 if history_type in ('all', 'usage'):
                     result['usage_history'] = usage_storage.get_usage_history(license_key, limit=100)
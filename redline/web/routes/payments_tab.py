@@ -72,8 +72,7 @@ def payment_success():
                         logger.warning(f"License server unavailable, payment processed but hours not added to server for {license_key}")
                         # Log payment anyway
                         try:
-                            from redline.database.usage_storage import UsageStorage
-                            usage_storage = UsageStorage()
+                            from redline.database.usage_storage import usage_storage
                             if usage_storage:
                                 usage_storage.log_payment(
                                     license_key=license_key,
@@ -102,8 +101,7 @@ def payment_success():
                     
                     # Log payment to persistent storage
                     try:
-                        from redline.database.usage_storage import UsageStorage
-                        usage_storage = UsageStorage()
+                        from redline.database.usage_storage import usage_storage
                         if usage_storage:
                             usage_storage.log_payment(
                                 license_key=license_key,
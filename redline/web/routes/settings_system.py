@@ -58,6 +58,19 @@ def get_system_info():
             system_info['disk'] = {'message': 'psutil not available'}
             system_info['cpu'] = {'message': 'psutil not available'}
         
+        # Data caches
+        from redline.core.frame_cache import get_frame_cache
+        from redline.core.file_catalog import get_file_catalog
+        system_info['caches'] = {
+            'frame_cache': get_frame_cache().get_stats(),
+            'file_catalog': get_file_catalog().get_stats()
+        }
+        
+        # Downloader HTTP responses, hit rate per source (shared on disk)
+        from redline.downloaders.response_cache import get_response_cache
+        response_cache = get_response_cache()
+        system_info['caches']['http_responses'] = response_cache.get_stats() if response_cache else {'mode': 'off'}
+        
         return jsonify(system_info)
         
     except Exception as e:
@@ -39,12 +39,24 @@ def submit_task():
             'process_data_download',
             'process_data_analysis',
             'process_file_upload',
-            'process_bulk_operations'
+            'process_bulk_operations',
+            'process_lake_compaction'
         ]
         
         if task_name not in valid_tasks:
             return jsonify({'error': f'Invalid task name: {task_name}'}), 400
         
+        if task_name == 'process_lake_compaction':
+            # Runs on a thread when no broker is configured (see submit_lake_compaction)
+            from ...background.tasks.lake_tasks import submit_lake_compaction
+            options = kwargs.get('options') or {}
+            options = {key: options[key] for key in ('small_file_mb', 'deduplicate') if key in options}
+            return jsonify({
+                'task_id': submit_lake_compaction(options),
+                'status': 'submitted',
+                'message': f'Task {task_name} submitted successfully'
+            })
+        
         # Submit task
         task_id = task_manager.submit_task(
             task_name=task_name,
@@ -447,15 +447,21 @@ const dataManager = {
             });
     },
 
-    // Export data
-    exportData: function(filename, format, exportFilename, filters = {}) {
+    // Fetch the next page of a filter result (cursor comes from the previous page)
+    fetchFilterPage: function(resultId, cursor, limit = 100) {
+        return api.get(`/data/filter/results/${resultId}?cursor=${encodeURIComponent(cursor || '')}&limit=${limit}`);
+    },
+
+    // Export data (a resultId from applyFilters exports the stored result without re-filtering)
+    exportData: function(filename, format, exportFilename, filters = {}, resultId = null) {
         ui.showLoading('Exporting data...');
         
         return api.post('/data/export', {
             filename: filename,
             format: format,
             export_filename: exportFilename,
-            filters: filters
+            filters: filters,
+            result_id: resultId
         })
             .then(response => {
                 ui.hideLoading();
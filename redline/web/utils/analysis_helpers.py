@@ -12,6 +12,7 @@ import logging
 from .data_loaders import load_data_file
 from .column_detectors import (
     detect_date_columns,
+    is_date_like_numeric,
     detect_ticker_column,
     detect_timestamp_column,
     detect_price_column,
@@ -33,6 +34,7 @@ __all__ = [
     'convert_numpy_types',
     'flatten_dict',
     'detect_date_columns',
+    'is_date_like_numeric',
     'detect_ticker_column',
     'detect_timestamp_column',
     'detect_price_column',
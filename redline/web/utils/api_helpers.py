@@ -34,18 +34,35 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def paginate_data(data, page=1, per_page=None):
-    """Paginate data for API responses."""
+def normalize_pagination(page=1, per_page=None):
+    """Clamp page and per_page to valid values."""
     if per_page is None:
         per_page = DEFAULT_PAGE_SIZE
-    
-    # Ensure page and per_page are valid
     page = max(1, int(page))
     per_page = min(max(1, int(per_page)), MAX_PAGE_SIZE)
+    return page, per_page
+
+
+def build_pagination(total_items, page, per_page):
+    """Build the pagination block for an API response."""
+    total_pages = (total_items + per_page - 1) // per_page
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total_items,
+        'pages': total_pages,
+        'has_next': page < total_pages,
+        'has_prev': page > 1
+    }
+
+
+def paginate_data(data, page=1, per_page=None):
+    """Paginate data for API responses."""
+    # Ensure page and per_page are valid
+    page, per_page = normalize_pagination(page, per_page)
     
     # Calculate pagination
     total_items = len(data)
-    total_pages = (total_items + per_page - 1) // per_page
     start_idx = (page - 1) * per_page
     end_idx = min(start_idx + per_page, total_items)
     
@@ -54,13 +71,5 @@ def paginate_data(data, page=1, per_page=None):
     
     return {
         'data': paginated_data,
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': total_items,
-            'pages': total_pages,
-            'has_next': page < total_pages,
-            'has_prev': page > 1
-        }
+        'pagination': build_pagination(total_items, page, per_page)
     }
-
@@ -18,13 +18,8 @@ def load_large_file_chunked(file_path: str, format_type: str, chunk_size: int =
         logger.info(f"Loading large file {file_path} in chunks of {chunk_size} rows")
         
         if format_type == 'csv':
-            # Load CSV in chunks
-            chunks = []
-            for chunk in pd.read_csv(file_path, chunksize=chunk_size):
-                chunks.append(chunk)
-                if len(chunks) >= 10:  # Limit memory usage
-                    combined = pd.concat(chunks, ignore_index=True)
-                    chunks = [combined]
+            # Load CSV in chunks, concatenated once (merging every few chunks re-copies the accumulated rows)
+            chunks = list(pd.read_csv(file_path, chunksize=chunk_size))
             
             if chunks:
                 return pd.concat(chunks, ignore_index=True)
@@ -40,12 +35,7 @@ def load_large_file_chunked(file_path: str, format_type: str, chunk_size: int =
                     
                 if '<TICKER>' in first_line:
                     # Stooq format - load in chunks
-                    chunks = []
-                    for chunk in pd.read_csv(file_path, chunksize=chunk_size, sep=','):
-                        chunks.append(chunk)
-                        if len(chunks) >= 10:
-                            combined = pd.concat(chunks, ignore_index=True)
-                            chunks = [combined]
+                    chunks = list(pd.read_csv(file_path, chunksize=chunk_size, sep=','))
                     
                     if chunks:
                         return pd.concat(chunks, ignore_index=True)
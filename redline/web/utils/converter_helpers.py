@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 SYSTEM_FILES = {
     'usage_data.duckdb',
     'redline_data.duckdb',
+    'conversion_jobs.sqlite',  # Batch conversion job state
+    'download_jobs.sqlite',  # Background download job state
     'data_config.ini',
     'config.ini',
     'api_keys.json',      # API keys configuration (sensitive)
@@ -70,21 +72,11 @@ def find_input_file_path(input_file, data_dir=None):
         
         input_path = dest_path
     else:
-        # Existing logic for relative paths
-        # Check in root data directory first
-        root_path = os.path.join(data_dir, input_file)
-        if os.path.exists(root_path):
-            input_path = root_path
-        else:
-            # Check in downloaded directory
-            downloaded_path = os.path.join(data_dir, 'downloaded', input_file)
-            if os.path.exists(downloaded_path):
-                input_path = downloaded_path
-            else:
-                # Check in stooq directory (for Stooq downloads)
-                stooq_path = os.path.join(data_dir, 'stooq', input_file)
-                if os.path.exists(stooq_path):
-                    input_path = stooq_path
+        # Relative paths: root data directory, then downloaded/, then stooq/ (Stooq downloads)
+        from redline.core.file_catalog import resolve_data_file
+        input_path = resolve_data_file(
+            input_file, locations=('root', 'downloaded', 'stooq'), data_dir=data_dir
+        )
     
     return input_path
 
@@ -102,6 +94,7 @@ def adjust_output_filename(output_filename, output_format):
     format_extensions = {
         'csv': '.csv',
         'json': '.json',
+        'jsonl': '.jsonl',
         'parquet': '.parquet',
         'feather': '.feather',
         'duckdb': '.duckdb',
@@ -201,6 +194,9 @@ def merge_dataframes(dataframes: List[pd.DataFrame],
     """
     Merge multiple DataFrames into one, handling column alignment and mappings.
     
+    Needs every frame in memory; the batch-merge route uses
+    redline.core.merge_engine.MergeEngine for out-of-core merges of files.
+    
     Args:
         dataframes: List of DataFrames to merge
         column_mappings: Optional dictionary mapping old column names to new names
@@ -220,16 +216,8 @@ def merge_dataframes(dataframes: List[pd.DataFrame],
     all_columns = align_columns_for_merge(dataframes, preferred_order=column_order)
     
     # Align all DataFrames to have the same columns
-    aligned_dfs = []
-    for df in dataframes:
-        if isinstance(df, pd.DataFrame):
-            # Add missing columns with NaN values
-            for col in all_columns:
-                if col not in df.columns:
-                    df[col] = None
-            # Reorder columns to match
-            df = df[all_columns]
-            aligned_dfs.append(df)
+    # Add missing columns (as NaN) and reorder in one step, without touching the caller's frames
+    aligned_dfs = [df.reindex(columns=all_columns) for df in dataframes if isinstance(df, pd.DataFrame)]
     
     # Concatenate all DataFrames
     if aligned_dfs:
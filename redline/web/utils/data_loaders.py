@@ -31,32 +31,11 @@ def load_data_file(filename, file_path_hint=None):
     """
     from redline.core.format_converter import FormatConverter
     from redline.core.schema import EXT_TO_FORMAT
+    from redline.core.file_catalog import resolve_data_file
     from .data_helpers import clean_dataframe_columns
     
     converter = FormatConverter()
-    data_dir = os.path.join(os.getcwd(), 'data')
-    data_path = None
-    
-    if file_path_hint and os.path.exists(file_path_hint):
-        data_path = file_path_hint
-    else:
-        search_paths = [
-            os.path.join(data_dir, filename),
-            os.path.join(data_dir, 'stooq', filename),
-            os.path.join(data_dir, 'downloaded', filename),
-            os.path.join(data_dir, 'uploads', filename)
-        ]
-        
-        converted_dir = os.path.join(data_dir, 'converted')
-        if os.path.exists(converted_dir):
-            for root, dirs, files in os.walk(converted_dir):
-                if filename in files:
-                    search_paths.append(os.path.join(root, filename))
-        
-        for path in search_paths:
-            if os.path.exists(path):
-                data_path = path
-                break
+    data_path = resolve_data_file(filename, file_path_hint=file_path_hint)
     
     if not data_path or not os.path.exists(data_path):
         raise FileNotFoundError(f'File not found: {filename}')
@@ -64,19 +43,9 @@ def load_data_file(filename, file_path_hint=None):
     ext = os.path.splitext(data_path)[1].lower()
     format_type = EXT_TO_FORMAT.get(ext, 'csv')
     
-    if format_type == 'csv':
-        df = pd.read_csv(data_path)
-    elif format_type == 'parquet':
-        df = pd.read_parquet(data_path)
-    elif format_type == 'feather':
-        df = pd.read_feather(data_path)
-    elif format_type == 'json':
-        df = pd.read_json(data_path)
-    elif format_type == 'duckdb':
-        import duckdb
-        conn = duckdb.connect(data_path)
-        df = conn.execute("SELECT * FROM tickers_data").fetchdf()
-        conn.close()
+    if format_type in ('csv', 'parquet', 'feather', 'json', 'duckdb'):
+        # Shared loader so repeat requests are served from the frame cache
+        df = converter.load_file_by_type(data_path, format_type)
     elif format_type in ('tensorflow', 'npz'):
         # Use allow_pickle=True for .npz files that may contain object arrays
         loaded = np.load(data_path, allow_pickle=True)
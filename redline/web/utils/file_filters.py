@@ -5,45 +5,312 @@ Functions for applying filters to DataFrames.
 """
 
 import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
+from ...core.time_index import TIME_COLUMN, is_time_sorted, range_bounds
+
 logger = logging.getLogger(__name__)
 
+FILTER_TYPES = ('equals', 'contains', 'greater_than', 'less_than', 'date_range')
+
+
+class FilterColumns:
+    """
+    Per-frame cache of the column views the filter kernels work on.
+
+    Parsing a text date column or hashing a text column dominates the cost
+    of a filter, so each is done at most once per column. Keep one instance
+    per frame and pass it to apply_filters when the same frame is filtered
+    repeatedly (e.g. a preview refreshed as the user edits the filters).
+    The cache assumes the frame's columns are not modified meanwhile.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._factors: Dict[str, tuple] = {}
+        self._numbers: Dict[str, np.ndarray] = {}
+        self._dates: Dict[str, pd.Index] = {}
+
+    def factors(self, column: str) -> Tuple[np.ndarray, pd.Series, np.ndarray, pd.Series]:
+        """
+        The column as codes into its distinct values, rendered as astype(str) renders them.
+
+        Returns:
+            (codes, text of each distinct value, positions of missing values,
+            text of each missing value). Missing values have code -1 and keep
+            their own text ('None', 'nan', 'NaT').
+        """
+        if column not in self._factors:
+            series = self.df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes = series.cat.codes.to_numpy()
+                uniques = series.cat.categories
+            else:
+                codes, uniques = pd.factorize(series)
+            labels = pd.Series(uniques).astype(str).reset_index(drop=True)
+            missing = np.flatnonzero(codes < 0)
+            self._factors[column] = (codes, labels, missing, series.iloc[missing].astype(str))
+        return self._factors[column]
+
+    def match_text(self, column: str, match) -> np.ndarray:
+        """
+        Evaluate a text predicate once per distinct value and map it back to the rows.
+
+        Args:
+            column: Column to match
+            match: Function from a Series of str to a boolean Series
+
+        Returns:
+            Boolean row mask
+        """
+        codes, labels, missing, missing_labels = self.factors(column)
+        matched = np.append(np.asarray(match(labels), dtype=bool), False)
+        mask = matched[codes]
+        if len(missing):
+            mask[missing] = np.asarray(match(missing_labels), dtype=bool)
+        return mask
+
+    def numbers(self, column: str) -> np.ndarray:
+        """The column as float64, unparsable values as NaN (pd.to_numeric with errors='coerce')."""
+        if column not in self._numbers:
+            series = self.df[column]
+            if not (series.dtype.kind in 'iuf' and isinstance(series.dtype, np.dtype)):
+                series = pd.to_numeric(series, errors='coerce')
+            self._numbers[column] = series.to_numpy(dtype='float64', na_value=np.nan)
+        return self._numbers[column]
+
+    def dates(self, column: str) -> pd.Index:
+        """The column parsed as datetimes (pd.to_datetime with errors='coerce')."""
+        if column not in self._dates:
+            self._dates[column] = pd.Index(pd.to_datetime(self.df[column], errors='coerce'))
+        return self._dates[column]
+
+
+class _Condition:
+    """One parsed form filter."""
+
+    __slots__ = ('column', 'type', 'value', 'bounds')
+
+    def __init__(self, column: str, filter_type: str, value, bounds=None):
+        self.column = column
+        self.type = filter_type
+        self.value = value
+        self.bounds = bounds
+
+
+def compile_filters(filters: dict) -> List[_Condition]:
+    """
+    Parse form filters once into conditions for apply_filters.
+
+    Filters without a type or value, of an unknown type, or whose value does
+    not parse (a non-numeric bound, a date range without ' to ') are dropped.
+
+    Args:
+        filters: {column: {'type': ..., 'value': ...}} as sent by the filter form
+
+    Returns:
+        Parsed conditions, reusable across frames
+    """
+    conditions = []
+    for column, filter_config in filters.items():
+        filter_type = filter_config.get('type')
+        filter_value = filter_config.get('value')
+
+        if not filter_type or not filter_value or filter_type not in FILTER_TYPES:
+            continue
+
+        try:
+            if filter_type in ('equals', 'contains'):
+                conditions.append(_Condition(column, filter_type, str(filter_value)))
+            elif filter_type in ('greater_than', 'less_than'):
+                conditions.append(_Condition(column, filter_type, float(filter_value)))
+            elif ' to ' in filter_value:
+                start_date, end_date = filter_value.split(' to ')
+                bounds = (pd.to_datetime(start_date), pd.to_datetime(end_date))
+                conditions.append(_Condition(column, filter_type, filter_value, bounds))
+        except Exception as e:
+            logger.error(f"Error applying filter {column}: {str(e)}")
+    return conditions
+
+
+def _equals_mask(columns: FilterColumns, column: str, value: str) -> np.ndarray:
+    series = columns.df[column]
+    kind = series.dtype.kind
+    if isinstance(series.dtype, np.dtype) and kind in 'iufM':
+        # Compare natively, then confirm the few candidate rows by their text
+        # ('1' must not match 1.0, which renders as '1.0')
+        try:
+            target = pd.Timestamp(value) if kind == 'M' else float(value)
+        except ValueError:
+            return np.zeros(len(series), dtype=bool)
+        if not pd.isna(target):
+            mask = series.to_numpy() == (target.to_datetime64() if kind == 'M' else target)
+            candidates = np.flatnonzero(mask)
+            if len(candidates) and kind == 'M':
+                # A datetime's text depends on the whole column (the time is
+                # dropped only when every value is at midnight)
+                codes, labels = columns.factors(column)[:2]
+                mask[candidates] = labels.to_numpy()[codes[candidates]] == value
+            elif len(candidates):
+                mask[candidates] = series.iloc[candidates].astype(str).to_numpy() == value
+            return mask
+    elif series.dtype == object and column not in columns._factors:
+        values = series.to_numpy()
+        if pd.api.types.infer_dtype(values, skipna=False) == 'string':
+            return values == value
+    return columns.match_text(column, lambda labels: labels == value)
+
+
+def _contains_mask(columns: FilterColumns, column: str, value: str) -> np.ndarray:
+    return columns.match_text(column, lambda labels: labels.str.contains(value, case=False, na=False))
+
+
+def _date_range_mask(columns: FilterColumns, column: str, bounds) -> np.ndarray:
+    start, end = bounds
+    if column == TIME_COLUMN and is_time_sorted(columns.df):
+        # Loaded frames carry a sorted timestamp index: binary-search each ticker's block
+        mask = np.zeros(len(columns.df), dtype=bool)
+        for lo, hi in range_bounds(columns.df, start, end):
+            mask[lo:hi] = True
+        return mask
+    dates = columns.dates(column)
+    if dates.is_monotonic_increasing:
+        # Sorted timestamps: the range is one contiguous slice
+        mask = np.zeros(len(dates), dtype=bool)
+        mask[dates.searchsorted(start, side='left'):dates.searchsorted(end, side='right')] = True
+        return mask
+    return np.asarray((dates >= start) & (dates <= end))
+
+
+def condition_mask(columns: FilterColumns, condition: _Condition) -> np.ndarray:
+    """Boolean row mask for one condition, using the kernel for its column's dtype."""
+    if condition.type == 'equals':
+        return _equals_mask(columns, condition.column, condition.value)
+    if condition.type == 'contains':
+        return _contains_mask(columns, condition.column, condition.value)
+    if condition.type == 'greater_than':
+        return columns.numbers(condition.column) > condition.value
+    if condition.type == 'less_than':
+        return columns.numbers(condition.column) < condition.value
+    return _date_range_mask(columns, condition.column, condition.bounds)
+
+
+def apply_filters(df: pd.DataFrame, filters: dict, columns: Optional[FilterColumns] = None) -> pd.DataFrame:
+    """
+    Apply form filters to a DataFrame.
+
+    Filters are parsed once, each condition is evaluated to a numpy mask by
+    a dtype-specific kernel, and the frame is indexed once with the combined
+    mask. Filters on missing columns are skipped, as are conditions that
+    fail to evaluate (the error is logged).
+
+    Args:
+        df: Frame to filter
+        filters: {column: {'type': ..., 'value': ...}}; see FILTER_TYPES
+        columns: Column cache for df, to reuse parsed columns across calls
+
+    Returns:
+        The matching rows (a new frame)
+    """
+    if columns is None or columns.df is not df:
+        columns = FilterColumns(df)
+
+    mask = None
+    for condition in compile_filters(filters):
+        if condition.column not in df.columns:
+            continue
+        try:
+            condition_rows = condition_mask(columns, condition)
+        except Exception as e:
+            logger.error(f"Error applying filter {condition.column}: {str(e)}")
+            continue
+        mask = condition_rows if mask is None else mask & condition_rows
+
+    return df.copy() if mask is None else df[mask]
 
-def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
-    """Apply filters to DataFrame."""
-    filtered_df = df.copy()
-    
+
+def to_load_filters(filters: dict) -> list:
+    """
+    Translate form filters into loader filters (see redline.core.load_filters).
+
+    Only the range filters (greater_than, less_than, date_range) are
+    translated; they can be pushed into the file reader and give the same
+    rows as apply_filters. Text filters (equals, contains) are left to
+    apply_filters, which should still be run on the loaded frame.
+    """
+    load_filters = []
     for column, filter_config in filters.items():
-        if column not in filtered_df.columns:
+        filter_type = filter_config.get('type')
+        filter_value = filter_config.get('value')
+        if not filter_type or not filter_value:
             continue
-            
+        try:
+            if filter_type in ('greater_than', 'less_than'):
+                load_filters.append((column, '>' if filter_type == 'greater_than' else '<', float(filter_value)))
+            elif filter_type == 'date_range' and ' to ' in filter_value:
+                start_date, end_date = filter_value.split(' to ')
+                pd.Timestamp(start_date), pd.Timestamp(end_date)
+                load_filters.append((column, 'between', (start_date, end_date)))
+        except (TypeError, ValueError):
+            # apply_filters skips filters whose value does not parse
+            continue
+    return load_filters
+
+
+def polars_filter_expression(filters: dict, schema):
+    """
+    Build a polars expression with the same semantics as apply_filters.
+
+    Args:
+        filters: Form filters, as for apply_filters
+        schema: Schema of the LazyFrame being filtered
+
+    Returns:
+        A polars expression, or None if no filter applies
+    """
+    import polars as pl
+
+    expression = None
+    for column, filter_config in filters.items():
+        if column not in schema:
+            continue
+
         filter_type = filter_config.get('type')
         filter_value = filter_config.get('value')
-        
+
         if not filter_type or not filter_value:
             continue
-        
+
+        col = pl.col(column)
         try:
             if filter_type == 'equals':
-                filtered_df = filtered_df[filtered_df[column].astype(str) == str(filter_value)]
+                condition = col.cast(pl.String) == str(filter_value)
             elif filter_type == 'contains':
-                filtered_df = filtered_df[filtered_df[column].astype(str).str.contains(str(filter_value), case=False, na=False)]
-            elif filter_type == 'greater_than':
-                filtered_df = filtered_df[pd.to_numeric(filtered_df[column], errors='coerce') > float(filter_value)]
-            elif filter_type == 'less_than':
-                filtered_df = filtered_df[pd.to_numeric(filtered_df[column], errors='coerce') < float(filter_value)]
-            elif filter_type == 'date_range':
-                # Handle date range filtering
-                if ' to ' in filter_value:
-                    start_date, end_date = filter_value.split(' to ')
-                    filtered_df = filtered_df[
-                        (pd.to_datetime(filtered_df[column], errors='coerce') >= pd.to_datetime(start_date)) &
-                        (pd.to_datetime(filtered_df[column], errors='coerce') <= pd.to_datetime(end_date))
-                    ]
+                condition = col.cast(pl.String).str.contains(f"(?i){filter_value}")
+            elif filter_type in ('greater_than', 'less_than'):
+                number = col.cast(pl.Float64, strict=False)
+                value = float(filter_value)
+                condition = number > value if filter_type == 'greater_than' else number < value
+            elif filter_type == 'date_range' and ' to ' in filter_value:
+                start_date, end_date = (pd.Timestamp(v).to_pydatetime() for v in filter_value.split(' to '))
+                dtype = schema[column]
+                if dtype == pl.String:
+                    dates = col.str.to_datetime(strict=False)
+                elif dtype.is_temporal():
+                    dates = col.cast(pl.Datetime)
+                else:
+                    continue
+                condition = dates.is_between(start_date, end_date)
+            else:
+                continue
         except Exception as e:
             logger.error(f"Error applying filter {column}: {str(e)}")
             continue
-    
-    return filtered_df
+        # Rows where the comparison is null are dropped, as in apply_filters
+        condition = condition.fill_null(False)
+        expression = condition if expression is None else expression & condition
 
+    return expression
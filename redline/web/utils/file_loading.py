@@ -11,7 +11,7 @@ from flask import current_app
 
 # Import from specialized modules
 from .parallel_loading import load_single_file_parallel, load_files_parallel
-from .file_filters import apply_filters
+from .file_filters import apply_filters, to_load_filters
 from .chunked_loading import load_large_file_chunked
 from ...core.format_loaders import FormatLoaders
 from ...core.format_savers import FormatSavers
@@ -34,11 +34,11 @@ def rate_limit(limit_string):
     return decorator
 
 # Compatibility functions that delegate to FormatLoaders/FormatSavers
-def load_file_by_format(file_path: str, format_type: str):
-    """Load file based on format type."""
+def load_file_by_format(file_path: str, format_type: str, columns=None, filters=None):
+    """Load file based on format type, optionally pushing down columns and row filters."""
     import pandas as pd
     loader = FormatLoaders()
-    return loader.load_file_by_type(file_path, format_type)
+    return loader.load_file_by_type(file_path, format_type, columns=columns, filters=filters)
 
 def save_file_by_format(df, file_path: str, format_type: str) -> bool:
     """Save DataFrame to file based on format type."""
@@ -58,6 +58,7 @@ __all__ = [
     'load_file_by_format',
     'save_file_by_format',
     'apply_filters',
+    'to_load_filters',
     'load_large_file_chunked',
     'detect_format_from_path'  # Re-export for backward compatibility
 ]
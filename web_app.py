@@ -478,6 +478,19 @@ def create_app():
     # Store socketio for potential use
     app.config['socketio'] = socketio
     
+    # Push batch download progress over SocketIO and resume download jobs
+    # interrupted by a crash or restart
+    try:
+        from redline.background.download_jobs import get_download_jobs
+        
+        def emit_download_progress(event):
+            if hasattr(socketio, 'emit'):
+                socketio.emit('batch_download_progress', event)
+        
+        get_download_jobs().start(emit_download_progress)
+    except Exception as e:
+        logger.warning(f"Could not start download job watchdog: {str(e)}")
+    
     # For Gunicorn, return only the app
     return app
 